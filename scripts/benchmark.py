@@ -12,33 +12,38 @@ Usage:
 
 import asyncio
 import json
+import random
 import time
 import argparse
 import statistics
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
-# Add src to path for imports
+# Add repository root to path so src imports as a package
 import sys
-sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from utils.performance import PerformanceMonitor, performance_context, get_memory_stats
-from utils.memory_optimizer import (
+from src.utils.performance.monitor import PerformanceMonitor, performance_context
+from src.utils.memory_optimizer import (
     MemoryEfficientStats, 
     CircularBuffer, 
     TimeBasedCache,
     StreamProcessor,
     get_memory_stats as get_memory_usage
 )
-from utils.network_optimizer import (
+from src.utils.network_optimizer import (
     ConnectionPool,
     DiscordAPIBatcher,
     AdaptivePoller,
     APIRequest
 )
-from utils.config_validator import ConfigValidator
+from src.utils.config_validator import ConfigValidator
+from src.utils.logging.structured_logger import StructuredLogger
+from src.utils.logging.log_query import LogSearch
+from src.utils.cache.cache_manager import CacheManager
+from src.types.models import LogLevel
 
 
 @dataclass
@@ -66,7 +71,7 @@ class BenchmarkSuite:
     performance_summary: Dict[str, Any]
 
 
-class StatsBot Benchmarker:
+class StatsBotBenchmarker:
     """
     Comprehensive benchmarking system for StatsBot optimizations.
     
@@ -111,6 +116,12 @@ class StatsBot Benchmarker:
         # Performance monitoring benchmarks
         await self._benchmark_performance_monitoring()
         
+        # Logging benchmarks
+        await self._benchmark_logging()
+        
+        # Cache eviction benchmarks
+        await self._benchmark_cache_eviction()
+        
         # Network optimization benchmarks
         await self._benchmark_network_optimizations()
         
@@ -182,7 +193,7 @@ class StatsBot Benchmarker:
         await self._run_benchmark(
             "timing_decorator_overhead",
             self._test_timing_decorator_overhead,
-            {"iterations": 1000}
+            {"iterations": 10000}
         )
         
         # Test memory monitoring overhead
@@ -192,6 +203,42 @@ class StatsBot Benchmarker:
             {"iterations": 500}
         )
     
+    async def _benchmark_logging(self):
+        """Benchmark structured logging overhead."""
+        self.log("📝 Benchmarking logging overhead...")
+        
+        # Test per-call cost of filtered and enabled log calls
+        await self._run_benchmark(
+            "logging_overhead",
+            self._test_logging_overhead,
+            {"iterations": 20000}
+        )
+        
+        # Test sparse log index build and indexed query cost
+        await self._run_benchmark(
+            "log_index_build",
+            self._test_log_index_build,
+            {"records": 50000, "minutes": 600}
+        )
+    
+    async def _benchmark_cache_eviction(self):
+        """Benchmark CacheManager eviction policies."""
+        self.log("🗃️ Benchmarking cache eviction policies...")
+        
+        # Replay one skewed key trace (with scans) against every policy
+        await self._run_benchmark(
+            "cache_eviction_policies",
+            self._test_cache_eviction_policies,
+            {"requests": 50000, "keys": 20000, "capacity": 2000}
+        )
+        
+        # Expiry ticks on a large cache should only pay for due entries
+        await self._run_benchmark(
+            "cache_expiry_cleanup",
+            self._test_cache_expiry_cleanup,
+            {"entries": 100000, "due": 1000}
+        )
+    
     async def _benchmark_network_optimizations(self):
         """Benchmark network optimization features."""
         self.log("🌐 Benchmarking network optimizations...")
@@ -388,13 +435,17 @@ class StatsBot Benchmarker:
         }
     
     async def _test_timing_decorator_overhead(self, iterations: int) -> Dict[str, Any]:
-        """Test timing decorator overhead."""
+        """Test timing decorator overhead, full and sampled."""
         monitor = PerformanceMonitor()
         
         @monitor.timing_decorator(category="benchmark")
         def decorated_function(x: int) -> int:
             return x * 2
         
+        @monitor.timing_decorator(category="benchmark", sample_rate=0.01)
+        def sampled_function(x: int) -> int:
+            return x * 2
+        
         def plain_function(x: int) -> int:
             return x * 2
         
@@ -404,6 +455,12 @@ class StatsBot Benchmarker:
             decorated_function(i)
         decorated_time = time.perf_counter() - start_time
         
+        # Benchmark sampled function
+        start_time = time.perf_counter()
+        for i in range(iterations):
+            sampled_function(i)
+        sampled_time = time.perf_counter() - start_time
+        
         # Benchmark plain function
         start_time = time.perf_counter()
         for i in range(iterations):
@@ -411,13 +468,20 @@ class StatsBot Benchmarker:
         plain_time = time.perf_counter() - start_time
         
         overhead_percent = ((decorated_time - plain_time) / plain_time) * 100
+        sampled_overhead_percent = ((sampled_time - plain_time) / plain_time) * 100
+        sampled_calls = monitor.get_metrics_summary("sampled_function")["sampled_calls"]
         
         monitor.shutdown()
         
         return {
             "decorated_time_ms": decorated_time * 1000,
+            "sampled_time_ms": sampled_time * 1000,
             "plain_time_ms": plain_time * 1000,
-            "overhead_percent": overhead_percent
+            "overhead_percent": overhead_percent,
+            "sampled_overhead_percent": sampled_overhead_percent,
+            "per_call_overhead_us": (decorated_time - plain_time) / iterations * 1_000_000,
+            "sampled_per_call_overhead_us": (sampled_time - plain_time) / iterations * 1_000_000,
+            "sampled_calls": sampled_calls
         }
     
     async def _test_memory_monitoring_overhead(self, iterations: int) -> Dict[str, Any]:
@@ -444,6 +508,206 @@ class StatsBot Benchmarker:
             "overhead_percent": overhead_percent
         }
     
+    async def _test_logging_overhead(self, iterations: int) -> Dict[str, Any]:
+        """Test per-call logging overhead with the level filter on and off."""
+        import tempfile
+        
+        member = {"name": "benchmark_user", "discriminator": "0001", "id": 123456789}
+        
+        def per_call_ns(fn: callable, count: int) -> float:
+            start = time.perf_counter_ns()
+            for _ in range(count):
+                fn()
+            return (time.perf_counter_ns() - start) / count
+        
+        with tempfile.TemporaryDirectory() as log_dir:
+            logger = StructuredLogger("benchmark", log_dir=log_dir, level=LogLevel.WARNING)
+            
+            results = {
+                # Eager f-string and context built even though DEBUG is filtered
+                "filtered_eager_ns": per_call_ns(
+                    lambda: logger.debug(
+                        f"Member joined: {member['name']}#{member['discriminator']}",
+                        member_id=str(member["id"])
+                    ),
+                    iterations
+                ),
+                "filtered_args_ns": per_call_ns(
+                    lambda: logger.debug(
+                        "Member joined: %s#%s", member["name"], member["discriminator"]
+                    ),
+                    iterations
+                ),
+                "filtered_callable_ns": per_call_ns(
+                    lambda: logger.debug(lambda: f"Member joined: {member['name']}"),
+                    iterations
+                ),
+                "filtered_guarded_ns": per_call_ns(
+                    lambda: logger.is_enabled(LogLevel.DEBUG) and logger.debug(
+                        f"Member joined: {member['name']}", member_id=str(member["id"])
+                    ),
+                    iterations
+                ),
+                # Enabled calls go through formatting and the background writer
+                "enabled_args_ns": per_call_ns(
+                    lambda: logger.warning(
+                        "Member joined: %s#%s", member["name"], member["discriminator"],
+                        member_id=str(member["id"])
+                    ),
+                    max(1, iterations // 10)
+                )
+            }
+            logger.flush()
+        
+        results["filtered_args_speedup"] = results["filtered_eager_ns"] / max(results["filtered_args_ns"], 1e-9)
+        return results
+    
+    async def _test_log_index_build(self, records: int, minutes: int) -> Dict[str, Any]:
+        """Test building a log segment index and querying with it versus a full scan."""
+        import gzip
+        import random
+        import tempfile
+        
+        rng = random.Random(42)
+        services = ["StatsService", "PresenceService", "MonitoringService", "CacheManager"]
+        levels = ["DEBUG"] * 30 + ["INFO"] * 60 + ["WARNING"] * 8 + ["ERROR"] * 2
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        
+        with tempfile.TemporaryDirectory() as log_dir:
+            day_dir = Path(log_dir) / "2025-01-01"
+            day_dir.mkdir()
+            segment = day_dir / "logs.json"
+            with open(segment, "w", encoding="utf-8") as f:
+                for i in range(records):
+                    timestamp = start + timedelta(seconds=i * minutes * 60 / records)
+                    f.write(json.dumps({
+                        "timestamp": timestamp.isoformat(),
+                        "level": rng.choice(levels),
+                        "message": f"Benchmark record {i}",
+                        "context": {"guild_id": "123456789"},
+                        "service": rng.choice(services)
+                    }) + "\n")
+            
+            search = LogSearch(log_dir)
+            build_start = time.perf_counter()
+            index = search.build_index(segment)
+            build_time = time.perf_counter() - build_start
+            
+            window = {
+                "start": start + timedelta(minutes=minutes // 2),
+                "end": start + timedelta(minutes=minutes // 2 + 60),
+                "levels": ["ERROR"],
+                "services": ["StatsService"]
+            }
+            
+            query_start = time.perf_counter()
+            indexed_matches = len(list(search.search(**window)))
+            query_time = time.perf_counter() - query_start
+            
+            # Same question answered by parsing every line
+            scan_start = time.perf_counter()
+            scan_matches = 0
+            with open(segment, encoding="utf-8") as f:
+                for line in f:
+                    record = json.loads(line)
+                    when = datetime.fromisoformat(record["timestamp"])
+                    if (window["start"] <= when <= window["end"] and record["level"] == "ERROR"
+                            and record["service"] == "StatsService"):
+                        scan_matches += 1
+            scan_time = time.perf_counter() - scan_start
+            
+            # Compressed segment reuses the decompressed offsets
+            with open(segment, "rb") as f_in, gzip.open(f"{segment}.gz", "wb") as f_out:
+                f_out.write(f_in.read())
+            segment.with_name("logs.json.idx").replace(day_dir / "logs.json.gz.idx")
+            segment.unlink()
+            gzip_start = time.perf_counter()
+            gzip_matches = len(list(LogSearch(log_dir).search(**window)))
+            gzip_time = time.perf_counter() - gzip_start
+            
+            return {
+                "build_time_ms": build_time * 1000,
+                "build_records_per_sec": records / build_time,
+                "index_blocks": len(index.blocks),
+                "index_bytes": (day_dir / "logs.json.gz.idx").stat().st_size,
+                "segment_bytes": index.indexed_bytes,
+                "indexed_query_ms": query_time * 1000,
+                "full_scan_ms": scan_time * 1000,
+                "gzip_indexed_query_ms": gzip_time * 1000,
+                "matches": indexed_matches,
+                "results_consistent": indexed_matches == scan_matches == gzip_matches
+            }
+    
+    async def _test_cache_eviction_policies(self, requests: int, keys: int, capacity: int) -> Dict[str, Any]:
+        """Compare hit ratio and set latency of eviction policies on a replayed trace."""
+        # Zipf-like popularity (s=0.9) with a burst of one-off keys every 5000
+        # requests, like a full member scan after a reconnect
+        rng = random.Random(42)
+        weights = [1 / (rank + 1) ** 0.9 for rank in range(keys)]
+        trace = []
+        for i, key in enumerate(rng.choices(range(keys), weights=weights, k=requests)):
+            trace.append(f"stats:{key}")
+            if i % 5000 == 4999:
+                trace.extend(f"scan:{i}:{n}" for n in range(capacity // 2))
+        
+        results = {"trace_length": len(trace)}
+        for policy in ("scored", "lru", "tinylfu"):
+            cache = CacheManager(default_ttl=3600, max_size=capacity, eviction_policy=policy)
+            set_times = []
+            for key in trace:
+                if cache.get(key) is None:
+                    start = time.perf_counter_ns()
+                    cache.set(key, key)
+                    set_times.append(time.perf_counter_ns() - start)
+            
+            set_times.sort()
+            stats = cache.get_policy_stats()
+            results[policy] = {
+                "hit_ratio": stats["hit_rate"],
+                "evictions": stats["evictions"],
+                "rejections": stats["rejections"],
+                "avg_set_us": sum(set_times) / len(set_times) / 1000,
+                "p99_set_us": set_times[int(len(set_times) * 0.99)] / 1000,
+                "max_set_us": set_times[-1] / 1000
+            }
+        
+        return results
+    
+    async def _test_cache_expiry_cleanup(self, entries: int, due: int) -> Dict[str, Any]:
+        """Compare heap-driven expiry ticks with the former full-scan cleanup."""
+        rng = random.Random(42)
+        cache = CacheManager(default_ttl=300, max_size=entries + due, eviction_policy="lru")
+        for i in range(entries):
+            cache.set(f"stats:{i}", i, ttl=rng.choice((60, 300, 3600)))
+        
+        # Idle tick: nothing is due yet
+        start = time.perf_counter()
+        cache._cleanup_expired()
+        idle_tick = time.perf_counter() - start
+        
+        # Former cleanup: walk every entry under the lock to find expired ones
+        start = time.perf_counter()
+        with cache._lock:
+            current_time = time.time()
+            [key for key, entry in cache._cache.items() if current_time > entry.expiry]
+        full_scan = time.perf_counter() - start
+        
+        for i in range(due):
+            cache.set(f"due:{i}", i, ttl=0)
+        time.sleep(0.01)
+        start = time.perf_counter()
+        expired = cache._cleanup_expired()
+        due_tick = time.perf_counter() - start
+        
+        return {
+            "entries": entries,
+            "expired": expired,
+            "idle_tick_us": idle_tick * 1_000_000,
+            "due_tick_ms": due_tick * 1000,
+            "full_scan_ms": full_scan * 1000,
+            "expiry_queue": cache.get_counters()["expiry_queue"]
+        }
+    
     async def _test_connection_pool(self, connections: int) -> Dict[str, Any]:
         """Test connection pool efficiency."""
         pool = ConnectionPool(max_connections=connections)
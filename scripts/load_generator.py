@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+StatsBot Synthetic Gateway Load Generator.
+
+This script drives the real OptimizedStatsBot member event handlers with
+fake guilds and members at a configurable rate and burst shape, and reports
+per-stage latency percentiles, peak RSS and file saves per event as JSON so
+runs can be compared over time.
+
+Stages measured for every generated event (latency from gateway dispatch):
+    handler         Handler ran and published to the member event bus
+    record          Stats tracker recorded the event (stats_tracker subscriber)
+    channel_update  A channel update covering the event's guild ran
+    save            A stats file write that includes the event completed
+
+Discord itself is not contacted: the stats service is MockStatsService with
+recording delegated to a real StatsTracker writing into a temp directory, and
+channel updates only record their timing.
+
+Usage:
+    python scripts/load_generator.py [--rate 50] [--duration 30] [--guilds 5]
+        [--shape steady|burst|spike|ramp] [--burst-rate 500]
+        [--burst-duration 5] [--burst-interval 20] [--replay-fraction 0.0]
+        [--output results.json]
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set, Tuple
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+# Add repository root to path so src and tests import as packages
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Keep stats files and logs out of the working tree. This must happen before
+# src is imported: module-level objects log tree sections at import time and
+# the tree logger resolves its logs/ directory on first use.
+CALLER_CWD = os.getcwd()
+WORKDIR = tempfile.TemporaryDirectory(prefix="statsbot-load-")
+os.chdir(WORKDIR.name)
+
+# Import the bot first: it resolves the services/stats import cycle
+from src.core.bot import OptimizedStatsBot
+from src.services.stats.tracker import StatsTracker
+from src.types.models import BotConfig
+from src.utils.logging.structured_logger import LogLevel
+import src.utils.file_io.json_utils as json_utils
+from tests.mocks import MockStatsService, MockGuild, MockMember
+
+
+STAGES = ("handler", "record", "channel_update", "save")
+EVENT_TYPES = ("join", "leave", "ban")
+
+
+@dataclass
+class LoadProfile:
+    """Shape and size of the generated load."""
+    rate: float = 50.0
+    duration: float = 30.0
+    guilds: int = 5
+    shape: str = "steady"
+    burst_rate: float = 500.0
+    burst_duration: float = 5.0
+    burst_interval: float = 20.0
+    mix: Dict[str, float] = field(default_factory=lambda: {"join": 0.6, "leave": 0.3, "ban": 0.1})
+    replay_fraction: float = 0.0
+    seed: int = 1
+    
+    def rate_at(self, offset: float) -> float:
+        """
+        Get the target event rate at an offset into the run.
+        
+        Args:
+            offset: Seconds since the start of the run
+        
+        Returns:
+            Events per second
+        """
+        if self.shape == "burst":
+            if offset % self.burst_interval < self.burst_duration:
+                return self.burst_rate
+        elif self.shape == "spike":
+            start = self.duration / 3
+            if start <= offset < start + self.burst_duration:
+                return self.burst_rate
+        elif self.shape == "ramp":
+            progress = min(1.0, offset / self.duration)
+            return self.rate + (self.burst_rate - self.rate) * progress
+        return self.rate
+
+
+@dataclass
+class StageSummary:
+    """Latency percentiles for one stage."""
+    count: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+@dataclass
+class LoadReport:
+    """Complete load generator run results."""
+    timestamp: str
+    profile: Dict[str, Any]
+    wall_time_s: float
+    events_generated: int
+    events_replayed: int
+    achieved_rate: float
+    stages: Dict[str, StageSummary]
+    incomplete: Dict[str, int]
+    saves: int
+    skipped_saves: int
+    saves_per_event: float
+    peak_rss_mb: float
+    tracker: Dict[str, Any]
+    pipeline: Dict[str, Any]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class GatewayLoadGenerator:
+    """Feeds synthetic gateway events through the bot and times each stage."""
+    
+    def __init__(self, profile: LoadProfile, log_level: LogLevel = LogLevel.WARNING):
+        """
+        Initialize the load generator.
+        
+        Args:
+            profile: Load shape and size
+            log_level: Level applied to the bot and tracker loggers
+        """
+        self.profile = profile
+        self.log_level = log_level
+        self.random = random.Random(profile.seed)
+        
+        self.guilds = [MockGuild(1000 + i, member_count=1000) for i in range(profile.guilds)]
+        self._next_member_id = 1
+        self._sent: List[Tuple[str, MockMember]] = []
+        self._guild_of: Dict[int, int] = {}
+        self._handlers: Set[asyncio.Task] = set()
+        
+        # member_id -> dispatch time, then stage -> latencies in seconds
+        self._dispatched_at: Dict[int, float] = {}
+        self._latencies: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        
+        # Events recorded but not yet covered by a channel update or a save
+        self._awaiting_update: Dict[Tuple[str, int], List[int]] = {}
+        self._awaiting_save: List[int] = []
+        
+        self.events_generated = 0
+        self.events_replayed = 0
+        self.saves = 0
+        self.skipped_saves = 0
+        
+        self.bot: Optional[OptimizedStatsBot] = None
+        self.tracker: Optional[StatsTracker] = None
+    
+    def _stage_done(self, stage: str, member_id: int) -> None:
+        """Record a stage latency for an event."""
+        started = self._dispatched_at.get(member_id)
+        if started is not None:
+            self._latencies[stage].append(time.perf_counter() - started)
+    
+    def _build_bot(self) -> OptimizedStatsBot:
+        """Create the bot with a mock stats service backed by a real tracker."""
+        config = BotConfig(
+            bot_token="load-generator",
+            member_count_channel_id=1,
+            online_count_channel_id=2,
+            ban_count_channel_id=3,
+            heartbeat_channel_id=4,
+            stats_channel_id=5
+        )
+        bot = OptimizedStatsBot(config)
+        bot.logger.set_level(self.log_level)
+        
+        self.tracker = StatsTracker(logger=bot.logger)
+        service = MockStatsService()
+        
+        def recorder(kind: str, record):
+            def record_event(member_id: int, username: str) -> None:
+                self._stage_done("record", member_id)
+                record(member_id, username)
+                self._awaiting_save.append(member_id)
+                guild_id = self._guild_of[member_id]
+                update_type = "ban_count" if kind == "ban" else "member_count"
+                self._awaiting_update.setdefault((update_type, guild_id), []).append(member_id)
+            return record_event
+        
+        service.record_member_join = recorder("join", self.tracker.record_member_join)
+        service.record_member_leave = recorder("leave", self.tracker.record_member_leave)
+        service.record_member_ban = recorder("ban", self.tracker.record_member_ban)
+        
+        def updater(update_type: str):
+            async def update(guild) -> None:
+                for member_id in self._awaiting_update.pop((update_type, guild.id), ()):
+                    self._stage_done("channel_update", member_id)
+            return update
+        
+        service.update_member_count = AsyncMock(side_effect=updater("member_count"))
+        service.update_ban_count = AsyncMock(side_effect=updater("ban_count"))
+        bot.stats_service = service
+        
+        # Time the handler stage once publishing (including backpressure) is done
+        publish_wait = bot.member_event_bus.publish_wait
+        
+        async def timed_publish_wait(event) -> int:
+            accepted = await publish_wait(event)
+            self._stage_done("handler", event.member_id)
+            return accepted
+        
+        bot.member_event_bus.publish_wait = timed_publish_wait
+        return bot
+    
+    def _instrument_saves(self):
+        """Wrap the JSON writer used by the tracker to count and time saves."""
+        original = json_utils.stream_json_to_file
+        
+        async def counted_write(path, data, *args, **kwargs):
+            covered = self._awaiting_save
+            self._awaiting_save = []
+            try:
+                result = await original(path, data, *args, **kwargs)
+            except Exception:
+                self._awaiting_save = covered + self._awaiting_save
+                raise
+            self.saves += 1
+            for member_id in covered:
+                self._stage_done("save", member_id)
+            return result
+        
+        json_utils.stream_json_to_file = counted_write
+        
+        has_changes = self.tracker._has_changes
+        
+        def counted_has_changes() -> bool:
+            changed = has_changes()
+            if not changed:
+                self.skipped_saves += 1
+            return changed
+        
+        self.tracker._has_changes = counted_has_changes
+        return original
+    
+    def _dispatch_one(self) -> None:
+        """Dispatch one new (or replayed) member event as its own task, as discord.py does."""
+        if self._sent and self.random.random() < self.profile.replay_fraction:
+            event_type, member = self.random.choice(self._sent)
+            self.events_replayed += 1
+        else:
+            event_type = self.random.choices(
+                list(self.profile.mix), weights=list(self.profile.mix.values())
+            )[0]
+            guild = self.random.choice(self.guilds)
+            member = MockMember(self._next_member_id, guild)
+            self._guild_of[member.id] = guild.id
+            self._next_member_id += 1
+            self._dispatched_at[member.id] = time.perf_counter()
+            self._sent.append((event_type, member))
+            self.events_generated += 1
+        
+        if event_type == "join":
+            handler = self.bot._on_member_join(member)
+        elif event_type == "leave":
+            handler = self.bot._on_member_remove(member)
+        else:
+            handler = self.bot._on_member_ban(member.guild, member)
+        self._handlers.add(asyncio.create_task(handler))
+    
+    async def _generate(self) -> None:
+        """Dispatch events following the profile's rate curve."""
+        start = time.perf_counter()
+        due = 0.0
+        while due < self.profile.duration:
+            now = time.perf_counter() - start
+            if due > now:
+                await asyncio.sleep(due - now)
+            self._dispatch_one()
+            due += 1.0 / max(self.profile.rate_at(due), 0.001)
+            
+            # Let handlers run between dispatches when behind schedule
+            if due <= time.perf_counter() - start:
+                await asyncio.sleep(0)
+    
+    async def run(self) -> LoadReport:
+        """
+        Run the load and collect the report.
+        
+        Returns:
+            LoadReport with per-stage latencies, saves and peak RSS
+        """
+        self.bot = self._build_bot()
+        original_writer = self._instrument_saves()
+        
+        await self.bot.member_event_bus.start()
+        await self.bot.channel_update_batcher.start()
+        
+        started = time.perf_counter()
+        try:
+            await self._generate()
+            generated_in = time.perf_counter() - started
+            
+            # Drain: stop flushes every subscriber queue and pending batch
+            await asyncio.gather(*self._handlers)
+            await self.bot.member_event_bus.stop()
+            await self.bot.channel_update_batcher.stop()
+            await self.tracker.save_data()
+            await asyncio.sleep(0)
+            pipeline = {
+                "member_event_bus": self.bot.member_event_bus.get_stats(),
+                "channel_update_batcher": self.bot.channel_update_batcher.get_stats(),
+                "member_event_dedupe": self.bot.member_event_dedupe.get_stats()
+            }
+        finally:
+            json_utils.stream_json_to_file = original_writer
+        
+        wall_time = time.perf_counter() - started
+        return self._build_report(wall_time, generated_in, pipeline)
+    
+    def _build_report(self, wall_time: float, generated_in: float,
+                      pipeline: Dict[str, Any]) -> LoadReport:
+        """Summarize latencies and counters into a report."""
+        stages = {}
+        incomplete = {}
+        for stage in STAGES:
+            values = sorted(value * 1000 for value in self._latencies[stage])
+            stages[stage] = StageSummary(
+                count=len(values),
+                p50_ms=round(percentile(values, 50), 3),
+                p95_ms=round(percentile(values, 95), 3),
+                p99_ms=round(percentile(values, 99), 3),
+                max_ms=round(values[-1], 3) if values else 0.0
+            )
+            incomplete[stage] = self.events_generated - len(values)
+        
+        profile = asdict(self.profile)
+        return LoadReport(
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            profile=profile,
+            wall_time_s=round(wall_time, 3),
+            events_generated=self.events_generated,
+            events_replayed=self.events_replayed,
+            achieved_rate=round(self.events_generated / generated_in, 2) if generated_in else 0.0,
+            stages=stages,
+            incomplete=incomplete,
+            saves=self.saves,
+            skipped_saves=self.skipped_saves,
+            saves_per_event=round(self.saves / self.events_generated, 4) if self.events_generated else 0.0,
+            peak_rss_mb=round(peak_rss_mb(), 2),
+            tracker=self.tracker.get_burst_stats(),
+            pipeline=pipeline
+        )
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse an event mix such as 'join=0.6,leave=0.3,ban=0.1'."""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in EVENT_TYPES:
+            raise argparse.ArgumentTypeError(f"unknown event type '{name}'")
+        mix[name] = float(weight)
+    return mix
+
+
+async def main():
+    """Main load generator entry point."""
+    parser = argparse.ArgumentParser(description="StatsBot Synthetic Gateway Load Generator")
+    parser.add_argument("--rate", type=float, default=50.0, help="Baseline events per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load to generate")
+    parser.add_argument("--guilds", type=int, default=5, help="Number of fake guilds")
+    parser.add_argument("--shape", choices=["steady", "burst", "spike", "ramp"], default="steady",
+                        help="Rate curve: constant, periodic bursts, one raid, or linear ramp")
+    parser.add_argument("--burst-rate", type=float, default=500.0,
+                        help="Events per second during bursts (ramp end rate)")
+    parser.add_argument("--burst-duration", type=float, default=5.0, help="Seconds per burst")
+    parser.add_argument("--burst-interval", type=float, default=20.0,
+                        help="Seconds between burst starts (burst shape)")
+    parser.add_argument("--mix", type=parse_mix, default="join=0.6,leave=0.3,ban=0.1",
+                        help="Event type weights")
+    parser.add_argument("--replay-fraction", type=float, default=0.0,
+                        help="Fraction of dispatches that replay an earlier event")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    parser.add_argument("--log-level", default="WARNING", choices=[level.name for level in LogLevel],
+                        help="Bot log level during the run")
+    parser.add_argument("--output", "-o", help="Output file for JSON results (default: stdout)")
+    
+    args = parser.parse_args()
+    
+    profile = LoadProfile(
+        rate=args.rate,
+        duration=args.duration,
+        guilds=args.guilds,
+        shape=args.shape,
+        burst_rate=args.burst_rate,
+        burst_duration=args.burst_duration,
+        burst_interval=args.burst_interval,
+        mix=args.mix,
+        replay_fraction=args.replay_fraction,
+        seed=args.seed
+    )
+    output = Path(CALLER_CWD, args.output) if args.output else None
+    
+    # Anything printed during the run goes to stderr; stdout is the JSON report
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            generator = GatewayLoadGenerator(profile, log_level=LogLevel[args.log_level])
+            report = await generator.run()
+    finally:
+        os.chdir(CALLER_CWD)
+        WORKDIR.cleanup()
+    
+    results = json.dumps(asdict(report), indent=2, default=str)
+    if output:
+        output.write_text(results)
+        print(f"📄 Results saved to: {output}", file=sys.stderr)
+    else:
+        print(results)
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
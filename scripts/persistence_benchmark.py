@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+StatsBot Persistence Benchmark.
+
+This script measures how StatsTracker load, save and query costs grow with
+the size of member_stats.json. It builds synthetic histories (30 days to
+5 years, 10 to 10k events per day), times the persistence and query paths
+and records their peak traced memory, and can compare a run against a saved
+baseline to flag regressions.
+
+Operations measured per scenario:
+    load          _load_stats_streaming (parse, hash and validate the file)
+    has_changes   _has_changes with no pending change (full data hash)
+    save          save_data with a pending change (atomic write + backup)
+    weekly        get_weekly_stats
+    summary       get_stats_summary
+    export        export_stats_to_file
+
+Usage:
+    python scripts/persistence_benchmark.py [--scenario 365x100 ...] [--full]
+        [--iterations 3] [--output results.json]
+        [--baseline baseline.json] [--threshold 0.2]
+"""
+
+import asyncio
+import inspect
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timedelta, timezone
+
+import pytz
+
+# Add repository root to path so src imports as a package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Import the bot package first: it resolves the services/stats import cycle
+import src.core.bot  # noqa: F401
+from src.services.stats.tracker import StatsTracker
+from src.utils.logging.structured_logger import StructuredLogger, LogLevel
+
+
+OPERATIONS = ("load", "has_changes", "save", "weekly", "summary", "export")
+
+# Default scenarios stay within a few hundred MB; --full runs the whole grid
+DEFAULT_SCENARIOS = ("30x10", "30x10000", "365x100", "365x1000", "1825x10", "1825x100")
+FULL_DAYS = (30, 365, 1825)
+FULL_EVENTS_PER_DAY = (10, 100, 1000, 10000)
+
+# Share of events per kind in the synthetic history
+EVENT_MIX = (("joins", 0.6), ("leaves", 0.35), ("bans", 0.04), ("unbans", 0.01))
+
+
+@dataclass
+class OperationResult:
+    """Timing and memory for one operation in one scenario."""
+    name: str
+    iterations: int
+    min_ms: float
+    median_ms: float
+    max_ms: float
+    peak_memory_mb: float
+
+
+@dataclass
+class ScenarioResult:
+    """Results for one synthetic history size."""
+    name: str
+    days: int
+    events_per_day: int
+    total_events: int
+    file_size_mb: float
+    operations: Dict[str, OperationResult] = field(default_factory=dict)
+
+
+@dataclass
+class Regression:
+    """An operation that got slower or hungrier than the baseline."""
+    scenario: str
+    operation: str
+    metric: str
+    baseline: float
+    current: float
+    change: float
+
+
+@dataclass
+class PersistenceBenchmarkSuite:
+    """Complete persistence benchmark results."""
+    timestamp: str
+    iterations: int
+    scenarios: Dict[str, ScenarioResult]
+    baseline_file: Optional[str] = None
+    threshold: Optional[float] = None
+    regressions: List[Regression] = field(default_factory=list)
+
+
+def parse_scenario(value: str) -> str:
+    """Validate a DAYSxEVENTS scenario name such as '365x100'."""
+    days, sep, events = value.partition("x")
+    if not sep or not days.isdigit() or not events.isdigit() or int(days) <= 0 or int(events) <= 0:
+        raise argparse.ArgumentTypeError(f"scenario must look like DAYSxEVENTS, got '{value}'")
+    return f"{int(days)}x{int(events)}"
+
+
+def generate_history(days: int, events_per_day: int, seed: int = 1) -> Dict[str, Dict[str, list]]:
+    """
+    Build a synthetic daily_stats history ending today (US/Eastern).
+    
+    Args:
+        days: Number of days of history
+        events_per_day: Member events per day across all kinds
+        seed: Random seed for member IDs and times
+    
+    Returns:
+        Mapping of date to event lists in the tracker's on-disk format
+    """
+    rng = random.Random(seed)
+    est = pytz.timezone('US/Eastern')
+    today = datetime.now(est).replace(hour=0, minute=0, second=0, microsecond=0)
+    history: Dict[str, Dict[str, list]] = {}
+    
+    for offset in range(days - 1, -1, -1):
+        day = today - timedelta(days=offset)
+        entry: Dict[str, list] = {kind: [] for kind, _ in EVENT_MIX}
+        for kind, share in EVENT_MIX:
+            for _ in range(round(events_per_day * share)):
+                member_id = rng.randrange(10**17, 10**18)
+                at = day + timedelta(seconds=rng.randrange(86400))
+                entry[kind].append({
+                    "id": member_id,
+                    "username": f"member{member_id % 100000}",
+                    "timestamp": at.isoformat()
+                })
+        history[day.strftime("%Y-%m-%d")] = entry
+    
+    return history
+
+
+async def measure(func: Callable[[], Any], iterations: int,
+                  setup: Optional[Callable[[], None]] = None) -> Dict[str, float]:
+    """
+    Time an operation, then measure its peak traced memory in a separate run.
+    
+    tracemalloc slows allocation-heavy code considerably, so timings are
+    taken with it off and memory is measured on one extra call.
+    
+    Args:
+        func: Operation to run (sync, or returning an awaitable)
+        iterations: Timed runs
+        setup: Called before every run to restore the operation's precondition
+    
+    Returns:
+        Dictionary with min/median/max milliseconds and peak memory in MB
+    """
+    async def run_once() -> None:
+        if setup:
+            setup()
+        result = func()
+        if inspect.isawaitable(result):
+            await result
+    
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await run_once()
+        durations.append((time.perf_counter() - start) * 1000)
+    
+    tracemalloc.start()
+    try:
+        await run_once()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    return {
+        "min_ms": round(min(durations), 3),
+        "median_ms": round(statistics.median(durations), 3),
+        "max_ms": round(max(durations), 3),
+        "peak_memory_mb": round(peak / (1024 * 1024), 3)
+    }
+
+
+class PersistenceBenchmarker:
+    """Runs StatsTracker persistence benchmarks over synthetic histories."""
+    
+    def __init__(self, iterations: int = 3, verbose: bool = False):
+        """
+        Initialize the benchmarker.
+        
+        Args:
+            iterations: Timed runs per operation
+            verbose: Print progress to stderr
+        """
+        self.iterations = iterations
+        self.verbose = verbose
+    
+    def _progress(self, message: str) -> None:
+        """Print a progress line when verbose."""
+        if self.verbose:
+            print(message, file=sys.stderr)
+    
+    async def run_scenario(self, name: str) -> ScenarioResult:
+        """
+        Benchmark one scenario in a fresh data directory.
+        
+        Must be called with the working directory set to a scratch directory,
+        since StatsTracker stores its data under ./data.
+        
+        Args:
+            name: Scenario name in DAYSxEVENTS form
+        
+        Returns:
+            ScenarioResult for the scenario
+        """
+        days, _, events = name.partition("x")
+        days, events_per_day = int(days), int(events)
+        
+        self._progress(f"📚 {name}: generating {days} days x {events_per_day} events/day")
+        history = generate_history(days, events_per_day)
+        data_dir = Path("data")
+        data_dir.mkdir(exist_ok=True)
+        stats_file = data_dir / "member_stats.json"
+        with open(stats_file, "w") as f:
+            json.dump(history, f, indent=4)
+        total_events = sum(len(entries) for day in history.values() for entries in day.values())
+        del history
+        
+        result = ScenarioResult(
+            name=name,
+            days=days,
+            events_per_day=events_per_day,
+            total_events=total_events,
+            file_size_mb=round(stats_file.stat().st_size / (1024 * 1024), 3)
+        )
+        
+        logger = StructuredLogger("persistence_benchmark", level=LogLevel.WARNING)
+        tracker = StatsTracker(logger=logger)
+        export_file = Path("export.json")
+        
+        def mark_changed() -> None:
+            tracker._change_detected = True
+        
+        def mark_clean() -> None:
+            tracker._change_detected = False
+        
+        operations = {
+            "load": (tracker._load_stats_streaming, None),
+            "has_changes": (tracker._has_changes, mark_clean),
+            "save": (tracker.save_data, mark_changed),
+            "weekly": (tracker.get_weekly_stats, None),
+            "summary": (tracker.get_stats_summary, None),
+            "export": (lambda: tracker.export_stats_to_file(export_file), None),
+        }
+        
+        for operation in OPERATIONS:
+            func, setup = operations[operation]
+            self._progress(f"   ⏱️  {operation}")
+            measured = await measure(func, self.iterations, setup)
+            result.operations[operation] = OperationResult(
+                name=operation,
+                iterations=self.iterations,
+                **measured
+            )
+        
+        return result
+    
+    async def run(self, scenarios: List[str]) -> PersistenceBenchmarkSuite:
+        """
+        Run every scenario, each in its own scratch directory.
+        
+        Args:
+            scenarios: Scenario names in DAYSxEVENTS form
+        
+        Returns:
+            PersistenceBenchmarkSuite with all scenario results
+        """
+        suite = PersistenceBenchmarkSuite(
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            iterations=self.iterations,
+            scenarios={}
+        )
+        
+        cwd = os.getcwd()
+        for name in scenarios:
+            with tempfile.TemporaryDirectory(prefix="statsbot-persistence-") as workdir:
+                os.chdir(workdir)
+                try:
+                    suite.scenarios[name] = await self.run_scenario(name)
+                finally:
+                    os.chdir(cwd)
+        
+        return suite
+
+
+def compare_to_baseline(suite: PersistenceBenchmarkSuite, baseline: Dict[str, Any],
+                        threshold: float) -> List[Regression]:
+    """
+    Flag operations whose median time or peak memory grew past the threshold.
+    
+    Scenarios or operations missing from the baseline are skipped.
+    
+    Args:
+        suite: Current results
+        baseline: Previously saved results (as written by --output)
+        threshold: Allowed relative growth, e.g. 0.2 for +20%
+    
+    Returns:
+        List of regressions, worst first
+    """
+    regressions = []
+    for name, scenario in suite.scenarios.items():
+        baseline_ops = baseline.get("scenarios", {}).get(name, {}).get("operations", {})
+        for operation, result in scenario.operations.items():
+            previous = baseline_ops.get(operation)
+            if not previous:
+                continue
+            for metric in ("median_ms", "peak_memory_mb"):
+                before = previous.get(metric)
+                after = getattr(result, metric)
+                if not before:
+                    continue
+                change = (after - before) / before
+                if change > threshold:
+                    regressions.append(Regression(
+                        scenario=name,
+                        operation=operation,
+                        metric=metric,
+                        baseline=before,
+                        current=after,
+                        change=round(change, 4)
+                    ))
+    
+    regressions.sort(key=lambda regression: regression.change, reverse=True)
+    return regressions
+
+
+def print_summary(suite: PersistenceBenchmarkSuite) -> None:
+    """Print a human-readable summary table to stderr."""
+    print("\n📊 PERSISTENCE BENCHMARK", file=sys.stderr)
+    for name, scenario in suite.scenarios.items():
+        print(
+            f"\n{name}: {scenario.total_events:,} events, {scenario.file_size_mb} MB",
+            file=sys.stderr
+        )
+        for operation in scenario.operations.values():
+            print(
+                f"   {operation.name:<12} {operation.median_ms:>10.2f} ms  "
+                f"{operation.peak_memory_mb:>8.2f} MB peak",
+                file=sys.stderr
+            )
+    
+    if suite.baseline_file is not None:
+        if suite.regressions:
+            print(f"\n❌ {len(suite.regressions)} regression(s) vs {suite.baseline_file} "
+                  f"(threshold {suite.threshold:.0%}):", file=sys.stderr)
+            for regression in suite.regressions:
+                print(
+                    f"   {regression.scenario} {regression.operation} {regression.metric}: "
+                    f"{regression.baseline} -> {regression.current} ({regression.change:+.0%})",
+                    file=sys.stderr
+                )
+        else:
+            print(f"\n✅ No regressions vs {suite.baseline_file}", file=sys.stderr)
+
+
+async def main():
+    """Main persistence benchmark entry point."""
+    parser = argparse.ArgumentParser(description="StatsBot Persistence Benchmark")
+    parser.add_argument("--scenario", "-s", action="append", type=parse_scenario,
+                        help="DAYSxEVENTS history to benchmark (repeatable)")
+    parser.add_argument("--full", action="store_true",
+                        help="Run every combination of 30/365/1825 days and 10/100/1k/10k events per day")
+    parser.add_argument("--iterations", "-n", type=int, default=3, help="Timed runs per operation")
+    parser.add_argument("--output", "-o", help="Output file for JSON results (default: stdout)")
+    parser.add_argument("--baseline", "-b", help="Saved results to compare against")
+    parser.add_argument("--threshold", "-t", type=float, default=0.2,
+                        help="Relative growth flagged as a regression (default: 0.2)")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Print progress")
+    
+    args = parser.parse_args()
+    
+    if args.full:
+        scenarios = [f"{days}x{events}" for days in FULL_DAYS for events in FULL_EVENTS_PER_DAY]
+    else:
+        scenarios = args.scenario or list(DEFAULT_SCENARIOS)
+    
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    output = Path(args.output).resolve() if args.output else None
+    
+    benchmarker = PersistenceBenchmarker(iterations=args.iterations, verbose=args.verbose)
+    suite = await benchmarker.run(scenarios)
+    
+    if baseline is not None:
+        suite.baseline_file = args.baseline
+        suite.threshold = args.threshold
+        suite.regressions = compare_to_baseline(suite, baseline, args.threshold)
+    
+    print_summary(suite)
+    
+    results = json.dumps(asdict(suite), indent=2)
+    if output:
+        output.write_text(results)
+        print(f"\n📄 Results saved to: {output}", file=sys.stderr)
+    else:
+        print(results)
+    
+    return 1 if suite.regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+StatsBot Log Query.
+
+This script searches the JSON logs under the log directory, including
+days that LogRotation has compressed. Each log segment gets a sparse
+index (byte offset per minute plus level and service bitmaps) stored next
+to it, so a query only reads the minutes that can match.
+
+Examples:
+    # Errors from StatsService in a time window (times are UTC)
+    python scripts/query_logs.py --level ERROR --level CRITICAL \\
+        --service StatsService --since 2025-01-10T12:00 --until 2025-01-10T13:30
+    
+    # Last 50 records mentioning "rate limit" in the past two hours
+    python scripts/query_logs.py --contains "rate limit" --last 2h --limit 50
+    
+    # Build or refresh every index and report the cost
+    python scripts/query_logs.py --build-index
+
+Usage:
+    python scripts/query_logs.py [--log-dir logs] [--since ISO] [--until ISO]
+        [--last 30m|2h|1d] [--level LEVEL ...] [--service NAME ...]
+        [--contains TEXT] [--limit N] [--json] [--stats] [--build-index]
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add repository root to path so src imports as a package
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.logging.log_query import LogSearch, build_indexes, parse_timestamp
+
+
+def parse_time(value: str) -> datetime:
+    """Parse an ISO 8601 time argument (naive values are UTC)."""
+    parsed = parse_timestamp(value)
+    if parsed is None:
+        raise argparse.ArgumentTypeError(f"expected an ISO 8601 time, got '{value}'")
+    return parsed
+
+
+def parse_duration(value: str) -> timedelta:
+    """Parse a duration argument such as 30m, 2h or 1d."""
+    units = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+    try:
+        return timedelta(**{units[value[-1]]: float(value[:-1])})
+    except (KeyError, ValueError, IndexError):
+        raise argparse.ArgumentTypeError(f"expected a duration like 30m, 2h or 1d, got '{value}'")
+
+
+def format_record(record: dict) -> str:
+    """Format a record as one human-readable line."""
+    timestamp = record.get("timestamp") or record.get("iso_datetime", "")
+    service = f" [{record['service']}]" if record.get("service") else ""
+    line = f"{timestamp} [{record.get('level', '?')}]{service} {record.get('message', '')}"
+    if record.get("error"):
+        line += f" | error={record['error']}"
+    return line
+
+
+def main() -> int:
+    """Main log query entry point."""
+    parser = argparse.ArgumentParser(description="StatsBot Log Query")
+    parser.add_argument("--log-dir", default="logs", help="Base log directory (default: logs)")
+    parser.add_argument("--since", type=parse_time, help="Earliest record time (ISO 8601, UTC if naive)")
+    parser.add_argument("--until", type=parse_time, help="Latest record time (ISO 8601, UTC if naive)")
+    parser.add_argument("--last", type=parse_duration, help="Only records from this long ago until now")
+    parser.add_argument("--level", "-l", action="append", help="Level to include (repeatable)")
+    parser.add_argument("--service", "-s", action="append", help="Service to include (repeatable)")
+    parser.add_argument("--contains", "-c", help="Text the message must contain")
+    parser.add_argument("--limit", "-n", type=int, help="Maximum number of records")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON records")
+    parser.add_argument("--stats", action="store_true", help="Print index and read statistics to stderr")
+    parser.add_argument("--build-index", action="store_true", help="Build or refresh every index and exit")
+    
+    args = parser.parse_args()
+    
+    if args.build_index:
+        print(json.dumps(build_indexes(args.log_dir), indent=2))
+        return 0
+    
+    since = args.since
+    if args.last is not None:
+        since = datetime.now(timezone.utc) - args.last
+    
+    search = LogSearch(args.log_dir)
+    count = 0
+    for record in search.search(
+        start=since,
+        end=args.until,
+        levels=args.level,
+        services=args.service,
+        contains=args.contains,
+        limit=args.limit
+    ):
+        print(json.dumps(record, ensure_ascii=False) if args.json else format_record(record))
+        count += 1
+    
+    if args.stats:
+        print(json.dumps({**search.get_stats(), "matches": count}, indent=2), file=sys.stderr)
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
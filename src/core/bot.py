@@ -11,21 +11,30 @@ import logging
 import signal
 import sys
 import traceback
-from datetime import datetime, timezone
 from typing import Dict, List, Optional, Set, Any, Tuple, Callable, Coroutine
 
-from ..types.models import BotConfig, ServiceStatus, EventType, ConnectionState
+from ..types.models import BotConfig, ServiceStatus, EventType, ConnectionState, GatewayMemberEvent, LogLevel
 from ..services.stats.service import OptimizedStatsService
 from ..services.monitoring.service import MonitoringService
 from ..services.presence.service import RichPresenceService
+from ..services.presence.metrics import GuildMetricsTracker
 from ..utils.logging.structured_logger import StructuredLogger
 from ..utils.async_utils.task_manager import TaskManager
+from ..utils.async_utils.operation_scheduler import global_operation_scheduler
 # Import EventQueue and EventBatcher lazily to avoid circular imports
 from ..utils.error_handling.connection_recovery import (
     ConnectionRecoveryManager, StateConsistencyManager, FallbackManager
 )
-from ..utils.performance.timing import async_timed, get_performance_metrics
+from ..utils.performance.timing import async_timed, get_latency_percentiles, get_performance_metrics
 from ..utils.performance.memory_monitor import MemoryMonitor
+from ..utils.performance.openmetrics import (
+    OpenMetricsExporter, MetricsWriter, write_timing_metrics, write_cache_metrics,
+    write_dedupe_metrics, write_event_queue_metrics, write_event_batcher_metrics, write_network_metrics,
+    write_memory_metrics, write_circuit_breaker_metrics
+)
+from ..utils.network_optimizer import connection_pool, AdaptivePoller, get_network_stats
+from ..utils.error_handling.circuit_breaker import get_circuit_breakers
+from ..utils.cache.dedupe_filter import SequenceDedupeFilter
 from .config import load_config
 from .service_coordinator import ServiceCoordinator
 from .exceptions import (
@@ -60,6 +69,15 @@ class OptimizedStatsBot(discord.Client):
         _services_initialized: Flag indicating if services are initialized
     """
     
+    # Adaptive refresh bounds (Discord allows ~2 channel renames per 10 minutes)
+    MIN_REFRESH_INTERVAL = 60.0
+    MAX_REFRESH_MULTIPLIER = 4
+    PERFORMANCE_REPORT_INTERVAL = 300.0
+    
+    # Replayed member events (after RESUME/reconnect) are dropped within this window
+    MEMBER_EVENT_DEDUPE_WINDOW = 60.0
+    MEMBER_EVENT_DEDUPE_CAPACITY = 10000
+    
     def __init__(self, config: BotConfig):
         """
         Initialize the optimized StatsBot.
@@ -77,11 +95,13 @@ class OptimizedStatsBot(discord.Client):
         super().__init__(
             intents=intents,
             # Let our custom connection recovery handle reconnects
-            reconnect=False
+            reconnect=False,
+            # Count Discord REST traffic (heartbeats, renames) in pool stats
+            http_trace=connection_pool.trace_config
         )
         
         self.config = config
-        self.logger = StructuredLogger("bot")
+        self.logger = StructuredLogger("bot", max_total_bytes=config.log_max_bytes or None)
         
         # Initialize shutdown event
         self.shutdown_event = asyncio.Event()
@@ -115,21 +135,49 @@ class OptimizedStatsBot(discord.Client):
             logger=self.logger
         )
         
+        # Optional local OpenMetrics endpoint for Prometheus (off when the port is 0)
+        self.metrics_exporter: Optional[OpenMetricsExporter] = None
+        if config.metrics_port:
+            self.metrics_exporter = OpenMetricsExporter(
+                host=config.metrics_host,
+                port=config.metrics_port,
+                logger=self.logger
+            )
+            self.metrics_exporter.register(self._collect_metrics)
+        
         # Services will be initialized in setup_hook
         self.stats_service: Optional[OptimizedStatsService] = None
         self.monitoring_service: Optional[MonitoringService] = None
         self.rich_presence_service: Optional[RichPresenceService] = None
         
-        # Import EventQueue and EventBatcher lazily to avoid circular imports
-        from ..utils.async_utils.event_queue import EventQueue, EventBatcher
+        # Import event utilities lazily to avoid circular imports
+        from ..utils.async_utils.event_queue import EventBatcher, OverflowPolicy
+        from ..utils.async_utils.event_bus import EventBus
         
-        # Initialize event queue for member events
-        self.member_event_queue = EventQueue(
-            name="member_events",
+        # Member events are published once and fanned out to independent
+        # subscribers, each with its own bounded queue and consumer
+        self.member_event_bus: "EventBus[GatewayMemberEvent]" = EventBus("member_events", logger=self.logger)
+        
+        # Stats tracking: partitioned per guild so guilds are processed
+        # concurrently while each guild's events stay in order
+        self.member_event_queue = self.member_event_bus.subscribe(
+            "stats_tracker",
             processor=self._process_member_events_batch,
+            partition_key=lambda event: event.guild_id,
             batch_size=10,
+            max_queue_size=5000,
             flush_interval=2.0,
-            logger=self.logger
+            overflow_policy=OverflowPolicy.BLOCK  # Never drop: stats must stay exact
+        )
+        
+        # Guild metrics and adaptive polling: cheap, applied quickly
+        self.member_event_bus.subscribe(
+            "guild_metrics",
+            processor=self._process_member_metrics_batch,
+            batch_size=100,
+            max_queue_size=5000,
+            flush_interval=0.25,
+            overflow_policy=OverflowPolicy.BLOCK  # Counters are incremental
         )
         
         # Initialize event batcher for channel updates
@@ -141,6 +189,28 @@ class OptimizedStatsBot(discord.Client):
             logger=self.logger
         )
         
+        # Shared guild metrics kept current from gateway events
+        self.guild_metrics = GuildMetricsTracker()
+        
+        # Remembers the last membership and ban event per member to drop replays
+        self.member_event_dedupe = SequenceDedupeFilter(
+            capacity=self.MEMBER_EVENT_DEDUPE_CAPACITY,
+            window=self.MEMBER_EVENT_DEDUPE_WINDOW
+        )
+        
+        # One adaptive poller per guild drives periodic channel/presence refreshes
+        self.guild_pollers: Dict[int, AdaptivePoller] = {}
+        self._next_guild_refresh: Dict[int, float] = {}
+        
+        # Presence rotation adapts to member churn from its own configured base
+        presence_interval = float(config.presence_update_interval)
+        self.presence_poller = AdaptivePoller(
+            base_interval=presence_interval,
+            min_interval=self.MIN_REFRESH_INTERVAL,
+            max_interval=presence_interval * self.MAX_REFRESH_MULTIPLIER,
+            name="presence"
+        )
+        
         # Track service initialization status
         self._services_initialized = False
         
@@ -231,6 +301,19 @@ class OptimizedStatsBot(discord.Client):
         if not self.is_closed():
             asyncio.create_task(self.close())
     
+    async def login(self, token: str) -> None:
+        """
+        Log in to Discord over the shared connection pool.
+        
+        The connector is created here rather than in ``__init__`` because
+        aiohttp connectors must be bound to the running event loop.
+        
+        Args:
+            token: Discord bot token
+        """
+        self.http.connector = connection_pool.get_connector()
+        await super().login(token)
+    
     async def setup_hook(self) -> None:
         """
         Set up the bot's services and background tasks.
@@ -276,7 +359,8 @@ class OptimizedStatsBot(discord.Client):
             # Initialize stats service first (other services depend on it)
             self.stats_service = OptimizedStatsService(
                 bot=self,
-                logger=self.logger
+                logger=self.logger,
+                task_manager=self.task_manager
             )
             
             # Initialize monitoring service
@@ -290,7 +374,9 @@ class OptimizedStatsBot(discord.Client):
             # Initialize rich presence service
             self.rich_presence_service = RichPresenceService(
                 bot=self,
-                update_interval=self.config.presence_update_interval
+                update_interval=self.config.presence_update_interval,
+                interval_provider=self._get_presence_interval,
+                metrics_tracker=self.guild_metrics
             )
             
             # Register services with the coordinator with proper dependencies
@@ -317,6 +403,7 @@ class OptimizedStatsBot(discord.Client):
         self.add_listener(self._on_member_remove, "on_member_remove")
         self.add_listener(self._on_member_ban, "on_member_ban")
         self.add_listener(self._on_member_unban, "on_member_unban")
+        self.add_listener(self._on_presence_update, "on_presence_update")
         
         # Error handling
         self.add_listener(self._on_error, "on_error")
@@ -346,17 +433,28 @@ class OptimizedStatsBot(discord.Client):
             # Start memory monitoring
             await self.memory_monitor.start_monitoring()
             
+            # Serve metrics; a port already in use must not stop the bot
+            if self.metrics_exporter is not None:
+                try:
+                    await self.metrics_exporter.start()
+                except OSError as e:
+                    self.logger.error(f"Failed to start metrics endpoint: {str(e)}")
+            
             # Start all services in dependency order using the coordinator
             await self.service_coordinator.start_services()
             
-            # Start event queue and batcher
-            await self.member_event_queue.start()
+            # Start member event bus subscribers and channel update batcher
+            await self.member_event_bus.start()
             await self.channel_update_batcher.start()
             
             # Register stats service daily task
             stats_task = await self.stats_service.start_daily_stats_task()
             self.task_manager.register_task(stats_task, "daily_stats")
             
+            # Start adaptive per-guild refresh loop
+            refresh_task = asyncio.create_task(self._periodic_update_loop())
+            self.task_manager.register_task(refresh_task, "periodic_updates")
+            
             # Start performance metrics collection task
             perf_task = asyncio.create_task(self._collect_performance_metrics())
             self.task_manager.register_task(perf_task, "performance_metrics")
@@ -394,6 +492,10 @@ class OptimizedStatsBot(discord.Client):
             # Execute any pending operations from previous connection
             await self.state_consistency.execute_pending_operations()
             
+            # Seed incremental guild metrics once per (re)connect
+            for guild in self.guilds:
+                self.guild_metrics.seed_online(guild)
+            
             # Perform initial channel updates if we have a guild
             if self.guilds:
                 guild = self.guilds[0]
@@ -680,15 +782,178 @@ class OptimizedStatsBot(discord.Client):
             self.logger.error(f"Fallback daily stats failed: {str(e)}", exc_info=True)
             raise
     
-    async def _process_member_events_batch(self, events: List[Dict[str, Any]]) -> None:
+    def _get_guild_poller(self, guild_id: int) -> AdaptivePoller:
+        """
+        Get or create the adaptive poller for a guild.
+        
+        Args:
+            guild_id: Discord guild ID
+            
+        Returns:
+            AdaptivePoller tracking activity for the guild
+        """
+        poller = self.guild_pollers.get(guild_id)
+        if poller is None:
+            base_interval = float(self.config.update_interval)
+            poller = AdaptivePoller(
+                base_interval=base_interval,
+                min_interval=self.MIN_REFRESH_INTERVAL,
+                max_interval=base_interval * self.MAX_REFRESH_MULTIPLIER,
+                name=f"guild:{guild_id}"
+            )
+            self.guild_pollers[guild_id] = poller
+        return poller
+    
+    def _get_presence_interval(self) -> float:
+        """
+        Get the presence rotation interval from the presence poller.
+        
+        Each call is one rotation, so recorded member churn is consumed here.
+        
+        Returns:
+            Interval in seconds until the next presence update
+        """
+        return self.presence_poller.get_next_interval()
+    
+    async def _periodic_update_loop(self) -> None:
+        """
+        Refresh channel counts for each guild on its own adaptive schedule.
+        
+        Busy guilds are refreshed more often while idle guilds back off toward
+        the poller's max interval, so quiet guilds cost few REST calls.
+        """
+        await self.wait_until_ready()
+        loop = asyncio.get_running_loop()
+        
+        while not self.shutdown_event.is_set():
+            now = loop.time()
+            next_due = now + self.MIN_REFRESH_INTERVAL
+            
+            for guild in self.guilds:
+                poller = self._get_guild_poller(guild.id)
+                
+                # on_ready already queued a full refresh for every guild
+                due = self._next_guild_refresh.setdefault(guild.id, now + poller.current_interval)
+                
+                if due <= now:
+                    await self.channel_update_batcher.add("member_count", guild)
+                    await self.channel_update_batcher.add("online_count", guild)
+                    due = now + poller.get_next_interval()
+                    self._next_guild_refresh[guild.id] = due
+                
+                next_due = min(next_due, due)
+            
+            # Drop schedules for guilds we have left
+            active_ids = {guild.id for guild in self.guilds}
+            for guild_id in list(self.guild_pollers):
+                if guild_id not in active_ids:
+                    self.guild_pollers.pop(guild_id, None)
+                    self._next_guild_refresh.pop(guild_id, None)
+                    self.guild_metrics.forget_guild(guild_id)
+                    await self.member_event_queue.remove_partition(guild_id)
+            
+            try:
+                await asyncio.wait_for(
+                    self.shutdown_event.wait(),
+                    timeout=max(1.0, next_due - loop.time())
+                )
+            except asyncio.TimeoutError:
+                pass
+    
+    def get_performance_report(self) -> Dict[str, Any]:
+        """
+        Build the performance report for the bot.
+        
+        Returns:
+            Dictionary with timing metrics, recent latency percentiles and
+            per-guild polling intervals
+        """
+        return {
+            "timings": get_performance_metrics(),
+            "latency_5m": get_latency_percentiles("5m"),
+            "adaptive_polling": {
+                str(guild_id): poller.get_stats()
+                for guild_id, poller in self.guild_pollers.items()
+            },
+            "presence_polling": self.presence_poller.get_stats(),
+            "connection_pool": connection_pool.get_stats(),
+            "operation_scheduler": global_operation_scheduler.get_stats(),
+            "guild_metrics": self.guild_metrics.get_stats(),
+            "member_event_dedupe": self.member_event_dedupe.get_stats(),
+            "member_event_bus": self.member_event_bus.get_stats(),
+            "channel_update_batcher": self.channel_update_batcher.get_stats()
+        }
+    
+    def _collect_metrics(self, writer: MetricsWriter) -> None:
+        """
+        Write subsystem counters for an OpenMetrics scrape.
+        
+        Args:
+            writer: Writer for the current scrape
+        """
+        write_timing_metrics(writer)
+        
+        for name, service in (("stats", self.stats_service), ("monitoring", self.monitoring_service)):
+            if service is not None:
+                write_cache_metrics(writer, name, service.cache.get_counters())
+        
+        write_dedupe_metrics(writer, "member_events", self.member_event_dedupe.get_stats())
+        
+        for name, subscriber in self.member_event_bus.get_stats()["subscribers"].items():
+            write_event_queue_metrics(writer, f"member_events.{name}", subscriber["queue"])
+        write_event_batcher_metrics(
+            writer, self.channel_update_batcher.name, self.channel_update_batcher.get_stats()
+        )
+        
+        write_network_metrics(writer, get_network_stats())
+        write_memory_metrics(writer, self.memory_monitor.get_memory_stats())
+        write_circuit_breaker_metrics(writer, get_circuit_breakers())
+        
+        for guild_id, poller in self.guild_pollers.items():
+            writer.gauge(
+                "guild_refresh_interval_seconds",
+                "Adaptive channel refresh interval",
+                poller.current_interval,
+                {"guild": guild_id}
+            )
+    
+    async def _collect_performance_metrics(self) -> None:
+        """Periodically log the performance report."""
+        while not self.shutdown_event.is_set():
+            try:
+                await asyncio.wait_for(
+                    self.shutdown_event.wait(),
+                    timeout=self.PERFORMANCE_REPORT_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                pass
+            else:
+                break
+            
+            try:
+                report = self.get_performance_report()
+                self.logger.info(
+                    "Performance report",
+                    guild_poll_intervals={
+                        guild_id: round(stats["current_interval"], 1)
+                        for guild_id, stats in report["adaptive_polling"].items()
+                    },
+                    connection_reuse_ratio=round(report["connection_pool"]["reuse_ratio"], 3),
+                    timed_operations=sum(len(ops) for ops in report["timings"].values())
+                )
+            except Exception as e:
+                self.logger.error(f"Error collecting performance metrics: {str(e)}", exc_info=True)
+    
+    async def _process_member_events_batch(self, events: List[GatewayMemberEvent]) -> None:
         """
-        Process a batch of member events.
+        Record a batch of member events in the stats tracker.
         
-        This method efficiently processes multiple member events in a single batch,
-        reducing the number of database operations and API calls.
+        Batches come from a single guild partition of the stats subscriber.
+        Events are recorded in arrival order, and channel updates are queued
+        for every guild the batch touched.
         
         Args:
-            events: List of member event dictionaries
+            events: Member events from the member event bus
         """
         try:
             self.logger.debug(
@@ -696,45 +961,29 @@ class OptimizedStatsBot(discord.Client):
                 batch_size=len(events)
             )
             
-            # Group events by type for efficient processing
-            joins = []
-            leaves = []
-            bans = []
-            unbans = []
+            # Guilds needing each kind of channel update, keyed by guild ID
+            member_count_guilds: Dict[int, discord.Guild] = {}
+            ban_count_guilds: Dict[int, discord.Guild] = {}
             
+            # Record events in order so a join followed by a leave stays consistent
             for event in events:
-                event_type = event["type"]
-                if event_type == "join":
-                    joins.append(event)
-                elif event_type == "leave":
-                    leaves.append(event)
-                elif event_type == "ban":
-                    bans.append(event)
-                elif event_type == "unban":
-                    unbans.append(event)
-            
-            # Process joins
-            for event in joins:
-                self.stats_service.record_member_join(event["id"], event["username"])
-            
-            # Process leaves
-            for event in leaves:
-                self.stats_service.record_member_leave(event["id"], event["username"])
-            
-            # Process bans
-            for event in bans:
-                self.stats_service.record_member_ban(event["id"], event["username"])
-            
-            # Update channels if needed
-            if events:
-                guild = events[0]["guild"]
-                
-                # Queue channel updates through the batcher
-                if joins or leaves:
-                    await self.channel_update_batcher.add("member_count", guild)
-                
-                if bans or unbans:
-                    await self.channel_update_batcher.add("ban_count", guild)
+                if event.event_type == EventType.JOIN:
+                    self.stats_service.record_member_join(event.member_id, event.username)
+                    member_count_guilds[event.guild_id] = event.guild
+                elif event.event_type == EventType.LEAVE:
+                    self.stats_service.record_member_leave(event.member_id, event.username)
+                    member_count_guilds[event.guild_id] = event.guild
+                elif event.event_type == EventType.BAN:
+                    self.stats_service.record_member_ban(event.member_id, event.username)
+                    ban_count_guilds[event.guild_id] = event.guild
+                elif event.event_type == EventType.UNBAN:
+                    ban_count_guilds[event.guild_id] = event.guild
+            
+            # Queue channel updates through the batcher
+            for guild in member_count_guilds.values():
+                await self.channel_update_batcher.add("member_count", guild)
+            for guild in ban_count_guilds.values():
+                await self.channel_update_batcher.add("ban_count", guild)
                 
         except Exception as e:
             self.logger.error(
@@ -743,6 +992,26 @@ class OptimizedStatsBot(discord.Client):
                 exc_info=True
             )
     
+    async def _process_member_metrics_batch(self, events: List[GatewayMemberEvent]) -> None:
+        """
+        Apply a batch of member events to guild metrics and refresh polling.
+        
+        Args:
+            events: Member events from the member event bus
+        """
+        for event in events:
+            # Member churn speeds up refresh polling and updates guild metrics
+            self._get_guild_poller(event.guild_id).record_activity()
+            self.presence_poller.record_activity()
+            if event.event_type == EventType.JOIN:
+                self.guild_metrics.on_member_join(event.user)
+            elif event.event_type == EventType.LEAVE:
+                self.guild_metrics.on_member_remove(event.user)
+            elif event.event_type == EventType.BAN:
+                self.guild_metrics.on_member_ban(event.guild)
+            elif event.event_type == EventType.UNBAN:
+                self.guild_metrics.on_member_unban(event.guild)
+    
     async def _process_channel_updates_batch(self, update_type: str, guilds: List[discord.Guild]) -> None:
         """
         Process a batch of channel updates of the same type.
@@ -783,6 +1052,50 @@ class OptimizedStatsBot(discord.Client):
                 exc_info=True
             )
     
+    def _is_replayed_member_event(self, event_type: str, guild_id: int, member_id: int) -> bool:
+        """
+        Check whether a member event was already handled in the dedupe window.
+        
+        Gateway replays after a RESUME or reconnect can deliver the same join,
+        leave or ban more than once; recording them again would skew stats and
+        trigger extra saves and channel renames. An event is a replay only if
+        it repeats the member's last join/leave (or ban/unban) within the
+        window, so a real leave and rejoin is always recorded.
+        
+        Args:
+            event_type: Event type ("join", "leave", "ban", "unban")
+            guild_id: Guild the event belongs to
+            member_id: Member or user the event is about
+            
+        Returns:
+            True if the event is a replay and should be ignored
+        """
+        stream = "ban" if event_type in ("ban", "unban") else "membership"
+        if self.member_event_dedupe.check_and_add((guild_id, member_id, stream), event_type):
+            self.logger.debug(
+                f"Ignoring replayed member {event_type} event",
+                member_id=str(member_id),
+                guild_id=str(guild_id),
+                event_type=event_type
+            )
+            return True
+        return False
+    
+    def _should_log_member_event(self) -> bool:
+        """
+        Check whether a member event should get its own INFO line.
+        
+        During a join raid the stats tracker writes one summary per burst
+        window instead, so per-event lines are skipped while burst mode is on.
+        
+        Returns:
+            True if the event should be logged at INFO
+        """
+        if not self.logger.is_enabled(LogLevel.INFO):
+            return False
+        tracker = getattr(self.stats_service, "stats_tracker", None)
+        return not getattr(tracker, "burst_active", False)
+    
     async def _on_member_join(self, member: discord.Member) -> None:
         """
         Handle member join event.
@@ -791,20 +1104,23 @@ class OptimizedStatsBot(discord.Client):
             member: Discord member who joined
         """
         try:
-            self.logger.info(
-                f"Member joined: {member.name}#{member.discriminator}",
-                member_id=str(member.id),
-                guild_id=str(member.guild.id)
-            )
-            
-            # Queue the event for batch processing
-            await self.member_event_queue.enqueue({
-                "type": "join",
-                "id": member.id,
-                "username": f"{member.name}#{member.discriminator}",
-                "guild": member.guild,
-                "timestamp": datetime.now(timezone.utc)
-            })
+            if self._is_replayed_member_event("join", member.guild.id, member.id):
+                return
+            
+            # Skip building the record entirely when INFO is filtered out
+            if self._should_log_member_event():
+                self.logger.info(
+                    "Member joined: %s#%s", member.name, member.discriminator,
+                    member_id=str(member.id),
+                    guild_id=str(member.guild.id)
+                )
+            
+            # Fan out to subscribers; lossless ones apply backpressure when full
+            await self.member_event_bus.publish_wait(GatewayMemberEvent(
+                event_type=EventType.JOIN,
+                guild=member.guild,
+                user=member
+            ))
             
         except Exception as e:
             self.logger.error(
@@ -821,20 +1137,22 @@ class OptimizedStatsBot(discord.Client):
             member: Discord member who left
         """
         try:
-            self.logger.info(
-                f"Member left: {member.name}#{member.discriminator}",
-                member_id=str(member.id),
-                guild_id=str(member.guild.id)
-            )
-            
-            # Queue the event for batch processing
-            await self.member_event_queue.enqueue({
-                "type": "leave",
-                "id": member.id,
-                "username": f"{member.name}#{member.discriminator}",
-                "guild": member.guild,
-                "timestamp": datetime.now(timezone.utc)
-            })
+            if self._is_replayed_member_event("leave", member.guild.id, member.id):
+                return
+            
+            if self._should_log_member_event():
+                self.logger.info(
+                    "Member left: %s#%s", member.name, member.discriminator,
+                    member_id=str(member.id),
+                    guild_id=str(member.guild.id)
+                )
+            
+            # Fan out to subscribers; lossless ones apply backpressure when full
+            await self.member_event_bus.publish_wait(GatewayMemberEvent(
+                event_type=EventType.LEAVE,
+                guild=member.guild,
+                user=member
+            ))
             
         except Exception as e:
             self.logger.error(
@@ -852,20 +1170,22 @@ class OptimizedStatsBot(discord.Client):
             user: Discord user who was banned
         """
         try:
-            self.logger.info(
-                f"Member banned: {user.name}#{user.discriminator}",
-                user_id=str(user.id),
-                guild_id=str(guild.id)
-            )
-            
-            # Queue the event for batch processing
-            await self.member_event_queue.enqueue({
-                "type": "ban",
-                "id": user.id,
-                "username": f"{user.name}#{user.discriminator}",
-                "guild": guild,
-                "timestamp": datetime.now(timezone.utc)
-            })
+            if self._is_replayed_member_event("ban", guild.id, user.id):
+                return
+            
+            if self._should_log_member_event():
+                self.logger.info(
+                    "Member banned: %s#%s", user.name, user.discriminator,
+                    user_id=str(user.id),
+                    guild_id=str(guild.id)
+                )
+            
+            # Fan out to subscribers; lossless ones apply backpressure when full
+            await self.member_event_bus.publish_wait(GatewayMemberEvent(
+                event_type=EventType.BAN,
+                guild=guild,
+                user=user
+            ))
             
         except Exception as e:
             self.logger.error(
@@ -883,20 +1203,22 @@ class OptimizedStatsBot(discord.Client):
             user: Discord user who was unbanned
         """
         try:
-            self.logger.info(
-                f"Member unbanned: {user.name}#{user.discriminator}",
-                user_id=str(user.id),
-                guild_id=str(guild.id)
-            )
-            
-            # Queue the event for batch processing
-            await self.member_event_queue.enqueue({
-                "type": "unban",
-                "id": user.id,
-                "username": f"{user.name}#{user.discriminator}",
-                "guild": guild,
-                "timestamp": datetime.now(timezone.utc)
-            })
+            if self._is_replayed_member_event("unban", guild.id, user.id):
+                return
+            
+            if self._should_log_member_event():
+                self.logger.info(
+                    "Member unbanned: %s#%s", user.name, user.discriminator,
+                    user_id=str(user.id),
+                    guild_id=str(guild.id)
+                )
+            
+            # Fan out to subscribers; lossless ones apply backpressure when full
+            await self.member_event_bus.publish_wait(GatewayMemberEvent(
+                event_type=EventType.UNBAN,
+                guild=guild,
+                user=user
+            ))
             
         except Exception as e:
             self.logger.error(
@@ -905,6 +1227,16 @@ class OptimizedStatsBot(discord.Client):
                 exc_info=True
             )
     
+    async def _on_presence_update(self, before: discord.Member, after: discord.Member) -> None:
+        """
+        Handle member presence changes.
+        
+        Args:
+            before: Member state before the update
+            after: Member state after the update
+        """
+        self.guild_metrics.on_presence_update(before, after)
+    
     async def _on_error(self, event: str, *args, **kwargs) -> None:
         """
         Handle Discord event errors.
@@ -949,12 +1281,19 @@ class OptimizedStatsBot(discord.Client):
             except Exception as e:
                 self.logger.error(f"Error stopping connection recovery manager: {str(e)}")
             
+            # Stop serving metrics
+            if self.metrics_exporter is not None:
+                try:
+                    await self.metrics_exporter.stop()
+                except Exception as e:
+                    self.logger.error(f"Error stopping metrics endpoint: {str(e)}")
+            
             # Stop event processors first
             try:
-                await self.member_event_queue.stop()
-                self.logger.info("Member event queue stopped")
+                await self.member_event_bus.stop()
+                self.logger.info("Member event bus stopped")
             except Exception as e:
-                self.logger.error(f"Error stopping member event queue: {str(e)}")
+                self.logger.error(f"Error stopping member event bus: {str(e)}")
                 
             try:
                 await self.channel_update_batcher.stop()
@@ -979,6 +1318,13 @@ class OptimizedStatsBot(discord.Client):
                         except Exception as e:
                             self.logger.error(f"Error saving stats data: {str(e)}")
             
+            # Let in-flight Discord operations finish and shed the rest
+            try:
+                await global_operation_scheduler.stop()
+                self.logger.info("Operation scheduler stopped")
+            except Exception as e:
+                self.logger.error(f"Error stopping operation scheduler: {str(e)}")
+            
             # Cancel all background tasks
             await self.task_manager.cancel_all_tasks()
             self.logger.info("All background tasks cancelled")
@@ -994,7 +1340,16 @@ class OptimizedStatsBot(discord.Client):
             self.logger.info("Disconnecting from Discord")
             await super().close()
             
+            # Release pooled connections shared with webhooks and the API batcher
+            try:
+                await connection_pool.close()
+            except Exception as e:
+                self.logger.error(f"Error closing connection pool: {str(e)}")
+            
             self.logger.info("Bot shutdown complete")
+            
+            # Make sure queued log records reach disk before the process exits
+            self.logger.flush()
         except Exception as e:
             self.logger.critical(f"Error during shutdown: {str(e)}", exc_info=True)
             # Ensure we still call the parent close method
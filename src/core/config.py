@@ -51,7 +51,10 @@ class ConfigManager:
         'MEMORY_WARNING_THRESHOLD': 80.0,
         'MEMORY_CRITICAL_THRESHOLD': 95.0,
         'ENVIRONMENT': 'development',
-        'DEBUG_MODE': 'false'
+        'DEBUG_MODE': 'false',
+        'METRICS_PORT': 0,
+        'METRICS_HOST': '127.0.0.1',
+        'LOG_MAX_BYTES': 0
     }
     
     # Environment variable types for validation
@@ -75,7 +78,10 @@ class ConfigManager:
         'MEMORY_WARNING_THRESHOLD': float,
         'MEMORY_CRITICAL_THRESHOLD': float,
         'ENVIRONMENT': str,
-        'DEBUG_MODE': bool
+        'DEBUG_MODE': bool,
+        'METRICS_PORT': int,
+        'METRICS_HOST': str,
+        'LOG_MAX_BYTES': int
     }
     
     def __init__(self, env_file_path: Optional[str] = None):
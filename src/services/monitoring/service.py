@@ -24,6 +24,9 @@ from src.utils.cache.cache_manager import CacheManager
 from src.utils.cache.circular_buffer import CircularBuffer
 from src.utils.logging.structured_logger import StructuredLogger, timed
 from src.utils.error_handling.circuit_breaker import circuit_breaker
+from src.utils.async_utils.operation_scheduler import (
+    OperationPriority, OperationShedError, global_operation_scheduler
+)
 from src.core.exceptions import MonitoringError
 
 
@@ -427,15 +430,20 @@ class MonitoringService:
             # Create heartbeat embed
             embed = await self.create_heartbeat_embed()
             
-            # Create or update heartbeat message
-            if not self.heartbeat_message:
-                self.heartbeat_message = await channel.send(embed=embed)
-            else:
-                try:
-                    await self.heartbeat_message.edit(embed=embed)
-                except discord.NotFound:
-                    # Message was deleted, send a new one
-                    self.heartbeat_message = await channel.send(embed=embed)
+            # Create or update heartbeat message through the shared scheduler
+            try:
+                await global_operation_scheduler.submit(
+                    "heartbeat_update",
+                    lambda: self._send_or_edit_heartbeat(channel, embed),
+                    priority=OperationPriority.HEARTBEAT,
+                    key="heartbeat_update"
+                )
+            except OperationShedError:
+                self.logger.warning(
+                    "Heartbeat update shed by operation scheduler",
+                    service="monitoring"
+                )
+                return
                     
             # Log heartbeat update
             metrics = self.get_system_metrics()
@@ -459,6 +467,23 @@ class MonitoringService:
             )
             raise MonitoringError("Failed to update heartbeat") from e
             
+    async def _send_or_edit_heartbeat(self, channel: discord.TextChannel, embed: discord.Embed) -> None:
+        """
+        Send a new heartbeat message or edit the existing one.
+        
+        Args:
+            channel: Heartbeat channel
+            embed: Heartbeat embed to display
+        """
+        if not self.heartbeat_message:
+            self.heartbeat_message = await channel.send(embed=embed)
+        else:
+            try:
+                await self.heartbeat_message.edit(embed=embed)
+            except discord.NotFound:
+                # Message was deleted, send a new one
+                self.heartbeat_message = await channel.send(embed=embed)
+    
     async def _heartbeat_loop(self) -> None:
         """Background loop for periodic heartbeat updates."""
         await self.bot.wait_until_ready()
@@ -8,14 +8,18 @@ Modules:
     service: Core rich presence service implementation
     types: Type definitions and enums for presence management
     utils: Utility functions for presence formatting
+    metrics: Incrementally maintained guild metrics
 """
 
 from .service import RichPresenceService
+from .metrics import GuildMetricsTracker, GuildMetricsSnapshot
 from .types import PresenceType, StatusType
 from .utils import format_count
 
 __all__ = [
     'RichPresenceService',
+    'GuildMetricsTracker',
+    'GuildMetricsSnapshot',
     'PresenceType', 
     'StatusType',
     'format_count'
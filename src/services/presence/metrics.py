@@ -0,0 +1,213 @@
+"""
+Incrementally maintained guild metrics for presence display.
+
+This module keeps a per-guild snapshot of the counts shown in the bot's
+presence (members, online, bans, boosts). Counts are seeded once and then
+kept current from gateway events, so reading a metric never requires
+scanning the member list or re-fetching the ban list.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Any
+
+import discord
+
+from ...utils.tree_log import log_perfect_tree_section, log_error_with_traceback
+from .types import PresenceType
+
+
+@dataclass
+class GuildMetricsSnapshot:
+    """Current metric values for a single guild."""
+    guild_id: int
+    member_count: int = 0
+    online_count: Optional[int] = None  # None until seeded
+    ban_count: Optional[int] = None  # None until seeded
+    boost_count: int = 0
+    updated_at: float = 0.0
+
+
+def _is_online(member: Any) -> bool:
+    """Check whether a member counts as online."""
+    return getattr(member, "status", discord.Status.offline) != discord.Status.offline
+
+
+class GuildMetricsTracker:
+    """
+    Shared, incrementally maintained guild metrics.
+    
+    The bot feeds gateway events (joins, leaves, bans, unbans and presence
+    changes) into the tracker; consumers read individual metrics on demand.
+    Member and boost counts come straight from the guild object, online and
+    ban counts are seeded once per guild and adjusted by events afterwards.
+    
+    Attributes:
+        _snapshots (Dict[int, GuildMetricsSnapshot]): Snapshots by guild ID
+        _stats (Dict[str, int]): Seed and incremental update counters
+    """
+    
+    def __init__(self):
+        """Initialize the guild metrics tracker."""
+        self._snapshots: Dict[int, GuildMetricsSnapshot] = {}
+        self._stats = {
+            "online_seeds": 0,
+            "ban_seeds": 0,
+            "incremental_updates": 0,
+            "reads": 0
+        }
+    
+    def get_snapshot(self, guild: discord.Guild) -> GuildMetricsSnapshot:
+        """
+        Get the snapshot for a guild, refreshing its O(1) fields.
+        
+        Args:
+            guild: Discord guild
+        
+        Returns:
+            Snapshot for the guild
+        """
+        snapshot = self._snapshots.get(guild.id)
+        if snapshot is None:
+            snapshot = GuildMetricsSnapshot(guild_id=guild.id)
+            self._snapshots[guild.id] = snapshot
+        
+        snapshot.member_count = guild.member_count or 0
+        snapshot.boost_count = guild.premium_subscription_count or 0
+        return snapshot
+    
+    def seed_online(self, guild: discord.Guild) -> int:
+        """
+        Count online members once so later updates can be incremental.
+        
+        Called when the guild becomes available (on ready or after a full
+        reconnect), never on the presence update path.
+        
+        Args:
+            guild: Discord guild
+        
+        Returns:
+            Seeded online count
+        """
+        snapshot = self.get_snapshot(guild)
+        snapshot.online_count = sum(1 for member in guild.members if _is_online(member))
+        snapshot.updated_at = time.time()
+        self._stats["online_seeds"] += 1
+        return snapshot.online_count
+    
+    async def seed_bans(self, guild: discord.Guild) -> int:
+        """
+        Fetch the ban count once so later updates can be incremental.
+        
+        Args:
+            guild: Discord guild
+        
+        Returns:
+            Seeded ban count (0 if the bot cannot read bans)
+        """
+        snapshot = self.get_snapshot(guild)
+        try:
+            snapshot.ban_count = sum([1 async for _ in guild.bans(limit=None)])
+        except discord.Forbidden:
+            log_perfect_tree_section(
+                "Ban Count Unavailable",
+                [
+                    ("guild_id", guild.id),
+                    ("reason", "Missing ban_members permission")
+                ],
+                emoji="⚠️"
+            )
+            snapshot.ban_count = 0
+        snapshot.updated_at = time.time()
+        self._stats["ban_seeds"] += 1
+        return snapshot.ban_count
+    
+    def _adjust(self, guild: discord.Guild, field_name: str, delta: int) -> None:
+        """
+        Apply an incremental change to a seeded counter.
+        
+        Args:
+            guild: Discord guild
+            field_name: Snapshot attribute to adjust
+            delta: Amount to add
+        """
+        snapshot = self.get_snapshot(guild)
+        current = getattr(snapshot, field_name)
+        if current is None:
+            # Not seeded yet; the seed will include this change
+            return
+        setattr(snapshot, field_name, max(0, current + delta))
+        snapshot.updated_at = time.time()
+        self._stats["incremental_updates"] += 1
+    
+    def on_member_join(self, member: discord.Member) -> None:
+        """Record a member join."""
+        if _is_online(member):
+            self._adjust(member.guild, "online_count", 1)
+    
+    def on_member_remove(self, member: discord.Member) -> None:
+        """Record a member leaving."""
+        if _is_online(member):
+            self._adjust(member.guild, "online_count", -1)
+    
+    def on_member_ban(self, guild: discord.Guild) -> None:
+        """Record a ban."""
+        self._adjust(guild, "ban_count", 1)
+    
+    def on_member_unban(self, guild: discord.Guild) -> None:
+        """Record an unban."""
+        self._adjust(guild, "ban_count", -1)
+    
+    def on_presence_update(self, before: discord.Member, after: discord.Member) -> None:
+        """Record a member's status transition."""
+        was_online = _is_online(before)
+        is_online = _is_online(after)
+        if was_online != is_online:
+            self._adjust(after.guild, "online_count", 1 if is_online else -1)
+    
+    async def get_metric(self, guild: discord.Guild, presence_type: PresenceType) -> int:
+        """
+        Get a single metric for a guild.
+        
+        Only the requested metric is computed. The online count is only
+        seeded on ready (seeding scans every member), so it reads 0 until
+        then; the ban count is seeded on first use.
+        
+        Args:
+            guild: Discord guild
+            presence_type: Metric to read
+        
+        Returns:
+            Current value of the metric
+        """
+        self._stats["reads"] += 1
+        snapshot = self.get_snapshot(guild)
+        
+        if presence_type == PresenceType.MEMBER_COUNT:
+            return snapshot.member_count
+        if presence_type == PresenceType.BOOST_COUNT:
+            return snapshot.boost_count
+        if presence_type == PresenceType.ONLINE_COUNT:
+            # Never scan members on the presence path
+            return snapshot.online_count or 0
+        if presence_type == PresenceType.BAN_COUNT:
+            if snapshot.ban_count is None:
+                try:
+                    return await self.seed_bans(guild)
+                except Exception as e:
+                    log_error_with_traceback("Failed to seed ban count", e)
+                    return 0
+            return snapshot.ban_count
+        
+        return 0
+    
+    def forget_guild(self, guild_id: int) -> None:
+        """Drop the snapshot for a guild the bot has left."""
+        self._snapshots.pop(guild_id, None)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tracker statistics."""
+        return {
+            **self._stats,
+            "guilds": len(self._snapshots)
+        }
@@ -14,7 +14,7 @@ import asyncio
 import logging
 import time
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable
 
 # Third-party imports
 import discord
@@ -22,11 +22,14 @@ import discord
 # Local imports
 from ...utils.performance import timing, performance_context
 from ...utils.tree_log import log_perfect_tree_section, log_error_with_traceback
+from ...utils.async_utils.operation_scheduler import (
+    OperationPriority, OperationShedError, global_operation_scheduler
+)
 from .types import PresenceType, StatusType, PRESENCE_CONFIGS
+from .metrics import GuildMetricsTracker
 from .utils import (
     get_presence_name, 
     calculate_next_presence_index,
-    get_guild_metrics,
     format_presence_activity
 )
 
@@ -42,6 +45,7 @@ class RichPresenceService:
         update_interval (int): Interval between presence updates in seconds
         current_index (int): Current presence type index
         presence_types (List[PresenceType]): Available presence types for cycling
+        metrics_tracker (GuildMetricsTracker): Shared incremental guild metrics
         _last_update (float): Timestamp of last presence update
         _error_count (int): Number of consecutive errors
         _max_errors (int): Maximum errors before disabling service
@@ -51,7 +55,9 @@ class RichPresenceService:
                  bot: discord.Client,
                  update_interval: int = 300,
                  presence_types: Optional[List[PresenceType]] = None,
-                 max_errors: int = 5):
+                 max_errors: int = 5,
+                 interval_provider: Optional[Callable[[], float]] = None,
+                 metrics_tracker: Optional[GuildMetricsTracker] = None):
         """
         Initialize the rich presence service.
         
@@ -60,9 +66,15 @@ class RichPresenceService:
             update_interval: Update interval in seconds (default: 300 = 5 minutes)
             presence_types: List of presence types to cycle through
             max_errors: Maximum consecutive errors before disabling service
+            interval_provider: Optional callable returning the current rotation
+                interval (e.g. from an adaptive poller); falls back to
+                update_interval when not set
+            metrics_tracker: Shared guild metrics tracker fed by gateway events
+                (a private tracker is created if not provided)
         """
         self.bot = bot
         self.update_interval = update_interval
+        self.interval_provider = interval_provider
         self.current_index = 0
         self.presence_types = presence_types or [
             PresenceType.MEMBER_COUNT,
@@ -80,10 +92,8 @@ class RichPresenceService:
         self._update_count = 0
         self._total_update_time = 0.0
         
-        # Caching for performance
-        self._cached_metrics: Dict[str, Any] = {}
-        self._cache_timestamp = 0.0
-        self._cache_ttl = 60.0  # Cache for 1 minute
+        # Incrementally maintained metrics; no member scans on rotation
+        self.metrics_tracker = metrics_tracker or GuildMetricsTracker()
         
         # Initialize logging
         log_perfect_tree_section(
@@ -117,20 +127,25 @@ class RichPresenceService:
                 guild = self.bot.guilds[0]
                 presence_type = self.presence_types[self.current_index]
                 
-                # Get cached or fresh metrics
-                metrics = await self._get_guild_metrics(guild)
-                if not metrics:
+                # Only compute the metric this rotation shows
+                count = await self._get_presence_count(guild, presence_type)
+                if count is None:
                     return False
                 
                 # Create presence activity
-                activity = await self._create_presence_activity(presence_type, metrics)
+                activity = await self._create_presence_activity(presence_type, count)
                 if not activity:
                     return False
                 
-                # Update presence
-                await self.bot.change_presence(
-                    status=discord.Status.online,
-                    activity=activity
+                # Update presence; a newer pending rotation replaces this one
+                await global_operation_scheduler.submit(
+                    "presence_update",
+                    lambda: self.bot.change_presence(
+                        status=discord.Status.online,
+                        activity=activity
+                    ),
+                    priority=OperationPriority.PRESENCE,
+                    key="presence_update"
                 )
                 
                 # Update rotation index
@@ -145,6 +160,9 @@ class RichPresenceService:
                 
                 return True
                 
+        except OperationShedError:
+            # Dropped by the scheduler under load; try again next rotation
+            return False
         except discord.HTTPException as e:
             # Handle Discord API errors specifically
             self._handle_discord_error(e)
@@ -154,47 +172,35 @@ class RichPresenceService:
             self._handle_unexpected_error(e)
             return False
     
-    async def _get_guild_metrics(self, guild: discord.Guild) -> Optional[Dict[str, Any]]:
+    async def _get_presence_count(self, 
+                                  guild: discord.Guild,
+                                  presence_type: PresenceType) -> Optional[int]:
         """
-        Get guild metrics with caching for performance.
+        Get the single metric shown by a presence type.
         
         Args:
-            guild: Discord guild to analyze
+            guild: Discord guild to read
+            presence_type: Presence type being displayed
             
         Returns:
-            Dictionary of guild metrics or None if failed
+            Metric value or None if failed
         """
-        current_time = time.time()
-        
-        # Return cached metrics if still valid
-        if (current_time - self._cache_timestamp < self._cache_ttl and 
-            self._cached_metrics):
-            return self._cached_metrics
-        
         try:
-            # Get fresh metrics
-            with performance_context("guild_metrics_fetch"):
-                metrics = await get_guild_metrics(guild)
-                
-            # Update cache
-            self._cached_metrics = metrics
-            self._cache_timestamp = current_time
-            
-            return metrics
-            
+            with performance_context("guild_metric_read"):
+                return await self.metrics_tracker.get_metric(guild, presence_type)
         except Exception as e:
-            log_error_with_traceback("Failed to get guild metrics", e)
+            log_error_with_traceback(f"Failed to get {presence_type.value} metric", e)
             return None
     
     async def _create_presence_activity(self, 
                                       presence_type: PresenceType,
-                                      metrics: Dict[str, Any]) -> Optional[discord.Activity]:
+                                      count: int) -> Optional[discord.Activity]:
         """
         Create Discord activity for presence display.
         
         Args:
             presence_type: Type of presence to create
-            metrics: Guild metrics dictionary
+            count: Metric value to display
             
         Returns:
             Discord Activity object or None if failed
@@ -204,10 +210,6 @@ class RichPresenceService:
             if not config:
                 return None
             
-            # Get count based on presence type
-            count_key = presence_type.value.replace('_count', '_count')
-            count = metrics.get(count_key, 0)
-            
             # Format presence name
             presence_name = config.format_name(count)
             
@@ -302,8 +304,22 @@ class RichPresenceService:
             if self._service_enabled:
                 await self.update_presence()
             
-            # Sleep for the configured interval
-            await asyncio.sleep(self.update_interval)
+            # Sleep for the configured (or adaptive) interval
+            await asyncio.sleep(self.get_update_interval())
+    
+    def get_update_interval(self) -> float:
+        """
+        Get the interval until the next presence rotation.
+        
+        Returns:
+            Interval in seconds
+        """
+        if self.interval_provider is not None:
+            try:
+                return self.interval_provider()
+            except Exception as e:
+                log_error_with_traceback("Presence interval provider failed", e)
+        return self.update_interval
     
     async def set_shutdown_presence(self) -> bool:
         """
@@ -348,17 +364,7 @@ class RichPresenceService:
                                     if self.presence_types else "none"),
             "uptime_seconds": uptime,
             "average_update_time_ms": avg_update_time * 1000,
-            "cache_hit_rate": self._calculate_cache_hit_rate(),
-            "next_update_in": max(0, self.update_interval - (time.time() - self._last_update))
+            "metrics_tracker": self.metrics_tracker.get_stats(),
+            "update_interval": self.get_update_interval(),
+            "next_update_in": max(0, self.get_update_interval() - (time.time() - self._last_update))
         }
-    
-    def _calculate_cache_hit_rate(self) -> float:
-        """Calculate cache hit rate for performance monitoring."""
-        # This is a simplified implementation
-        # In a real scenario, you'd track cache hits vs misses
-        if self._update_count == 0:
-            return 0.0
-        
-        # Estimate based on cache TTL and update frequency
-        cache_effectiveness = min(1.0, self._cache_ttl / self.update_interval)
-        return cache_effectiveness * 100  # Return as percentage
\ No newline at end of file
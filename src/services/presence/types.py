@@ -15,6 +15,7 @@ class PresenceType(Enum):
     MEMBER_COUNT = "member_count"
     ONLINE_COUNT = "online_count" 
     BAN_COUNT = "ban_count"
+    BOOST_COUNT = "boost_count"
 
 class StatusType(Enum):
     """Enumeration of Discord status types."""
@@ -54,5 +55,11 @@ PRESENCE_CONFIGS: Dict[PresenceType, PresenceConfig] = {
         activity_type=discord.ActivityType.watching,
         name_template="bans",
         description="Total server bans"
+    ),
+    PresenceType.BOOST_COUNT: PresenceConfig(
+        emoji="💎",
+        activity_type=discord.ActivityType.watching,
+        name_template="boosts",
+        description="Active server boosts"
     )
 } 
\ No newline at end of file
@@ -18,6 +18,10 @@ from src.core.config import get_config
 from src.core.exceptions import RateLimitError, DiscordAPIError
 from src.types.models import ChannelStats, EventType, MemberEvent
 # Import CacheManager lazily to avoid circular imports
+from src.utils.async_utils.task_manager import TaskManager
+from src.utils.async_utils.operation_scheduler import (
+    OperationPriority, global_operation_scheduler
+)
 from src.utils.error_handling.backoff import exponential_backoff
 from src.utils.logging.structured_logger import StructuredLogger, timed
 
@@ -48,11 +52,22 @@ class OptimizedStatsService:
     CACHE_KEY_CHANNEL_PREFIX = "stats:channel:{channel_id}"
     CACHE_KEY_STATS = "stats:channel_stats:{guild_id}"
     
+    # Ban lists are expensive to fetch and change rarely: after the soft TTL
+    # the cached count is still served while it is refetched in the
+    # background, and only a count unused for the hard TTL is fetched inline
+    BAN_COUNT_SOFT_TTL = 600
+    BAN_COUNT_TTL = 3600
+    # Refetch hot counts in the last 20% of their soft TTL
+    BAN_COUNT_REFRESH_AHEAD = 0.2
+    # How long a failed ban fetch (e.g. missing permission) is not retried
+    BAN_COUNT_FAILURE_TTL = 60
+    
     def __init__(
         self, 
         bot: discord.Client,
         logger: Optional[StructuredLogger] = None,
-        cache_ttl: int = 300
+        cache_ttl: int = 300,
+        task_manager: Optional[TaskManager] = None
     ):
         """
         Initialize the optimized stats service.
@@ -61,12 +76,13 @@ class OptimizedStatsService:
             bot: Discord bot client
             logger: Structured logger (optional)
             cache_ttl: Default cache TTL in seconds (default: 300)
+            task_manager: Task manager for background cache refreshes (optional)
         """
         self.bot = bot
         self.stats_tracker = StatsTracker()
         # Import CacheManager lazily to avoid circular imports
         from src.utils.cache.cache_manager import CacheManager
-        self.cache = CacheManager(default_ttl=cache_ttl)
+        self.cache = CacheManager(default_ttl=cache_ttl, task_manager=task_manager)
         self.logger = logger or StructuredLogger("stats_service")
         
         # Set up EST timezone
@@ -200,18 +216,26 @@ class OptimizedStatsService:
             
             # Add detailed lists if there was activity
             if stats['joins'] > 0:
-                join_list = "\n".join([f"<@{join['id']}>" for join in stats['join_list'][:10]])
-                if len(stats['join_list']) > 10:
-                    join_list += f"\n*...and {len(stats['join_list']) - 10} more*"
+                # Members aggregated during a raid are counted but not listed
+                shown_joins = stats['join_list'][:10]
+                join_list = "\n".join([f"<@{join['id']}>" for join in shown_joins])
+                if stats['joins'] > len(shown_joins):
+                    join_list += f"\n*...and {stats['joins'] - len(shown_joins)} more*"
                 embed.add_field(name="New Members", value=join_list or "None", inline=False)
             
             if stats['leaves'] > 0:
-                leave_list = "\n".join([f"{leave['username']}" for leave in stats['leave_list'][:10]])
-                if len(stats['leave_list']) > 10:
-                    leave_list += f"\n*...and {len(stats['leave_list']) - 10} more*"
+                shown_leaves = stats['leave_list'][:10]
+                leave_list = "\n".join([f"{leave['username']}" for leave in shown_leaves])
+                if stats['leaves'] > len(shown_leaves):
+                    leave_list += f"\n*...and {stats['leaves'] - len(shown_leaves)} more*"
                 embed.add_field(name="Members Left", value=leave_list or "None", inline=False)
             
-            await channel.send(embed=embed)
+            # Highest scheduler priority so the report survives rate-limit storms
+            await global_operation_scheduler.submit(
+                "daily_stats_report",
+                lambda: channel.send(embed=embed),
+                priority=OperationPriority.DAILY_REPORT
+            )
             
             self.logger.info(
                 "Daily stats sent successfully",
@@ -264,12 +288,18 @@ class OptimizedStatsService:
                     f"Channel {channel_id} name unchanged, skipping update",
                     service="StatsService",
                     channel_id=channel_id,
-                    channel_name=new_name
+                    channel_name=new_name,
+                    sample=True
                 )
                 return
                 
-            # Update the channel name
-            await channel.edit(name=new_name)
+            # Update the channel name; pending renames of the same channel coalesce
+            await global_operation_scheduler.submit(
+                f"channel_rename:{channel_id}",
+                lambda: channel.edit(name=new_name),
+                priority=OperationPriority.CHANNEL_RENAME,
+                key=f"channel_rename:{channel_id}"
+            )
             
             # Cache the new channel name
             cache_key = self.CACHE_KEY_CHANNEL_PREFIX.format(channel_id=channel_id)
@@ -331,7 +361,8 @@ class OptimizedStatsService:
                     "Member count unchanged, skipping update",
                     service="StatsService",
                     guild_id=guild.id,
-                    member_count=guild.member_count
+                    member_count=guild.member_count,
+                    sample=True
                 )
                 return False
                 
@@ -397,7 +428,8 @@ class OptimizedStatsService:
                     "Online count unchanged, skipping update",
                     service="StatsService",
                     guild_id=guild.id,
-                    online_count=online_count
+                    online_count=online_count,
+                    sample=True
                 )
                 return False
                 
@@ -452,27 +484,7 @@ class OptimizedStatsService:
         async with self._ban_lock:
             try:
                 # Get ban count (this is an expensive API call, so we cache it longer)
-                cache_key = self.CACHE_KEY_BAN_COUNT.format(guild_id=guild.id)
-                ban_count = self.cache.get(cache_key)
-                
-                if ban_count is None:
-                    # Cache miss, need to fetch bans
-                    bans = [entry async for entry in guild.bans()]
-                    ban_count = len(bans)
-                    # Cache ban count with longer TTL (10 minutes) since it changes less frequently
-                    self.cache.set(cache_key, ban_count, ttl=600)
-                    
-                    self.logger.debug(
-                        f"Fetched ban count: {ban_count}",
-                        service="StatsService",
-                        guild_id=guild.id
-                    )
-                else:
-                    self.logger.debug(
-                        f"Using cached ban count: {ban_count}",
-                        service="StatsService",
-                        guild_id=guild.id
-                    )
+                ban_count = await self._get_ban_count(guild)
                 
                 # Get channel and extract prefix
                 channel = self.bot.get_channel(self.ban_count_channel_id)
@@ -504,7 +516,8 @@ class OptimizedStatsService:
                         "Ban count unchanged, skipping update",
                         service="StatsService",
                         guild_id=guild.id,
-                        ban_count=ban_count
+                        ban_count=ban_count,
+                        sample=True
                     )
                     return False
                     
@@ -524,6 +537,40 @@ class OptimizedStatsService:
                 )
                 return False
     
+    async def _get_ban_count(self, guild: discord.Guild) -> int:
+        """
+        Get the guild's ban count from cache, fetching it at most once at a time.
+        
+        Concurrent misses (e.g. several updates after a reconnect) share one
+        ban list fetch, and a failed fetch is not retried for
+        BAN_COUNT_FAILURE_TTL seconds. A stale count is returned immediately
+        while it is refetched in the background, so channel updates only
+        wait for a fetch when no count has been cached for BAN_COUNT_TTL.
+        
+        Args:
+            guild: Discord guild
+            
+        Returns:
+            int: Number of bans
+        """
+        async def fetch_ban_count() -> int:
+            ban_count = len([entry async for entry in guild.bans()])
+            self.logger.debug(
+                f"Fetched ban count: {ban_count}",
+                service="StatsService",
+                guild_id=guild.id
+            )
+            return ban_count
+        
+        return await self.cache.get_or_load(
+            self.CACHE_KEY_BAN_COUNT.format(guild_id=guild.id),
+            fetch_ban_count,
+            ttl=self.BAN_COUNT_TTL,
+            negative_ttl=self.BAN_COUNT_FAILURE_TTL,
+            soft_ttl=self.BAN_COUNT_SOFT_TTL,
+            refresh_ahead=self.BAN_COUNT_REFRESH_AHEAD
+        )
+    
     async def _update_cached_stats(self, guild: discord.Guild) -> None:
         """
         Update the cached channel statistics.
@@ -537,13 +584,7 @@ class OptimizedStatsService:
             online_count = len([m for m in guild.members if m.status != discord.Status.offline])
             
             # Get ban count from cache or fetch if needed
-            ban_cache_key = self.CACHE_KEY_BAN_COUNT.format(guild_id=guild.id)
-            ban_count = self.cache.get(ban_cache_key)
-            if ban_count is None:
-                # This is an expensive operation, so we only do it if necessary
-                bans = [entry async for entry in guild.bans()]
-                ban_count = len(bans)
-                self.cache.set(ban_cache_key, ban_count, ttl=600)
+            ban_count = await self._get_ban_count(guild)
             
             # Create stats object
             stats = ChannelStats(
@@ -650,10 +691,13 @@ class OptimizedStatsService:
                 event_type=event_type
             )
             
+            # During a raid the tracker logs one summary per window instead
+            log_event = self.logger.debug if self.stats_tracker.burst_active else self.logger.info
+            
             # Record event based on type
             if event_type == EventType.JOIN:
                 self.stats_tracker.record_member_join(member_id, username)
-                self.logger.info(
+                log_event(
                     f"Member joined: {username}",
                     service="StatsService",
                     member_id=member_id,
@@ -662,7 +706,7 @@ class OptimizedStatsService:
                 )
             elif event_type == EventType.LEAVE:
                 self.stats_tracker.record_member_leave(member_id, username)
-                self.logger.info(
+                log_event(
                     f"Member left: {username}",
                     service="StatsService",
                     member_id=member_id,
@@ -671,7 +715,7 @@ class OptimizedStatsService:
                 )
             elif event_type == EventType.BAN:
                 self.stats_tracker.record_member_ban(member_id, username)
-                self.logger.info(
+                log_event(
                     f"Member banned: {username}",
                     service="StatsService",
                     member_id=member_id,
@@ -684,7 +728,12 @@ class OptimizedStatsService:
             if guild_id:
                 self.cache.invalidate(self.CACHE_KEY_MEMBER_COUNT.format(guild_id=guild_id))
                 if event_type == EventType.BAN:
-                    self.cache.invalidate(self.CACHE_KEY_BAN_COUNT.format(guild_id=guild_id))
+                    # Count the ban in place so the channel update needs no ban list
+                    # walk; the soft TTL refresh still corrects any drift
+                    self.cache.update(
+                        self.CACHE_KEY_BAN_COUNT.format(guild_id=guild_id),
+                        lambda count: count + 1
+                    )
         except Exception as e:
             self.logger.error(
                 f"Failed to record {event_type.value} event",
@@ -734,5 +783,10 @@ class OptimizedStatsService:
             "hit_count": stats.hit_count,
             "miss_count": stats.miss_count,
             "hit_rate": stats.hit_rate,
-            "memory_usage_bytes": stats.memory_usage_bytes
+            "memory_usage_bytes": stats.memory_usage_bytes,
+            "singleflight_waits": stats.singleflight_waits,
+            "singleflight_loads": stats.singleflight_loads,
+            "negative_hits": stats.negative_hits,
+            "stale_hits": stats.stale_hits,
+            "background_refreshes": stats.background_refreshes
         }
\ No newline at end of file
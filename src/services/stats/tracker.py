@@ -6,6 +6,7 @@ This module provides an optimized implementation of the StatsTracker with:
 - Memory-efficient data structures for statistics storage
 - Streaming operations for large datasets
 - Optimized statistics calculation with change detection
+- Burst mode that collapses join raids into compact per-second aggregates
 """
 
 import json
@@ -20,6 +21,9 @@ from typing import Dict, List, Optional, Any, Union, Set, Iterator, Generator, T
 import time
 import hashlib
 import io
+import base64
+import sys
+from array import array
 
 from src.utils.logging.structured_logger import StructuredLogger, timed
 from src.core.exceptions import DataPersistenceError
@@ -44,6 +48,7 @@ class StatsTracker:
         _change_detected (bool): Flag indicating if changes have been made
         _last_hash (str): Hash of the last saved data for change detection
         _recent_events (CircularBuffer): Circular buffer for recent events
+        burst_active (bool): Whether burst mode is currently collapsing events
     """
     
     # Constants for file operations
@@ -51,12 +56,26 @@ class StatsTracker:
     BACKUP_RETENTION_COUNT = 3
     CHUNK_SIZE = 8192  # 8KB chunks for streaming operations   
     
-    def __init__(self, logger: Optional[StructuredLogger] = None):
+    # Burst mode: above this many events per second, events are aggregated
+    BURST_RATE_THRESHOLD = 20.0
+    BURST_WINDOW_SECONDS = 10.0
+    EVENT_KINDS = ("joins", "leaves", "bans", "unbans")
+    
+    def __init__(
+        self,
+        logger: Optional[StructuredLogger] = None,
+        burst_threshold: Optional[float] = None,
+        burst_window: Optional[float] = None
+    ):
         """
         Initialize the stats tracker.
         
         Args:
             logger: Structured logger (optional)
+            burst_threshold: Events per second that switch burst mode on
+                (default: BURST_RATE_THRESHOLD)
+            burst_window: Seconds per burst summary/persistence window
+                (default: BURST_WINDOW_SECONDS)
         """
         self.est_tz = pytz.timezone('US/Eastern')
         self.data_dir = Path("data")
@@ -71,6 +90,19 @@ class StatsTracker:
         # Use circular buffer for recent events to limit memory usage
         self._recent_events = CircularBuffer[MemberEvent](self.MAX_RECENT_EVENTS)
         
+        # Burst mode state: events per second, and per-second packed ID arrays
+        # for the current window keyed by kind then epoch second
+        self.burst_threshold = burst_threshold or self.BURST_RATE_THRESHOLD
+        self.burst_window = burst_window or self.BURST_WINDOW_SECONDS
+        self.burst_active = False
+        self._rate_second = 0
+        self._rate_count = 0
+        self._burst_pending: Dict[str, Dict[int, array]] = {kind: {} for kind in self.EVENT_KINDS}
+        self._burst_window_events = 0
+        self._burst_window_started = 0.0
+        self._burst_timer: Optional[asyncio.TimerHandle] = None
+        self._burst_stats = {"bursts": 0, "aggregated_events": 0, "windows": 0}
+        
         # Load stats with streaming for large files
         self._load_stats_streaming()
         
@@ -332,6 +364,9 @@ class StatsTracker:
         Raises:
             DataPersistenceError: If file cannot be written
         """
+        # Persist the open burst window too so nothing is lost at shutdown
+        self._fold_burst_window()
+        
         if not self._has_changes():
             self.logger.debug(
                 "No changes to save",
@@ -392,6 +427,178 @@ class StatsTracker:
                 "unbans": []
             }
     
+    def _track_rate(self) -> bool:
+        """
+        Count an event towards the current second and switch burst mode on.
+        
+        Returns:
+            True if the event should be recorded in burst mode
+        """
+        now = int(time.time())
+        if now != self._rate_second:
+            self._rate_second = now
+            self._rate_count = 0
+        self._rate_count += 1
+        
+        if not self.burst_active and self._rate_count >= self.burst_threshold:
+            self._start_burst()
+        return self.burst_active
+    
+    def _start_burst(self) -> None:
+        """Switch burst mode on and start the first summary window."""
+        self.burst_active = True
+        self._burst_stats["bursts"] += 1
+        self.logger.warning(
+            "Burst mode activated",
+            service="StatsTracker",
+            events_per_second=self._rate_count,
+            threshold=self.burst_threshold
+        )
+        self._start_burst_window()
+    
+    def _start_burst_window(self) -> None:
+        """Begin a summary window and arm its timer if a loop is running."""
+        self._burst_window_events = 0
+        self._burst_window_started = time.time()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._burst_timer = None
+            return
+        self._burst_timer = loop.call_later(self.burst_window, self._end_burst_window)
+    
+    def _record_burst_event(self, kind: str, member_id: int) -> None:
+        """
+        Record an event as part of the current second's aggregate.
+        
+        Args:
+            kind: Event list name ("joins", "leaves", "bans", "unbans")
+            member_id: Member ID
+        """
+        per_second = self._burst_pending[kind]
+        ids = per_second.get(self._rate_second)
+        if ids is None:
+            self._ensure_date_entry(datetime.fromtimestamp(self._rate_second, self.est_tz).strftime("%Y-%m-%d"))
+            ids = per_second[self._rate_second] = array("Q")
+        ids.append(member_id)
+        self._burst_window_events += 1
+        self._burst_stats["aggregated_events"] += 1
+        
+        # Without an event loop there is no timer; close windows inline
+        if self._burst_timer is None and time.time() - self._burst_window_started >= self.burst_window:
+            self._end_burst_window()
+    
+    @staticmethod
+    def _pack_ids(ids: array) -> str:
+        """Encode a packed ID array as little-endian base64."""
+        if sys.byteorder == "big":
+            ids = array("Q", ids)
+            ids.byteswap()
+        return base64.b64encode(ids.tobytes()).decode("ascii")
+    
+    @staticmethod
+    def _unpack_ids(packed: str) -> array:
+        """Decode IDs packed by _pack_ids."""
+        ids = array("Q")
+        ids.frombytes(base64.b64decode(packed))
+        if sys.byteorder == "big":
+            ids.byteswap()
+        return ids
+    
+    def _fold_burst_window(self) -> int:
+        """
+        Move pending per-second aggregates into daily_stats.
+        
+        Aggregates are stored under daily_stats[date]["bursts"][kind] as
+        {"second", "count", "ids"} records, one per second and kind.
+        
+        Returns:
+            Number of events folded
+        """
+        folded = 0
+        for kind, per_second in self._burst_pending.items():
+            for second, ids in sorted(per_second.items()):
+                moment = datetime.fromtimestamp(second, self.est_tz)
+                date = moment.strftime("%Y-%m-%d")
+                self._ensure_date_entry(date)
+                bursts = self.daily_stats[date].setdefault("bursts", {})
+                bursts.setdefault(kind, []).append({
+                    "second": moment.isoformat(),
+                    "count": len(ids),
+                    "ids": self._pack_ids(ids)
+                })
+                folded += len(ids)
+            per_second.clear()
+        
+        if folded:
+            self._change_detected = True
+        return folded
+    
+    def _end_burst_window(self) -> None:
+        """Close a burst window: persist once, log one summary and maybe exit."""
+        elapsed = max(time.time() - self._burst_window_started, 1e-6)
+        window_events = self._burst_window_events
+        rate = window_events / elapsed
+        folded = self._fold_burst_window()
+        self._burst_stats["windows"] += 1
+        
+        self.logger.info(
+            f"Burst window summary: {window_events} member events aggregated",
+            service="StatsTracker",
+            events=window_events,
+            events_per_second=round(rate, 1),
+            window_seconds=round(elapsed, 1)
+        )
+        
+        if folded:
+            # One coalesced save per window instead of one per event
+            try:
+                asyncio.get_running_loop().create_task(self._save_stats_atomic())
+            except RuntimeError:
+                pass
+        
+        if rate < self.burst_threshold / 2:
+            self.burst_active = False
+            self._burst_timer = None
+            self.logger.info(
+                "Burst mode deactivated",
+                service="StatsTracker",
+                events_per_second=round(rate, 1)
+            )
+        else:
+            self._start_burst_window()
+    
+    def _burst_count(self, date: str, kind: str) -> int:
+        """
+        Count aggregated burst events for a date, including the open window.
+        
+        Args:
+            date: Date string in YYYY-MM-DD format
+            kind: Event list name
+            
+        Returns:
+            Number of burst events
+        """
+        count = sum(
+            record["count"]
+            for record in self.daily_stats.get(date, {}).get("bursts", {}).get(kind, [])
+        )
+        for second, ids in self._burst_pending[kind].items():
+            if datetime.fromtimestamp(second, self.est_tz).strftime("%Y-%m-%d") == date:
+                count += len(ids)
+        return count
+    
+    def get_burst_stats(self) -> Dict[str, Any]:
+        """Get burst mode statistics."""
+        return {
+            **self._burst_stats,
+            "active": self.burst_active,
+            "threshold": self.burst_threshold,
+            "pending_events": sum(
+                len(ids) for per_second in self._burst_pending.values() for ids in per_second.values()
+            )
+        }
+    
     def record_member_join(self, member_id: int, username: str) -> None:
         """
         Record a member join event.
@@ -400,6 +607,10 @@ class StatsTracker:
             member_id: Member ID
             username: Member username
         """
+        if self._track_rate():
+            self._record_burst_event("joins", member_id)
+            return
+        
         current_date = datetime.now(self.est_tz).strftime("%Y-%m-%d")
         self._ensure_date_entry(current_date)
         
@@ -413,7 +624,7 @@ class StatsTracker:
         asyncio.create_task(self._save_stats_atomic())
         
         self.logger.info(
-            f"Member join recorded: {username}",
+            "Member join recorded: %s", username,
             service="StatsTracker",
             member_id=member_id,
             username=username,
@@ -428,6 +639,10 @@ class StatsTracker:
             member_id: Member ID
             username: Member username
         """
+        if self._track_rate():
+            self._record_burst_event("leaves", member_id)
+            return
+        
         current_date = datetime.now(self.est_tz).strftime("%Y-%m-%d")
         self._ensure_date_entry(current_date)
         
@@ -441,7 +656,7 @@ class StatsTracker:
         asyncio.create_task(self._save_stats_atomic())
         
         self.logger.info(
-            f"Member leave recorded: {username}",
+            "Member leave recorded: %s", username,
             service="StatsTracker",
             member_id=member_id,
             username=username,
@@ -456,6 +671,10 @@ class StatsTracker:
             member_id: Member ID
             username: Member username
         """
+        if self._track_rate():
+            self._record_burst_event("bans", member_id)
+            return
+        
         current_date = datetime.now(self.est_tz).strftime("%Y-%m-%d")
         self._ensure_date_entry(current_date)
         
@@ -469,7 +688,7 @@ class StatsTracker:
         asyncio.create_task(self._save_stats_atomic())
         
         self.logger.info(
-            f"Member ban recorded: {username}",
+            "Member ban recorded: %s", username,
             service="StatsTracker",
             member_id=member_id,
             username=username,
@@ -484,6 +703,10 @@ class StatsTracker:
             member_id: Member ID
             username: Member username
         """
+        if self._track_rate():
+            self._record_burst_event("unbans", member_id)
+            return
+        
         current_date = datetime.now(self.est_tz).strftime("%Y-%m-%d")
         self._ensure_date_entry(current_date)
         
@@ -501,7 +724,7 @@ class StatsTracker:
         asyncio.create_task(self._save_stats_atomic())
         
         self.logger.info(
-            f"Member unban recorded: {username}",
+            "Member unban recorded: %s", username,
             service="StatsTracker",
             member_id=member_id,
             username=username,
@@ -512,6 +735,11 @@ class StatsTracker:
         """
         Get stats for a specific date or today.
         
+        Counts include events aggregated in burst mode, but the join, leave,
+        ban and unban lists only hold individually recorded events: burst
+        aggregates keep member IDs only, under daily_stats[date]["bursts"].
+        The lists can therefore be shorter than their counts after a raid.
+        
         Args:
             date: Date string in YYYY-MM-DD format (default: today)
             
@@ -525,10 +753,11 @@ class StatsTracker:
             stats = self.daily_stats[date]
             
             # Use efficient list length calculation instead of creating new lists
-            joins_count = len(stats["joins"])
-            leaves_count = len(stats["leaves"])
-            bans_count = len(stats.get("bans", []))
-            unbans_count = len(stats.get("unbans", []))
+            # Burst aggregates count towards the totals so they stay exact
+            joins_count = len(stats["joins"]) + self._burst_count(date, "joins")
+            leaves_count = len(stats["leaves"]) + self._burst_count(date, "leaves")
+            bans_count = len(stats.get("bans", [])) + self._burst_count(date, "bans")
+            unbans_count = len(stats.get("unbans", [])) + self._burst_count(date, "unbans")
             
             return {
                 "date": date,
@@ -732,9 +961,9 @@ class StatsTracker:
         
         # Calculate totals efficiently
         for date, stats in self.daily_stats.items():
-            total_joins += len(stats["joins"])
-            total_leaves += len(stats["leaves"])
-            total_bans += len(stats.get("bans", []))
+            total_joins += len(stats["joins"]) + self._burst_count(date, "joins")
+            total_leaves += len(stats["leaves"]) + self._burst_count(date, "leaves")
+            total_bans += len(stats.get("bans", [])) + self._burst_count(date, "bans")
         
         return {
             "total_dates": total_dates,
@@ -742,7 +971,8 @@ class StatsTracker:
             "total_leaves": total_leaves,
             "total_bans": total_bans,
             "net_change": total_joins - total_leaves,
-            "has_unsaved_changes": self._has_changes()
+            "has_unsaved_changes": self._has_changes(),
+            "burst_mode": self.get_burst_stats()
         }
     
     def stream_all_events(self, event_type: Optional[str] = None) -> Generator[Dict[str, Any], None, None]:
@@ -774,6 +1004,20 @@ class StatsTracker:
                 # Stream specific event type
                 for event in stats[event_type]:
                     yield {"date": date, "type": event_type[:-1], **event}
+            
+            # Burst aggregates expand to one event per member (no username)
+            for kind, records in stats.get("bursts", {}).items():
+                if event_type is not None and event_type not in ("all", kind):
+                    continue
+                for record in records:
+                    for member_id in self._unpack_ids(record["ids"]):
+                        yield {
+                            "date": date,
+                            "type": kind[:-1],
+                            "id": member_id,
+                            "username": None,
+                            "timestamp": record["second"]
+                        }
     
     async def export_stats_to_file(self, output_file: Path) -> None:
         """
@@ -6,7 +6,7 @@ with proper type hints for better type safety and code clarity.
 """
 
 from dataclasses import dataclass, field, asdict
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum, auto
 from typing import Dict, List, Optional, Any, Union, TypedDict, Protocol, Callable, Tuple, Set, Generic, TypeVar
 import discord
@@ -94,6 +94,13 @@ class BotConfig:
     environment: str = "development"  # development, testing, production
     debug_mode: bool = False
     
+    # OpenMetrics endpoint (disabled when metrics_port is 0)
+    metrics_port: int = 0
+    metrics_host: str = "127.0.0.1"
+    
+    # Disk budget for the logs directory in bytes (no limit when 0)
+    log_max_bytes: int = 0
+    
     def validate(self) -> None:
         """
         Validate configuration values with comprehensive checks.
@@ -149,6 +156,12 @@ class BotConfig:
         
         if self.memory_warning_threshold >= self.memory_critical_threshold:
             raise ValueError("memory_warning_threshold must be less than memory_critical_threshold")
+        
+        if not (0 <= self.metrics_port <= 65535):
+            raise ValueError("metrics_port must be between 0 and 65535")
+        
+        if self.log_max_bytes < 0:
+            raise ValueError("log_max_bytes cannot be negative")
             
         # Log level validation
         valid_log_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
@@ -237,6 +250,45 @@ class MemberEvent:
         )
 
 
+@dataclass
+class GatewayMemberEvent:
+    """
+    A member event as published on the in-process member event bus.
+    
+    Unlike MemberEvent, this carries the live Discord objects so that
+    subscribers can read guild and member state without refetching.
+    """
+    event_type: EventType
+    guild: discord.Guild
+    user: Union[discord.Member, discord.User]
+    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    
+    @property
+    def guild_id(self) -> int:
+        """ID of the guild the event belongs to."""
+        return self.guild.id
+    
+    @property
+    def member_id(self) -> int:
+        """ID of the member or user the event is about."""
+        return self.user.id
+    
+    @property
+    def username(self) -> str:
+        """Display name in name#discriminator form."""
+        return f"{self.user.name}#{self.user.discriminator}"
+    
+    def to_member_event(self) -> MemberEvent:
+        """Convert to a serializable MemberEvent."""
+        return MemberEvent(
+            member_id=self.member_id,
+            username=self.username,
+            timestamp=self.timestamp,
+            event_type=self.event_type,
+            guild_id=self.guild_id
+        )
+
+
 # Statistics data models
 @dataclass
 class ChannelStats:
@@ -261,6 +313,7 @@ class DailyStats(TypedDict):
     Daily statistics summary.
     
     Using TypedDict for JSON compatibility while maintaining type safety.
+    Counts include burst-aggregated events; the lists do not.
     """
     date: str
     joins: int
@@ -319,6 +372,13 @@ class CacheStats:
     miss_count: int
     eviction_count: int
     memory_usage_bytes: int
+    eviction_policy: str = "tinylfu"
+    singleflight_hits: int = 0
+    singleflight_waits: int = 0
+    singleflight_loads: int = 0
+    negative_hits: int = 0
+    stale_hits: int = 0
+    background_refreshes: int = 0
     hit_rate: float = field(init=False)
     
     def __post_init__(self):
@@ -355,6 +415,22 @@ class LogEntry:
     duration_ms: Optional[float] = None
     error: Optional[str] = None
     
+    # Formatted forms, computed once and shared by every sink
+    _formatted_context: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _json: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    def format_context(self) -> str:
+        """Format the context as space-separated key=value pairs (cached)."""
+        if self._formatted_context is None:
+            self._formatted_context = " ".join([f"{k}={v}" for k, v in self.context.items()])
+        return self._formatted_context
+    
+    def to_json(self) -> str:
+        """Serialize to a JSON line (cached)."""
+        if self._json is None:
+            self._json = json.dumps(self.to_dict())
+        return self._json
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON logging."""
         data = {
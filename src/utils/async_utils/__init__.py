@@ -8,6 +8,12 @@ primitives, task management, event queuing, and other async operation utilities.
 # Import task_manager and semaphore_manager directly
 from .task_manager import TaskManager
 from .semaphore_manager import SemaphoreManager
+from .operation_scheduler import (
+    OperationScheduler,
+    OperationPriority,
+    OperationShedError,
+    global_operation_scheduler
+)
 
 # Import async_helpers directly
 from .async_helpers import (
@@ -20,8 +26,12 @@ from .async_helpers import (
 
 # Use lazy imports for event_queue to avoid circular imports
 def _import_event_queue():
-    from .event_queue import EventQueue, EventBatcher
-    return EventQueue, EventBatcher
+    from .event_queue import EventQueue, EventBatcher, OverflowPolicy, PartitionedEventQueue
+    return EventQueue, EventBatcher, OverflowPolicy, PartitionedEventQueue
+
+def _import_event_bus():
+    from .event_bus import EventBus
+    return EventBus
 
 # Define properties for lazy imports
 class _LazyModule:
@@ -32,6 +42,18 @@ class _LazyModule:
     @property
     def EventBatcher(self):
         return _import_event_queue()[1]
+    
+    @property
+    def OverflowPolicy(self):
+        return _import_event_queue()[2]
+    
+    @property
+    def PartitionedEventQueue(self):
+        return _import_event_queue()[3]
+    
+    @property
+    def EventBus(self):
+        return _import_event_bus()
 
 # Create lazy module instance
 _lazy = _LazyModule()
@@ -39,12 +61,22 @@ _lazy = _LazyModule()
 # Export symbols
 EventQueue = _lazy.EventQueue
 EventBatcher = _lazy.EventBatcher
+OverflowPolicy = _lazy.OverflowPolicy
+PartitionedEventQueue = _lazy.PartitionedEventQueue
+EventBus = _lazy.EventBus
 
 __all__ = [
     'TaskManager',
     'SemaphoreManager',
+    'OperationScheduler',
+    'OperationPriority',
+    'OperationShedError',
+    'global_operation_scheduler',
     'EventQueue',
     'EventBatcher',
+    'OverflowPolicy',
+    'PartitionedEventQueue',
+    'EventBus',
     'gather_with_concurrency',
     'run_with_timeout',
     'periodic_task',
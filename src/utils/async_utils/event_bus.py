@@ -0,0 +1,237 @@
+"""
+In-process publish/subscribe bus for high-frequency gateway events.
+
+This module lets independent consumers (stats tracking, guild metrics,
+webhook logging) subscribe to a stream of events without wrapping each
+other's handlers. Every subscriber has its own bounded EventQueue and
+consumer task, so a slow subscriber cannot hold up the other subscribers.
+publish() never awaits; publish_wait() waits for space in lossless (BLOCK)
+subscribers so their queues stay within max_queue_size.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, List, Optional, TypeVar, Union
+
+from ...utils.logging.structured_logger import StructuredLogger
+from .event_queue import EventQueue, OverflowPolicy, PartitionedEventQueue
+
+T = TypeVar('T')
+
+
+class EventBus(Generic[T]):
+    """
+    Typed publish/subscribe bus with a bounded, batching queue per subscriber.
+    
+    Attributes:
+        name: Name of the bus (for logging)
+        logger: Logger instance
+    """
+    
+    def __init__(self, name: str, logger: Optional[StructuredLogger] = None):
+        """
+        Initialize a new event bus.
+        
+        Args:
+            name: Name of the bus (for logging)
+            logger: Logger instance (creates one if None)
+        """
+        self.name = name
+        self.logger = logger or StructuredLogger("event_bus")
+        self._subscribers: Dict[str, Union[EventQueue[T], PartitionedEventQueue[T]]] = {}
+        self._stats = {"published": 0, "deliveries": 0, "dropped": 0}
+    
+    def subscribe(
+        self,
+        name: str,
+        processor: Callable[[List[T]], Awaitable[None]],
+        batch_size: int = 50,
+        max_queue_size: int = 1000,
+        flush_interval: float = 1.0,
+        overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        partition_key: Optional[Callable[[T], Hashable]] = None,
+        key_func: Optional[Callable[[T], Hashable]] = None
+    ) -> Union[EventQueue[T], PartitionedEventQueue[T]]:
+        """
+        Register a subscriber with its own queue and consumer.
+        
+        Args:
+            name: Unique subscriber name (used in metrics)
+            processor: Async function receiving batches of events
+            batch_size: Maximum events per batch
+            max_queue_size: Queue bound before the overflow policy applies
+            flush_interval: Maximum time in seconds an event waits before delivery
+            overflow_policy: Behaviour when the subscriber falls behind. BLOCK
+                never drops events delivered with publish_wait(), which waits
+                for space; publish() cannot wait, so it refuses events once
+                the queue is full (counted as "overflowed")
+            partition_key: If given, events are partitioned by this key and
+                each partition is processed in order by its own worker
+            key_func: Coalescing key function (COALESCE only)
+        
+        Returns:
+            The subscriber's queue
+        
+        Raises:
+            ValueError: If a subscriber with this name already exists
+        """
+        if name in self._subscribers:
+            raise ValueError(f"Subscriber '{name}' is already registered on bus '{self.name}'")
+        
+        queue_name = f"{self.name}.{name}"
+        if partition_key is not None:
+            queue: Union[EventQueue[T], PartitionedEventQueue[T]] = PartitionedEventQueue(
+                name=queue_name,
+                processor=processor,
+                partition_key=partition_key,
+                batch_size=batch_size,
+                max_queue_size=max_queue_size,
+                flush_interval=flush_interval,
+                logger=self.logger,
+                overflow_policy=overflow_policy,
+                key_func=key_func
+            )
+        else:
+            queue = EventQueue(
+                name=queue_name,
+                processor=processor,
+                batch_size=batch_size,
+                max_queue_size=max_queue_size,
+                flush_interval=flush_interval,
+                logger=self.logger,
+                overflow_policy=overflow_policy,
+                key_func=key_func
+            )
+        
+        self._subscribers[name] = queue
+        self.logger.info(
+            f"Subscriber '{name}' registered on bus '{self.name}'",
+            bus=self.name,
+            subscriber=name,
+            overflow_policy=overflow_policy.value
+        )
+        return queue
+    
+    async def unsubscribe(self, name: str) -> None:
+        """
+        Remove a subscriber after delivering its pending events.
+        
+        Args:
+            name: Subscriber name
+        """
+        queue = self._subscribers.pop(name, None)
+        if queue is not None:
+            await queue.stop()
+    
+    def get_subscriber(self, name: str) -> Optional[Union[EventQueue[T], PartitionedEventQueue[T]]]:
+        """Get a subscriber's queue by name."""
+        return self._subscribers.get(name)
+    
+    def publish(self, event: T) -> int:
+        """
+        Deliver an event to every subscriber's queue without waiting.
+        
+        Args:
+            event: Event to publish
+        
+        Returns:
+            Number of subscribers that accepted the event
+        """
+        self._stats["published"] += 1
+        accepted = 0
+        for name, queue in self._subscribers.items():
+            try:
+                if queue.enqueue_nowait(event):
+                    accepted += 1
+                else:
+                    self._stats["dropped"] += 1
+            except Exception as e:
+                self._stats["dropped"] += 1
+                self.logger.error(
+                    f"Failed to deliver event to subscriber '{name}'",
+                    error=str(e),
+                    bus=self.name,
+                    subscriber=name,
+                    exc_info=True
+                )
+        self._stats["deliveries"] += accepted
+        return accepted
+    
+    async def publish_wait(self, event: T) -> int:
+        """
+        Deliver an event to every subscriber, waiting for space in BLOCK queues.
+        
+        Subscribers with a dropping or coalescing policy are handled as in
+        publish(). A full BLOCK subscriber applies backpressure to the caller
+        instead of growing past its bound or losing the event.
+        
+        Args:
+            event: Event to publish
+        
+        Returns:
+            Number of subscribers that accepted the event
+        """
+        self._stats["published"] += 1
+        accepted = 0
+        for name, queue in list(self._subscribers.items()):
+            try:
+                if queue.overflow_policy == OverflowPolicy.BLOCK:
+                    await queue.enqueue(event)
+                    accepted += 1
+                elif queue.enqueue_nowait(event):
+                    accepted += 1
+                else:
+                    self._stats["dropped"] += 1
+            except Exception as e:
+                self._stats["dropped"] += 1
+                self.logger.error(
+                    f"Failed to deliver event to subscriber '{name}'",
+                    error=str(e),
+                    bus=self.name,
+                    subscriber=name,
+                    exc_info=True
+                )
+        self._stats["deliveries"] += accepted
+        return accepted
+    
+    async def start(self) -> None:
+        """Start every subscriber's consumer."""
+        for queue in self._subscribers.values():
+            await queue.start()
+    
+    async def stop(self) -> None:
+        """Stop all subscribers, delivering their pending events first."""
+        for name, queue in list(self._subscribers.items()):
+            try:
+                await queue.stop()
+            except Exception as e:
+                self.logger.error(
+                    f"Error stopping subscriber '{name}'",
+                    error=str(e),
+                    bus=self.name,
+                    subscriber=name
+                )
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get bus statistics with per-subscriber lag.
+        
+        Returns:
+            Dictionary with publish counters and, per subscriber, the number of
+            pending events, the age of the oldest one and queue statistics
+        """
+        subscribers = {}
+        for name, queue in self._subscribers.items():
+            stats = queue.get_stats()
+            subscribers[name] = {
+                "lag_events": stats["queue_size"],
+                "lag_ms": stats["oldest_pending_ms"],
+                "queue_wait_p99_ms": stats["queue_wait_ms"]["p99_ms"],
+                "processed": stats["processed"],
+                "dropped": stats["dropped_oldest"] + stats["dropped_newest"],
+                "overflowed": stats["overflowed"],
+                "errors": stats["errors"],
+                "queue": stats
+            }
+        return {
+            **self._stats,
+            "subscribers": subscribers
+        }
@@ -7,11 +7,13 @@ downstream systems while ensuring timely processing of events.
 """
 
 import asyncio
+import heapq
 import logging
 import time
-from typing import Dict, List, Any, Callable, Awaitable, TypeVar, Generic, Optional, Set, Tuple
-from collections import defaultdict
+from typing import Dict, List, Any, Callable, Awaitable, TypeVar, Generic, Optional, Set, Tuple, Deque, Hashable
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
+from enum import Enum
 
 # Define a local AsyncOperationError to avoid circular imports
 class AsyncOperationError(Exception):
@@ -47,26 +49,78 @@ class AsyncOperationError(Exception):
 
 # Import StructuredLogger
 from ...utils.logging.structured_logger import StructuredLogger
+from ..performance.timing import LatencyHistogram
 
 T = TypeVar('T')
 K = TypeVar('K')
 V = TypeVar('V')
 
 
+class OverflowPolicy(Enum):
+    """What an EventQueue does when an event arrives while it is full."""
+    BLOCK = "block"                # Wait for space (backpressure on the producer)
+    DROP_OLDEST = "drop_oldest"    # Evict the oldest pending event
+    DROP_NEWEST = "drop_newest"    # Discard the incoming event
+    COALESCE = "coalesce"          # Merge into a pending event with the same key
+
+
+# Upper bounds of the latency buckets reported by queue and batcher stats
+LATENCY_BUCKETS_MS: Tuple[int, ...] = (
+    1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000
+)
+
+
+def _latency_snapshot(histogram: LatencyHistogram) -> Dict[str, Any]:
+    """
+    Summarize a latency histogram for stats and metrics.
+    
+    Args:
+        histogram: Histogram of durations in microseconds
+    
+    Returns:
+        Dictionary with count, mean, max, percentiles and per-bucket counts
+        keyed le_<bound>ms (plus "inf"), all in milliseconds
+    """
+    buckets: Dict[str, int] = {}
+    previous = 0
+    cumulative = histogram.cumulative_counts(bound * 1000 for bound in LATENCY_BUCKETS_MS)
+    for bound, total in zip(LATENCY_BUCKETS_MS, cumulative):
+        buckets[f"le_{bound}ms"] = total - previous
+        previous = total
+    buckets["inf"] = histogram.count - previous
+    
+    p50, p95, p99 = histogram.percentiles((0.50, 0.95, 0.99))
+    return {
+        "count": histogram.count,
+        "mean_ms": histogram.total_us / histogram.count / 1000 if histogram.count else 0.0,
+        "max_ms": histogram.max_us / 1000,
+        "p50_ms": p50 / 1000,
+        "p95_ms": p95 / 1000,
+        "p99_ms": p99 / 1000,
+        "buckets": buckets
+    }
+
+
 class EventQueue(Generic[T]):
     """
     Queue for handling high-frequency events with batching capabilities.
     
     This class provides a way to efficiently process high-frequency events by:
     - Batching events together to reduce processing overhead
-    - Implementing backpressure mechanisms to prevent overwhelming consumers
-    - Providing configurable flush triggers (size, time)
+    - Applying a configurable overflow policy once max_queue_size is reached
+    - Flushing when a batch fills up or the oldest event reaches flush_interval
+    
+    The consumer sleeps until an event arrives or the oldest pending event's
+    flush deadline passes, so an idle queue does no work.
     
     Attributes:
         name: Name of the event queue (for logging)
         batch_size: Maximum number of events to process in a batch
-        max_queue_size: Maximum queue size before applying backpressure
-        flush_interval: Time in seconds between automatic flushes
+        max_queue_size: Maximum queue size before the overflow policy applies
+        flush_interval: Maximum time in seconds an event waits before a flush
+        overflow_policy: Behaviour when the queue is full
+        key_func: Extracts the coalescing key from an event (COALESCE only)
+        max_retries: Times a failed event is retried before it is dropped
         processor: Async function to process batches of events
         logger: Logger instance
     """
@@ -78,7 +132,10 @@ class EventQueue(Generic[T]):
         batch_size: int = 50,
         max_queue_size: int = 1000,
         flush_interval: float = 1.0,
-        logger: Optional[StructuredLogger] = None
+        logger: Optional[StructuredLogger] = None,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        key_func: Optional[Callable[[T], Hashable]] = None,
+        max_retries: int = 3
     ):
         """
         Initialize a new event queue.
@@ -87,53 +144,77 @@ class EventQueue(Generic[T]):
             name: Name of the event queue (for logging)
             processor: Async function to process batches of events
             batch_size: Maximum number of events to process in a batch
-            max_queue_size: Maximum queue size before applying backpressure
-            flush_interval: Time in seconds between automatic flushes
+            max_queue_size: Maximum queue size before the overflow policy applies
+            flush_interval: Maximum time in seconds an event waits before a flush
             logger: Logger instance (creates one if None)
+            overflow_policy: Behaviour when the queue is full. COALESCE merges
+                any event whose key is already pending (latest event wins) and
+                blocks for new keys when full.
+            key_func: Extracts the coalescing key from an event; required for
+                the COALESCE policy
+            max_retries: Times a failed event is retried before it is
+                dropped (dead-lettered), so one poison event cannot block
+                the events queued behind it forever
         """
+        if overflow_policy == OverflowPolicy.COALESCE and key_func is None:
+            raise ValueError("key_func is required for the COALESCE overflow policy")
+        
         self.name = name
         self.processor = processor
         self.batch_size = batch_size
         self.max_queue_size = max_queue_size
         self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.key_func = key_func
+        self.max_retries = max(0, max_retries)
         self.logger = logger or StructuredLogger("event_queue")
         
-        # Internal state
-        self._queue: asyncio.Queue[T] = asyncio.Queue(maxsize=max_queue_size)
+        # Internal state; entries are [enqueued_at, event, key, failed_attempts]
+        self._buffer: Deque[list] = deque()
+        self._pending_keys: Dict[Hashable, list] = {}
+        self._event_available = asyncio.Event()
+        self._space_available = asyncio.Event()
+        self._space_available.set()
         self._processing_task: Optional[asyncio.Task] = None
-        self._flush_task: Optional[asyncio.Task] = None
         self._running = False
         self._lock = asyncio.Lock()
-        self._last_flush_time = 0
         self._stats = {
             "enqueued": 0,
             "processed": 0,
             "batches": 0,
             "backpressure_events": 0,
-            "errors": 0
+            "dropped_oldest": 0,
+            "dropped_newest": 0,
+            "coalesced": 0,
+            "overflowed": 0,
+            "errors": 0,
+            "dead_lettered": 0
         }
+        self._queue_wait = LatencyHistogram()
+        self._batch_latency = LatencyHistogram()
     
     async def start(self) -> None:
         """Start the event queue processor."""
         async with self._lock:
-            if self._running:
-                return
-                
-            self._running = True
-            self._last_flush_time = time.time()
-            
-            # Start processing task
-            self._processing_task = asyncio.create_task(self._process_events())
-            
-            # Start periodic flush task
-            self._flush_task = asyncio.create_task(self._periodic_flush())
+            self._start_now()
+    
+    def _start_now(self) -> None:
+        """Start the processing task if it is not already running."""
+        if self._running:
+            return
             
-            self.logger.info(
-                f"Event queue '{self.name}' started",
-                queue=self.name,
-                batch_size=self.batch_size,
-                flush_interval=self.flush_interval
-            )
+        self._running = True
+        
+        # Start processing task
+        self._processing_task = asyncio.create_task(self._process_events())
+        
+        self.logger.info(
+            f"Event queue '{self.name}' started",
+            queue=self.name,
+            batch_size=self.batch_size,
+            flush_interval=self.flush_interval,
+            overflow_policy=self.overflow_policy.value
+        )
     
     async def stop(self) -> None:
         """Stop the event queue processor and process remaining events."""
@@ -143,19 +224,7 @@ class EventQueue(Generic[T]):
                 
             self._running = False
             
-            # Cancel periodic flush task
-            if self._flush_task:
-                self._flush_task.cancel()
-                try:
-                    await self._flush_task
-                except asyncio.CancelledError:
-                    pass
-                self._flush_task = None
-            
-            # Process remaining events
-            await self._flush()
-            
-            # Cancel processing task
+            # Stop the consumer before draining so batches are not processed twice
             if self._processing_task:
                 self._processing_task.cancel()
                 try:
@@ -163,6 +232,14 @@ class EventQueue(Generic[T]):
                 except asyncio.CancelledError:
                     pass
                 self._processing_task = None
+            
+            # Process remaining events
+            while self._buffer:
+                if not await self._flush():
+                    break
+            
+            # Release any producers still waiting for space
+            self._space_available.set()
                 
             self.logger.info(
                 f"Event queue '{self.name}' stopped",
@@ -174,8 +251,10 @@ class EventQueue(Generic[T]):
         """
         Add an event to the queue.
         
-        If the queue is full, this will block until space is available,
-        implementing backpressure to prevent memory issues.
+        When the queue is full the configured overflow policy applies: BLOCK
+        waits for space (backpressure), DROP_OLDEST evicts the oldest pending
+        event, DROP_NEWEST discards this event and COALESCE merges it into a
+        pending event with the same key.
         
         Args:
             event: Event to enqueue
@@ -184,19 +263,28 @@ class EventQueue(Generic[T]):
             await self.start()
             
         try:
-            # Use put_nowait with exception handling for backpressure metrics
-            try:
-                self._queue.put_nowait(event)
-            except asyncio.QueueFull:
-                self._stats["backpressure_events"] += 1
-                # Fall back to blocking put
-                await self._queue.put(event)
+            coalesced, key = self._coalesce(event)
+            if coalesced:
+                return
+            
+            if len(self._buffer) >= self.max_queue_size:
+                if self.overflow_policy == OverflowPolicy.DROP_NEWEST:
+                    self._stats["dropped_newest"] += 1
+                    return
                 
-            self._stats["enqueued"] += 1
+                if self.overflow_policy == OverflowPolicy.DROP_OLDEST:
+                    dropped = self._buffer.popleft()
+                    if dropped[2] is not None:
+                        self._pending_keys.pop(dropped[2], None)
+                    self._stats["dropped_oldest"] += 1
+                else:
+                    # BLOCK (and COALESCE for new keys): wait for the consumer
+                    self._stats["backpressure_events"] += 1
+                    while len(self._buffer) >= self.max_queue_size and self._running:
+                        self._space_available.clear()
+                        await self._space_available.wait()
             
-            # Auto-flush if batch size reached
-            if self._queue.qsize() >= self.batch_size:
-                asyncio.create_task(self._flush())
+            self._append(event, key)
                 
         except Exception as e:
             self._stats["errors"] += 1
@@ -211,16 +299,108 @@ class EventQueue(Generic[T]):
                 operation_name=f"enqueue_{self.name}"
             )
     
+    def enqueue_nowait(self, event: T) -> bool:
+        """
+        Add an event without ever suspending the caller.
+        
+        Overflow policies apply as in enqueue(), except that BLOCK cannot
+        wait: max_queue_size is a hard cap and the event is refused and
+        counted as "overflowed". Lossless producers should await enqueue()
+        instead. Must be called from the event loop thread.
+        
+        Args:
+            event: Event to enqueue
+            
+        Returns:
+            True if the event was queued or coalesced, False if it was dropped
+        """
+        if not self._running:
+            self._start_now()
+        
+        coalesced, key = self._coalesce(event)
+        if coalesced:
+            return True
+        
+        if len(self._buffer) >= self.max_queue_size:
+            if self.overflow_policy == OverflowPolicy.DROP_NEWEST:
+                self._stats["dropped_newest"] += 1
+                return False
+            
+            if self.overflow_policy == OverflowPolicy.DROP_OLDEST:
+                dropped = self._buffer.popleft()
+                if dropped[2] is not None:
+                    self._pending_keys.pop(dropped[2], None)
+                self._stats["dropped_oldest"] += 1
+            else:
+                self._stats["overflowed"] += 1
+                return False
+        
+        self._append(event, key)
+        return True
+    
+    def _coalesce(self, event: T) -> Tuple[bool, Optional[Hashable]]:
+        """
+        Merge an event into a pending one with the same key (COALESCE only).
+        
+        Args:
+            event: Incoming event
+            
+        Returns:
+            Tuple of (merged, coalescing key or None)
+        """
+        if self.overflow_policy != OverflowPolicy.COALESCE:
+            return False, None
+        
+        key = self.key_func(event)
+        entry = self._pending_keys.get(key)
+        if entry is not None:
+            # Keep the original position and wait time, replace the payload
+            entry[1] = event
+            self._stats["coalesced"] += 1
+            return True, key
+        return False, key
+    
+    def _append(self, event: T, key: Optional[Hashable]) -> None:
+        """
+        Append an event and wake the consumer if its decision can change.
+        
+        Args:
+            event: Event to append
+            key: Coalescing key, if any
+        """
+        entry = [time.monotonic(), event, key, 0]
+        self._buffer.append(entry)
+        if key is not None:
+            self._pending_keys[key] = entry
+        self._stats["enqueued"] += 1
+        
+        if len(self._buffer) == 1 or len(self._buffer) >= self.batch_size:
+            self._event_available.set()
+    
     async def _process_events(self) -> None:
-        """Process events from the queue continuously."""
+        """Process events as batches fill up or flush deadlines pass."""
         while self._running:
             try:
-                # Wait for events or periodic flush
-                await asyncio.sleep(0.01)  # Small sleep to prevent CPU spinning
+                if not self._buffer:
+                    # Idle: sleep until the first event arrives
+                    self._event_available.clear()
+                    await self._event_available.wait()
+                    continue
                 
-                # Check if it's time to flush based on interval
-                if time.time() - self._last_flush_time >= self.flush_interval:
-                    await self._flush()
+                if len(self._buffer) < self.batch_size:
+                    # Partial batch: wait for more events or the oldest event's deadline
+                    timeout = self._buffer[0][0] + self.flush_interval - time.monotonic()
+                    if timeout > 0:
+                        self._event_available.clear()
+                        try:
+                            await asyncio.wait_for(self._event_available.wait(), timeout)
+                        except asyncio.TimeoutError:
+                            pass
+                        continue
+                
+                if not await self._flush():
+                    # Back off before retrying a failing processor
+                    await asyncio.sleep(self.flush_interval)
                     
             except asyncio.CancelledError:
                 self.logger.debug(f"Event processor for '{self.name}' cancelled")
@@ -236,59 +416,49 @@ class EventQueue(Generic[T]):
                 # Sleep briefly to prevent tight error loops
                 await asyncio.sleep(1)
     
-    async def _periodic_flush(self) -> None:
-        """Periodically flush the queue based on the flush interval."""
-        while self._running:
-            try:
-                await asyncio.sleep(self.flush_interval)
-                await self._flush()
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                self._stats["errors"] += 1
-                self.logger.error(
-                    f"Error in periodic flush for '{self.name}'",
-                    error=str(e),
-                    queue=self.name,
-                    exc_info=True
-                )
-    
-    async def _flush(self) -> None:
-        """Flush current events in the queue to the processor."""
-        if self._queue.empty():
-            return
-            
-        # Update last flush time
-        self._last_flush_time = time.time()
+    async def _flush(self) -> bool:
+        """
+        Flush up to one batch of queued events to the processor.
+        
+        Returns:
+            True if the batch was processed (or there was nothing to do),
+            False if the processor failed and the events were re-queued or,
+            after max_retries failures, dead-lettered
+        """
+        if not self._buffer:
+            return True
         
         # Collect events up to batch size
-        events = []
+        entries = []
+        while self._buffer and len(entries) < self.batch_size:
+            entry = self._buffer.popleft()
+            if entry[2] is not None:
+                self._pending_keys.pop(entry[2], None)
+            entries.append(entry)
+        self._space_available.set()
+        
+        events = [entry[1] for entry in entries]
+        started = time.monotonic()
+        for entry in entries:
+            self._queue_wait.record((started - entry[0]) * 1_000_000)
+        
         try:
-            # Get up to batch_size events without blocking
-            for _ in range(min(self.batch_size, self._queue.qsize())):
-                if not self._queue.empty():
-                    events.append(self._queue.get_nowait())
-                    
-            if not events:
-                return
-                
             # Process the batch
             batch_size = len(events)
             self.logger.debug(
                 f"Processing batch of {batch_size} events from '{self.name}'",
                 queue=self.name,
-                batch_size=batch_size
+                batch_size=batch_size,
+                sample=True
             )
             
             await self.processor(events)
             
             # Update stats
+            self._batch_latency.record((time.monotonic() - started) * 1_000_000)
             self._stats["processed"] += batch_size
             self._stats["batches"] += 1
-            
-            # Mark tasks as done
-            for _ in range(batch_size):
-                self._queue.task_done()
+            return True
                 
         except Exception as e:
             self._stats["errors"] += 1
@@ -300,22 +470,218 @@ class EventQueue(Generic[T]):
                 exc_info=True
             )
             
-            # Put events back in queue if processor failed
-            # This is a best-effort approach and may not preserve order
-            for event in events:
-                try:
-                    await self._queue.put(event)
-                except:
-                    pass
+            # Put events back at the front of the queue, preserving order,
+            # unless they have failed too often
+            dead = 0
+            for entry in reversed(entries):
+                entry[3] += 1
+                if entry[3] > self.max_retries:
+                    dead += 1
+                    continue
+                if entry[2] is not None:
+                    if entry[2] in self._pending_keys:
+                        # A newer event for this key arrived meanwhile
+                        continue
+                    self._pending_keys[entry[2]] = entry
+                self._buffer.appendleft(entry)
+            
+            if dead:
+                self._stats["dead_lettered"] += dead
+                self.logger.warning(
+                    f"Dropped {dead} events from '{self.name}' after {self.max_retries} retries",
+                    queue=self.name,
+                    dead_lettered=dead
+                )
+            return False
     
-    def get_stats(self) -> Dict[str, int]:
+    def get_stats(self) -> Dict[str, Any]:
         """Get current statistics for this event queue."""
-        stats = dict(self._stats)
-        stats["queue_size"] = self._queue.qsize()
+        stats: Dict[str, Any] = dict(self._stats)
+        stats["queue_size"] = len(self._buffer)
+        stats["oldest_pending_ms"] = (time.monotonic() - self._buffer[0][0]) * 1000 if self._buffer else 0.0
+        stats["max_queue_size"] = self.max_queue_size
+        stats["overflow_policy"] = self.overflow_policy.value
         stats["running"] = self._running
+        stats["queue_wait_ms"] = _latency_snapshot(self._queue_wait)
+        stats["batch_latency_ms"] = _latency_snapshot(self._batch_latency)
         return stats
 
 
+class PartitionedEventQueue(Generic[T]):
+    """
+    Event queue split into independent partitions, each with its own worker.
+    
+    Events are routed to a partition by key (for example the guild ID). Each
+    partition is an EventQueue with its own consumer, so events within a
+    partition are processed in order while partitions are processed
+    concurrently. Partitions are created on first use.
+    
+    Attributes:
+        name: Name of the partitioned queue (for logging)
+        partition_key: Extracts the partition key from an event
+        processor: Async function to process batches from one partition
+        logger: Logger instance
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        processor: Callable[[List[T]], Awaitable[None]],
+        partition_key: Callable[[T], Hashable],
+        batch_size: int = 50,
+        max_queue_size: int = 1000,
+        flush_interval: float = 1.0,
+        logger: Optional[StructuredLogger] = None,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        key_func: Optional[Callable[[T], Hashable]] = None,
+        max_retries: int = 3
+    ):
+        """
+        Initialize a new partitioned event queue.
+        
+        Args:
+            name: Name of the partitioned queue (for logging)
+            processor: Async function to process batches from one partition
+            partition_key: Extracts the partition key from an event
+            batch_size: Maximum number of events in a batch, per partition
+            max_queue_size: Maximum queue size, per partition
+            flush_interval: Maximum time in seconds an event waits before a flush
+            logger: Logger instance (creates one if None)
+            overflow_policy: Overflow policy applied by each partition
+            key_func: Coalescing key function (COALESCE only)
+            max_retries: Retries per failed event, per partition
+        """
+        self.name = name
+        self.processor = processor
+        self.partition_key = partition_key
+        self.batch_size = batch_size
+        self.max_queue_size = max_queue_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.key_func = key_func
+        self.max_retries = max_retries
+        self.logger = logger or StructuredLogger("event_queue")
+        
+        self._partitions: Dict[Hashable, EventQueue[T]] = {}
+        self._running = False
+        self._removed_stats = {"processed": 0, "batches": 0}
+    
+    def _get_partition(self, key: Hashable) -> EventQueue[T]:
+        """
+        Get or create the queue for a partition.
+        
+        Args:
+            key: Partition key
+        
+        Returns:
+            EventQueue for the partition
+        """
+        partition = self._partitions.get(key)
+        if partition is None:
+            partition = EventQueue(
+                name=f"{self.name}[{key}]",
+                processor=self.processor,
+                batch_size=self.batch_size,
+                max_queue_size=self.max_queue_size,
+                flush_interval=self.flush_interval,
+                logger=self.logger,
+                overflow_policy=self.overflow_policy,
+                key_func=self.key_func,
+                max_retries=self.max_retries
+            )
+            self._partitions[key] = partition
+        return partition
+    
+    async def start(self) -> None:
+        """Start the partitioned queue; partitions start on first event."""
+        self._running = True
+    
+    async def stop(self) -> None:
+        """Stop every partition, processing remaining events."""
+        self._running = False
+        await asyncio.gather(
+            *(partition.stop() for partition in list(self._partitions.values())),
+            return_exceptions=True
+        )
+    
+    async def enqueue(self, event: T) -> None:
+        """
+        Route an event to its partition.
+        
+        Args:
+            event: Event to enqueue
+        """
+        if not self._running:
+            await self.start()
+        await self._get_partition(self.partition_key(event)).enqueue(event)
+    
+    def enqueue_nowait(self, event: T) -> bool:
+        """
+        Route an event to its partition without suspending the caller.
+        
+        Args:
+            event: Event to enqueue
+            
+        Returns:
+            True if the event was queued or coalesced, False if it was dropped
+        """
+        self._running = True
+        return self._get_partition(self.partition_key(event)).enqueue_nowait(event)
+    
+    async def remove_partition(self, key: Hashable) -> None:
+        """
+        Drain and drop a partition that will receive no more events.
+        
+        Args:
+            key: Partition key
+        """
+        partition = self._partitions.pop(key, None)
+        if partition is None:
+            return
+        await partition.stop()
+        stats = partition.get_stats()
+        self._removed_stats["processed"] += stats["processed"]
+        self._removed_stats["batches"] += stats["batches"]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get aggregated statistics across all partitions."""
+        totals: Dict[str, Any] = {
+            "enqueued": 0,
+            "processed": self._removed_stats["processed"],
+            "batches": self._removed_stats["batches"],
+            "backpressure_events": 0,
+            "dropped_oldest": 0,
+            "dropped_newest": 0,
+            "coalesced": 0,
+            "overflowed": 0,
+            "errors": 0,
+            "dead_lettered": 0,
+            "queue_size": 0
+        }
+        oldest_pending_ms = 0.0
+        queue_wait = LatencyHistogram()
+        batch_latency = LatencyHistogram()
+        partition_sizes = {}
+        
+        for key, partition in self._partitions.items():
+            stats = partition.get_stats()
+            for name in totals:
+                totals[name] += stats.get(name, 0)
+            queue_wait.merge(partition._queue_wait)
+            batch_latency.merge(partition._batch_latency)
+            partition_sizes[str(key)] = stats["queue_size"]
+            oldest_pending_ms = max(oldest_pending_ms, stats["oldest_pending_ms"])
+        
+        totals["oldest_pending_ms"] = oldest_pending_ms
+        totals["partitions"] = len(self._partitions)
+        totals["partition_queue_sizes"] = partition_sizes
+        totals["overflow_policy"] = self.overflow_policy.value
+        totals["running"] = self._running
+        totals["queue_wait_ms"] = _latency_snapshot(queue_wait)
+        totals["batch_latency_ms"] = _latency_snapshot(batch_latency)
+        return totals
+
+
 class EventBatcher(Generic[K, V]):
     """
     Groups related events together for efficient batch processing.
@@ -324,11 +690,17 @@ class EventBatcher(Generic[K, V]):
     in batches, reducing the number of operations needed for high-frequency
     events that can be logically grouped.
     
+    Each open batch has a deadline (creation time plus max_batch_age) kept
+    in a min-heap. A single timer sleeps until the earliest deadline, and
+    due batches are dispatched outside the lock so a slow key never delays
+    the others. Batches for the same key are still processed in order.
+    
     Attributes:
         name: Name of the event batcher (for logging)
         processor: Async function to process batches of events
         max_batch_size: Maximum number of events in a batch
         max_batch_age: Maximum age of a batch before processing (seconds)
+        max_retries: Times a failed event is retried before it is dropped
         logger: Logger instance
     """
     
@@ -336,8 +708,10 @@ class EventBatcher(Generic[K, V]):
     class Batch:
         """Represents a batch of events with the same key."""
         items: List[V] = field(default_factory=list)
-        created_at: float = field(default_factory=time.time)
-        last_updated: float = field(default_factory=time.time)
+        attempts: List[int] = field(default_factory=list)  # failed attempts per item
+        created_at: float = field(default_factory=time.monotonic)
+        last_updated: float = field(default_factory=time.monotonic)
+        deadline: float = 0.0
     
     def __init__(
         self,
@@ -345,6 +719,7 @@ class EventBatcher(Generic[K, V]):
         processor: Callable[[K, List[V]], Awaitable[None]],
         max_batch_size: int = 100,
         max_batch_age: float = 5.0,
+        max_retries: int = 3,
         logger: Optional[StructuredLogger] = None
     ):
         """
@@ -355,25 +730,34 @@ class EventBatcher(Generic[K, V]):
             processor: Async function to process batches of events
             max_batch_size: Maximum number of events in a batch
             max_batch_age: Maximum age of a batch before processing (seconds)
+            max_retries: Times a failed event is retried before it is
+                dead-lettered
             logger: Logger instance (creates one if None)
         """
         self.name = name
         self.processor = processor
         self.max_batch_size = max_batch_size
         self.max_batch_age = max_batch_age
+        self.max_retries = max(0, max_retries)
         self.logger = logger or StructuredLogger("event_batcher")
         
         # Internal state
         self._batches: Dict[K, EventBatcher.Batch] = {}
+        self._deadlines: List[Tuple[float, int, K]] = []  # (deadline, sequence, key) min-heap
+        self._sequence = 0
         self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
         self._flush_task: Optional[asyncio.Task] = None
+        self._in_flight: Dict[K, asyncio.Task] = {}
         self._running = False
         self._stats = {
             "added_events": 0,
             "processed_events": 0,
             "processed_batches": 0,
-            "errors": 0
+            "errors": 0,
+            "dead_lettered": 0
         }
+        self._flush_latency = LatencyHistogram()
     
     async def start(self) -> None:
         """Start the event batcher."""
@@ -383,8 +767,8 @@ class EventBatcher(Generic[K, V]):
                 
             self._running = True
             
-            # Start periodic flush task
-            self._flush_task = asyncio.create_task(self._periodic_flush())
+            # Start the deadline timer
+            self._flush_task = asyncio.create_task(self._deadline_timer())
             
             self.logger.info(
                 f"Event batcher '{self.name}' started",
@@ -401,7 +785,7 @@ class EventBatcher(Generic[K, V]):
                 
             self._running = False
             
-            # Cancel periodic flush task
+            # Cancel the deadline timer
             if self._flush_task:
                 self._flush_task.cancel()
                 try:
@@ -410,14 +794,19 @@ class EventBatcher(Generic[K, V]):
                     pass
                 self._flush_task = None
             
-            # Process remaining batches
-            await self._flush_all()
-            
-            self.logger.info(
-                f"Event batcher '{self.name}' stopped",
-                batcher=self.name,
-                stats=self._stats
-            )
+            # Dispatch remaining batches
+            for key in list(self._batches):
+                self._dispatch(key)
+            self._deadlines.clear()
+        
+        # Wait for in-flight batches outside the lock
+        await self._flush_all()
+        
+        self.logger.info(
+            f"Event batcher '{self.name}' stopped",
+            batcher=self.name,
+            stats=self._stats
+        )
     
     async def add(self, key: K, value: V) -> None:
         """
@@ -435,18 +824,23 @@ class EventBatcher(Generic[K, V]):
             
         try:
             async with self._lock:
-                # Create batch if it doesn't exist
-                if key not in self._batches:
-                    self._batches[key] = self.Batch()
+                batch = self._batches.get(key)
+                
+                # Create batch and schedule its deadline if it doesn't exist
+                if batch is None:
+                    batch = self.Batch()
+                    self._batches[key] = batch
+                    self._schedule(key, batch)
                 
                 # Add item to batch
-                self._batches[key].items.append(value)
-                self._batches[key].last_updated = time.time()
+                batch.items.append(value)
+                batch.attempts.append(0)
+                batch.last_updated = time.monotonic()
                 self._stats["added_events"] += 1
                 
                 # Process batch if it's full
-                if len(self._batches[key].items) >= self.max_batch_size:
-                    await self._process_batch(key)
+                if len(batch.items) >= self.max_batch_size:
+                    self._dispatch(key)
                     
         except Exception as e:
             self._stats["errors"] += 1
@@ -458,69 +852,115 @@ class EventBatcher(Generic[K, V]):
                 exc_info=True
             )
     
-    async def _periodic_flush(self) -> None:
-        """Periodically check for and flush old batches."""
-        check_interval = min(1.0, self.max_batch_age / 2)  # Check at least twice per max_batch_age
+    def _schedule(self, key: K, batch: "EventBatcher.Batch") -> None:
+        """
+        Push a batch deadline onto the heap, waking the timer if it is earliest.
         
+        Args:
+            key: Batch key
+            batch: Batch whose deadline to schedule
+        """
+        batch.deadline = batch.created_at + self.max_batch_age
+        self._sequence += 1
+        heapq.heappush(self._deadlines, (batch.deadline, self._sequence, key))
+        if self._deadlines[0][1] == self._sequence:
+            self._wakeup.set()
+    
+    async def _deadline_timer(self) -> None:
+        """Sleep until the earliest batch deadline and dispatch due batches."""
         while self._running:
             try:
-                await asyncio.sleep(check_interval)
-                await self._flush_old_batches()
+                self._wakeup.clear()
+                if not self._deadlines:
+                    await self._wakeup.wait()
+                    continue
+                
+                timeout = self._deadlines[0][0] - time.monotonic()
+                if timeout > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                
+                async with self._lock:
+                    now = time.monotonic()
+                    while self._deadlines and self._deadlines[0][0] <= now:
+                        deadline, _, key = heapq.heappop(self._deadlines)
+                        batch = self._batches.get(key)
+                        # Skip stale entries for batches already dispatched
+                        if batch is not None and batch.deadline == deadline:
+                            self._dispatch(key)
+                            
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 self._stats["errors"] += 1
                 self.logger.error(
-                    f"Error in periodic flush for batcher '{self.name}'",
+                    f"Error in deadline timer for batcher '{self.name}'",
                     error=str(e),
                     batcher=self.name,
                     exc_info=True
                 )
+                await asyncio.sleep(min(1.0, self.max_batch_age))
     
-    async def _flush_old_batches(self) -> None:
-        """Flush batches that have exceeded max_batch_age."""
-        now = time.time()
-        keys_to_process = []
+    def _dispatch(self, key: K) -> None:
+        """
+        Detach a batch and process it in its own task.
         
-        async with self._lock:
-            for key, batch in self._batches.items():
-                if now - batch.last_updated >= self.max_batch_age and batch.items:
-                    keys_to_process.append(key)
-            
-            for key in keys_to_process:
-                await self._process_batch(key)
+        Must be called with the lock held. The processing itself runs outside
+        the lock, chained after any in-flight batch for the same key.
+        
+        Args:
+            key: Batch key to dispatch
+        """
+        batch = self._batches.pop(key, None)
+        if batch is None or not batch.items:
+            return
+        
+        previous = self._in_flight.get(key)
+        task = asyncio.create_task(self._process_batch(key, batch, previous))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda t, k=key: self._on_batch_done(k, t))
+    
+    def _on_batch_done(self, key: K, task: asyncio.Task) -> None:
+        """Forget a finished batch task unless a newer one replaced it."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
     
     async def _flush_all(self) -> None:
-        """Flush all current batches."""
-        async with self._lock:
-            keys = list(self._batches.keys())
-            for key in keys:
-                if self._batches[key].items:
-                    await self._process_batch(key)
+        """Wait for every dispatched batch to finish processing."""
+        while self._in_flight:
+            await asyncio.gather(*list(self._in_flight.values()), return_exceptions=True)
     
-    async def _process_batch(self, key: K) -> None:
+    async def _process_batch(
+        self,
+        key: K,
+        batch: "EventBatcher.Batch",
+        previous: Optional[asyncio.Task] = None
+    ) -> None:
         """
-        Process a single batch by key.
+        Process a single detached batch.
         
         Args:
-            key: Batch key to process
+            key: Batch key
+            batch: Batch to process
+            previous: In-flight task for the same key to wait for first
         """
-        if key not in self._batches or not self._batches[key].items:
-            return
-            
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        
+        items = batch.items
+        batch_size = len(items)
+        
         try:
-            # Get batch items
-            items = self._batches[key].items
-            batch_size = len(items)
-            
-            if batch_size == 0:
-                return
-                
+            self._flush_latency.record((time.monotonic() - batch.created_at) * 1_000_000)
             self.logger.debug(
                 f"Processing batch of {batch_size} events for key '{key}' from batcher '{self.name}'",
                 batcher=self.name,
                 key=str(key),
-                batch_size=batch_size
+                batch_size=batch_size,
+                sample=True
             )
             
             # Process the batch
@@ -530,9 +970,6 @@ class EventBatcher(Generic[K, V]):
             self._stats["processed_events"] += batch_size
             self._stats["processed_batches"] += 1
             
-            # Clear the batch
-            self._batches[key] = self.Batch()
-            
         except Exception as e:
             self._stats["errors"] += 1
             self.logger.error(
@@ -542,11 +979,45 @@ class EventBatcher(Generic[K, V]):
                 key=str(key),
                 exc_info=True
             )
+            
+            # Retry with the next batch for this key unless an item has
+            # failed too often
+            retry_items = []
+            retry_attempts = []
+            for item, attempts in zip(items, batch.attempts):
+                if attempts + 1 > self.max_retries:
+                    continue
+                retry_items.append(item)
+                retry_attempts.append(attempts + 1)
+            
+            dead = batch_size - len(retry_items)
+            if dead:
+                self._stats["dead_lettered"] += dead
+                self.logger.warning(
+                    f"Dropped {dead} events for key '{key}' from batcher '{self.name}' "
+                    f"after {self.max_retries} retries",
+                    batcher=self.name,
+                    key=str(key),
+                    dead_lettered=dead
+                )
+            
+            if self._running and retry_items:
+                async with self._lock:
+                    pending = self._batches.get(key)
+                    if pending is None:
+                        pending = self.Batch()
+                        self._batches[key] = pending
+                        self._schedule(key, pending)
+                    pending.items[:0] = retry_items
+                    pending.attempts[:0] = retry_attempts
     
     def get_stats(self) -> Dict[str, Any]:
         """Get current statistics for this event batcher."""
-        stats = dict(self._stats)
+        stats: Dict[str, Any] = dict(self._stats)
         stats["active_batches"] = len(self._batches)
         stats["pending_events"] = sum(len(batch.items) for batch in self._batches.values())
+        stats["in_flight_batches"] = len(self._in_flight)
+        stats["scheduled_deadlines"] = len(self._deadlines)
         stats["running"] = self._running
-        return stats
\ No newline at end of file
+        stats["flush_latency_ms"] = _latency_snapshot(self._flush_latency)
+        return stats
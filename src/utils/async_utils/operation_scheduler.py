@@ -0,0 +1,493 @@
+"""
+Priority- and deadline-aware scheduling for outbound Discord operations.
+
+This module provides a central scheduler that all services submit their
+outbound Discord calls to (daily reports, channel renames, presence updates,
+heartbeat edits and webhook logs). Operations are dispatched strictly by
+priority class, expired low-priority work is shed instead of executed late,
+and a slot is always reserved for the daily report so a rate-limit storm on
+other operations (including channel renames) cannot delay it. Each class also
+has its own concurrency limit and operations sharing a key run one at a time,
+so a rename stuck in a 429 sleep only holds its own channel's slot while
+presence, heartbeat and webhook work keep running.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from ...utils.logging.structured_logger import StructuredLogger
+
+
+class OperationPriority(IntEnum):
+    """Priority classes for outbound operations (lower values run first)."""
+    DAILY_REPORT = 0
+    CHANNEL_RENAME = 1
+    PRESENCE = 2
+    HEARTBEAT = 3
+    WEBHOOK_LOG = 4
+
+
+class OperationShedError(Exception):
+    """
+    Raised to callers whose operation was dropped without being executed.
+    
+    Attributes:
+        operation_name: Name of the shed operation
+        priority: Priority class of the operation
+        reason: Why the operation was shed ("expired", "overflow", "stopped")
+    """
+    
+    def __init__(self, operation_name: str, priority: OperationPriority, reason: str):
+        super().__init__(f"Operation '{operation_name}' shed: {reason}")
+        self.operation_name = operation_name
+        self.priority = priority
+        self.reason = reason
+
+
+@dataclass(order=True)
+class ScheduledOperation:
+    """An operation waiting in the scheduler, ordered by priority then deadline."""
+    priority: int
+    deadline: float
+    sequence: int
+    name: str = field(compare=False)
+    factory: Callable[[], Awaitable[Any]] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    key: Optional[str] = field(default=None, compare=False)
+    submitted_at: float = field(default=0.0, compare=False)
+    superseded: bool = field(default=False, compare=False)
+
+
+class OperationScheduler:
+    """
+    Central async scheduler for outbound Discord operations.
+    
+    Features:
+    - Strict priority classes (report > renames > presence > heartbeat > logs)
+    - Per-operation deadlines with shedding of expired low-priority work
+    - Reserved concurrency for the daily report
+    - Per-class concurrency limits and one running operation per key
+    - Coalescing of pending operations that share a key (latest wins)
+    
+    Attributes:
+        name: Name of the scheduler (for logging)
+        max_concurrency: Maximum operations executing at once
+        reserved_slots: Slots only DAILY_REPORT operations may use
+        class_limits: Maximum operations executing at once per priority class
+        shed_priority: Lowest-importance class that is never shed; classes
+            at or beyond this value are dropped once their deadline passes
+        max_pending: Maximum queued operations before overflow shedding
+        default_deadlines: Default deadline in seconds per priority class
+    """
+    
+    DEFAULT_DEADLINES: Dict[OperationPriority, float] = {
+        OperationPriority.DAILY_REPORT: 900.0,
+        OperationPriority.CHANNEL_RENAME: 600.0,
+        OperationPriority.PRESENCE: 120.0,
+        OperationPriority.HEARTBEAT: 300.0,
+        OperationPriority.WEBHOOK_LOG: 60.0,
+    }
+    
+    # One rename per stats channel, the rest single-lane so they cannot
+    # starve each other; together they fill the shared slots
+    DEFAULT_CLASS_LIMITS: Dict[OperationPriority, int] = {
+        OperationPriority.DAILY_REPORT: 1,
+        OperationPriority.CHANNEL_RENAME: 3,
+        OperationPriority.PRESENCE: 1,
+        OperationPriority.HEARTBEAT: 1,
+        OperationPriority.WEBHOOK_LOG: 2,
+    }
+    
+    def __init__(
+        self,
+        name: str = "discord_operations",
+        max_concurrency: int = 8,
+        reserved_slots: int = 1,
+        shed_priority: OperationPriority = OperationPriority.PRESENCE,
+        max_pending: int = 500,
+        default_deadlines: Optional[Dict[OperationPriority, float]] = None,
+        class_limits: Optional[Dict[OperationPriority, int]] = None,
+        logger: Optional[Union[logging.Logger, StructuredLogger]] = None
+    ):
+        """
+        Initialize the operation scheduler.
+        
+        Args:
+            name: Name of the scheduler (for logging)
+            max_concurrency: Maximum operations executing at once
+            reserved_slots: Slots kept free for DAILY_REPORT operations
+            shed_priority: Priority class from which expired work is shed
+            max_pending: Maximum queued operations before overflow shedding
+            default_deadlines: Override default deadlines per priority class
+            class_limits: Override default concurrency limits per priority class
+            logger: Logger instance (creates one if None)
+        """
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.reserved_slots = min(max(0, reserved_slots), self.max_concurrency - 1)
+        self.shed_priority = shed_priority
+        self.max_pending = max_pending
+        self.default_deadlines = {**self.DEFAULT_DEADLINES, **(default_deadlines or {})}
+        self.class_limits = {**self.DEFAULT_CLASS_LIMITS, **(class_limits or {})}
+        self.logger = logger or StructuredLogger("operation_scheduler")
+        
+        # Loop-bound state, created on first use in the running loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        
+        self._heap: List[ScheduledOperation] = []
+        self._pending_by_key: Dict[str, ScheduledOperation] = {}
+        self._running_tasks: set = set()
+        self._active = 0
+        self._active_shared = 0
+        self._active_by_priority: Dict[int, int] = {int(p): 0 for p in OperationPriority}
+        self._running_keys: set = set()
+        self._sequence = itertools.count()
+        
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "shed_expired": 0,
+            "shed_overflow": 0,
+            "shed_stopped": 0,
+            "late": 0,
+            "coalesced": 0
+        }
+        self._wait_time_by_priority: Dict[str, float] = {p.name: 0.0 for p in OperationPriority}
+        self._count_by_priority: Dict[str, int] = {p.name: 0 for p in OperationPriority}
+    
+    def _ensure_started(self) -> None:
+        """Start (or rebind) the dispatcher in the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Futures from a previous loop can never be awaited again
+            self._heap.clear()
+            self._pending_by_key.clear()
+            self._running_tasks.clear()
+            self._active = 0
+            self._active_shared = 0
+            self._active_by_priority = {int(p): 0 for p in OperationPriority}
+            self._running_keys.clear()
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._dispatcher = None
+        
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch_loop())
+    
+    def _is_sheddable(self, priority: int) -> bool:
+        """Check whether a priority class may be shed."""
+        return priority >= self.shed_priority
+    
+    @staticmethod
+    def _may_use_reserved(priority: int) -> bool:
+        """Check whether a priority class may run in a reserved slot."""
+        return priority == OperationPriority.DAILY_REPORT
+    
+    def _has_class_capacity(self, op: ScheduledOperation) -> bool:
+        """Check whether an operation's class and key leave room for it to run."""
+        if op.key is not None and op.key in self._running_keys:
+            return False
+        limit = self.class_limits.get(OperationPriority(op.priority), self.max_concurrency)
+        return self._active_by_priority[op.priority] < limit
+    
+    async def submit(
+        self,
+        name: str,
+        factory: Callable[[], Awaitable[Any]],
+        priority: OperationPriority = OperationPriority.WEBHOOK_LOG,
+        deadline: Optional[float] = None,
+        key: Optional[str] = None
+    ) -> Any:
+        """
+        Submit an operation and wait for its result.
+        
+        Args:
+            name: Operation name (for logging and stats)
+            factory: Callable returning the awaitable to execute
+            priority: Priority class of the operation
+            deadline: Seconds from now by which the operation should start
+                (defaults to the class default)
+            key: Optional coalescing key; a pending operation with the same key
+                is replaced and its caller receives this operation's result
+        
+        Returns:
+            The result of the awaited operation
+        
+        Raises:
+            OperationShedError: If the operation was shed before running
+        """
+        self._ensure_started()
+        
+        now = time.monotonic()
+        if deadline is None:
+            deadline = self.default_deadlines.get(priority, 60.0)
+        
+        op = ScheduledOperation(
+            priority=int(priority),
+            deadline=now + deadline,
+            sequence=next(self._sequence),
+            name=name,
+            factory=factory,
+            future=self._loop.create_future(),
+            key=key,
+            submitted_at=now
+        )
+        self._stats["submitted"] += 1
+        
+        if key is not None:
+            previous = self._pending_by_key.get(key)
+            if previous is not None and not previous.future.done():
+                # Latest value wins; the older caller gets the newer outcome
+                previous.superseded = True
+                op.future.add_done_callback(
+                    lambda f, target=previous.future: self._copy_outcome(f, target)
+                )
+                self._stats["coalesced"] += 1
+            self._pending_by_key[key] = op
+        
+        heapq.heappush(self._heap, op)
+        
+        if len(self._heap) > self.max_pending:
+            self._shed_overflow()
+        
+        self._wakeup.set()
+        return await op.future
+    
+    @staticmethod
+    def _copy_outcome(source: asyncio.Future, target: asyncio.Future) -> None:
+        """Propagate a finished future's outcome to a superseded caller."""
+        if target.done():
+            return
+        if source.cancelled():
+            target.cancel()
+        elif source.exception() is not None:
+            target.set_exception(source.exception())
+        else:
+            target.set_result(source.result())
+    
+    def _shed(self, op: ScheduledOperation, reason: str) -> None:
+        """Drop an operation and notify its caller."""
+        if op.key is not None and self._pending_by_key.get(op.key) is op:
+            del self._pending_by_key[op.key]
+        
+        self._stats[f"shed_{reason}"] += 1
+        if not op.future.done():
+            op.future.set_exception(
+                OperationShedError(op.name, OperationPriority(op.priority), reason)
+            )
+        
+        self.logger.debug(
+            f"Shed operation '{op.name}' ({reason})",
+            scheduler=self.name,
+            operation=op.name,
+            priority=OperationPriority(op.priority).name,
+            reason=reason
+        )
+    
+    def _shed_overflow(self) -> None:
+        """Shed the least important pending operation when over capacity."""
+        candidates = [op for op in self._heap if not op.superseded and not op.future.done()]
+        if not candidates:
+            return
+        
+        worst = max(candidates, key=lambda op: (op.priority, op.deadline))
+        if not self._is_sheddable(worst.priority):
+            return
+        
+        worst.superseded = True
+        self._shed(worst, "overflow")
+    
+    def _dispatch_ready(self) -> None:
+        """Start as many ready operations as concurrency limits allow."""
+        now = time.monotonic()
+        shared_limit = self.max_concurrency - self.reserved_slots
+        
+        # Operations whose class or key is busy step aside for lower classes
+        deferred: List[ScheduledOperation] = []
+        try:
+            self._dispatch_heap(now, shared_limit, deferred)
+        finally:
+            for op in deferred:
+                heapq.heappush(self._heap, op)
+    
+    def _dispatch_heap(
+        self,
+        now: float,
+        shared_limit: int,
+        deferred: List[ScheduledOperation]
+    ) -> None:
+        """
+        Start ready operations from the heap in priority order.
+        
+        Args:
+            now: Current monotonic time
+            shared_limit: Slots available to classes other than DAILY_REPORT
+            deferred: Receives operations popped because their class or key
+                is at capacity
+        """
+        while self._heap:
+            op = self._heap[0]
+            
+            if op.superseded or op.future.done():
+                heapq.heappop(self._heap)
+                continue
+            
+            sheddable = self._is_sheddable(op.priority)
+            if op.deadline < now and sheddable:
+                heapq.heappop(self._heap)
+                self._shed(op, "expired")
+                continue
+            
+            if self._active >= self.max_concurrency:
+                break
+            
+            # Keep reserved slots free for the daily report; anything else
+            # (a rename stuck in a 429 sleep included) only gets shared slots
+            shared = not self._may_use_reserved(op.priority)
+            if shared and self._active_shared >= shared_limit:
+                break
+            
+            if not self._has_class_capacity(op):
+                deferred.append(heapq.heappop(self._heap))
+                continue
+            
+            heapq.heappop(self._heap)
+            if op.key is not None and self._pending_by_key.get(op.key) is op:
+                del self._pending_by_key[op.key]
+            
+            if op.deadline < now:
+                self._stats["late"] += 1
+            
+            priority_name = OperationPriority(op.priority).name
+            self._wait_time_by_priority[priority_name] += now - op.submitted_at
+            self._count_by_priority[priority_name] += 1
+            
+            self._active += 1
+            self._active_by_priority[op.priority] += 1
+            if op.key is not None:
+                self._running_keys.add(op.key)
+            if shared:
+                self._active_shared += 1
+            
+            task = self._loop.create_task(self._execute(op, shared))
+            self._running_tasks.add(task)
+            task.add_done_callback(self._running_tasks.discard)
+    
+    async def _execute(self, op: ScheduledOperation, shared: bool) -> None:
+        """
+        Execute a dispatched operation and resolve its future.
+        
+        Args:
+            op: Operation to execute
+            shared: Whether the operation occupies a shared (non-reserved) slot
+        """
+        try:
+            result = await op.factory()
+            if not op.future.done():
+                op.future.set_result(result)
+            self._stats["completed"] += 1
+        except asyncio.CancelledError:
+            if not op.future.done():
+                op.future.cancel()
+            raise
+        except Exception as e:
+            self._stats["failed"] += 1
+            if not op.future.done():
+                op.future.set_exception(e)
+        finally:
+            self._active -= 1
+            self._active_by_priority[op.priority] -= 1
+            self._running_keys.discard(op.key)
+            if shared:
+                self._active_shared -= 1
+            self._wakeup.set()
+    
+    async def _dispatch_loop(self) -> None:
+        """Dispatch queued operations whenever work arrives or a slot frees up."""
+        while True:
+            self._wakeup.clear()
+            try:
+                self._dispatch_ready()
+            except Exception as e:
+                self.logger.error(
+                    f"Error dispatching operations in scheduler '{self.name}': {str(e)}",
+                    scheduler=self.name,
+                    exc_info=True
+                )
+            
+            # Wake up for new work, freed slots, or the next sheddable deadline
+            timeout = None
+            deadlines = [op.deadline for op in self._heap if self._is_sheddable(op.priority)]
+            if deadlines:
+                timeout = max(0.0, min(deadlines) - time.monotonic())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the scheduler, letting running operations finish.
+        
+        Pending operations are shed and their callers receive
+        OperationShedError.
+        
+        Args:
+            timeout: Maximum seconds to wait for running operations
+        """
+        if self._dispatcher and not self._dispatcher.done():
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+        self._dispatcher = None
+        
+        while self._heap:
+            op = heapq.heappop(self._heap)
+            if not op.superseded and not op.future.done():
+                self._shed(op, "stopped")
+        
+        if self._running_tasks:
+            await asyncio.wait(list(self._running_tasks), timeout=timeout)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get scheduler statistics.
+        
+        Returns:
+            Dictionary with throughput, shedding and per-priority wait stats
+        """
+        pending_by_priority = {p.name: 0 for p in OperationPriority}
+        for op in self._heap:
+            if not op.superseded and not op.future.done():
+                pending_by_priority[OperationPriority(op.priority).name] += 1
+        
+        return {
+            **self._stats,
+            "pending": sum(pending_by_priority.values()),
+            "active": self._active,
+            "active_by_priority": {
+                OperationPriority(priority).name: count
+                for priority, count in self._active_by_priority.items()
+            },
+            "pending_by_priority": pending_by_priority,
+            "avg_wait_ms_by_priority": {
+                name: (self._wait_time_by_priority[name] / count) * 1000
+                for name, count in self._count_by_priority.items()
+                if count
+            }
+        }
+
+
+# Global scheduler shared by all services for outbound Discord operations
+global_operation_scheduler = OperationScheduler("discord_operations")
@@ -7,5 +7,10 @@ cache invalidation strategies, and metrics tracking.
 
 from .circular_buffer import CircularBuffer
 from .cache_manager import CacheManager, CacheEntry
+from .eviction import EvictionPolicy, LRUEviction, TinyLFUEviction, ScoredEviction
+from .dedupe_filter import SequenceDedupeFilter
 
-__all__ = ['CircularBuffer', 'CacheManager', 'CacheEntry']
\ No newline at end of file
+__all__ = [
+    'CircularBuffer', 'CacheManager', 'CacheEntry', 'EvictionPolicy', 'LRUEviction',
+    'TinyLFUEviction', 'ScoredEviction', 'SequenceDedupeFilter'
+]
\ No newline at end of file
@@ -2,18 +2,36 @@
 TTL-based cache manager with memory-efficient storage.
 
 This module provides a thread-safe, time-to-live (TTL) based cache implementation
-with memory-efficient storage, cache invalidation strategies, and metrics tracking.
+with memory-efficient storage, cache invalidation strategies, pluggable O(1)
+eviction (see eviction.py) and metrics tracking.
+
+Expiry is driven by a min-heap keyed by expiry time, so background cleanup
+only touches entries that are actually due instead of scanning the cache.
+
+Async callers can use get_or_load, which coalesces concurrent misses for a
+key into one shared load and can briefly cache load failures. Entries may
+also carry a soft TTL: past it get_or_load keeps serving the stale value
+while a single background refresh runs, until the hard TTL expires it.
 """
 
+import asyncio
+import heapq
 import time
 import threading
-from typing import Dict, Any, Optional, List, Tuple, Set, Generic, TypeVar
+from typing import (
+    TYPE_CHECKING, Any, Awaitable, Callable, Dict, Generic, List, Optional, Set, Tuple, TypeVar,
+    Union
+)
 import logging
 from datetime import datetime
 import sys
 
 # Import models directly
 from ...types.models import CacheStats, CacheOperation
+from .eviction import EvictionPolicy, create_eviction_policy
+
+if TYPE_CHECKING:
+    from ..async_utils.task_manager import TaskManager
 
 # We'll define a local CacheError class to avoid circular imports
 class CacheError(Exception):
@@ -50,24 +68,28 @@ class CacheEntry(Generic[T]):
     Attributes:
         value: The cached value
         expiry: Expiration timestamp (seconds since epoch)
+        soft_expiry: Timestamp after which the value is stale but still
+            served while it is refreshed, or None
         created_at: Creation timestamp (seconds since epoch)
         last_accessed: Last access timestamp (seconds since epoch)
         access_count: Number of times this entry has been accessed
     """
     
-    __slots__ = ('value', 'expiry', 'created_at', 'last_accessed', 'access_count')
+    __slots__ = ('value', 'expiry', 'soft_expiry', 'created_at', 'last_accessed', 'access_count')
     
-    def __init__(self, value: T, ttl: int):
+    def __init__(self, value: T, ttl: int, soft_ttl: Optional[float] = None):
         """
         Initialize a new cache entry.
         
         Args:
             value: Value to cache
             ttl: Time to live in seconds
+            soft_ttl: Seconds until the value is stale, or None
         """
         self.value = value
         current_time = time.time()
         self.expiry = current_time + ttl
+        self.soft_expiry = current_time + soft_ttl if soft_ttl is not None else None
         self.created_at = current_time
         self.last_accessed = current_time
         self.access_count = 0
@@ -81,6 +103,15 @@ class CacheEntry(Generic[T]):
         """
         return time.time() > self.expiry
         
+    def is_stale(self) -> bool:
+        """
+        Check if the entry is past its soft TTL.
+        
+        Returns:
+            True if entry has a soft TTL that has passed, False otherwise
+        """
+        return self.soft_expiry is not None and time.time() >= self.soft_expiry
+        
     def access(self) -> None:
         """Update last accessed time and increment access count."""
         self.last_accessed = time.time()
@@ -119,18 +150,44 @@ class CacheManager:
         _cache (Dict): Internal storage for cache entries
         _lock (threading.RLock): Lock for thread safety
         _stats (Dict): Cache statistics
+        _policy (EvictionPolicy): Chooses entries to evict when full
+        _expiry_heap (List): (expiry, key) pairs ordered by expiry; pairs
+            whose entry was replaced, refreshed or removed are skipped lazily
+        _inflight (Dict): Shared load tasks for keys being loaded by get_or_load;
+            a load removed from here by a write or invalidation is superseded
+            and its result is not stored
+        _failures (Dict): Negatively cached load failures as (expiry, error)
+        _task_manager (TaskManager): Runs background refreshes, if provided
     """
     
-    def __init__(self, default_ttl: int = 300, max_size: int = 10000):
+    # Most heap pops per lock acquisition during background cleanup
+    EXPIRY_BATCH_SIZE = 500
+    # Shortest pause between cleanup ticks, in seconds
+    MIN_CLEANUP_INTERVAL = 1.0
+    # Hits on one entry before get_or_load may refresh it ahead of its soft TTL
+    HOT_ACCESS_COUNT = 3
+    
+    def __init__(
+        self,
+        default_ttl: int = 300,
+        max_size: int = 10000,
+        eviction_policy: Union[str, EvictionPolicy] = "tinylfu",
+        task_manager: Optional["TaskManager"] = None
+    ):
         """
         Initialize a new cache manager.
         
         Args:
             default_ttl: Default time-to-live for cache entries in seconds
             max_size: Maximum number of entries the cache can hold
+            eviction_policy: "tinylfu" (default), "lru", "scored" (the
+                original full-sort scorer) or an EvictionPolicy instance
+            task_manager: TaskManager for background refreshes (plain
+                asyncio tasks are used if None)
             
         Raises:
-            ValueError: If default_ttl or max_size is not positive
+            ValueError: If default_ttl or max_size is not positive, or the
+                eviction policy is unknown
         """
         if default_ttl <= 0:
             raise ValueError("Default TTL must be positive")
@@ -141,6 +198,11 @@ class CacheManager:
         self.max_size = max_size
         self._cache: Dict[str, CacheEntry] = {}
         self._lock = threading.RLock()
+        self._policy = create_eviction_policy(eviction_policy, max_size)
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._failures: Dict[str, Tuple[float, Exception]] = {}
+        self._task_manager = task_manager
         
         # Statistics tracking
         self._stats = {
@@ -150,6 +212,12 @@ class CacheManager:
             'evictions': 0,
             'expirations': 0,
             'invalidations': 0,
+            'singleflight_hits': 0,
+            'singleflight_waits': 0,
+            'singleflight_loads': 0,
+            'negative_hits': 0,
+            'stale_hits': 0,
+            'background_refreshes': 0,
             'created_at': time.time()
         }
         
@@ -166,96 +234,125 @@ class CacheManager:
         cleanup_thread.start()
         
     def _cleanup_loop(self) -> None:
-        """Background loop for periodic cache cleanup."""
+        """Background loop that wakes when the next entry is due."""
         while True:
             try:
-                # Sleep first to avoid immediate cleanup on startup
-                time.sleep(min(60, self.default_ttl / 2))
+                time.sleep(self._next_cleanup_delay())
                 self._cleanup_expired()
             except Exception as e:
                 logging.error(f"Error in cache cleanup: {e}")
                 
+    def _next_cleanup_delay(self) -> float:
+        """
+        Get how long the cleanup thread should sleep.
+        
+        Returns:
+            Seconds until the earliest expiry, clamped between
+            MIN_CLEANUP_INTERVAL and min(60, default_ttl / 2)
+        """
+        max_delay = max(self.MIN_CLEANUP_INTERVAL, min(60, self.default_ttl / 2))
+        with self._lock:
+            if not self._expiry_heap:
+                return max_delay
+            due_in = self._expiry_heap[0][0] - time.time()
+        return min(max_delay, max(self.MIN_CLEANUP_INTERVAL, due_in))
+        
     def _cleanup_expired(self) -> int:
         """
         Remove expired entries from the cache.
         
+        Pops due entries off the expiry heap in batches of EXPIRY_BATCH_SIZE,
+        releasing the lock between batches so a large expiry wave does not
+        stall readers. Entries that are not yet due are never visited.
+        
         Returns:
             Number of entries removed
         """
+        removed = 0
+        while True:
+            with self._lock:
+                popped, expired = self._expire_due(time.time(), self.EXPIRY_BATCH_SIZE)
+                if len(self._expiry_heap) > 2 * len(self._cache) + self.EXPIRY_BATCH_SIZE:
+                    self._compact_expiry_heap()
+            removed += expired
+            if popped < self.EXPIRY_BATCH_SIZE:
+                break
+        
+        # Failures are few and short-lived, so a scan is cheap here
         with self._lock:
             current_time = time.time()
-            expired_keys = [
-                key for key, entry in self._cache.items()
-                if current_time > entry.expiry
-            ]
-            
-            for key in expired_keys:
-                del self._cache[key]
+            for key in [key for key, (expiry, _) in self._failures.items() if current_time > expiry]:
+                del self._failures[key]
+        return removed
                 
-            self._stats['expirations'] += len(expired_keys)
-            return len(expired_keys)
-            
-    def _evict_if_needed(self) -> int:
+    def _expire_due(self, current_time: float, limit: int) -> Tuple[int, int]:
         """
-        Evict entries if cache is over capacity.
+        Pop due heap items and delete the entries they still describe.
         
-        This method uses a combination of strategies to determine which
-        entries to evict: least recently used, least frequently used,
-        and closest to expiration.
+        Must be called with the lock held.
         
+        Args:
+            current_time: Timestamp to compare expiries against
+            limit: Maximum number of heap items to pop
+            
         Returns:
-            Number of entries evicted
+            Tuple of (heap items popped, entries expired)
+        """
+        heap = self._expiry_heap
+        cache = self._cache
+        popped = expired = 0
+        while heap and popped < limit and heap[0][0] < current_time:
+            expiry, key = heapq.heappop(heap)
+            popped += 1
+            entry = cache.get(key)
+            # Skip items left behind by an overwrite, refresh or removal
+            if entry is None or entry.expiry != expiry:
+                continue
+            del cache[key]
+            self._policy.remove(key)
+            expired += 1
+        self._stats['expirations'] += expired
+        return popped, expired
+        
+    def _compact_expiry_heap(self) -> None:
         """
-        with self._lock:
-            if len(self._cache) <= self.max_size:
-                return 0
-                
-            # Calculate how many entries to evict
-            # At minimum, evict enough to get below max_size
-            min_to_evict = len(self._cache) - self.max_size
-            # Evict at least 1, up to 20% of max_size for efficiency
-            to_evict = max(min_to_evict, max(1, int(self.max_size * 0.2)))
-            
-            # Score entries based on a combination of factors
-            # Lower score = more likely to be evicted
-            scored_entries = []
-            current_time = time.time()
-            
-            for key, entry in self._cache.items():
-                # Factors to consider:
-                # 1. Time since last access (older = more likely to evict)
-                # 2. Access frequency (less frequent = more likely to evict)
-                # 3. Time to expiry (closer to expiry = more likely to evict)
-                
-                time_factor = current_time - entry.last_accessed
-                frequency_factor = 1 / (entry.access_count + 1)
-                expiry_factor = max(0.1, entry.expiry - current_time)
-                
-                # Combined score (lower = more likely to evict)
-                score = (expiry_factor * 0.5) - (time_factor * 0.3) - (frequency_factor * 100)
-                scored_entries.append((key, score))
-            
-            # Sort by score (ascending) and take the lowest scoring entries
-            scored_entries.sort(key=lambda x: x[1])
-            keys_to_evict = [key for key, _ in scored_entries[:to_evict]]
-            
-            # Evict selected entries
-            for key in keys_to_evict:
-                del self._cache[key]
-                
-            self._stats['evictions'] += len(keys_to_evict)
-            return len(keys_to_evict)
+        Rebuild the expiry heap from live entries, dropping stale items.
+        
+        Must be called with the lock held. Only needed when keys are
+        overwritten or refreshed much faster than they expire.
+        """
+        self._expiry_heap = [(entry.expiry, key) for key, entry in self._cache.items()]
+        heapq.heapify(self._expiry_heap)
             
     def get(self, key: str) -> Optional[Any]:
         """
         Get a value from the cache.
         
+        Stale values (past their soft TTL) are returned until their hard TTL
+        expires; only get_or_load refreshes them.
+        
         Args:
             key: Cache key to retrieve
             
         Returns:
             Cached value, or None if key not found or expired
             
+        Raises:
+            CacheError: If an error occurs during retrieval
+        """
+        entry = self._get_entry(key)
+        return entry.value if entry is not None else None
+        
+    def _get_entry(self, key: str) -> Optional[CacheEntry]:
+        """
+        Look up a live entry, updating hit, miss and expiry statistics.
+        
+        Args:
+            key: Cache key to retrieve
+            
+        Returns:
+            The entry, or None if key not found or expired
+            
         Raises:
             CacheError: If an error occurs during retrieval
         """
@@ -264,6 +361,7 @@ class CacheManager:
                 # Check if key exists
                 if key not in self._cache:
                     self._stats['misses'] += 1
+                    self._policy.record_miss(key)
                     return None
                     
                 entry = self._cache[key]
@@ -271,15 +369,18 @@ class CacheManager:
                 # Check if entry has expired
                 if entry.is_expired():
                     del self._cache[key]
+                    self._policy.remove(key)
                     self._stats['expirations'] += 1
                     self._stats['misses'] += 1
+                    self._policy.record_miss(key)
                     return None
                     
                 # Update access statistics
                 entry.access()
+                self._policy.record_access(key)
                 self._stats['hits'] += 1
                 
-                return entry.value
+                return entry
         except Exception as e:
             raise CacheError(
                 f"Error retrieving from cache: {str(e)}",
@@ -287,7 +388,13 @@ class CacheManager:
                 operation=CacheOperation.GET.name
             )
             
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        soft_ttl: Optional[float] = None
+    ) -> None:
         """
         Set a value in the cache.
         
@@ -295,6 +402,9 @@ class CacheManager:
             key: Cache key
             value: Value to cache
             ttl: Time-to-live in seconds (uses default_ttl if None)
+            soft_ttl: Seconds after which get_or_load treats the value as
+                stale and refreshes it in the background; should be less
+                than ttl (None disables stale-while-revalidate)
             
         Raises:
             CacheError: If an error occurs during storage
@@ -304,12 +414,24 @@ class CacheManager:
             
             with self._lock:
                 # Store the new entry
-                self._cache[key] = CacheEntry(value, ttl)
+                is_new = key not in self._cache
+                entry = CacheEntry(value, ttl, soft_ttl)
+                self._cache[key] = entry
+                heapq.heappush(self._expiry_heap, (entry.expiry, key))
+                self._failures.pop(key, None)
+                # A load already in flight read older data than this value
+                self._inflight.pop(key, None)
                 self._stats['sets'] += 1
                 
-                # Check if we need to evict entries (always check after adding)
-                if len(self._cache) > self.max_size:
-                    self._evict_if_needed()
+                if not is_new:
+                    self._policy.record_access(key)
+                    return
+                
+                # The policy names any entries to evict (possibly this one)
+                victims = self._policy.admit(key, self._cache)
+                for victim in victims:
+                    del self._cache[victim]
+                self._stats['evictions'] += len(victims)
         except Exception as e:
             raise CacheError(
                 f"Error setting cache value: {str(e)}",
@@ -317,10 +439,48 @@ class CacheManager:
                 operation=CacheOperation.SET.name
             )
             
+    def update(self, key: str, func: Callable[[Any], Any]) -> bool:
+        """
+        Replace a live cached value with func(value), keeping its TTLs.
+        
+        Use this to apply a known change (e.g. one more ban) without a
+        reload. A get_or_load load already in flight for the key is
+        superseded either way, so it cannot store a value read before the
+        change.
+        
+        Args:
+            key: Cache key
+            func: Called with the current value; returns the new value
+            
+        Returns:
+            True if a live value was updated, False if none was cached
+            
+        Raises:
+            CacheError: If an error occurs during the update
+        """
+        try:
+            with self._lock:
+                self._inflight.pop(key, None)
+                entry = self._cache.get(key)
+                if entry is None or entry.is_expired():
+                    return False
+                entry.value = func(entry.value)
+                return True
+        except Exception as e:
+            raise CacheError(
+                f"Error updating cache value: {str(e)}",
+                cache_key=key,
+                operation=CacheOperation.SET.name
+            )
+            
     def invalidate(self, key: str) -> bool:
         """
         Invalidate a specific cache entry.
         
+        A get_or_load load in flight for the key is superseded: callers
+        already waiting on it still get its result, but it is not stored,
+        and the next miss starts a fresh load.
+        
         Args:
             key: Cache key to invalidate
             
@@ -332,8 +492,11 @@ class CacheManager:
         """
         try:
             with self._lock:
+                self._failures.pop(key, None)
+                self._inflight.pop(key, None)
                 if key in self._cache:
                     del self._cache[key]
+                    self._policy.remove(key)
                     self._stats['invalidations'] += 1
                     return True
                 return False
@@ -366,6 +529,11 @@ class CacheManager:
                 
                 for key in keys_to_invalidate:
                     del self._cache[key]
+                    self._policy.remove(key)
+                for key in [key for key in self._failures if pattern in key]:
+                    del self._failures[key]
+                for key in [key for key in self._inflight if pattern in key]:
+                    del self._inflight[key]
                     
                 self._stats['invalidations'] += len(keys_to_invalidate)
                 return len(keys_to_invalidate)
@@ -390,6 +558,10 @@ class CacheManager:
             with self._lock:
                 count = len(self._cache)
                 self._cache.clear()
+                self._expiry_heap.clear()
+                self._failures.clear()
+                self._inflight.clear()
+                self._policy.clear()
                 self._stats['invalidations'] += count
                 return count
         except Exception as e:
@@ -419,6 +591,7 @@ class CacheManager:
                 if key in self._cache:
                     entry = self._cache[key]
                     entry.expiry = time.time() + ttl
+                    heapq.heappush(self._expiry_heap, (entry.expiry, key))
                     return True
                 return False
         except Exception as e:
@@ -460,6 +633,185 @@ class CacheManager:
                 operation="GET_OR_SET"
             )
             
+    async def get_or_load(
+        self,
+        key: str,
+        coro_factory: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        negative_ttl: Optional[float] = None,
+        soft_ttl: Optional[float] = None,
+        refresh_ahead: Optional[float] = None
+    ) -> Any:
+        """
+        Get a value from cache or load it once for all concurrent callers.
+        
+        On a miss the first caller starts ``coro_factory()`` as a task; callers
+        that miss the same key while it runs await that task instead of
+        starting their own load. A waiter being cancelled does not cancel the
+        shared load.
+        
+        With ``soft_ttl`` the value is stored with a soft and a hard TTL.
+        Past the soft TTL the stale value is returned immediately and one
+        background refresh is started (through the TaskManager, if any); only
+        a miss after the hard TTL waits for a load. With ``refresh_ahead``,
+        entries hit at least HOT_ACCESS_COUNT times are refreshed in the
+        background once they are within that fraction of their soft TTL of
+        going stale, so hot keys are never served stale.
+        
+        Args:
+            key: Cache key
+            coro_factory: Zero-argument callable returning an awaitable that
+                produces the value (a None result is returned but not cached)
+            ttl: Hard time-to-live in seconds (uses default_ttl if None)
+            negative_ttl: If set, a failed load is remembered for this many
+                seconds and callers get the same error without reloading
+            soft_ttl: Seconds until the value is stale and refreshed in the
+                background (None disables stale-while-revalidate)
+            refresh_ahead: Fraction (0-1) of soft_ttl before staleness at
+                which hot entries are refreshed early
+            
+        Returns:
+            Cached or loaded value
+            
+        Raises:
+            Exception: Whatever the load raised, for the loading caller, its
+                waiters and (with negative_ttl) later callers
+        """
+        entry = self._get_entry(key)
+        if entry is not None:
+            self._stats['singleflight_hits'] += 1
+            if entry.soft_expiry is not None:
+                current_time = time.time()
+                if current_time >= entry.soft_expiry:
+                    self._stats['stale_hits'] += 1
+                    self._refresh_in_background(key, coro_factory, ttl, negative_ttl, soft_ttl)
+                elif (
+                    refresh_ahead
+                    and entry.access_count >= self.HOT_ACCESS_COUNT
+                    and entry.soft_expiry - current_time
+                    <= refresh_ahead * (entry.soft_expiry - entry.created_at)
+                ):
+                    self._refresh_in_background(key, coro_factory, ttl, negative_ttl, soft_ttl)
+            return entry.value
+        
+        task = self._inflight.get(key)
+        if task is not None:
+            self._stats['singleflight_waits'] += 1
+            return await asyncio.shield(task)
+        
+        failure = self._failures.get(key)
+        if failure is not None:
+            expiry, error = failure
+            if time.time() <= expiry:
+                self._stats['negative_hits'] += 1
+                raise error
+            self._failures.pop(key, None)
+        
+        task = asyncio.ensure_future(self._load(key, coro_factory, ttl, negative_ttl, soft_ttl))
+        self._inflight[key] = task
+        self._stats['singleflight_loads'] += 1
+        return await asyncio.shield(task)
+        
+    def _refresh_in_background(
+        self,
+        key: str,
+        coro_factory: Callable[[], Awaitable[Any]],
+        ttl: Optional[int],
+        negative_ttl: Optional[float],
+        soft_ttl: Optional[float]
+    ) -> bool:
+        """
+        Start a background reload of a cached key unless one is running.
+        
+        Refreshes are skipped while a remembered failure for the key is
+        still fresh, so a failing source is not retried on every read.
+        
+        Args:
+            key: Cache key to reload
+            coro_factory: Callable producing the value
+            ttl: Hard time-to-live for the new value
+            negative_ttl: Time to remember a failure, or None
+            soft_ttl: Soft time-to-live for the new value
+            
+        Returns:
+            True if a refresh was started, False otherwise
+        """
+        if key in self._inflight:
+            return False
+        failure = self._failures.get(key)
+        if failure is not None and time.time() <= failure[0]:
+            return False
+        
+        coro = self._load(key, coro_factory, ttl, negative_ttl, soft_ttl)
+        if self._task_manager is not None:
+            task = self._task_manager.create_task(coro, name=f"cache_refresh:{key}@{id(self):x}")
+        else:
+            task = asyncio.ensure_future(coro)
+        # Nobody awaits a refresh; a failure is already logged or remembered
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._inflight[key] = task
+        self._stats['background_refreshes'] += 1
+        return True
+        
+    async def _load(
+        self,
+        key: str,
+        coro_factory: Callable[[], Awaitable[Any]],
+        ttl: Optional[int],
+        negative_ttl: Optional[float],
+        soft_ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Run one shared load for get_or_load and store its outcome.
+        
+        The outcome is only stored if the load is still the key's registered
+        load when it finishes; a set, update or invalidation in the meantime
+        supersedes it.
+        
+        Args:
+            key: Cache key being loaded
+            coro_factory: Callable producing the value
+            ttl: Time-to-live for the value
+            negative_ttl: Time to remember a failure, or None
+            soft_ttl: Soft time-to-live for the value, or None
+            
+        Returns:
+            Loaded value
+        """
+        task = asyncio.current_task()
+        try:
+            value = await coro_factory()
+        except Exception as e:
+            with self._lock:
+                if self._release_load(key, task) and negative_ttl:
+                    self._failures[key] = (time.time() + negative_ttl, e)
+            raise
+        except BaseException:
+            with self._lock:
+                self._release_load(key, task)
+            raise
+        
+        with self._lock:
+            if self._release_load(key, task) and value is not None:
+                self.set(key, value, ttl, soft_ttl)
+        return value
+        
+    def _release_load(self, key: str, task: Optional[asyncio.Task]) -> bool:
+        """
+        Unregister a finished load (caller holds the lock).
+        
+        Args:
+            key: Cache key that was loaded
+            task: Task that ran the load
+            
+        Returns:
+            True if the load was still current, False if it was superseded
+        """
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            return True
+        return False
+        
     def get_stats(self) -> CacheStats:
         """
         Get cache statistics.
@@ -479,7 +831,14 @@ class CacheManager:
                 hit_count=self._stats['hits'],
                 miss_count=self._stats['misses'],
                 eviction_count=self._stats['evictions'],
-                memory_usage_bytes=memory_usage
+                memory_usage_bytes=memory_usage,
+                eviction_policy=self._policy.name,
+                singleflight_hits=self._stats['singleflight_hits'],
+                singleflight_waits=self._stats['singleflight_waits'],
+                singleflight_loads=self._stats['singleflight_loads'],
+                negative_hits=self._stats['negative_hits'],
+                stale_hits=self._stats['stale_hits'],
+                background_refreshes=self._stats['background_refreshes']
             )
             
     def _estimate_memory_usage(self) -> int:
@@ -515,6 +874,44 @@ class CacheManager:
             
             return int(total_estimated_size)
             
+    def get_counters(self) -> Dict[str, int]:
+        """
+        Get raw cache counters without estimating memory usage.
+        
+        Unlike get_stats this does not sample entries, so it is cheap enough
+        to call on every metrics scrape.
+        
+        Returns:
+            Dictionary with entry count, capacity and operation counters
+        """
+        with self._lock:
+            return {
+                'entries': len(self._cache),
+                'max_size': self.max_size,
+                'hits': self._stats['hits'],
+                'misses': self._stats['misses'],
+                'sets': self._stats['sets'],
+                'evictions': self._stats['evictions'],
+                'expirations': self._stats['expirations'],
+                'invalidations': self._stats['invalidations'],
+                'expiry_queue': len(self._expiry_heap)
+            }
+            
+    def get_policy_stats(self) -> Dict[str, Any]:
+        """
+        Get eviction policy statistics together with the hit rate.
+        
+        Returns:
+            Dictionary with the policy name, hit rate, evictions, admission
+            rejections and policy-specific details
+        """
+        with self._lock:
+            total_requests = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._policy.get_stats(),
+                'hit_rate': self._stats['hits'] / total_requests if total_requests else 0.0
+            }
+            
     def get_keys(self) -> List[str]:
         """
         Get all cache keys.
@@ -594,6 +991,7 @@ class CacheManager:
             entry = self._cache[key]
             if entry.is_expired():
                 del self._cache[key]
+                self._policy.remove(key)
                 self._stats['expirations'] += 1
                 return False
                 
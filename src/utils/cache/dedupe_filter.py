@@ -0,0 +1,96 @@
+"""
+Bounded dedupe filter for replayed events.
+
+This module provides a sequence filter that only drops an event repeating
+the last event seen for the same subject, remembering a bounded number of
+subjects in LRU order.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class SequenceDedupeFilter:
+    """
+    Dedupe filter keyed on the last event seen for each subject.
+    
+    An event is a duplicate only if it repeats the most recent event for its
+    subject within the window, so a real leave followed by a rejoin is never
+    dropped, and a replay is caught however close it falls to a clock
+    boundary. Once more than capacity subjects are tracked, the least
+    recently seen subjects are forgotten.
+    
+    Attributes:
+        capacity (int): Maximum number of subjects tracked
+        window (float): Seconds during which a repeated event is a duplicate
+        _last (OrderedDict): Last (event, timestamp) per subject in recency order
+    """
+    
+    def __init__(self, capacity: int = 10000, window: float = 60.0):
+        """
+        Initialize a sequence dedupe filter.
+        
+        Args:
+            capacity: Maximum number of subjects tracked
+            window: Seconds during which a repeated event is a duplicate
+        
+        Raises:
+            ValueError: If capacity or window are out of range
+        """
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError("Capacity must be a positive integer")
+        if window <= 0:
+            raise ValueError("Window must be positive")
+        
+        self.capacity = capacity
+        self.window = window
+        self._last: "OrderedDict[Hashable, Tuple[Hashable, float]]" = OrderedDict()
+        self._stats = {"checks": 0, "hits": 0, "evictions": 0}
+    
+    def check_and_add(self, subject: Hashable, event: Hashable, now: Optional[float] = None) -> bool:
+        """
+        Record an event for a subject and report whether it is a repeat.
+        
+        A duplicate does not extend the window; it stays anchored to the
+        event that was first recorded.
+        
+        Args:
+            subject: What the event is about (e.g. a guild and member pair)
+            event: Event value (e.g. "join" or "leave")
+            now: Event time in seconds (defaults to the monotonic clock)
+        
+        Returns:
+            True if the event repeats the subject's last event within the
+            window, False otherwise
+        """
+        if now is None:
+            now = time.monotonic()
+        self._stats["checks"] += 1
+        
+        last = self._last.get(subject)
+        if last is not None:
+            self._last.move_to_end(subject)
+            last_event, seen_at = last
+            if last_event == event and now - seen_at < self.window:
+                self._stats["hits"] += 1
+                return True
+        
+        self._last[subject] = (event, now)
+        if len(self._last) > self.capacity:
+            self._last.popitem(last=False)
+            self._stats["evictions"] += 1
+        return False
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get filter statistics."""
+        return {
+            **self._stats,
+            "type": "sequence",
+            "size": len(self._last),
+            "capacity": self.capacity,
+            "window": self.window,
+            "hit_rate": self._stats["hits"] / self._stats["checks"] if self._stats["checks"] else 0.0,
+            "false_positive_rate": 0.0
+        }
+
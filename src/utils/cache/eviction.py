@@ -0,0 +1,404 @@
+"""
+Eviction policies for CacheManager.
+
+This module provides interchangeable policies that decide which key leaves
+a full cache:
+
+- LRUEviction: least recently used, O(1) per operation via an OrderedDict
+- TinyLFUEviction: W-TinyLFU (a small LRU window in front of a segmented
+  LRU main area, with admission decided by a count-min frequency sketch),
+  O(1) per operation and resistant to scans and one-hit wonders
+- ScoredEviction: the original scorer (recency, frequency and time to
+  expiry), which sorts the whole cache and evicts 20% at a time; kept for
+  comparison
+
+Policies are not thread-safe; CacheManager calls them under its lock.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Mapping, Union
+
+# Odd 64-bit multipliers, one per count-min sketch row
+_SKETCH_SEEDS = (
+    0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93
+)
+_MASK64 = (1 << 64) - 1
+
+# Byte translation table mapping every counter value to half of it
+_HALVE_TABLE = bytes(count >> 1 for count in range(256))
+
+
+class EvictionPolicy:
+    """
+    Base class for cache eviction policies.
+    
+    The cache reports every lookup and insertion; the policy tracks the keys
+    it holds and, on insertion, names the keys to remove so the cache stays
+    within capacity.
+    
+    Attributes:
+        name (str): Policy name used in statistics
+        capacity (int): Maximum number of keys
+    """
+    
+    name = "base"
+    
+    def __init__(self, capacity: int):
+        """
+        Initialize the policy.
+        
+        Args:
+            capacity: Maximum number of keys
+        
+        Raises:
+            ValueError: If capacity is not a positive integer
+        """
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError("Capacity must be a positive integer")
+        self.capacity = capacity
+        self._stats = {"evictions": 0, "rejections": 0}
+    
+    def record_access(self, key: Hashable) -> None:
+        """
+        Record a hit (or an update of an existing key).
+        
+        Args:
+            key: Key that was accessed
+        """
+    
+    def record_miss(self, key: Hashable) -> None:
+        """
+        Record a lookup for a key that is not cached.
+        
+        Args:
+            key: Key that was looked up
+        """
+    
+    def admit(self, key: Hashable, entries: Mapping[Hashable, Any]) -> List[Hashable]:
+        """
+        Track a newly inserted key and choose keys to remove.
+        
+        Args:
+            key: Key just inserted into ``entries``
+            entries: The cache's entries, including ``key``
+        
+        Returns:
+            Keys the cache must remove; may include ``key`` itself if the
+            policy rejects it
+        """
+        raise NotImplementedError
+    
+    def remove(self, key: Hashable) -> None:
+        """
+        Stop tracking a key removed by the cache (expiry or invalidation).
+        
+        Args:
+            key: Key that was removed
+        """
+    
+    def clear(self) -> None:
+        """Stop tracking all keys."""
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get policy statistics."""
+        return {"policy": self.name, "capacity": self.capacity, **self._stats}
+
+
+class LRUEviction(EvictionPolicy):
+    """
+    Least-recently-used eviction in O(1).
+    
+    Attributes:
+        _order (OrderedDict): Tracked keys, least recently used first
+    """
+    
+    name = "lru"
+    
+    def __init__(self, capacity: int):
+        """
+        Initialize an LRU policy.
+        
+        Args:
+            capacity: Maximum number of keys
+        """
+        super().__init__(capacity)
+        self._order: "OrderedDict[Hashable, None]" = OrderedDict()
+    
+    def record_access(self, key: Hashable) -> None:
+        """Move a key to the most recently used end."""
+        if key in self._order:
+            self._order.move_to_end(key)
+    
+    def admit(self, key: Hashable, entries: Mapping[Hashable, Any]) -> List[Hashable]:
+        """Track a new key and evict the least recently used one if full."""
+        self._order[key] = None
+        if len(self._order) <= self.capacity:
+            return []
+        victim, _ = self._order.popitem(last=False)
+        self._stats["evictions"] += 1
+        return [victim]
+    
+    def remove(self, key: Hashable) -> None:
+        """Stop tracking a key."""
+        self._order.pop(key, None)
+    
+    def clear(self) -> None:
+        """Stop tracking all keys."""
+        self._order.clear()
+
+
+class CountMinSketch:
+    """
+    Approximate frequency counter with periodic aging.
+    
+    Four rows of 4-bit-saturating counters (stored one per byte), each row
+    four times the cache capacity wide to keep collisions rare. Once
+    ``sample_size`` increments have been recorded every counter is halved,
+    so the sketch reflects recent popularity rather than all-time counts.
+    
+    Attributes:
+        width (int): Counters per row (a power of two)
+        sample_size (int): Increments between agings
+    """
+    
+    MAX_COUNT = 15
+    
+    def __init__(self, capacity: int):
+        """
+        Initialize a sketch sized for a cache.
+        
+        Args:
+            capacity: Number of keys the cache holds
+        """
+        self.width = 1 << max(4, (4 * capacity - 1).bit_length())
+        self._shift = 64 - (self.width.bit_length() - 1)
+        self._rows = tuple((row * self.width, seed) for row, seed in enumerate(_SKETCH_SEEDS))
+        self.sample_size = 10 * capacity
+        self._counters = bytearray(len(_SKETCH_SEEDS) * self.width)
+        self._additions = 0
+        self.resets = 0
+    
+    def increment(self, key: Hashable) -> None:
+        """
+        Count one occurrence of a key.
+        
+        Args:
+            key: Key to count
+        """
+        counters = self._counters
+        shift = self._shift
+        h = hash(key) & _MASK64
+        h ^= h >> 33
+        max_count = self.MAX_COUNT
+        added = False
+        for offset, seed in self._rows:
+            index = offset + (((h * seed) & _MASK64) >> shift)
+            if counters[index] < max_count:
+                counters[index] += 1
+                added = True
+        if added:
+            self._additions += 1
+            if self._additions >= self.sample_size:
+                self._age()
+    
+    def estimate(self, key: Hashable) -> int:
+        """
+        Estimate how often a key has occurred recently.
+        
+        Args:
+            key: Key to look up
+        
+        Returns:
+            Smallest counter for the key (never an underestimate before aging)
+        """
+        counters = self._counters
+        shift = self._shift
+        h = hash(key) & _MASK64
+        h ^= h >> 33
+        smallest = self.MAX_COUNT
+        for offset, seed in self._rows:
+            count = counters[offset + (((h * seed) & _MASK64) >> shift)]
+            if count < smallest:
+                smallest = count
+        return smallest
+    
+    def _age(self) -> None:
+        """Halve every counter (one C-level pass over the bytes)."""
+        self._counters = self._counters.translate(_HALVE_TABLE)
+        self._additions //= 2
+        self.resets += 1
+
+
+class TinyLFUEviction(EvictionPolicy):
+    """
+    W-TinyLFU eviction in O(1).
+    
+    New keys enter a small LRU window (1% of capacity). Keys leaving the
+    window compete with the main area's eviction candidate: whichever the
+    frequency sketch says is more popular stays. The main area is a
+    segmented LRU, where keys hit while in probation are promoted to the
+    protected segment (80% of the main area).
+    
+    Attributes:
+        window_capacity (int): Keys in the admission window
+        protected_capacity (int): Keys in the protected segment
+        sketch (CountMinSketch): Frequency estimates for admission
+    """
+    
+    name = "tinylfu"
+    
+    def __init__(self, capacity: int, window_ratio: float = 0.01, protected_ratio: float = 0.8):
+        """
+        Initialize a W-TinyLFU policy.
+        
+        Args:
+            capacity: Maximum number of keys
+            window_ratio: Share of capacity used by the admission window
+            protected_ratio: Share of the main area used by the protected segment
+        """
+        super().__init__(capacity)
+        self.window_capacity = max(1, int(capacity * window_ratio)) if capacity > 1 else 0
+        self.main_capacity = capacity - self.window_capacity
+        self.protected_capacity = int(self.main_capacity * protected_ratio)
+        self.sketch = CountMinSketch(capacity)
+        self._window: "OrderedDict[Hashable, None]" = OrderedDict()
+        self._probation: "OrderedDict[Hashable, None]" = OrderedDict()
+        self._protected: "OrderedDict[Hashable, None]" = OrderedDict()
+        self._stats["promotions"] = 0
+    
+    def record_access(self, key: Hashable) -> None:
+        """Count a hit and update the key's segment."""
+        self.sketch.increment(key)
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+        elif key in self._probation:
+            del self._probation[key]
+            self._protected[key] = None
+            self._stats["promotions"] += 1
+            if len(self._protected) > self.protected_capacity:
+                demoted, _ = self._protected.popitem(last=False)
+                self._probation[demoted] = None
+    
+    def record_miss(self, key: Hashable) -> None:
+        """Count a lookup for an uncached key."""
+        self.sketch.increment(key)
+    
+    def admit(self, key: Hashable, entries: Mapping[Hashable, Any]) -> List[Hashable]:
+        """Place a new key in the window and settle any overflow."""
+        if not self.window_capacity:
+            candidate = key
+        else:
+            self._window[key] = None
+            if len(self._window) <= self.window_capacity:
+                return []
+            candidate, _ = self._window.popitem(last=False)
+        
+        if len(self._probation) + len(self._protected) < self.main_capacity:
+            self._probation[candidate] = None
+            return []
+        
+        main = self._probation if self._probation else self._protected
+        victim = next(iter(main))
+        if self.sketch.estimate(candidate) > self.sketch.estimate(victim):
+            del main[victim]
+            self._probation[candidate] = None
+            self._stats["evictions"] += 1
+            return [victim]
+        
+        self._stats["rejections"] += 1
+        return [candidate]
+    
+    def remove(self, key: Hashable) -> None:
+        """Stop tracking a key."""
+        for segment in (self._window, self._probation, self._protected):
+            if key in segment:
+                del segment[key]
+                return
+    
+    def clear(self) -> None:
+        """Stop tracking all keys (frequency history is kept)."""
+        self._window.clear()
+        self._probation.clear()
+        self._protected.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get policy statistics including segment sizes."""
+        return {
+            **super().get_stats(),
+            "window": len(self._window),
+            "probation": len(self._probation),
+            "protected": len(self._protected),
+            "sketch_resets": self.sketch.resets
+        }
+
+
+class ScoredEviction(EvictionPolicy):
+    """
+    Original scored eviction, kept as a baseline.
+    
+    When the cache is over capacity every entry is scored by recency,
+    access frequency and time to expiry, the whole cache is sorted and the
+    lowest 20% of capacity is evicted: O(n log n) per eviction.
+    """
+    
+    name = "scored"
+    
+    def admit(self, key: Hashable, entries: Mapping[Hashable, Any]) -> List[Hashable]:
+        """Evict the lowest-scoring entries once over capacity."""
+        if len(entries) <= self.capacity:
+            return []
+        
+        # At minimum, evict enough to get below capacity; up to 20% for efficiency
+        min_to_evict = len(entries) - self.capacity
+        to_evict = max(min_to_evict, max(1, int(self.capacity * 0.2)))
+        
+        # Lower score = more likely to be evicted
+        scored_entries = []
+        current_time = time.time()
+        
+        for entry_key, entry in entries.items():
+            time_factor = current_time - entry.last_accessed
+            frequency_factor = 1 / (entry.access_count + 1)
+            expiry_factor = max(0.1, entry.expiry - current_time)
+            
+            score = (expiry_factor * 0.5) - (time_factor * 0.3) - (frequency_factor * 100)
+            scored_entries.append((entry_key, score))
+        
+        scored_entries.sort(key=lambda x: x[1])
+        victims = [entry_key for entry_key, _ in scored_entries[:to_evict]]
+        self._stats["evictions"] += len(victims)
+        return victims
+
+
+EVICTION_POLICIES = {
+    LRUEviction.name: LRUEviction,
+    TinyLFUEviction.name: TinyLFUEviction,
+    ScoredEviction.name: ScoredEviction
+}
+
+
+def create_eviction_policy(policy: Union[str, EvictionPolicy], capacity: int) -> EvictionPolicy:
+    """
+    Create an eviction policy by name, or pass an instance through.
+    
+    Args:
+        policy: "lru", "tinylfu", "scored", or an EvictionPolicy instance
+        capacity: Maximum number of keys
+    
+    Returns:
+        The eviction policy
+    
+    Raises:
+        ValueError: If the policy name is unknown
+    """
+    if isinstance(policy, EvictionPolicy):
+        return policy
+    try:
+        return EVICTION_POLICIES[policy](capacity)
+    except KeyError:
+        raise ValueError(
+            f"Unknown eviction policy '{policy}' (expected one of {', '.join(EVICTION_POLICIES)})"
+        ) from None
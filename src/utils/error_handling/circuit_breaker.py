@@ -226,6 +226,16 @@ def get_circuit_breaker(name: str) -> Optional[CircuitBreaker]:
     return _circuit_breakers.get(name)
 
 
+def get_circuit_breakers() -> Dict[str, CircuitBreaker]:
+    """
+    Get all circuit breakers in the global registry.
+    
+    Returns:
+        Dict[str, CircuitBreaker]: Circuit breakers by name (a copy of the registry)
+    """
+    return dict(_circuit_breakers)
+
+
 def register_circuit_breaker(
     name: str,
     failure_threshold: int = 5,
@@ -254,6 +254,11 @@ class DataValidator:
             for event_type, events in date_data.items():
                 repaired_events = []
                 
+                # Keep burst-mode aggregates, which are not per-event lists
+                if event_type == "bursts" and isinstance(events, dict):
+                    repaired_data[valid_date_key][event_type] = events
+                    continue
+                
                 if not isinstance(events, list):
                     repaired_data[valid_date_key][event_type] = []
                     continue
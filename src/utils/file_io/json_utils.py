@@ -11,7 +11,7 @@ import json
 import os
 import hashlib
 from pathlib import Path
-from typing import Dict, Any, Optional, Iterator, Union, List, Callable, TypeVar, Generic
+from typing import Dict, Any, Optional, Iterator, Union, List, Callable, TypeVar, Generic, Tuple
 import logging
 import io
 
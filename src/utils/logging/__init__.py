@@ -7,10 +7,18 @@ contextual information, and performance timing capabilities.
 
 from .structured_logger import StructuredLogger, ContextLogger, timed
 from .log_rotation import LogRotation
+from .log_writer import BackgroundLogWriter, flush_all
+from .log_sampling import SamplingPolicy, sampled_logging
+from .log_query import LogSearch
 
 __all__ = [
     'StructuredLogger',
     'ContextLogger',
     'LogRotation',
+    'BackgroundLogWriter',
+    'flush_all',
+    'SamplingPolicy',
+    'sampled_logging',
+    'LogSearch',
     'timed'
 ]
\ No newline at end of file
@@ -0,0 +1,524 @@
+"""
+Indexed search over structured JSON logs.
+
+Each JSON log segment (logs.json from StructuredLogger, tree.json from
+TreeLogger, or a rotated or compressed copy of either) gets a sparse index
+stored next to it as <segment>.idx. The index holds one block per minute of
+records: the block's byte offset, a bitmap of the levels it contains and a
+bitmap of the services it contains. A query first picks the
+blocks whose minute, levels and services can match, then seeks to those
+offsets and parses only those records. Offsets refer to decompressed bytes,
+so the same index serves a segment after LogRotation compresses it.
+
+Indexes are built on first query and extended as the live segment grows.
+Each index also records a hash of the segment's first bytes, so an index
+left behind by a rotated, replaced or truncated segment is rebuilt instead
+of trusted.
+"""
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from src.utils.logging.log_rotation import open_log_file
+
+# Bit position of each level in a block's level bitmap
+LEVEL_BITS = {
+    "DEBUG": 1 << 0,
+    "INFO": 1 << 1,
+    "WARNING": 1 << 2,
+    "ERROR": 1 << 3,
+    "CRITICAL": 1 << 4
+}
+OTHER_LEVEL_BIT = 1 << 5
+
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 2
+
+# Decompressed bytes hashed at the start of a segment to identify it
+HEAD_BYTES = 4096
+
+# Block minutes are UTC and sort lexicographically
+MINUTE_FORMAT = "%Y-%m-%dT%H:%M"
+
+
+@dataclass
+class IndexBlock:
+    """Records from one minute of a segment, stored back to back."""
+    minute: str
+    offset: int
+    end: int
+    count: int = 0
+    levels: int = 0
+    services: int = 0
+
+
+@dataclass
+class SegmentIndex:
+    """
+    Sparse index for one JSON log segment.
+    
+    Attributes:
+        path (Path): Indexed segment
+        indexed_bytes (int): Decompressed bytes covered by the index
+        head_bytes (int): Length of the segment head that head_hash covers
+        head_hash (str): Hash of the segment's first head_bytes decompressed bytes
+        services (List[str]): Service names; position i is bit i of a block's service bitmap
+        blocks (List[IndexBlock]): Blocks in file order
+    """
+    path: Path
+    indexed_bytes: int = 0
+    head_bytes: int = 0
+    head_hash: str = ""
+    services: List[str] = field(default_factory=list)
+    blocks: List[IndexBlock] = field(default_factory=list)
+    
+    @property
+    def index_path(self) -> Path:
+        """Path of the index file for this segment."""
+        return self.path.with_name(self.path.name + INDEX_SUFFIX)
+    
+    def service_mask(self, services: Iterable[str]) -> int:
+        """Bitmap of the given services (0 if none occur in this segment)."""
+        mask = 0
+        for service in services:
+            if service in self.services:
+                mask |= 1 << self.services.index(service)
+        return mask
+    
+    def add_record(self, record: Dict[str, Any], offset: int, end: int) -> None:
+        """Add one parsed record occupying bytes [offset, end)."""
+        minute = record_minute(record)
+        block = self.blocks[-1] if self.blocks else None
+        if block is None or block.minute != minute or block.end != offset:
+            block = IndexBlock(minute=minute, offset=offset, end=offset)
+            self.blocks.append(block)
+        
+        block.end = end
+        block.count += 1
+        block.levels |= LEVEL_BITS.get(str(record.get("level", "")).upper(), OTHER_LEVEL_BIT)
+        
+        service = record.get("service")
+        if service:
+            if service not in self.services:
+                self.services.append(service)
+            block.services |= 1 << self.services.index(service)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the on-disk index format."""
+        return {
+            "version": INDEX_VERSION,
+            "indexed_bytes": self.indexed_bytes,
+            "head": [self.head_bytes, self.head_hash],
+            "services": self.services,
+            "blocks": [
+                [b.minute, b.offset, b.end, b.count, b.levels, b.services]
+                for b in self.blocks
+            ]
+        }
+    
+    @classmethod
+    def from_dict(cls, path: Path, data: Dict[str, Any]) -> "SegmentIndex":
+        """Load from the on-disk index format."""
+        return cls(
+            path=path,
+            indexed_bytes=data["indexed_bytes"],
+            head_bytes=data["head"][0],
+            head_hash=data["head"][1],
+            services=list(data["services"]),
+            blocks=[IndexBlock(*block) for block in data["blocks"]]
+        )
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """
+    Parse a record timestamp as an aware UTC datetime.
+    
+    Args:
+        value: ISO 8601 string (naive values are taken as UTC)
+    
+    Returns:
+        Datetime, or None if the value is not a timestamp
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def record_time(record: Dict[str, Any]) -> Optional[datetime]:
+    """Get a record's time (StructuredLogger timestamp or TreeLogger iso_datetime)."""
+    return parse_timestamp(record.get("timestamp")) or parse_timestamp(record.get("iso_datetime"))
+
+
+def record_minute(record: Dict[str, Any]) -> str:
+    """Get the UTC minute key of a record ("" if it has no timestamp)."""
+    when = record_time(record)
+    return when.strftime(MINUTE_FORMAT) if when else ""
+
+
+class LogSearch:
+    """
+    Query API over the day directories of a log directory.
+    
+    Attributes:
+        log_dir (Path): Base directory for logs
+        _stats (Dict[str, int]): Index and query counters
+    """
+    
+    SEGMENT_GLOBS = ("logs.json*", "tree.json*")
+    
+    def __init__(self, log_dir: Union[str, Path] = "logs"):
+        """
+        Initialize a log search over a directory.
+        
+        Args:
+            log_dir: Base directory for logs
+        """
+        self.log_dir = Path(log_dir)
+        self._stats = {
+            "indexes_built": 0,
+            "indexes_extended": 0,
+            "indexes_stale": 0,
+            "records_indexed": 0,
+            "blocks_read": 0,
+            "blocks_skipped": 0,
+            "bytes_read": 0
+        }
+    
+    def search(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        levels: Optional[Iterable[str]] = None,
+        services: Optional[Iterable[str]] = None,
+        contains: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Find log records matching every given filter.
+        
+        Args:
+            start: Earliest record time, inclusive (naive values are UTC)
+            end: Latest record time, inclusive (naive values are UTC)
+            levels: Level names to include (e.g. {"ERROR", "CRITICAL"})
+            services: Service names to include
+            contains: Substring the message must contain
+            limit: Maximum number of records to return
+        
+        Returns:
+            Iterator over matching records, oldest segment first
+        """
+        start = self._as_utc(start)
+        end = self._as_utc(end)
+        level_names = {level.upper() for level in levels} if levels is not None else None
+        service_names = set(services) if services is not None else None
+        
+        level_mask = None
+        if level_names is not None:
+            level_mask = 0
+            for level in level_names:
+                level_mask |= LEVEL_BITS.get(level, OTHER_LEVEL_BIT)
+        
+        found = 0
+        for segment in self.find_segments(start, end):
+            index = self.get_index(segment)
+            
+            if service_names is not None:
+                service_mask = index.service_mask(service_names)
+                if not service_mask:
+                    self._stats["blocks_skipped"] += len(index.blocks)
+                    continue
+            else:
+                service_mask = None
+            
+            ranges = self._plan(index, start, end, level_mask, service_mask)
+            for record in self._read_ranges(segment, ranges):
+                if not self._matches(record, start, end, level_names, service_names, contains):
+                    continue
+                yield record
+                found += 1
+                if limit is not None and found >= limit:
+                    return
+    
+    def find_segments(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Path]:
+        """
+        List JSON log segments in day directories that can overlap a time range.
+        
+        Day directories are named in the writer's local date, so one day of
+        slack is allowed on each side.
+        
+        Args:
+            start: Earliest time of interest
+            end: Latest time of interest
+        
+        Returns:
+            Segment paths, oldest first
+        """
+        if not self.log_dir.exists():
+            return []
+        
+        first = (start.date() - timedelta(days=1)) if start else date.min
+        last = (end.date() + timedelta(days=1)) if end else date.max
+        
+        segments = []
+        for day_dir in sorted(self.log_dir.iterdir()):
+            if not day_dir.is_dir():
+                continue
+            try:
+                day = datetime.strptime(day_dir.name, "%Y-%m-%d").date()
+            except ValueError:
+                # Not a date-formatted directory, skip
+                continue
+            if first <= day <= last:
+                segments.extend(sorted(
+                    (path for pattern in self.SEGMENT_GLOBS for path in day_dir.glob(pattern)
+                     if path.suffix not in (INDEX_SUFFIX, ".tmp", ".rotating")),
+                    key=self._segment_order
+                ))
+        return segments
+    
+    def get_index(self, segment: Path) -> SegmentIndex:
+        """
+        Load a segment's index, building or extending it when out of date.
+        
+        An index whose head hash no longer matches the segment belongs to
+        different contents (a rotated archive, or a replaced or truncated
+        live file) and is rebuilt.
+        
+        Args:
+            segment: JSON log segment
+        
+        Returns:
+            Index covering the whole segment
+        """
+        index = self._load_index(segment)
+        if index is not None and not self._same_segment(index):
+            self._stats["indexes_stale"] += 1
+            index = None
+        compressed = segment.suffix in (".gz", ".zst")
+        
+        if index is not None:
+            if compressed:
+                return index
+            size = segment.stat().st_size
+            if size == index.indexed_bytes:
+                return index
+            if size > index.indexed_bytes:
+                self._index_from(index, index.indexed_bytes)
+                self._stats["indexes_extended"] += 1
+                self._save_index(index)
+                return index
+            # Smaller than indexed: the file was truncated, rebuild
+        
+        return self.build_index(segment)
+    
+    def build_index(self, segment: Path) -> SegmentIndex:
+        """
+        Build and save a segment's index from scratch.
+        
+        Args:
+            segment: JSON log segment
+        
+        Returns:
+            New index
+        """
+        index = SegmentIndex(path=segment)
+        self._index_from(index, 0)
+        self._stats["indexes_built"] += 1
+        self._save_index(index)
+        return index
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index and query statistics."""
+        return dict(self._stats)
+    
+    def _index_from(self, index: SegmentIndex, offset: int) -> None:
+        """Index the records of a segment from a byte offset to its end."""
+        with open_log_file(index.path, binary=True) as f:
+            if offset:
+                f.seek(offset)
+            for line in f:
+                end = offset + len(line)
+                if not line.endswith(b"\n"):
+                    # Partially written last line; index it on the next pass
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                if isinstance(record, dict):
+                    index.add_record(record, offset, end)
+                    self._stats["records_indexed"] += 1
+                offset = end
+        index.indexed_bytes = offset
+        
+        if index.head_bytes < min(offset, HEAD_BYTES):
+            index.head_bytes = min(offset, HEAD_BYTES)
+            index.head_hash = self._head_hash(index.path, index.head_bytes)
+    
+    def _same_segment(self, index: SegmentIndex) -> bool:
+        """Check that an index's head hash still matches its segment."""
+        try:
+            return self._head_hash(index.path, index.head_bytes) == index.head_hash
+        except (OSError, EOFError, RuntimeError):
+            return False
+    
+    @staticmethod
+    def _head_hash(segment: Path, length: int) -> str:
+        """Hash the first length decompressed bytes of a segment ("" if it is shorter)."""
+        if not length:
+            return ""
+        with open_log_file(segment, binary=True) as f:
+            head = b""
+            while len(head) < length:
+                chunk = f.read(length - len(head))
+                if not chunk:
+                    return ""
+                head += chunk
+        return hashlib.blake2b(head, digest_size=16).hexdigest()
+    
+    def _plan(
+        self,
+        index: SegmentIndex,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        level_mask: Optional[int],
+        service_mask: Optional[int]
+    ) -> List[Tuple[int, int]]:
+        """Pick the byte ranges whose blocks can match, merging neighbours."""
+        first_minute = start.strftime(MINUTE_FORMAT) if start else None
+        last_minute = end.strftime(MINUTE_FORMAT) if end else None
+        
+        ranges: List[Tuple[int, int]] = []
+        for block in index.blocks:
+            # Records without a timestamp ("" minute) are only kept for open ranges
+            wanted = (
+                (first_minute is None or block.minute >= first_minute)
+                and (last_minute is None or (block.minute and block.minute <= last_minute))
+                and (level_mask is None or block.levels & level_mask)
+                and (service_mask is None or block.services & service_mask)
+            )
+            if not wanted:
+                self._stats["blocks_skipped"] += 1
+                continue
+            self._stats["blocks_read"] += 1
+            if ranges and ranges[-1][1] == block.offset:
+                ranges[-1] = (ranges[-1][0], block.end)
+            else:
+                ranges.append((block.offset, block.end))
+        return ranges
+    
+    def _read_ranges(self, segment: Path, ranges: List[Tuple[int, int]]) -> Iterator[Dict[str, Any]]:
+        """Seek to each byte range and parse its records."""
+        if not ranges:
+            return
+        with open_log_file(segment, binary=True) as f:
+            for offset, end in ranges:
+                f.seek(offset)
+                # Line by line so a caller that stops early stops the reads too
+                while offset < end:
+                    line = f.readline()
+                    if not line:
+                        break
+                    offset += len(line)
+                    self._stats["bytes_read"] += len(line)
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(record, dict):
+                        yield record
+    
+    @staticmethod
+    def _matches(
+        record: Dict[str, Any],
+        start: Optional[datetime],
+        end: Optional[datetime],
+        levels: Optional[Set[str]],
+        services: Optional[Set[str]],
+        contains: Optional[str]
+    ) -> bool:
+        """Apply the exact filters to a record from a candidate block."""
+        if start is not None or end is not None:
+            when = record_time(record)
+            if when is None or (start and when < start) or (end and when > end):
+                return False
+        if levels is not None and str(record.get("level", "")).upper() not in levels:
+            return False
+        if services is not None and record.get("service") not in services:
+            return False
+        if contains is not None and contains not in str(record.get("message", "")):
+            return False
+        return True
+    
+    @staticmethod
+    def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+        """Normalize a query bound to an aware UTC datetime."""
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+    
+    @staticmethod
+    def _segment_order(path: Path) -> Tuple[int, str]:
+        """Order a day's segments oldest first (logs.json.2.gz, logs.json.1.gz, logs.json)."""
+        parts = path.name.split(".")
+        if len(parts) > 2 and parts[2].isdigit():
+            return (-int(parts[2]), path.name)
+        return (0, path.name)
+    
+    def _load_index(self, segment: Path) -> Optional[SegmentIndex]:
+        """Read a segment's index file, if present and readable."""
+        index_path = segment.with_name(segment.name + INDEX_SUFFIX)
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return None
+            return SegmentIndex.from_dict(segment, data)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
+    def _save_index(self, index: SegmentIndex) -> None:
+        """Write a segment's index next to it."""
+        temp = index.index_path.with_name(index.index_path.name + ".tmp")
+        try:
+            with open(temp, "w", encoding="utf-8") as f:
+                json.dump(index.to_dict(), f, separators=(",", ":"))
+            temp.replace(index.index_path)
+        except OSError:
+            # Read-only archive: the in-memory index still answers this query
+            pass
+
+
+def build_indexes(log_dir: Union[str, Path] = "logs") -> Dict[str, Any]:
+    """
+    Build or refresh the index of every segment in a log directory.
+    
+    Args:
+        log_dir: Base directory for logs
+    
+    Returns:
+        Dictionary with segment, block and timing counts
+    """
+    search = LogSearch(log_dir)
+    started = time.perf_counter()
+    segments = search.find_segments()
+    blocks = sum(len(search.get_index(segment).blocks) for segment in segments)
+    return {
+        **search.get_stats(),
+        "segments": len(segments),
+        "blocks": blocks,
+        "duration_ms": (time.perf_counter() - started) * 1000
+    }
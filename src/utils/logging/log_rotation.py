@@ -2,14 +2,82 @@
 Log rotation and cleanup utilities.
 
 This module provides utilities for log rotation and cleanup based on
-configurable retention policies.
+configurable retention policies. Finished day directories are compressed
+on a worker thread, total log size can be held under a byte budget by
+evicting the oldest days first, and every compressed day is recorded in an
+archive index (archive_index.json) so readers can find it without
+scanning the directory tree.
 """
 
+import gzip
+import io
+import json
 import os
 import shutil
-from datetime import datetime, timedelta
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import IO, Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import zstandard  # Optional faster, denser compression
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+# File suffix for each supported codec
+COMPRESSION_SUFFIXES = {
+    "gzip": ".gz",
+    "zstd": ".zst"
+}
+
+INDEX_FILE = "archive_index.json"
+
+# No timezone's date lags UTC-12's, so a day before it has ended for every writer
+EARLIEST_TIMEZONE = timezone(timedelta(hours=-12))
+
+
+def open_log_file(path: Union[str, Path], binary: bool = False) -> IO[Any]:
+    """
+    Open a log file for reading, decompressing by file suffix.
+    
+    Args:
+        path: Plain, .gz or .zst log file
+        binary: Return a byte stream (offsets then refer to decompressed bytes)
+        
+    Returns:
+        Text or byte stream over the decompressed contents
+        
+    Raises:
+        RuntimeError: If a .zst file is opened without zstandard installed
+    """
+    path = Path(path)
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb") if binary else gzip.open(path, "rt", encoding="utf-8")
+    if path.suffix == ".zst":
+        if not HAS_ZSTD:
+            raise RuntimeError(f"zstandard package not available to read {path}")
+        # Late files are appended to an archive as extra frames
+        raw = zstandard.ZstdDecompressor().stream_reader(
+            open(path, "rb"), read_across_frames=True, closefd=True
+        )
+        return raw if binary else io.TextIOWrapper(raw, encoding="utf-8")
+    return open(path, "rb") if binary else open(path, "r", encoding="utf-8")
+
+
+@dataclass
+class ArchiveSegment:
+    """A compressed day directory recorded in the archive index."""
+    date: str
+    codec: str
+    files: List[str] = field(default_factory=list)
+    original_bytes: int = 0
+    compressed_bytes: int = 0
+    archived_at: str = ""
 
 
 class LogRotation:
@@ -19,32 +87,311 @@ class LogRotation:
     This class provides methods for rotating log files and cleaning up
     old log files based on retention policies.
     
+    Compression, age cleanup and budget eviction run on a single worker
+    thread so rotation never blocks logging. Between day rollovers the
+    budget is rechecked from log writer flushes, at most once per
+    budget_check_interval.
+    
     Attributes:
         log_dir (Path): Base directory for logs
         retention_days (int): Number of days to keep log files
+        max_total_bytes (Optional[int]): Budget for all day directories (None for no limit)
+        compression (str): Codec for finished days ("gzip" or "zstd")
+        min_idle_seconds (float): Quiet time required before a day is compressed
+        budget_check_interval (float): Minimum seconds between flush-driven budget checks
     """
     
-    def __init__(self, log_dir: str = "logs", retention_days: int = 7):
+    def __init__(
+        self,
+        log_dir: Union[str, Path] = "logs",
+        retention_days: int = 7,
+        max_total_bytes: Optional[int] = None,
+        compression: str = "gzip",
+        min_idle_seconds: float = 300.0,
+        budget_check_interval: float = 60.0
+    ):
         """
         Initialize a new log rotation utility.
         
         Args:
             log_dir: Base directory for logs
             retention_days: Number of days to keep log files
+            max_total_bytes: Budget for all log directories (None for no limit)
+            compression: Codec for finished days ("gzip" or "zstd"); zstd
+                falls back to gzip when zstandard is not installed
+            min_idle_seconds: Skip days with files modified more recently than this
+            budget_check_interval: Minimum seconds between flush-driven budget checks
+            
+        Raises:
+            ValueError: If the compression codec is unknown
         """
+        if compression not in COMPRESSION_SUFFIXES:
+            valid = ", ".join(COMPRESSION_SUFFIXES)
+            raise ValueError(f"Invalid compression: {compression}. Valid codecs are: {valid}")
+            
         self.log_dir = Path(log_dir)
         self.retention_days = retention_days
+        self.max_total_bytes = max_total_bytes
+        self.compression = compression if compression != "zstd" or HAS_ZSTD else "gzip"
+        self.min_idle_seconds = min_idle_seconds
+        self.budget_check_interval = budget_check_interval
+        
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-rotation")
+        self._pending: Optional[Future] = None
+        self._pending_budget: Optional[Future] = None
+        self._last_budget_check = 0.0
+        self._over_budget = False
+        self._lock = threading.Lock()
+        self._stats = {
+            "days_compressed": 0,
+            "bytes_saved": 0,
+            "days_evicted": 0,
+            "days_expired": 0,
+            "budget_checks": 0,
+            "over_budget": 0,
+            "errors": 0
+        }
         
-    def rotate_logs(self) -> None:
+    def rotate_logs(self) -> Future:
         """
         Rotate logs by creating a new directory for the current day.
         
-        This method ensures that a new directory exists for the current day's logs.
-        It does not move or modify existing log files.
+        This method ensures that a new directory exists for the current day's
+        logs, then schedules maintenance on the worker thread: finished days
+        are compressed, days past retention are removed and the byte budget
+        is enforced. Calls made while maintenance is queued share its run.
+        
+        Returns:
+            Future that completes when the scheduled maintenance has run
         """
         today_dir = self._get_today_dir()
         today_dir.mkdir(parents=True, exist_ok=True)
         
+        with self._lock:
+            if self._pending is None or self._pending.running() or self._pending.done():
+                self._pending = self._executor.submit(self._run_maintenance)
+            return self._pending
+            
+    def set_budget(self, max_total_bytes: Optional[int]) -> None:
+        """
+        Change the byte budget and schedule a check against it.
+        
+        Args:
+            max_total_bytes: Budget for all log directories (None for no limit)
+        """
+        self.max_total_bytes = max_total_bytes
+        self._over_budget = False
+        self._last_budget_check = 0.0
+        self.on_flush()
+        
+    def on_flush(self) -> None:
+        """
+        Schedule a budget check after a log writer flush, if one is due.
+        
+        Called on the writer thread; only submits work to the worker.
+        """
+        if self.max_total_bytes is None:
+            return
+        
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_budget_check < self.budget_check_interval:
+                return
+            if self._pending_budget is not None and not self._pending_budget.done():
+                return
+            self._last_budget_check = now
+            try:
+                self._pending_budget = self._executor.submit(self._run_budget_check)
+            except RuntimeError:
+                # Worker already shut down (interpreter exit)
+                pass
+            
+    def _run_budget_check(self) -> None:
+        """Evict old days if the logs have grown past the budget (worker thread)."""
+        try:
+            self._stats["budget_checks"] += 1
+            self.enforce_budget()
+        except Exception as e:
+            self._stats["errors"] += 1
+            print(f"Log budget check failed in {self.log_dir}: {e}", file=sys.stderr)
+            
+    def on_day_rollover(self, date: str) -> None:
+        """
+        Schedule maintenance when a log writer moves to a new day.
+        
+        Args:
+            date: The new day's date (YYYY-MM-DD)
+        """
+        self.rotate_logs()
+        
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the worker thread.
+        
+        Args:
+            wait: Wait for running maintenance to finish
+        """
+        self._executor.shutdown(wait=wait)
+        
+    def _run_maintenance(self) -> None:
+        """Compress, expire and evict day directories (worker thread)."""
+        try:
+            self.compress_finished_days()
+            self._stats["days_expired"] += len(self.cleanup_old_logs())
+            self.enforce_budget()
+        except Exception as e:
+            self._stats["errors"] += 1
+            print(f"Log rotation failed in {self.log_dir}: {e}", file=sys.stderr)
+            
+    def compress_finished_days(self) -> List[ArchiveSegment]:
+        """
+        Compress every day directory that has ended for all writers and gone quiet.
+        
+        Each file is compressed next to the original (logs.log becomes
+        logs.log.gz) and the original removed, so the day layout is kept.
+        Writers name day directories in their own timezone and keep the
+        day's files open until their next record, so a day is only
+        compressed once it has ended in every timezone.
+        
+        Returns:
+            Segments added to the archive index
+        """
+        segments = []
+        oldest_open = self._oldest_open_day()
+        now = time.time()
+        
+        for day_dir, _ in self._list_day_dirs():
+            if day_dir.name >= oldest_open:
+                continue
+            pending = [
+                path for path in day_dir.iterdir()
+                if path.is_file() and path.suffix not in (".gz", ".zst", ".tmp", ".idx")
+            ]
+            if not pending:
+                continue
+            if any(now - path.stat().st_mtime < self.min_idle_seconds for path in pending):
+                # Still being written (late records or another timezone's "today")
+                continue
+            segments.append(self._compress_day(day_dir, pending))
+            
+        if segments:
+            index = self._load_index()
+            for segment in segments:
+                existing = index.get(segment.date)
+                if existing is not None:
+                    # Files written after an earlier pass; merge into one segment
+                    segment.files = sorted(set(existing.files) | set(segment.files))
+                    segment.original_bytes += existing.original_bytes
+                    segment.compressed_bytes += existing.compressed_bytes
+                index[segment.date] = segment
+            self._save_index(index)
+        return segments
+        
+    def _compress_day(self, day_dir: Path, paths: List[Path]) -> ArchiveSegment:
+        """
+        Compress the given files of one day directory.
+        
+        A file written after the day was already compressed is appended to
+        the existing archive as another gzip member (or zstd frame), which
+        readers decompress as one stream, so no archived records are lost.
+        """
+        suffix = COMPRESSION_SUFFIXES[self.compression]
+        segment = ArchiveSegment(date=day_dir.name, codec=self.compression)
+        
+        for path in paths:
+            target = path.with_name(path.name + suffix)
+            temp = target.with_name(target.name + ".tmp")
+            with open(path, "rb") as f_in, self._open_compressed(temp) as f_out:
+                shutil.copyfileobj(f_in, f_out)
+            
+            original = path.stat().st_size
+            compressed = temp.stat().st_size
+            appended = target.exists()
+            if appended:
+                with open(temp, "rb") as f_in, open(target, "ab") as f_out:
+                    shutil.copyfileobj(f_in, f_out)
+                temp.unlink()
+            else:
+                os.replace(temp, target)
+            path.unlink()
+            
+            # Search indexes hold decompressed offsets, so a complete one stays
+            # valid unless the archive already held earlier records
+            index_path = path.with_name(path.name + ".idx")
+            target_index = target.with_name(target.name + ".idx")
+            if appended and target_index.exists():
+                target_index.unlink()
+            if index_path.exists():
+                if not appended and self._index_covers(index_path, original):
+                    os.replace(index_path, target_index)
+                else:
+                    index_path.unlink()
+            
+            segment.files.append(target.name)
+            segment.original_bytes += original
+            segment.compressed_bytes += compressed
+            
+        segment.archived_at = datetime.now(timezone.utc).isoformat()
+        self._stats["days_compressed"] += 1
+        self._stats["bytes_saved"] += segment.original_bytes - segment.compressed_bytes
+        return segment
+        
+    @staticmethod
+    def _index_covers(index_path: Path, size: int) -> bool:
+        """Check whether a search index covers a whole file of the given size."""
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("indexed_bytes") == size
+        except (OSError, ValueError):
+            return False
+        
+    def _open_compressed(self, path: Path) -> IO[bytes]:
+        """Open a file for writing with the configured codec."""
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor().stream_writer(open(path, "wb"), closefd=True)
+        return gzip.open(path, "wb")
+        
+    def enforce_budget(self) -> List[str]:
+        """
+        Remove the oldest day directories until the logs fit max_total_bytes.
+        
+        Days a writer may still have open are never removed; if those alone
+        exceed the budget it is counted as "over_budget" and reported once.
+        
+        Returns:
+            List of removed directory names
+        """
+        if self.max_total_bytes is None:
+            return []
+            
+        days = [(day_dir, self._dir_size(day_dir)) for day_dir, _ in self._list_day_dirs()]
+        total = sum(size for _, size in days)
+        oldest_open = self._oldest_open_day()
+        removed = []
+        
+        for day_dir, size in days:
+            if total <= self.max_total_bytes or day_dir.name >= oldest_open:
+                break
+            shutil.rmtree(day_dir)
+            total -= size
+            removed.append(day_dir.name)
+            
+        over_budget = total > self.max_total_bytes
+        if over_budget:
+            self._stats["over_budget"] += 1
+            if not self._over_budget:
+                print(
+                    f"Logs in {self.log_dir} use {total} bytes, over the "
+                    f"{self.max_total_bytes} byte budget, with only open days left",
+                    file=sys.stderr
+                )
+        self._over_budget = over_budget
+        
+        if removed:
+            self._stats["days_evicted"] += len(removed)
+            self._drop_from_index(removed)
+        return removed
+        
     def cleanup_old_logs(self) -> List[str]:
         """
         Remove log directories older than retention_days.
@@ -72,8 +419,30 @@ class LogRotation:
                 # Not a date-formatted directory, skip
                 continue
                 
+        if removed_dirs:
+            self._drop_from_index(removed_dirs)
         return removed_dirs
         
+    def get_archive_index(self) -> List[ArchiveSegment]:
+        """
+        Get the archived segments, oldest first.
+        
+        Returns:
+            List of ArchiveSegment entries
+        """
+        with self._lock:
+            index = self._load_index()
+        return [index[date] for date in sorted(index)]
+        
+    def get_stats(self) -> Dict[str, Any]:
+        """Get rotation statistics."""
+        return {
+            **self._stats,
+            "codec": self.compression,
+            "total_bytes": self.get_log_size(),
+            "max_total_bytes": self.max_total_bytes
+        }
+        
     def get_log_size(self, days: Optional[int] = None) -> int:
         """
         Get total size of log files in bytes.
@@ -133,6 +502,66 @@ class LogRotation:
             "json": date_dir / "logs.json"
         }
         
+    def _list_day_dirs(self) -> List[Tuple[Path, datetime]]:
+        """List (directory, date) for date-named directories, oldest first."""
+        if not self.log_dir.exists():
+            return []
+            
+        days = []
+        for item in self.log_dir.iterdir():
+            if not item.is_dir():
+                continue
+            try:
+                days.append((item, datetime.strptime(item.name, "%Y-%m-%d")))
+            except ValueError:
+                # Not a date-formatted directory, skip
+                continue
+        return sorted(days, key=lambda day: day[1])
+        
+    @staticmethod
+    def _dir_size(path: Path) -> int:
+        """Total size of the files under a directory."""
+        return sum(file_path.stat().st_size for file_path in path.glob("**/*") if file_path.is_file())
+        
+    def _load_index(self) -> Dict[str, ArchiveSegment]:
+        """Read the archive index, keyed by date."""
+        try:
+            with open(self.log_dir / INDEX_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {entry["date"]: ArchiveSegment(**entry) for entry in data.get("segments", [])}
+        
+    def _save_index(self, index: Dict[str, ArchiveSegment]) -> None:
+        """Write the archive index atomically."""
+        path = self.log_dir / INDEX_FILE
+        temp = path.with_name(path.name + ".tmp")
+        data = {"segments": [asdict(index[date]) for date in sorted(index)]}
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp, path)
+        
+    def _drop_from_index(self, dates: List[str]) -> None:
+        """Remove deleted days from the archive index."""
+        index = self._load_index()
+        if any(date in index for date in dates):
+            for date in dates:
+                index.pop(date, None)
+            self._save_index(index)
+            
+    @staticmethod
+    def _oldest_open_day() -> str:
+        """
+        Get the oldest date a log writer may still be writing to.
+        
+        TreeLogger names days in fixed EST and StructuredLogger in local
+        time; no timezone's date is behind UTC-12's.
+        
+        Returns:
+            Date string in YYYY-MM-DD format
+        """
+        return datetime.now(EARLIEST_TIMEZONE).strftime("%Y-%m-%d")
+        
     def _get_today_dir(self) -> Path:
         """Get directory path for today's logs."""
         today = datetime.now().strftime("%Y-%m-%d")
@@ -152,4 +581,33 @@ class LogRotation:
             date = datetime.now()
             
         date_str = date.strftime("%Y-%m-%d")
-        return self.log_dir / date_str
\ No newline at end of file
+        return self.log_dir / date_str
+
+
+# One rotation worker per log directory so loggers sharing it never race
+_rotations: Dict[Path, LogRotation] = {}
+_rotations_lock = threading.Lock()
+
+
+def get_log_rotation(log_dir: Union[str, Path], **options: Any) -> LogRotation:
+    """
+    Get the shared LogRotation for a log directory.
+    
+    Args:
+        log_dir: Base directory for logs
+        **options: LogRotation options, used when the directory's instance is
+            created; a max_total_bytes other than None also updates the
+            budget of an existing instance
+        
+    Returns:
+        LogRotation for the directory
+    """
+    key = Path(log_dir).resolve()
+    with _rotations_lock:
+        rotation = _rotations.get(key)
+        if rotation is None:
+            rotation = LogRotation(key, **options)
+            _rotations[key] = rotation
+        elif options.get("max_total_bytes") not in (None, rotation.max_total_bytes):
+            rotation.set_budget(options["max_total_bytes"])
+        return rotation
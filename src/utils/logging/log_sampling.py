@@ -0,0 +1,305 @@
+"""
+Per-call-site log sampling and rate limiting.
+
+Hot paths (skipped channel updates, queue flushes, cache lookups) can log
+on every iteration. This module bounds that volume: each call site that opts
+in gets its own token bucket, plus an optional per-level sampling
+probability. Suppressed messages are counted, and the logger writes one
+"Suppressed N similar messages" summary per call site instead of each one.
+
+Call sites opt in with the ``sample`` keyword on any log call, or for every
+log call made inside a function with the ``sampled_logging`` decorator.
+"""
+
+import asyncio
+import contextvars
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, TypeVar, cast
+
+from src.types.models import LogLevel
+
+# Type variable for generic function decorator
+F = TypeVar('F', bound=Callable[..., Any])
+
+
+@dataclass
+class SamplingPolicy:
+    """
+    How often a call site may log.
+    
+    Attributes:
+        rate: Sustained messages per second allowed per call site
+        burst: Messages allowed back to back before rate limiting starts
+        level_probabilities: Chance of keeping a message, by level (default 1.0)
+        summary_interval: Seconds between "suppressed" summaries for a quiet site
+    """
+    rate: float = 1.0
+    burst: int = 10
+    level_probabilities: Dict[LogLevel, float] = field(default_factory=dict)
+    summary_interval: float = 60.0
+
+
+DEFAULT_SAMPLING_POLICY = SamplingPolicy()
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+    
+    Attributes:
+        rate (float): Tokens added per second
+        capacity (float): Maximum tokens held
+        tokens (float): Tokens currently available
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize a full bucket.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+    
+    def try_acquire(self, now: Optional[float] = None) -> bool:
+        """
+        Take one token if available.
+        
+        Args:
+            now: Current monotonic time (default: time.monotonic())
+        
+        Returns:
+            True if a token was taken
+        """
+        now = time.monotonic() if now is None else now
+        elapsed = max(0.0, now - self._updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self._updated = max(now, self._updated)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+@dataclass
+class CallSiteState:
+    """Sampling state for one call site."""
+    bucket: TokenBucket
+    policy: SamplingPolicy
+    level: LogLevel
+    message: str = ""
+    suppressed: int = 0
+    first_suppressed: float = 0.0
+
+
+@dataclass
+class SuppressionSummary:
+    """Messages dropped at one call site since its last summary."""
+    site: Hashable
+    level: LogLevel
+    message: str
+    count: int
+    period_s: float
+
+
+class LogSampler:
+    """
+    Tracks per-call-site buckets and suppressed counts for one logger.
+    
+    Attributes:
+        _sites (Dict[Hashable, CallSiteState]): State per call site
+        _stats (Dict[str, int]): Sampling counters
+    """
+    
+    def __init__(self, rng: Optional[random.Random] = None):
+        """
+        Initialize the sampler.
+        
+        Args:
+            rng: Random source for probabilistic sampling (for tests)
+        """
+        self._sites: Dict[Hashable, CallSiteState] = {}
+        self._lock = threading.Lock()
+        self._random = rng or random.Random()
+        self._next_sweep = 0.0
+        self._stats = {
+            "sampled": 0,
+            "suppressed": 0,
+            "summaries": 0
+        }
+    
+    def check(
+        self,
+        site: Hashable,
+        level: LogLevel,
+        message: str,
+        policy: SamplingPolicy
+    ) -> Tuple[bool, List[SuppressionSummary]]:
+        """
+        Decide whether a message may be logged.
+        
+        Args:
+            site: Call site key (file and line, or an explicit key)
+            level: Message level
+            message: Message text (kept as the summary's example)
+            policy: Sampling policy for the call site
+        
+        Returns:
+            Tuple of (allowed, summaries to log first). Summaries cover this
+            site when it logs again after suppressing, and any other site
+            that has gone quiet with suppressed messages pending.
+        """
+        now = time.monotonic()
+        summaries: List[SuppressionSummary] = []
+        
+        with self._lock:
+            state = self._sites.get(site)
+            if state is None:
+                state = CallSiteState(
+                    bucket=TokenBucket(policy.rate, policy.burst),
+                    policy=policy,
+                    level=level
+                )
+                self._sites[site] = state
+            self._stats["sampled"] += 1
+            
+            probability = policy.level_probabilities.get(level, 1.0)
+            allowed = (
+                (probability >= 1.0 or self._random.random() < probability)
+                and state.bucket.try_acquire(now)
+            )
+            
+            if allowed:
+                if state.suppressed:
+                    summaries.append(self._take_summary(site, state, now))
+            else:
+                if not state.suppressed:
+                    state.first_suppressed = now
+                    self._next_sweep = min(self._next_sweep, now + policy.summary_interval)
+                state.suppressed += 1
+                state.level = level
+                state.message = message
+                self._stats["suppressed"] += 1
+            
+            if now >= self._next_sweep:
+                summaries.extend(self._sweep(now))
+        
+        return allowed, summaries
+    
+    def _take_summary(self, site: Hashable, state: CallSiteState, now: float) -> SuppressionSummary:
+        """Reset a site's suppressed count and describe what was dropped."""
+        summary = SuppressionSummary(
+            site=site,
+            level=state.level,
+            message=state.message,
+            count=state.suppressed,
+            period_s=round(now - state.first_suppressed, 3)
+        )
+        state.suppressed = 0
+        self._stats["summaries"] += 1
+        return summary
+    
+    def _sweep(self, now: float) -> List[SuppressionSummary]:
+        """Summarize sites that suppressed messages and then went quiet."""
+        summaries = []
+        next_sweep = now + DEFAULT_SAMPLING_POLICY.summary_interval
+        for site, state in self._sites.items():
+            if not state.suppressed:
+                continue
+            due = state.first_suppressed + state.policy.summary_interval
+            if now >= due:
+                summaries.append(self._take_summary(site, state, now))
+            else:
+                next_sweep = min(next_sweep, due)
+        self._next_sweep = next_sweep
+        return summaries
+    
+    def flush(self) -> List[SuppressionSummary]:
+        """Summarize every site with pending suppressed messages."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                self._take_summary(site, state, now)
+                for site, state in self._sites.items()
+                if state.suppressed
+            ]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get sampling statistics."""
+        with self._lock:
+            return {
+                **self._stats,
+                "call_sites": len(self._sites),
+                "pending_suppressed": sum(state.suppressed for state in self._sites.values())
+            }
+
+
+# Policy applied to log calls made inside a @sampled_logging function
+_active_policy: contextvars.ContextVar[Optional[SamplingPolicy]] = contextvars.ContextVar(
+    "sampling_policy", default=None
+)
+
+
+def get_active_policy() -> Optional[SamplingPolicy]:
+    """Get the sampling policy set by an enclosing @sampled_logging function."""
+    return _active_policy.get()
+
+
+def sampled_logging(
+    rate: float = 1.0,
+    burst: int = 10,
+    level_probabilities: Optional[Dict[LogLevel, float]] = None,
+    summary_interval: float = 60.0
+) -> Callable[[F], F]:
+    """
+    Decorator that samples every log call made while the function runs.
+    
+    Each log call inside the function is still its own call site with its
+    own bucket; the decorator only supplies the policy.
+    
+    Args:
+        rate: Sustained messages per second allowed per call site
+        burst: Messages allowed back to back before rate limiting starts
+        level_probabilities: Chance of keeping a message, by level
+        summary_interval: Seconds between summaries for a quiet site
+    
+    Returns:
+        Decorated function
+    """
+    policy = SamplingPolicy(
+        rate=rate,
+        burst=burst,
+        level_probabilities=level_probabilities or {},
+        summary_interval=summary_interval
+    )
+    
+    def decorator(func: F) -> F:
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                token = _active_policy.set(policy)
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    _active_policy.reset(token)
+            
+            return cast(F, async_wrapper)
+        
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            token = _active_policy.set(policy)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _active_policy.reset(token)
+        
+        return cast(F, wrapper)
+    return decorator
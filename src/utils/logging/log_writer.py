@@ -0,0 +1,385 @@
+"""
+Background buffered log writer.
+
+This module moves log file I/O off the calling thread. Loggers push
+preformatted records onto a lock-free queue; a single writer thread per log
+directory keeps the day's files open, writes records in batches, flushes on
+an interval (or immediately for errors) and switches to a new day directory
+at midnight. Records still queued at shutdown are written before exit. The
+queue is bounded: if the disk cannot keep up, new records are dropped and
+counted rather than growing memory without limit.
+"""
+
+import atexit
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, IO, List, Optional, Union
+
+
+@dataclass
+class LogRecord:
+    """A preformatted log record waiting to be written."""
+    date: str
+    text: str
+    json: str
+    is_error: bool = False
+
+
+class BackgroundLogWriter:
+    """
+    Writes log records for one log directory on a background thread.
+    
+    submit() only appends to a deque (atomic in CPython) and wakes the
+    writer when a batch fills up or an error is logged; otherwise the writer
+    wakes once per flush interval. Files are opened once per day and kept
+    open between batches. Records submitted while max_queue_size records are
+    pending, or lost to a failed write, are counted as "dropped".
+    
+    Attributes:
+        log_dir (Path): Base directory; files go to log_dir/YYYY-MM-DD/
+        flush_interval (float): Maximum seconds a record waits before flushing
+        batch_size (int): Queued records that trigger an early write
+        max_queue_size (int): Pending records beyond which new ones are dropped
+        _queue (Deque): Pending records and flush markers
+        _handles (Dict[str, IO]): Open files for the current day by kind
+        _day_listeners (List[Callable]): Called with the new date after a day rollover
+        _flush_listeners (List[Callable]): Called after files are flushed
+        _stats (Dict[str, int]): Writer counters
+    """
+    
+    FILE_NAMES = {
+        "main": "logs.log",
+        "error": "errors.log",
+        "json": "logs.json"
+    }
+    
+    def __init__(
+        self,
+        log_dir: Union[str, Path],
+        flush_interval: float = 1.0,
+        batch_size: int = 256,
+        max_queue_size: int = 50000
+    ):
+        """
+        Initialize and start the writer thread.
+        
+        Args:
+            log_dir: Base directory for log files
+            flush_interval: Seconds between periodic flushes
+            batch_size: Queue length that wakes the writer early
+            max_queue_size: Pending records beyond which new ones are dropped
+        """
+        self.log_dir = Path(log_dir)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_queue_size = max(batch_size, max_queue_size)
+        
+        self._queue: Deque[Union[LogRecord, threading.Event]] = deque()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._handles: Dict[str, IO[str]] = {}
+        self._current_date: Optional[str] = None
+        self._reopen_requested = False
+        self._day_listeners: List[Callable[[str], Any]] = []
+        self._flush_listeners: List[Callable[[], Any]] = []
+        self._stats = {
+            "submitted": 0,
+            "written": 0,
+            "batches": 0,
+            "flushes": 0,
+            "rotations": 0,
+            "write_errors": 0,
+            "dropped": 0
+        }
+        self._dropping = False
+        
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"log-writer[{self.log_dir}]",
+            daemon=True
+        )
+        self._thread.start()
+    
+    def submit(self, record: LogRecord) -> None:
+        """
+        Queue a record for writing without blocking on disk I/O.
+        
+        Args:
+            record: Preformatted log record
+        """
+        if self._closed and not self._thread.is_alive():
+            # Writer is gone (interpreter shutdown); write inline so nothing is lost
+            self._write_batch([record])
+            self._flush_handles()
+            return
+        
+        self._stats["submitted"] += 1
+        if len(self._queue) >= self.max_queue_size:
+            # The disk is not keeping up; shed new records instead of growing
+            self._stats["dropped"] += 1
+            if not self._dropping:
+                self._dropping = True
+                print(
+                    f"Log writer queue for {self.log_dir} is full; dropping records",
+                    file=sys.stderr
+                )
+            self._wakeup.set()
+            return
+        
+        self._dropping = False
+        self._queue.append(record)
+        if record.is_error or len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+    
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Wait until every record submitted so far is written and flushed.
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+        
+        Returns:
+            True if the records were flushed before the timeout
+        """
+        if self._closed or threading.current_thread() is self._thread:
+            return True
+        
+        marker = threading.Event()
+        self._queue.append(marker)
+        self._wakeup.set()
+        return marker.wait(timeout)
+    
+    def add_day_listener(self, callback: Callable[[str], Any]) -> None:
+        """
+        Register a callback for day rollovers (runs on the writer thread).
+        
+        Args:
+            callback: Called with the new date; should hand off any slow work
+        """
+        if callback not in self._day_listeners:
+            self._day_listeners.append(callback)
+    
+    def add_flush_listener(self, callback: Callable[[], Any]) -> None:
+        """
+        Register a callback run after each flush (runs on the writer thread).
+        
+        Args:
+            callback: Called with no arguments; should hand off any slow work
+        """
+        if callback not in self._flush_listeners:
+            self._flush_listeners.append(callback)
+    
+    def reopen(self) -> None:
+        """Close open files so the next batch reopens them (after external rotation)."""
+        self._reopen_requested = True
+        self._wakeup.set()
+    
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """
+        Write all pending records, close files and stop the writer thread.
+        
+        Args:
+            timeout: Maximum seconds to wait for the writer to drain
+        """
+        if self._closed:
+            return
+        
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join(timeout)
+        
+        # Anything queued while the thread was exiting is written inline
+        if not self._thread.is_alive() and self._queue:
+            self._write_batch([item for item in self._queue if isinstance(item, LogRecord)])
+            self._queue.clear()
+            self._flush_handles()
+    
+    def _run(self) -> None:
+        """Writer thread main loop."""
+        last_flush = time.monotonic()
+        
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            stopping = self._closed
+            
+            if self._reopen_requested:
+                self._reopen_requested = False
+                self._close_handles()
+            
+            # Drain everything queued so far; the deque may keep growing
+            records: List[LogRecord] = []
+            markers: List[threading.Event] = []
+            urgent = False
+            while self._queue:
+                item = self._queue.popleft()
+                if isinstance(item, threading.Event):
+                    markers.append(item)
+                    urgent = True
+                else:
+                    records.append(item)
+                    urgent = urgent or item.is_error
+            
+            if records:
+                self._write_batch(records)
+            
+            now = time.monotonic()
+            if urgent or stopping or now - last_flush >= self.flush_interval:
+                self._flush_handles()
+                last_flush = now
+                for callback in self._flush_listeners:
+                    try:
+                        callback()
+                    except Exception as e:
+                        print(f"Log writer flush listener failed: {e}", file=sys.stderr)
+            
+            for marker in markers:
+                marker.set()
+            
+            if stopping and not self._queue:
+                self._close_handles()
+                return
+    
+    def _open_day(self, date: str) -> None:
+        """Switch the open files to a day directory."""
+        rolled_over = self._current_date is not None and date != self._current_date
+        if rolled_over:
+            self._stats["rotations"] += 1
+        self._close_handles()
+        
+        day_dir = self.log_dir / date
+        day_dir.mkdir(parents=True, exist_ok=True)
+        self._handles["main"] = self._open(day_dir, "main")
+        self._handles["json"] = self._open(day_dir, "json")
+        self._current_date = date
+        
+        if rolled_over:
+            for callback in self._day_listeners:
+                try:
+                    callback(date)
+                except Exception as e:
+                    print(f"Log writer day listener failed: {e}", file=sys.stderr)
+    
+    def _open(self, day_dir: Path, kind: str) -> IO[str]:
+        """Open one of the day's files for appending."""
+        return open(day_dir / self.FILE_NAMES[kind], "a", encoding="utf-8")
+    
+    def _write_batch(self, records: List[LogRecord]) -> None:
+        """Write records to the day's files, rotating when the date changes."""
+        main: List[str] = []
+        errors: List[str] = []
+        json_lines: List[str] = []
+        
+        try:
+            for record in records:
+                if record.date != self._current_date or not self._handles:
+                    self._write_lines(main, errors, json_lines)
+                    main, errors, json_lines = [], [], []
+                    self._open_day(record.date)
+                
+                main.append(record.text)
+                json_lines.append(record.json)
+                if record.is_error:
+                    errors.append(record.text)
+            
+            self._write_lines(main, errors, json_lines)
+            self._stats["written"] += len(records)
+            self._stats["batches"] += 1
+        except OSError as e:
+            self._stats["write_errors"] += 1
+            self._stats["dropped"] += len(records)
+            self._close_handles()
+            print(f"Log writer failed to write {len(records)} records: {e}", file=sys.stderr)
+    
+    def _write_lines(self, main: List[str], errors: List[str], json_lines: List[str]) -> None:
+        """Append buffered lines to the open files."""
+        if main:
+            self._handles["main"].write("\n".join(main) + "\n")
+        if errors:
+            if "error" not in self._handles:
+                # errors.log only exists on days with errors
+                self._handles["error"] = self._open(self.log_dir / self._current_date, "error")
+            self._handles["error"].write("\n".join(errors) + "\n")
+        if json_lines:
+            self._handles["json"].write("\n".join(json_lines) + "\n")
+    
+    def _flush_handles(self) -> None:
+        """Flush open files to the OS."""
+        try:
+            for handle in self._handles.values():
+                handle.flush()
+            self._stats["flushes"] += 1
+        except OSError as e:
+            self._stats["write_errors"] += 1
+            print(f"Log writer failed to flush: {e}", file=sys.stderr)
+    
+    def _close_handles(self) -> None:
+        """Close every open file."""
+        for handle in self._handles.values():
+            try:
+                handle.close()
+            except OSError:
+                pass
+        self._handles = {}
+        self._current_date = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get writer statistics."""
+        return {
+            **self._stats,
+            "queue_size": len(self._queue),
+            "open_files": len(self._handles),
+            "running": self._thread.is_alive()
+        }
+
+
+# One writer per log directory so loggers sharing files never interleave lines
+_writers: Dict[Path, BackgroundLogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_log_writer(log_dir: Union[str, Path]) -> BackgroundLogWriter:
+    """
+    Get the shared background writer for a log directory.
+    
+    Args:
+        log_dir: Base directory for log files
+    
+    Returns:
+        Running BackgroundLogWriter for the directory
+    """
+    key = Path(log_dir).resolve()
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None or writer._closed:
+            writer = BackgroundLogWriter(key)
+            _writers[key] = writer
+        return writer
+
+
+def flush_all(timeout: Optional[float] = 5.0) -> bool:
+    """
+    Flush every background writer.
+    
+    Args:
+        timeout: Maximum seconds to wait per writer
+    
+    Returns:
+        True if every writer flushed in time
+    """
+    with _writers_lock:
+        writers = list(_writers.values())
+    return all([writer.flush(timeout) for writer in writers])
+
+
+@atexit.register
+def close_all() -> None:
+    """Drain and close every background writer (runs at interpreter exit)."""
+    with _writers_lock:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.close()
@@ -6,25 +6,50 @@ This module provides a comprehensive logging system with:
 - Configurable log levels (DEBUG, INFO, WARNING, ERROR, CRITICAL)
 - Performance timing for critical operations
 - Contextual logging with proper field naming
-- Log rotation and cleanup with retention policies
+- Log rotation and cleanup with retention policies, compression and a disk budget
+- File writes batched on a background thread, off the event loop
+- Opt-in per-call-site sampling and rate limiting for hot paths
+- Lazy records: level checked before any message or context formatting
+- Indexed search over JSON logs on disk, including compressed days
 """
 
-import json
+import asyncio
 import logging
 import os
+import sys
 import time
-import shutil
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from functools import wraps
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Union, TypeVar, cast
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union, TypeVar, cast
 
 from src.types.models import LogEntry, LogLevel
 from src.utils.cache.circular_buffer import CircularBuffer
+from src.utils.logging.log_query import LogSearch
+from src.utils.logging.log_rotation import get_log_rotation
+from src.utils.logging.log_writer import LogRecord, get_log_writer
+from src.utils.logging.log_sampling import (
+    DEFAULT_SAMPLING_POLICY, LogSampler, SamplingPolicy, SuppressionSummary, get_active_policy
+)
+from src.utils.performance.timing import record_timing
 
 # Type variable for generic function decorator
 F = TypeVar('F', bound=Callable[..., Any])
 
+# A message, or a callable producing it only if the level is enabled
+Message = Union[str, Callable[[], str]]
+
+# Numeric ordering of levels for cheap enabled checks
+LEVEL_VALUES = {
+    LogLevel.DEBUG: 0,
+    LogLevel.INFO: 1,
+    LogLevel.WARNING: 2,
+    LogLevel.ERROR: 3,
+    LogLevel.CRITICAL: 4
+}
+_DEBUG_VALUE = LEVEL_VALUES[LogLevel.DEBUG]
+_INFO_VALUE = LEVEL_VALUES[LogLevel.INFO]
+
 class StructuredLogger:
     """
     Structured logger with JSON formatting and performance monitoring.
@@ -49,7 +74,8 @@ class StructuredLogger:
         level: Union[LogLevel, str] = LogLevel.INFO,
         log_dir: Union[str, Path] = "logs",
         max_memory_entries: int = 1000,
-        retention_days: int = 7
+        retention_days: int = 7,
+        max_total_bytes: Optional[int] = None
     ):
         """
         Initialize a new structured logger.
@@ -60,6 +86,9 @@ class StructuredLogger:
             log_dir: Directory for log files (default: "logs")
             max_memory_entries: Maximum number of log entries to keep in memory
             retention_days: Number of days to keep log files
+            max_total_bytes: Disk budget for the log directory (None leaves the
+                current budget); other retention options apply when the first
+                logger for log_dir is created
             
         Raises:
             ValueError: If invalid log level is provided
@@ -80,6 +109,8 @@ class StructuredLogger:
                 raise ValueError(f"Invalid log level: {level}. Valid levels are: {valid_levels}")
         else:
             self.level = level
+        # Cached threshold so disabled calls cost a single dict lookup
+        self._level_value = LEVEL_VALUES[self.level]
             
         # Set up Python's built-in logging
         self._setup_logging()
@@ -87,8 +118,24 @@ class StructuredLogger:
         # Create log directory if it doesn't exist
         self._ensure_log_directory()
         
-        # Clean up old log files
-        self._cleanup_old_logs()
+        # Compression, retention and the size budget run on a shared worker
+        self._rotation = get_log_rotation(
+            self.log_dir,
+            retention_days=retention_days,
+            max_total_bytes=max_total_bytes
+        )
+        self._rotation.rotate_logs()
+        
+        # File writes go through a shared background writer for this directory
+        self._writer = get_log_writer(self.log_dir)
+        self._writer.add_day_listener(self._rotation.on_day_rollover)
+        self._writer.add_flush_listener(self._rotation.on_flush)
+        
+        # Indexed search over the JSON logs written so far
+        self._search = LogSearch(self.log_dir)
+        
+        # Per-call-site rate limits for call sites that opt in to sampling
+        self._sampler = LogSampler()
         
     def _setup_logging(self) -> None:
         """Set up Python's built-in logging with appropriate handlers."""
@@ -131,56 +178,40 @@ class StructuredLogger:
         daily_log_dir = self.log_dir / today
         daily_log_dir.mkdir(parents=True, exist_ok=True)
         
-    def _get_log_file_paths(self) -> Dict[str, Path]:
-        """Get paths for various log files."""
-        today = datetime.now().strftime("%Y-%m-%d")
-        daily_log_dir = self.log_dir / today
-        
-        return {
-            "main": daily_log_dir / "logs.log",
-            "error": daily_log_dir / "errors.log",
-            "json": daily_log_dir / "logs.json"
-        }
-        
     def _cleanup_old_logs(self) -> None:
-        """Remove log files older than retention_days."""
-        if not self.log_dir.exists():
-            return
-            
-        cutoff_date = datetime.now() - timedelta(days=self.retention_days)
+        """Schedule compression and removal of old log files."""
+        self._rotation.rotate_logs()
         
-        for item in self.log_dir.iterdir():
-            if not item.is_dir():
-                continue
-                
-            try:
-                # Try to parse directory name as date
-                dir_date = datetime.strptime(item.name, "%Y-%m-%d")
-                if dir_date < cutoff_date:
-                    shutil.rmtree(item)
-            except ValueError:
-                # Not a date-formatted directory, skip
-                continue
-                
     def _should_log(self, level: LogLevel) -> bool:
         """Check if a message with the given level should be logged."""
-        level_values = {
-            LogLevel.DEBUG: 0,
-            LogLevel.INFO: 1,
-            LogLevel.WARNING: 2,
-            LogLevel.ERROR: 3,
-            LogLevel.CRITICAL: 4
-        }
-        return level_values[level] >= level_values[self.level]
+        return LEVEL_VALUES[level] >= self._level_value
         
-    def _write_to_file(self, entry: LogEntry, file_path: Path, error_only: bool = False) -> None:
-        """Write log entry to file."""
-        if error_only and entry.level not in [LogLevel.ERROR, LogLevel.CRITICAL]:
-            return
+    def is_enabled(self, level: LogLevel) -> bool:
+        """
+        Check whether a level would be logged, before building the message.
+        
+        Args:
+            level: Log level
             
-        # Create parent directory if it doesn't exist
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+        Returns:
+            True if messages at this level are logged
+        """
+        return LEVEL_VALUES[level] >= self._level_value
         
+    @staticmethod
+    def _render_message(message: Message, args: Tuple[Any, ...]) -> str:
+        """Resolve a deferred message and apply %-style arguments."""
+        text = message() if callable(message) else message
+        if args:
+            try:
+                text = text % args
+            except (TypeError, ValueError):
+                # Keep the record rather than fail the caller over a bad format
+                text = " ".join([str(text), *map(str, args)])
+        return text
+        
+    def _format_text(self, entry: LogEntry) -> str:
+        """Format a log entry as a human-readable line."""
         # Format timestamp for human-readable logs
         timestamp = entry.timestamp.strftime("%Y-%m-%d %H:%M:%S")
         
@@ -190,10 +221,9 @@ class StructuredLogger:
             message += f" [{entry.service}]"
         message += f" {entry.message}"
         
-        # Add context if available
+        # Add context if available (formatted once per entry)
         if entry.context:
-            context_str = " ".join([f"{k}={v}" for k, v in entry.context.items()])
-            message += f" ({context_str})"
+            message += f" ({entry.format_context()})"
             
         # Add performance info if available
         if entry.operation and entry.duration_ms is not None:
@@ -203,22 +233,74 @@ class StructuredLogger:
         if entry.error:
             message += f" [error={entry.error}]"
             
-        # Write to file (append mode)
-        with open(file_path, "a", encoding="utf-8") as f:
-            f.write(message + "\n")
-            
-    def _write_json_log(self, entry: LogEntry, file_path: Path) -> None:
-        """Write log entry to JSON file."""
-        # Create parent directory if it doesn't exist
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+        return message
+        
+    def _write_entry(self, entry: LogEntry) -> None:
+        """
+        Hand a log entry to the background writer.
+        
+        Formatting happens here so the record reflects the context values at
+        call time; the file I/O happens on the writer thread.
+        """
+        self._writer.submit(LogRecord(
+            date=datetime.now().strftime("%Y-%m-%d"),
+            text=self._format_text(entry),
+            json=entry.to_json(),
+            is_error=entry.level in (LogLevel.ERROR, LogLevel.CRITICAL)
+        ))
+        
+    @staticmethod
+    def _call_site() -> Tuple[str, int]:
+        """Get the file and line of the first caller outside this module."""
+        frame = sys._getframe(2)
+        while frame is not None and frame.f_code.co_filename == __file__:
+            frame = frame.f_back
+        if frame is None:
+            return ("<unknown>", 0)
+        return (frame.f_code.co_filename, frame.f_lineno)
+        
+    def _log_summary(self, summary: SuppressionSummary) -> None:
+        """Log how many messages a sampled call site suppressed."""
+        if isinstance(summary.site, tuple) and len(summary.site) == 2:
+            site = f"{os.path.basename(str(summary.site[0]))}:{summary.site[1]}"
+        else:
+            site = str(summary.site)
+        self._emit(
+            summary.level,
+            f"Suppressed {summary.count} similar messages",
+            call_site=site,
+            example=self._render_message(summary.message, ()),
+            period_s=summary.period_s
+        )
+        
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Wait until every entry logged so far has been written to disk.
         
-        # Convert entry to dictionary
-        entry_dict = entry.to_dict()
+        Pending "suppressed" summaries from sampled call sites are logged first.
         
-        # Write to file (append mode)
-        with open(file_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry_dict) + "\n")
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
             
+        Returns:
+            True if the entries were flushed before the timeout
+        """
+        for summary in self._sampler.flush():
+            self._log_summary(summary)
+        return self._writer.flush(timeout)
+        
+    def get_sampling_stats(self) -> Dict[str, Any]:
+        """Get statistics for sampled call sites."""
+        return self._sampler.get_stats()
+        
+    def get_writer_stats(self) -> Dict[str, Any]:
+        """Get statistics for the background log writer."""
+        return self._writer.get_stats()
+        
+    def get_rotation_stats(self) -> Dict[str, Any]:
+        """Get compression, retention and disk budget statistics."""
+        return self._rotation.get_stats()
+        
     def set_level(self, level: Union[LogLevel, str]) -> None:
         """
         Set the log level.
@@ -237,6 +319,7 @@ class StructuredLogger:
                 raise ValueError(f"Invalid log level: {level}. Valid levels are: {valid_levels}")
         else:
             self.level = level
+        self._level_value = LEVEL_VALUES[self.level]
             
         # Update Python logger level
         self._logger.setLevel(self._get_python_log_level(self.level))
@@ -256,28 +339,64 @@ class StructuredLogger:
     def log(
         self,
         level: LogLevel,
-        message: str,
+        message: Message,
+        *args: Any,
         service: Optional[str] = None,
         operation: Optional[str] = None,
         duration_ms: Optional[float] = None,
         error: Optional[Union[str, Exception]] = None,
+        sample: Union[bool, SamplingPolicy, None] = None,
+        sample_key: Optional[Hashable] = None,
         **context: Any
     ) -> None:
         """
         Log a message with the specified level and context.
         
+        Formatting is deferred until the level check (and sampling) pass:
+        pass %-style arguments after the message, or a callable returning
+        the message, instead of building an f-string at the call site.
+        
         Args:
             level: Log level
-            message: Log message
+            message: Log message, %-style format, or callable returning the message
+            *args: Arguments for a %-style message
             service: Service name (optional)
             operation: Operation name for performance logging (optional)
             duration_ms: Operation duration in milliseconds (optional)
             error: Error message or exception (optional)
+            sample: Rate limit this call site: True for the default policy, a
+                SamplingPolicy, or False to opt out inside @sampled_logging
+            sample_key: Key shared by sampled call sites (default: caller file and line)
             **context: Additional context key-value pairs
         """
         if not self._should_log(level):
             return
             
+        # Hot-path call sites may opt in to sampling, directly or via @sampled_logging
+        policy = get_active_policy() if sample is None else (
+            DEFAULT_SAMPLING_POLICY if sample is True else sample or None
+        )
+        if policy is not None:
+            site = sample_key if sample_key is not None else self._call_site()
+            allowed, summaries = self._sampler.check(site, level, message, policy)
+            for summary in summaries:
+                self._log_summary(summary)
+            if not allowed:
+                return
+            
+        self._emit(level, self._render_message(message, args), service, operation, duration_ms, error, **context)
+        
+    def _emit(
+        self,
+        level: LogLevel,
+        message: str,
+        service: Optional[str] = None,
+        operation: Optional[str] = None,
+        duration_ms: Optional[float] = None,
+        error: Optional[Union[str, Exception]] = None,
+        **context: Any
+    ) -> None:
+        """Build a log entry and send it to every sink (no level or sampling checks)."""
         # Process error if it's an exception
         error_str = None
         if error is not None:
@@ -304,49 +423,52 @@ class StructuredLogger:
         # Add to memory buffer
         self.memory_buffer.append(entry)
         
-        # Write to files
-        log_files = self._get_log_file_paths()
-        self._write_to_file(entry, log_files["main"])
-        self._write_to_file(entry, log_files["error"], error_only=True)
-        self._write_json_log(entry, log_files["json"])
+        # Queue for the background writer; no disk I/O on the calling thread
+        self._write_entry(entry)
         
         # Log using Python's logging
         python_level = self._get_python_log_level(level)
         self._logger.log(python_level, message)
         
-    def debug(self, message: str, **context: Any) -> None:
+    def debug(self, message: Message, *args: Any, **context: Any) -> None:
         """
         Log a debug message.
         
         Args:
-            message: Log message
+            message: Log message, %-style format, or callable returning the message
+            *args: Arguments for a %-style message
             **context: Context key-value pairs
         """
-        self.log(LogLevel.DEBUG, message, **context)
+        if self._level_value <= _DEBUG_VALUE:
+            self.log(LogLevel.DEBUG, message, *args, **context)
         
-    def info(self, message: str, **context: Any) -> None:
+    def info(self, message: Message, *args: Any, **context: Any) -> None:
         """
         Log an info message.
         
         Args:
-            message: Log message
+            message: Log message, %-style format, or callable returning the message
+            *args: Arguments for a %-style message
             **context: Context key-value pairs
         """
-        self.log(LogLevel.INFO, message, **context)
+        if self._level_value <= _INFO_VALUE:
+            self.log(LogLevel.INFO, message, *args, **context)
         
-    def warning(self, message: str, **context: Any) -> None:
+    def warning(self, message: Message, *args: Any, **context: Any) -> None:
         """
         Log a warning message.
         
         Args:
-            message: Log message
+            message: Log message, %-style format, or callable returning the message
+            *args: Arguments for a %-style message
             **context: Context key-value pairs
         """
-        self.log(LogLevel.WARNING, message, **context)
+        self.log(LogLevel.WARNING, message, *args, **context)
         
     def error(
         self,
-        message: str,
+        message: Message,
+        *args: Any,
         error: Optional[Union[str, Exception]] = None,
         **context: Any
     ) -> None:
@@ -354,15 +476,17 @@ class StructuredLogger:
         Log an error message.
         
         Args:
-            message: Log message
+            message: Log message, %-style format, or callable returning the message
+            *args: Arguments for a %-style message
             error: Error message or exception (optional)
             **context: Context key-value pairs
         """
-        self.log(LogLevel.ERROR, message, error=error, **context)
+        self.log(LogLevel.ERROR, message, *args, error=error, **context)
         
     def critical(
         self,
-        message: str,
+        message: Message,
+        *args: Any,
         error: Optional[Union[str, Exception]] = None,
         **context: Any
     ) -> None:
@@ -370,11 +494,12 @@ class StructuredLogger:
         Log a critical message.
         
         Args:
-            message: Log message
+            message: Log message, %-style format, or callable returning the message
+            *args: Arguments for a %-style message
             error: Error message or exception (optional)
             **context: Context key-value pairs
         """
-        self.log(LogLevel.CRITICAL, message, error=error, **context)
+        self.log(LogLevel.CRITICAL, message, *args, error=error, **context)
         
     def performance(
         self,
@@ -425,6 +550,45 @@ class StructuredLogger:
             
         return entries
         
+    def query_logs(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        levels: Optional[List[Union[LogLevel, str]]] = None,
+        services: Optional[List[str]] = None,
+        contains: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search the JSON log files, including compressed days, via their indexes.
+        
+        Args:
+            start: Earliest record time, inclusive (naive values are UTC)
+            end: Latest record time, inclusive (naive values are UTC)
+            levels: Levels to include (optional)
+            services: Service names to include (optional)
+            contains: Substring the message must contain (optional)
+            limit: Maximum number of records to return (optional)
+            
+        Returns:
+            Matching records as dictionaries, oldest first
+        """
+        # Records still queued for the writer are not on disk yet
+        self.flush()
+        
+        level_names = None
+        if levels is not None:
+            level_names = [level.value if isinstance(level, LogLevel) else level for level in levels]
+            
+        return list(self._search.search(
+            start=start,
+            end=end,
+            levels=level_names,
+            services=services,
+            contains=contains,
+            limit=limit
+        ))
+        
     def rotate_logs(self) -> None:
         """
         Force log rotation.
@@ -434,6 +598,7 @@ class StructuredLogger:
         """
         self._ensure_log_directory()
         self._cleanup_old_logs()
+        self._writer.reopen()
 
 
 class ContextLogger:
@@ -472,14 +637,21 @@ class ContextLogger:
         combined_context = {**self._context, **context}
         return ContextLogger(self._logger, combined_context)
         
+    def is_enabled(self, level: LogLevel) -> bool:
+        """Check whether a level would be logged by the parent logger."""
+        return self._logger.is_enabled(level)
+        
     def log(
         self,
         level: LogLevel,
-        message: str,
+        message: Message,
+        *args: Any,
         service: Optional[str] = None,
         operation: Optional[str] = None,
         duration_ms: Optional[float] = None,
         error: Optional[Union[str, Exception]] = None,
+        sample: Union[bool, SamplingPolicy, None] = None,
+        sample_key: Optional[Hashable] = None,
         **context: Any
     ) -> None:
         """
@@ -487,57 +659,69 @@ class ContextLogger:
         
         Args:
             level: Log level
-            message: Log message
+            message: Log message, %-style format, or callable returning the message
+            *args: Arguments for a %-style message
             service: Service name (optional)
             operation: Operation name for performance logging (optional)
             duration_ms: Operation duration in milliseconds (optional)
             error: Error message or exception (optional)
+            sample: Sampling opt-in, as for StructuredLogger.log
+            sample_key: Key shared by sampled call sites (default: caller file and line)
             **context: Additional context key-value pairs
         """
+        if not self._logger.is_enabled(level):
+            return
         combined_context = {**self._context, **context}
         self._logger.log(
             level,
             message,
+            *args,
             service=service,
             operation=operation,
             duration_ms=duration_ms,
             error=error,
+            sample=sample,
+            sample_key=sample_key,
             **combined_context
         )
         
-    def debug(self, message: str, **context: Any) -> None:
+    def debug(self, message: Message, *args: Any, **context: Any) -> None:
         """
         Log a debug message.
         
         Args:
-            message: Log message
+            message: Log message, %-style format, or callable returning the message
+            *args: Arguments for a %-style message
             **context: Additional context key-value pairs
         """
-        self.log(LogLevel.DEBUG, message, **context)
+        self.log(LogLevel.DEBUG, message, *args, **context)
         
-    def info(self, message: str, **context: Any) -> None:
+    def info(self, message: Message, *args: Any, **context: Any) -> None:
         """
         Log an info message.
         
         Args:
-            message: Log message
+            message: Log message, %-style format, or callable returning the message
+            *args: Arguments for a %-style message
             **context: Additional context key-value pairs
         """
-        self.log(LogLevel.INFO, message, **context)
+        self.log(LogLevel.INFO, message, *args, **context)
         
-    def warning(self, message: str, **context: Any) -> None:
+    def warning(self, message: Message, *args: Any, **context: Any) -> None:
         """
         Log a warning message.
         
         Args:
-            message: Log message
+            message: Log message, %-style format, or callable returning the message
+            *args: Arguments for a %-style message
             **context: Additional context key-value pairs
         """
-        self.log(LogLevel.WARNING, message, **context)
+        self.log(LogLevel.WARNING, message, *args, **context)
         
     def error(
         self,
-        message: str,
+        message: Message,
+        *args: Any,
         error: Optional[Union[str, Exception]] = None,
         **context: Any
     ) -> None:
@@ -545,15 +729,17 @@ class ContextLogger:
         Log an error message.
         
         Args:
-            message: Log message
+            message: Log message, %-style format, or callable returning the message
+            *args: Arguments for a %-style message
             error: Error message or exception (optional)
             **context: Additional context key-value pairs
         """
-        self.log(LogLevel.ERROR, message, error=error, **context)
+        self.log(LogLevel.ERROR, message, *args, error=error, **context)
         
     def critical(
         self,
-        message: str,
+        message: Message,
+        *args: Any,
         error: Optional[Union[str, Exception]] = None,
         **context: Any
     ) -> None:
@@ -561,11 +747,12 @@ class ContextLogger:
         Log a critical message.
         
         Args:
-            message: Log message
+            message: Log message, %-style format, or callable returning the message
+            *args: Arguments for a %-style message
             error: Error message or exception (optional)
             **context: Additional context key-value pairs
         """
-        self.log(LogLevel.CRITICAL, message, error=error, **context)
+        self.log(LogLevel.CRITICAL, message, *args, error=error, **context)
         
     def performance(
         self,
@@ -594,6 +781,11 @@ def timed(operation_name: str) -> Callable[[F], F]:
     """
     Decorator to time function execution and log performance.
     
+    Durations are also recorded in the operation's latency histogram
+    (src.utils.performance.timing), under the name of the class the
+    function is defined on, so p50/p99 are available next to the logs.
+    Coroutine functions are timed until they complete.
+    
     Args:
         operation_name: Name of the operation for logging
         
@@ -601,24 +793,43 @@ def timed(operation_name: str) -> Callable[[F], F]:
         Decorated function
     """
     def decorator(func: F) -> F:
-        @wraps(func)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
+        qualname_parts = func.__qualname__.split('.')
+        category = qualname_parts[-2] if len(qualname_parts) > 1 else "default"
+        
+        def get_logger(args: Tuple[Any, ...]) -> Optional[StructuredLogger]:
             # Get logger from first argument if it's a class method
-            logger = None
             if args and hasattr(args[0], 'logger') and isinstance(args[0].logger, StructuredLogger):
-                logger = args[0].logger
-                
-            start_time = time.time()
+                return args[0].logger
+            return None
+        
+        def finish(logger: Optional[StructuredLogger], start_time: float) -> None:
+            duration = time.perf_counter() - start_time
+            record_timing(category, operation_name, duration)
+            
+            # Log performance if logger is available
+            if logger:
+                logger.performance(operation_name, duration * 1000)
+        
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                logger = get_logger(args)
+                start_time = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    finish(logger, start_time)
+            
+            return cast(F, async_wrapper)
+        
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            logger = get_logger(args)
+            start_time = time.perf_counter()
             try:
-                result = func(*args, **kwargs)
-                return result
+                return func(*args, **kwargs)
             finally:
-                end_time = time.time()
-                duration_ms = (end_time - start_time) * 1000
-                
-                # Log performance if logger is available
-                if logger:
-                    logger.performance(operation_name, duration_ms)
+                finish(logger, start_time)
                     
         return cast(F, wrapper)
     return decorator
\ No newline at end of file
@@ -29,7 +29,7 @@ import aiohttp
 import discord
 
 # Local imports
-from .performance import timing, performance_context, performance_monitor
+from .performance import timing, performance_context
 from .tree_log import log_perfect_tree_section, log_error_with_traceback
 
 @dataclass
@@ -64,51 +64,159 @@ class NetworkMetrics:
     active_connections: int = 0
     connection_pool_size: int = 0
 
+@dataclass
+class ConnectionPoolMetrics:
+    """Connection reuse metrics collected from aiohttp trace hooks."""
+    requests: int = 0
+    handshakes: int = 0
+    reused_connections: int = 0
+    pool_waits: int = 0
+    pool_wait_time_ms: float = 0.0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+    request_errors: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Fraction of acquired connections that were reused from the pool."""
+        acquired = self.handshakes + self.reused_connections
+        return self.reused_connections / acquired if acquired else 0.0
+
 class ConnectionPool:
     """
     HTTP connection pool for efficient Discord API requests.
     
-    This pool manages HTTP connections with proper session reuse,
-    timeout handling, and connection limits for optimal performance.
+    This pool is the single session provider for outbound HTTP traffic
+    (webhook delivery, API batching and, through the shared connector and
+    trace hooks, the Discord client used for heartbeats). Connections are
+    kept alive between requests, DNS lookups are cached and every request
+    is instrumented so reuse can be verified from ``get_network_stats()``.
     
     Attributes:
         max_connections (int): Maximum number of concurrent connections
+        limit_per_host (int): Maximum concurrent connections per host
         timeout (aiohttp.ClientTimeout): Request timeout configuration
+        trace_config (aiohttp.TraceConfig): Trace hooks feeding the metrics
+        metrics (ConnectionPoolMetrics): Reuse/handshake/wait counters
         _session (aiohttp.ClientSession): HTTP session for connection pooling
+        _connector (aiohttp.TCPConnector): Connector shared by all sessions
         _connection_count (int): Current number of active connections
     """
     
     def __init__(self, 
                  max_connections: int = 100,
                  timeout_seconds: float = 30.0,
-                 keepalive_timeout: float = 30.0):
+                 keepalive_timeout: float = 75.0,
+                 limit_per_host: int = 20,
+                 dns_cache_ttl: int = 300):
         """
         Initialize connection pool.
         
         Args:
             max_connections: Maximum concurrent connections
             timeout_seconds: Request timeout in seconds
-            keepalive_timeout: Keep-alive timeout for connections
+            keepalive_timeout: Keep-alive timeout for idle connections
+            limit_per_host: Maximum concurrent connections per host
+            dns_cache_ttl: Seconds to cache resolved host addresses
         """
         self.max_connections = max_connections
         self.timeout = aiohttp.ClientTimeout(total=timeout_seconds)
         self.keepalive_timeout = keepalive_timeout
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
         
         # Connection tracking
         self._session: Optional[aiohttp.ClientSession] = None
+        self._connector: Optional[aiohttp.TCPConnector] = None
         self._connection_count = 0
         self._session_lock = asyncio.Lock()
         
+        # Instrumentation
+        self.metrics = ConnectionPoolMetrics()
+        self.trace_config = self._create_trace_config()
+        
         log_perfect_tree_section(
             "Connection Pool",
             [
                 ("max_connections", max_connections),
+                ("limit_per_host", limit_per_host),
                 ("timeout_seconds", timeout_seconds),
-                ("keepalive_timeout", keepalive_timeout)
+                ("keepalive_timeout", keepalive_timeout),
+                ("dns_cache_ttl", f"{dns_cache_ttl}s")
             ],
             emoji="🔗"
         )
     
+    def _create_trace_config(self) -> aiohttp.TraceConfig:
+        """
+        Build trace hooks that record connection reuse and pool pressure.
+        
+        Returns:
+            TraceConfig bound to this pool's metrics
+        """
+        metrics = self.metrics
+        trace_config = aiohttp.TraceConfig()
+        
+        async def on_request_start(session, ctx, params):
+            metrics.requests += 1
+        
+        async def on_request_exception(session, ctx, params):
+            metrics.request_errors += 1
+        
+        async def on_connection_create_end(session, ctx, params):
+            metrics.handshakes += 1
+        
+        async def on_connection_reuseconn(session, ctx, params):
+            metrics.reused_connections += 1
+        
+        async def on_connection_queued_start(session, ctx, params):
+            metrics.pool_waits += 1
+            ctx.queued_at = time.perf_counter()
+        
+        async def on_connection_queued_end(session, ctx, params):
+            queued_at = getattr(ctx, 'queued_at', None)
+            if queued_at is not None:
+                metrics.pool_wait_time_ms += (time.perf_counter() - queued_at) * 1000
+        
+        async def on_dns_cache_hit(session, ctx, params):
+            metrics.dns_cache_hits += 1
+        
+        async def on_dns_cache_miss(session, ctx, params):
+            metrics.dns_cache_misses += 1
+        
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_exception.append(on_request_exception)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_connection_queued_start.append(on_connection_queued_start)
+        trace_config.on_connection_queued_end.append(on_connection_queued_end)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        
+        return trace_config
+    
+    def get_connector(self) -> aiohttp.TCPConnector:
+        """
+        Get or create the shared TCP connector.
+        
+        The connector is also handed to the Discord client so gateway REST
+        calls and our own requests share keep-alive connections to
+        discord.com. Must be called from a running event loop.
+        
+        Returns:
+            Shared aiohttp TCPConnector
+        """
+        if self._connector is None or self._connector.closed:
+            self._connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+                enable_cleanup_closed=True
+            )
+        return self._connector
+    
     async def get_session(self) -> aiohttp.ClientSession:
         """
         Get or create HTTP session with connection pooling.
@@ -116,18 +224,23 @@ class ConnectionPool:
         Returns:
             Configured aiohttp ClientSession
         """
+        session = self._session
+        if session is not None and not session.closed and not session.connector.closed:
+            return session
+        
         async with self._session_lock:
-            if self._session is None or self._session.closed:
-                connector = aiohttp.TCPConnector(
-                    limit=self.max_connections,
-                    limit_per_host=20,
-                    keepalive_timeout=self.keepalive_timeout,
-                    enable_cleanup_closed=True
-                )
-                
+            if (self._session is None or self._session.closed
+                    or self._session.connector.closed):
+                # The connector may have been closed by another owner (e.g.
+                # discord.py's session); close the stale session before
+                # replacing it so it is not leaked
+                if self._session is not None and not self._session.closed:
+                    await self._session.close()
                 self._session = aiohttp.ClientSession(
-                    connector=connector,
+                    connector=self.get_connector(),
+                    connector_owner=False,
                     timeout=self.timeout,
+                    trace_configs=[self.trace_config],
                     headers={
                         'User-Agent': 'StatsBot/1.0 (https://github.com/trippixn963/StatsBot)'
                     }
@@ -162,21 +275,42 @@ class ConnectionPool:
         async with self._session_lock:
             if self._session and not self._session.closed:
                 await self._session.close()
-                self._session = None
+            self._session = None
+            
+            if self._connector and not self._connector.closed:
+                await self._connector.close()
+            self._connector = None
         
         log_perfect_tree_section(
             "Connection Pool Closed",
-            [("connections_closed", "all")],
+            [
+                ("connections_closed", "all"),
+                ("handshakes", self.metrics.handshakes),
+                ("reuse_ratio", f"{self.metrics.reuse_ratio:.1%}")
+            ],
             emoji="🔒"
         )
     
     def get_stats(self) -> Dict[str, Any]:
         """Get connection pool statistics."""
+        metrics = self.metrics
         return {
             'max_connections': self.max_connections,
+            'limit_per_host': self.limit_per_host,
             'active_connections': self._connection_count,
             'session_open': self._session is not None and not self._session.closed,
-            'timeout_seconds': self.timeout.total
+            'timeout_seconds': self.timeout.total,
+            'keepalive_timeout': self.keepalive_timeout,
+            'dns_cache_ttl': self.dns_cache_ttl,
+            'requests': metrics.requests,
+            'request_errors': metrics.request_errors,
+            'handshakes': metrics.handshakes,
+            'reused_connections': metrics.reused_connections,
+            'reuse_ratio': metrics.reuse_ratio,
+            'pool_waits': metrics.pool_waits,
+            'avg_pool_wait_ms': metrics.pool_wait_time_ms / max(1, metrics.pool_waits),
+            'dns_cache_hits': metrics.dns_cache_hits,
+            'dns_cache_misses': metrics.dns_cache_misses
         }
 
 class DiscordAPIBatcher:
@@ -208,6 +342,7 @@ class DiscordAPIBatcher:
         self.batch_size = batch_size
         self.batch_timeout = batch_timeout
         self.connection_pool = connection_pool or ConnectionPool()
+        self._owns_connection_pool = connection_pool is None
         
         # Request tracking
         self.pending_requests: deque = deque()
@@ -224,7 +359,7 @@ class DiscordAPIBatcher:
             [
                 ("batch_size", batch_size),
                 ("batch_timeout", f"{batch_timeout}s"),
-                ("connection_pool", "enabled")
+                ("connection_pool", "owned" if self._owns_connection_pool else "shared")
             ],
             emoji="📦"
         )
@@ -241,7 +376,9 @@ class DiscordAPIBatcher:
         if self._batch_task and not self._batch_task.done():
             await self._batch_task
         
-        await self.connection_pool.close()
+        # A shared pool outlives the batcher; only close one we created
+        if self._owns_connection_pool:
+            await self.connection_pool.close()
     
     @timing(category="discord_api")
     async def queue_request(self, request: APIRequest) -> Any:
@@ -379,18 +516,32 @@ class DiscordAPIBatcher:
         Returns:
             API response data
         """
-        # This is a simplified implementation
-        # In practice, you'd use the actual Discord API client
         start_time = time.time()
         
-        # Simulate API request
-        await asyncio.sleep(0.1)  # Simulate network delay
+        if request.endpoint.startswith(('http://', 'https://')):
+            # Absolute URLs go out over the shared connection pool
+            async with self.connection_pool.request(
+                request.method, request.endpoint, json=request.data
+            ) as response:
+                if 'X-RateLimit-Limit' in response.headers:
+                    self.update_rate_limit(request.endpoint, response.headers)
+                if response.status == 429:
+                    self.metrics.rate_limited_requests += 1
+                response.raise_for_status()
+                # Chunked responses have no Content-Length; json() reads the
+                # body either way and returns None when it is empty
+                result = await response.json(content_type=None)
+        else:
+            # Relative endpoints are handled by the Discord client itself;
+            # this path keeps the batching semantics for those callers
+            await asyncio.sleep(0.1)  # Simulate network delay
+            result = {"status": "success", "endpoint": request.endpoint}
         
         # Update metrics
         duration = (time.time() - start_time) * 1000
         self._update_response_time(duration)
         
-        return {"status": "success", "endpoint": request.endpoint}
+        return result
     
     def _update_response_time(self, duration_ms: float):
         """Update average response time metric."""
@@ -523,7 +674,8 @@ class AdaptivePoller:
                  base_interval: float = 60.0,
                  min_interval: float = 10.0,
                  max_interval: float = 300.0,
-                 activity_threshold: int = 10):
+                 activity_threshold: int = 10,
+                 name: str = "default"):
         """
         Initialize adaptive poller.
         
@@ -532,7 +684,9 @@ class AdaptivePoller:
             min_interval: Minimum polling interval
             max_interval: Maximum polling interval
             activity_threshold: Activity events per interval to trigger faster polling
+            name: Identifier for this poller (e.g. the guild it drives)
         """
+        self.name = name
         self.base_interval = base_interval
         self.min_interval = min_interval
         self.max_interval = max_interval
@@ -546,6 +700,7 @@ class AdaptivePoller:
         log_perfect_tree_section(
             "Adaptive Poller",
             [
+                ("name", name),
                 ("base_interval", f"{base_interval}s"),
                 ("min_interval", f"{min_interval}s"),
                 ("max_interval", f"{max_interval}s"),
@@ -558,6 +713,11 @@ class AdaptivePoller:
         """Record an activity event for polling frequency calculation."""
         self._activity_count += 1
     
+    @property
+    def current_interval(self) -> float:
+        """Current polling interval without consuming recorded activity."""
+        return self._current_interval
+    
     def get_next_interval(self) -> float:
         """
         Calculate the next polling interval based on recent activity.
@@ -600,8 +760,11 @@ class AdaptivePoller:
         activity_rate = (self._activity_count / max(time_elapsed, 1)) * 60
         
         return {
+            'name': self.name,
             'current_interval': self._current_interval,
             'base_interval': self.base_interval,
+            'min_interval': self.min_interval,
+            'max_interval': self.max_interval,
             'activity_count': self._activity_count,
             'activity_rate_per_minute': activity_rate,
             'is_high_activity': activity_rate > self.activity_threshold
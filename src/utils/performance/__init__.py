@@ -10,17 +10,60 @@ from .timing import (
     async_timed, 
     performance_context, 
     get_performance_metrics,
-    reset_performance_metrics
+    reset_performance_metrics,
+    record_timing,
+    get_latency_histogram,
+    get_latency_percentiles,
+    iter_latency_histograms,
+    LatencyHistogram,
+    WindowedHistogram
 )
 
 from .memory_monitor import MemoryMonitor, memory_monitor
 
+# Function-level timing and memory monitor (timing_decorator, metrics summary, alerts)
+from .monitor import (
+    PerformanceMonitor,
+    PerformanceMetric,
+    SampleRing,
+    MemoryAlert,
+    AlertLevel,
+    performance_monitor,
+    memory_timing,
+    simple_timing,
+    sampled_timing,
+    optimize_memory,
+    get_performance_report
+)
+
+# Local OpenMetrics endpoint for Prometheus
+from .openmetrics import OpenMetricsExporter, MetricsWriter
+
 __all__ = [
     'timing',
     'async_timed',
     'performance_context',
     'get_performance_metrics',
     'reset_performance_metrics',
+    'record_timing',
+    'get_latency_histogram',
+    'get_latency_percentiles',
+    'iter_latency_histograms',
+    'LatencyHistogram',
+    'WindowedHistogram',
     'MemoryMonitor',
-    'memory_monitor'
+    'memory_monitor',
+    'PerformanceMonitor',
+    'PerformanceMetric',
+    'SampleRing',
+    'MemoryAlert',
+    'AlertLevel',
+    'performance_monitor',
+    'memory_timing',
+    'simple_timing',
+    'sampled_timing',
+    'optimize_memory',
+    'get_performance_report',
+    'OpenMetricsExporter',
+    'MetricsWriter'
 ]
\ No newline at end of file
@@ -8,7 +8,7 @@ This module provides comprehensive performance monitoring capabilities including
 - Resource optimization utilities
 
 Key Features:
-- Low-overhead timing decorators
+- Low-overhead timing decorators, with a sampled mode for production use
 - Memory usage tracking and alerts
 - Performance metrics aggregation
 - Resource optimization helpers
@@ -17,6 +17,7 @@ Key Features:
 
 import time
 import functools
+from array import array
 import asyncio
 import threading
 import psutil
@@ -62,6 +63,99 @@ class MemoryAlert:
     threshold: float
     timestamp: datetime
 
+class SampleRing:
+    """
+    Preallocated ring of timing samples for one sampled function.
+    
+    Samples are stored in primitive arrays rather than PerformanceMetric
+    objects, so recording one allocates nothing. Running totals cover every
+    sample ever taken; the arrays hold the most recent ``capacity`` samples.
+    
+    Attributes:
+        interval (int): One call in ``interval`` is sampled
+        calls (int): Estimated calls, counting unsampled ones
+        sampled (int): Number of samples taken
+    """
+    
+    __slots__ = (
+        'capacity', 'interval', 'started_ns', 'durations_ns', 'memory_deltas',
+        'failed', 'index', 'calls', 'sampled', 'total_ns', 'min_ns', 'max_ns',
+        'exceptions', 'slow', 'memory_samples', 'memory_total', 'memory_min',
+        'memory_max'
+    )
+    
+    def __init__(self, capacity: int, interval: int):
+        """
+        Initialize an empty ring.
+        
+        Args:
+            capacity: Number of recent samples to keep
+            interval: Sampling interval (one call in ``interval``)
+        """
+        self.capacity = capacity
+        self.interval = interval
+        self.started_ns = array('q', bytes(8 * capacity))
+        self.durations_ns = array('q', bytes(8 * capacity))
+        self.memory_deltas = array('d', bytes(8 * capacity))
+        self.failed = array('B', bytes(capacity))
+        self.index = 0
+        self.calls = 0
+        self.sampled = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.exceptions = 0
+        self.slow = 0
+        self.memory_samples = 0
+        self.memory_total = 0.0
+        self.memory_min = 0.0
+        self.memory_max = 0.0
+    
+    def record(self, started_ns: int, duration_ns: int, memory_delta: Optional[float],
+               failed: bool, slow: bool):
+        """
+        Record one sample, overwriting the oldest once the ring is full.
+        
+        Args:
+            started_ns: perf_counter_ns() at call start
+            duration_ns: Call duration in nanoseconds
+            memory_delta: RSS change in MB, or None if memory wasn't measured
+            failed: Whether the call raised
+            slow: Whether the call exceeded the slow operation threshold
+        """
+        i = self.index
+        self.started_ns[i] = started_ns
+        self.durations_ns[i] = duration_ns
+        self.memory_deltas[i] = memory_delta or 0.0
+        self.failed[i] = failed
+        self.index = i + 1 if i + 1 < self.capacity else 0
+        
+        self.calls += self.interval if self.sampled else 1
+        if not self.sampled or duration_ns < self.min_ns:
+            self.min_ns = duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+        self.sampled += 1
+        self.total_ns += duration_ns
+        self.exceptions += failed
+        self.slow += slow
+        
+        if memory_delta is not None:
+            if not self.memory_samples or memory_delta < self.memory_min:
+                self.memory_min = memory_delta
+            if not self.memory_samples or memory_delta > self.memory_max:
+                self.memory_max = memory_delta
+            self.memory_samples += 1
+            self.memory_total += memory_delta
+    
+    def recent_durations_ms(self) -> List[float]:
+        """Return the retained sample durations in ms, oldest first."""
+        if self.sampled < self.capacity:
+            durations = self.durations_ns[:self.index]
+        else:
+            durations = self.durations_ns[self.index:] + self.durations_ns[:self.index]
+        return [d / 1_000_000 for d in durations]
+
 class PerformanceMonitor:
     """
     Comprehensive performance monitoring system.
@@ -91,6 +185,8 @@ class PerformanceMonitor:
             slow_operation_threshold_ms: Threshold for slow operations (ms)
         """
         self.metrics: Dict[str, deque] = defaultdict(lambda: deque(maxlen=max_metrics))
+        self.sample_rings: Dict[str, SampleRing] = {}
+        self._max_metrics = max_metrics
         self.memory_alerts: deque = deque(maxlen=100)
         self.thresholds = {
             'memory_warning': memory_threshold_mb,
@@ -109,18 +205,40 @@ class PerformanceMonitor:
     def timing_decorator(self, 
                         include_memory: bool = True,
                         log_slow: bool = True,
-                        category: str = "general") -> Callable:
+                        category: str = "general",
+                        sample_rate: Optional[float] = None) -> Callable:
         """
         Decorator for timing function execution with minimal overhead.
         
+        Without ``sample_rate`` every call is stored as a PerformanceMetric.
+        With it, only one call in ``round(1 / sample_rate)`` is timed (the
+        first call always is); samples go into a SampleRing and memory is only
+        read on sampled calls, so unsampled calls cost a counter decrement.
+        
         Args:
             include_memory: Whether to include memory monitoring
             log_slow: Whether to log slow operations
             category: Category for grouping metrics
+            sample_rate: Fraction of calls to time (0 < rate <= 1), or None
+                to time every call
             
         Returns:
             Decorated function with performance monitoring
+            
+        Raises:
+            ValueError: If sample_rate is outside (0, 1]
         """
+        if sample_rate is not None:
+            if not 0 < sample_rate <= 1:
+                raise ValueError(f"sample_rate must be in (0, 1], got {sample_rate}")
+            return functools.partial(
+                self._sampled_decorator,
+                interval=max(1, round(1 / sample_rate)),
+                include_memory=include_memory,
+                log_slow=log_slow,
+                category=category
+            )
+        
         def decorator(func: Callable) -> Callable:
             @functools.wraps(func)
             async def async_wrapper(*args, **kwargs):
@@ -142,6 +260,123 @@ class PerformanceMonitor:
                 
         return decorator
     
+    def _sampled_decorator(self,
+                           func: Callable,
+                           interval: int,
+                           include_memory: bool,
+                           log_slow: bool,
+                           category: str) -> Callable:
+        """Wrap a function so one call in ``interval`` is sampled."""
+        name = f"{category}.{func.__name__}"
+        with self._lock:
+            ring = self.sample_rings.get(name)
+            if ring is None:
+                ring = self.sample_rings[name] = SampleRing(self._max_metrics, interval)
+        countdown = 1
+        
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                nonlocal countdown
+                countdown -= 1
+                if countdown:
+                    return await func(*args, **kwargs)
+                countdown = interval
+                return await self._sample_async_function(
+                    func, args, kwargs, ring, include_memory, log_slow
+                )
+            
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            nonlocal countdown
+            countdown -= 1
+            if countdown:
+                return func(*args, **kwargs)
+            countdown = interval
+            return self._sample_sync_function(
+                func, args, kwargs, ring, include_memory, log_slow
+            )
+        
+        return sync_wrapper
+    
+    async def _sample_async_function(self,
+                                     func: Callable,
+                                     args: tuple,
+                                     kwargs: dict,
+                                     ring: SampleRing,
+                                     include_memory: bool,
+                                     log_slow: bool) -> Any:
+        """Time one sampled async call."""
+        memory_before = self._get_memory_usage() if include_memory else 0.0
+        failed = False
+        start_ns = time.perf_counter_ns()
+        
+        try:
+            return await func(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            duration_ns = time.perf_counter_ns() - start_ns
+            memory_after = self._get_memory_usage() if include_memory else 0.0
+            self._record_sample(
+                func, ring, start_ns, duration_ns, memory_before, memory_after,
+                include_memory, failed, log_slow
+            )
+    
+    def _sample_sync_function(self,
+                              func: Callable,
+                              args: tuple,
+                              kwargs: dict,
+                              ring: SampleRing,
+                              include_memory: bool,
+                              log_slow: bool) -> Any:
+        """Time one sampled sync call."""
+        memory_before = self._get_memory_usage() if include_memory else 0.0
+        failed = False
+        start_ns = time.perf_counter_ns()
+        
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            duration_ns = time.perf_counter_ns() - start_ns
+            memory_after = self._get_memory_usage() if include_memory else 0.0
+            self._record_sample(
+                func, ring, start_ns, duration_ns, memory_before, memory_after,
+                include_memory, failed, log_slow
+            )
+    
+    def _record_sample(self,
+                       func: Callable,
+                       ring: SampleRing,
+                       start_ns: int,
+                       duration_ns: int,
+                       memory_before: float,
+                       memory_after: float,
+                       include_memory: bool,
+                       failed: bool,
+                       log_slow: bool):
+        """Record a sampled call into its ring."""
+        duration = duration_ns / 1_000_000
+        slow = duration > self.thresholds['slow_operation']
+        memory_delta = memory_after - memory_before if memory_after > 0 else None
+        
+        with self._lock:
+            ring.record(start_ns, duration_ns, memory_delta, failed, slow)
+        
+        if log_slow and slow:
+            perf_logger.warning(
+                f"Slow operation detected: {func.__name__} took {duration:.2f}ms (sampled)"
+            )
+        
+        if include_memory and memory_after > 0:
+            self._check_memory_thresholds(memory_after)
+    
     async def _time_async_function(self, 
                                  func: Callable, 
                                  args: tuple, 
@@ -293,6 +528,10 @@ class PerformanceMonitor:
         """
         Get performance metrics summary.
         
+        Sampled functions contribute their running totals; their call count
+        is estimated from the sampling interval and ``sampled_calls`` gives
+        the number of calls actually timed.
+        
         Args:
             function_name: Optional function name to filter metrics
             
@@ -306,28 +545,44 @@ class PerformanceMonitor:
             else:
                 metrics = [m for deque_metrics in self.metrics.values() 
                           for m in deque_metrics]
+            rings = [ring for name, ring in self.sample_rings.items()
+                     if ring.sampled and (not function_name or function_name in name)]
         
-        if not metrics:
+        if not metrics and not rings:
             return {"message": "No metrics available"}
         
         durations = [m.duration for m in metrics]
         memory_deltas = [m.memory_after - m.memory_before for m in metrics if m.memory_after > 0]
+        sampled_calls = sum(ring.sampled for ring in rings)
+        observed_ms = sum(durations) + sum(ring.total_ns for ring in rings) / 1_000_000
         
         summary = {
-            "total_calls": len(metrics),
-            "avg_duration_ms": sum(durations) / len(durations),
-            "min_duration_ms": min(durations),
-            "max_duration_ms": max(durations),
-            "total_duration_ms": sum(durations),
-            "exceptions": len([m for m in metrics if m.exception]),
-            "slow_operations": len([m for m in metrics if m.duration > self.thresholds['slow_operation']])
+            "total_calls": len(metrics) + sum(ring.calls for ring in rings),
+            "avg_duration_ms": observed_ms / (len(durations) + sampled_calls),
+            "min_duration_ms": min(durations + [ring.min_ns / 1_000_000 for ring in rings]),
+            "max_duration_ms": max(durations + [ring.max_ns / 1_000_000 for ring in rings]),
+            "total_duration_ms": sum(durations) + sum(
+                ring.total_ns / 1_000_000 * ring.calls / ring.sampled for ring in rings
+            ),
+            "exceptions": len([m for m in metrics if m.exception]) + sum(ring.exceptions for ring in rings),
+            "slow_operations": (
+                len([m for m in metrics if m.duration > self.thresholds['slow_operation']])
+                + sum(ring.slow for ring in rings)
+            )
         }
         
-        if memory_deltas:
+        if rings:
+            summary["sampled_calls"] = sampled_calls
+        
+        memory_rings = [ring for ring in rings if ring.memory_samples]
+        if memory_deltas or memory_rings:
+            memory_count = len(memory_deltas) + sum(ring.memory_samples for ring in memory_rings)
             summary.update({
-                "avg_memory_delta_mb": sum(memory_deltas) / len(memory_deltas),
-                "max_memory_delta_mb": max(memory_deltas),
-                "min_memory_delta_mb": min(memory_deltas)
+                "avg_memory_delta_mb": (
+                    sum(memory_deltas) + sum(ring.memory_total for ring in memory_rings)
+                ) / memory_count,
+                "max_memory_delta_mb": max(memory_deltas + [ring.memory_max for ring in memory_rings]),
+                "min_memory_delta_mb": min(memory_deltas + [ring.memory_min for ring in memory_rings])
             })
         
         return summary
@@ -350,6 +605,7 @@ performance_monitor = PerformanceMonitor()
 timing = performance_monitor.timing_decorator
 memory_timing = functools.partial(performance_monitor.timing_decorator, include_memory=True)
 simple_timing = functools.partial(performance_monitor.timing_decorator, include_memory=False)
+sampled_timing = functools.partial(performance_monitor.timing_decorator, sample_rate=0.01)
 
 @contextmanager
 def performance_context(name: str, include_memory: bool = True):
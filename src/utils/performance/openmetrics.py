@@ -0,0 +1,524 @@
+"""
+OpenMetrics exporter for bot internals.
+
+This module serves the counters that subsystems already keep (cache
+hit/miss counts, event queue depths and latency buckets, network and memory
+statistics, operation timings and circuit breaker states) as OpenMetrics
+text on a local HTTP endpoint, so they can be scraped by Prometheus.
+
+Collection is pull-based: nothing is computed between scrapes. On each
+request the registered collectors read their subsystem's counters and write
+samples into a MetricsWriter, which groups them into metric families.
+
+Example:
+    exporter = OpenMetricsExporter(port=9464)
+    exporter.register(lambda writer: write_memory_metrics(writer, monitor.get_memory_stats()))
+    await exporter.start()
+"""
+
+import logging
+import math
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from aiohttp import web
+
+from .timing import REPORTED_PERCENTILES, iter_latency_histograms
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Monotonic counters reported by EventQueue.get_stats()
+EVENT_QUEUE_COUNTERS = (
+    "enqueued", "processed", "batches", "backpressure_events", "dropped_oldest",
+    "dropped_newest", "coalesced", "overflowed", "errors", "dead_lettered"
+)
+
+Collector = Callable[["MetricsWriter"], None]
+
+
+def _format_value(value: Any) -> str:
+    """Format a sample value as OpenMetrics text."""
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def _format_labels(labels: Optional[Mapping[str, Any]]) -> str:
+    """Format a label set, escaping backslashes, quotes and newlines."""
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels.items():
+        text = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{text}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class MetricsWriter:
+    """
+    Accumulates samples for one scrape and renders them as OpenMetrics text.
+    
+    Samples are grouped by family, so several collectors can write to the
+    same family (for example one cache per service) and the output still
+    lists each family's samples together, as the format requires.
+    
+    Attributes:
+        prefix: Prefix added to every metric family name
+    """
+    
+    def __init__(self, prefix: str = "statsbot"):
+        """
+        Initialize an empty writer.
+        
+        Args:
+            prefix: Prefix added to every metric family name
+        """
+        self.prefix = prefix
+        self._families: Dict[str, Tuple[str, str, List[str]]] = {}
+    
+    def _family(self, name: str, metric_type: str, help_text: str) -> Tuple[str, List[str]]:
+        """Get or create a family's sample list."""
+        full_name = f"{self.prefix}_{name}" if self.prefix else name
+        family = self._families.get(full_name)
+        if family is None:
+            family = self._families[full_name] = (metric_type, help_text, [])
+        elif family[0] != metric_type:
+            raise ValueError(f"Metric '{full_name}' already written as {family[0]}, not {metric_type}")
+        return full_name, family[2]
+    
+    def gauge(self, name: str, help_text: str, value: Any,
+              labels: Optional[Mapping[str, Any]] = None) -> None:
+        """
+        Write a gauge sample.
+        
+        Args:
+            name: Family name (without prefix)
+            help_text: Family description
+            value: Current value
+            labels: Optional label set
+        """
+        full_name, samples = self._family(name, "gauge", help_text)
+        samples.append(f"{full_name}{_format_labels(labels)} {_format_value(value)}")
+    
+    def counter(self, name: str, help_text: str, value: Any,
+                labels: Optional[Mapping[str, Any]] = None) -> None:
+        """
+        Write a counter sample (the ``_total`` suffix is added).
+        
+        Args:
+            name: Family name (without prefix or ``_total``)
+            help_text: Family description
+            value: Monotonic count
+            labels: Optional label set
+        """
+        full_name, samples = self._family(name, "counter", help_text)
+        samples.append(f"{full_name}_total{_format_labels(labels)} {_format_value(value)}")
+    
+    def summary(self, name: str, help_text: str, quantiles: Iterable[Tuple[float, float]],
+                count: int, total: float, labels: Optional[Mapping[str, Any]] = None) -> None:
+        """
+        Write a summary: quantile samples plus count and sum.
+        
+        Args:
+            name: Family name (without prefix)
+            help_text: Family description
+            quantiles: (quantile, value) pairs
+            count: Number of observations
+            total: Sum of observations
+            labels: Optional label set
+        """
+        full_name, samples = self._family(name, "summary", help_text)
+        labels = dict(labels or {})
+        for quantile, value in quantiles:
+            quantile_labels = _format_labels({**labels, "quantile": quantile})
+            samples.append(f"{full_name}{quantile_labels} {_format_value(value)}")
+        label_text = _format_labels(labels)
+        samples.append(f"{full_name}_count{label_text} {count}")
+        samples.append(f"{full_name}_sum{label_text} {_format_value(total)}")
+    
+    def histogram(self, name: str, help_text: str, buckets: Iterable[Tuple[float, int]],
+                  total: float, labels: Optional[Mapping[str, Any]] = None) -> None:
+        """
+        Write a histogram from per-bucket (not cumulative) counts.
+        
+        Args:
+            name: Family name (without prefix)
+            help_text: Family description
+            buckets: (upper bound, count) pairs in increasing order; the last
+                bound should be ``math.inf``
+            total: Sum of observations
+            labels: Optional label set
+        """
+        full_name, samples = self._family(name, "histogram", help_text)
+        labels = dict(labels or {})
+        cumulative = 0
+        for bound, count in buckets:
+            cumulative += count
+            bucket_labels = _format_labels({**labels, "le": _format_value(float(bound))})
+            samples.append(f"{full_name}_bucket{bucket_labels} {cumulative}")
+        label_text = _format_labels(labels)
+        samples.append(f"{full_name}_count{label_text} {cumulative}")
+        samples.append(f"{full_name}_sum{label_text} {_format_value(total)}")
+    
+    def stateset(self, name: str, help_text: str, states: Iterable[str], current: str,
+                 labels: Optional[Mapping[str, Any]] = None) -> None:
+        """
+        Write a state set with exactly one state enabled.
+        
+        Args:
+            name: Family name (without prefix); also used as the state label
+            help_text: Family description
+            states: All possible states
+            current: The enabled state
+            labels: Optional label set
+        """
+        full_name, samples = self._family(name, "stateset", help_text)
+        labels = dict(labels or {})
+        for state in states:
+            state_labels = _format_labels({**labels, full_name: state})
+            samples.append(f"{full_name}{state_labels} {1 if state == current else 0}")
+    
+    def render(self) -> str:
+        """
+        Render all families as OpenMetrics text, terminated by ``# EOF``.
+        
+        Returns:
+            Exposition text
+        """
+        lines = []
+        for full_name, (metric_type, help_text, samples) in self._families.items():
+            lines.append(f"# TYPE {full_name} {metric_type}")
+            if help_text:
+                lines.append(f"# HELP {full_name} {help_text}")
+            lines.extend(samples)
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def write_timing_metrics(writer: MetricsWriter, window: str = "5m") -> None:
+    """
+    Write per-operation latency summaries from the timing histograms.
+    
+    Quantiles cover the recent window; count and sum cover all time.
+    
+    Args:
+        writer: Writer for the current scrape
+        window: Histogram window for the quantiles ("1m", "5m" or "1h")
+    """
+    for category, operation, histogram in iter_latency_histograms():
+        recent = histogram.snapshot(window)
+        quantiles = [q for _, q in REPORTED_PERCENTILES]
+        values = recent.percentiles(quantiles)
+        writer.summary(
+            "operation_latency_seconds",
+            f"Operation latency (quantiles over the last {window})",
+            [(q, v / 1_000_000) for q, v in zip(quantiles, values)],
+            histogram.total.count,
+            histogram.total.total_us / 1_000_000,
+            {"category": category, "operation": operation}
+        )
+
+
+def write_cache_metrics(writer: MetricsWriter, name: str, counters: Mapping[str, int]) -> None:
+    """
+    Write cache size and hit/miss counters.
+    
+    Args:
+        writer: Writer for the current scrape
+        name: Cache name (used as the ``cache`` label)
+        counters: Result of ``CacheManager.get_counters()``
+    """
+    labels = {"cache": name}
+    writer.gauge("cache_entries", "Entries currently cached", counters["entries"], labels)
+    writer.gauge("cache_capacity", "Maximum cache entries", counters["max_size"], labels)
+    writer.counter("cache_hits", "Cache lookups that found a live entry", counters["hits"], labels)
+    writer.counter("cache_misses", "Cache lookups that found nothing", counters["misses"], labels)
+    writer.counter("cache_evictions", "Entries evicted to stay within capacity", counters["evictions"], labels)
+    writer.counter("cache_expirations", "Entries removed after their TTL", counters["expirations"], labels)
+
+
+def write_dedupe_metrics(writer: MetricsWriter, name: str, stats: Mapping[str, Any]) -> None:
+    """
+    Write size, lookup and hit counters for a dedupe filter.
+    
+    Args:
+        writer: Writer for the current scrape
+        name: Filter name (used as the ``filter`` label)
+        stats: Result of ``SequenceDedupeFilter.get_stats()``
+    """
+    labels = {"filter": name}
+    writer.gauge("dedupe_entries", "Subjects currently remembered", stats["size"], labels)
+    writer.gauge("dedupe_capacity", "Maximum subjects remembered", stats["capacity"], labels)
+    writer.counter("dedupe_checks", "Events checked for replays", stats["checks"], labels)
+    writer.counter("dedupe_hits", "Replayed events dropped", stats["hits"], labels)
+    writer.counter("dedupe_evictions", "Subjects forgotten to stay within capacity", stats["evictions"], labels)
+
+
+def _write_latency_buckets(writer: MetricsWriter, name: str, help_text: str,
+                           snapshot: Mapping[str, Any], labels: Mapping[str, Any]) -> None:
+    """Write an event queue latency snapshot (buckets keyed le_<ms>ms) in seconds."""
+    bounds = [float(key[3:-2]) / 1000 for key in snapshot["buckets"] if key != "inf"] + [math.inf]
+    writer.histogram(
+        name,
+        help_text,
+        zip(bounds, snapshot["buckets"].values()),
+        snapshot["mean_ms"] * snapshot["count"] / 1000,
+        labels
+    )
+
+
+def write_event_queue_metrics(writer: MetricsWriter, name: str, stats: Mapping[str, Any]) -> None:
+    """
+    Write queue depth, counters and latency histograms for an event queue.
+    
+    Args:
+        writer: Writer for the current scrape
+        name: Queue name (used as the ``queue`` label)
+        stats: Result of ``EventQueue.get_stats()`` or
+            ``PartitionedEventQueue.get_stats()``
+    """
+    labels = {"queue": name}
+    writer.gauge("event_queue_depth", "Events waiting to be processed", stats["queue_size"], labels)
+    writer.gauge(
+        "event_queue_oldest_pending_seconds",
+        "Age of the oldest waiting event",
+        stats["oldest_pending_ms"] / 1000,
+        labels
+    )
+    if "partitions" in stats:
+        writer.gauge("event_queue_partitions", "Active queue partitions", stats["partitions"], labels)
+    for counter in EVENT_QUEUE_COUNTERS:
+        writer.counter(f"event_queue_{counter}", f"Event queue {counter.replace('_', ' ')}", stats[counter], labels)
+    _write_latency_buckets(
+        writer, "event_queue_wait_seconds", "Time events spent queued", stats["queue_wait_ms"], labels
+    )
+    _write_latency_buckets(
+        writer, "event_queue_batch_seconds", "Batch processing time", stats["batch_latency_ms"], labels
+    )
+
+
+def write_event_batcher_metrics(writer: MetricsWriter, name: str, stats: Mapping[str, Any]) -> None:
+    """
+    Write pending work, counters and flush latency for an event batcher.
+    
+    Args:
+        writer: Writer for the current scrape
+        name: Batcher name (used as the ``batcher`` label)
+        stats: Result of ``EventBatcher.get_stats()``
+    """
+    labels = {"batcher": name}
+    writer.gauge("event_batcher_pending_events", "Events waiting in open batches", stats["pending_events"], labels)
+    writer.gauge("event_batcher_active_batches", "Open batches", stats["active_batches"], labels)
+    writer.counter("event_batcher_added_events", "Events added to batches", stats["added_events"], labels)
+    writer.counter("event_batcher_processed_events", "Events processed", stats["processed_events"], labels)
+    writer.counter("event_batcher_processed_batches", "Batches processed", stats["processed_batches"], labels)
+    writer.counter("event_batcher_errors", "Batch processing errors", stats["errors"], labels)
+    writer.counter(
+        "event_batcher_dead_lettered", "Events dropped after max retries", stats["dead_lettered"], labels
+    )
+    _write_latency_buckets(
+        writer, "event_batcher_flush_seconds", "Batch flush time", stats["flush_latency_ms"], labels
+    )
+
+
+def write_network_metrics(writer: MetricsWriter, stats: Mapping[str, Any]) -> None:
+    """
+    Write connection pool and API batcher metrics.
+    
+    Args:
+        writer: Writer for the current scrape
+        stats: Result of ``get_network_stats()``
+    """
+    pool = stats["connection_pool"]
+    writer.gauge("http_active_connections", "Open HTTP connections", pool["active_connections"])
+    writer.counter("http_requests", "HTTP requests sent", pool["requests"])
+    writer.counter("http_request_errors", "HTTP requests that failed", pool["request_errors"])
+    writer.counter("http_handshakes", "New HTTP connections opened", pool["handshakes"])
+    writer.counter("http_reused_connections", "Requests served on a reused connection", pool["reused_connections"])
+    writer.counter("http_pool_waits", "Requests that waited for a pooled connection", pool["pool_waits"])
+    writer.counter("http_dns_cache_hits", "DNS cache hits", pool["dns_cache_hits"])
+    writer.counter("http_dns_cache_misses", "DNS cache misses", pool["dns_cache_misses"])
+    
+    requests = stats["api_batcher"]["requests"]
+    writer.counter("api_requests", "Batched Discord API requests", requests["total"])
+    writer.counter("api_failed_requests", "Batched Discord API requests that failed", requests["failed"])
+    writer.counter("api_rate_limited_requests", "Batched Discord API requests that hit a rate limit",
+                   requests["rate_limited"])
+    writer.gauge("api_pending_requests", "Discord API requests waiting to be batched",
+                 stats["api_batcher"]["performance"]["pending_requests"])
+
+
+def write_memory_metrics(writer: MetricsWriter, stats: Mapping[str, Any]) -> None:
+    """
+    Write process memory usage and monitor counters.
+    
+    Args:
+        writer: Writer for the current scrape
+        stats: Result of ``MemoryMonitor.get_memory_stats()``
+    """
+    writer.gauge("memory_rss_bytes", "Resident set size", stats["current_usage_mb"] * 1024 * 1024)
+    writer.gauge("memory_peak_rss_bytes", "Peak resident set size seen by the monitor",
+                 stats["peak_usage_mb"] * 1024 * 1024)
+    writer.counter("memory_warnings", "Memory warning alerts", stats["warnings"])
+    writer.counter("memory_critical_alerts", "Critical memory alerts", stats["critical_alerts"])
+    writer.counter("memory_gc_collections", "Garbage collections triggered by the monitor", stats["gc_collections"])
+
+
+def write_circuit_breaker_metrics(writer: MetricsWriter, breakers: Mapping[str, Any]) -> None:
+    """
+    Write the state and failure count of each circuit breaker.
+    
+    Args:
+        writer: Writer for the current scrape
+        breakers: Circuit breakers by name
+    """
+    for name, breaker in breakers.items():
+        labels = {"name": name}
+        writer.stateset(
+            "circuit_breaker_state",
+            "Circuit breaker state",
+            ("closed", "open", "half_open"),
+            breaker.state.value,
+            labels
+        )
+        writer.gauge("circuit_breaker_failures", "Consecutive failures", breaker.failure_count, labels)
+
+
+class OpenMetricsExporter:
+    """
+    Local HTTP endpoint serving OpenMetrics text.
+    
+    Collectors are called on every scrape; a failing collector is logged and
+    counted but does not fail the scrape.
+    
+    Attributes:
+        host: Address to bind (localhost by default)
+        port: Port to bind (0 picks a free port, see ``bound_port``)
+        path: URL path of the metrics endpoint
+    """
+    
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 9464,
+        path: str = "/metrics",
+        prefix: str = "statsbot",
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Initialize the exporter.
+        
+        Args:
+            host: Address to bind (localhost by default)
+            port: Port to bind (0 picks a free port)
+            path: URL path of the metrics endpoint
+            prefix: Prefix added to every metric family name
+            logger: Logger instance (uses the module logger if None)
+        """
+        self.host = host
+        self.port = port
+        self.path = path
+        self.prefix = prefix
+        self.logger = logger or logging.getLogger("performance.openmetrics")
+        self._collectors: List[Collector] = []
+        self._runner: Optional[web.AppRunner] = None
+        self._site: Optional[web.TCPSite] = None
+        self._stats = {
+            "scrapes": 0,
+            "collector_errors": 0,
+            "last_scrape_ms": 0.0
+        }
+    
+    def register(self, collector: Collector) -> None:
+        """
+        Register a collector called with a MetricsWriter on every scrape.
+        
+        Args:
+            collector: Callable that writes samples
+        """
+        self._collectors.append(collector)
+    
+    def collect(self) -> str:
+        """
+        Run every collector and render the result.
+        
+        Returns:
+            OpenMetrics exposition text
+        """
+        start = time.perf_counter()
+        writer = MetricsWriter(self.prefix)
+        for collector in self._collectors:
+            try:
+                collector(writer)
+            except Exception as e:
+                self._stats["collector_errors"] += 1
+                self.logger.error(f"Metrics collector {collector!r} failed: {str(e)}", exc_info=True)
+        
+        self._stats["scrapes"] += 1
+        writer.counter("metrics_scrapes", "Metrics scrapes served", self._stats["scrapes"])
+        writer.counter("metrics_collector_errors", "Collectors that raised during a scrape",
+                       self._stats["collector_errors"])
+        writer.gauge("metrics_last_scrape_seconds", "Time taken by the previous scrape",
+                     self._stats["last_scrape_ms"] / 1000)
+        self._stats["last_scrape_ms"] = (time.perf_counter() - start) * 1000
+        return writer.render()
+    
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        """Serve one scrape."""
+        return web.Response(body=self.collect().encode("utf-8"), headers={"Content-Type": CONTENT_TYPE})
+    
+    @property
+    def running(self) -> bool:
+        """Whether the HTTP endpoint is serving."""
+        return self._site is not None
+    
+    @property
+    def bound_port(self) -> Optional[int]:
+        """Port actually bound, or None if not running."""
+        if self._runner is None or not self._runner.addresses:
+            return None
+        return self._runner.addresses[0][1]
+    
+    async def start(self) -> None:
+        """Start serving; does nothing if already running."""
+        if self._site is not None:
+            return
+        
+        app = web.Application()
+        app.router.add_get(self.path, self._handle_metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        self._site = web.TCPSite(self._runner, self.host, self.port)
+        try:
+            await self._site.start()
+        except Exception:
+            await self._runner.cleanup()
+            self._runner = None
+            self._site = None
+            raise
+        
+        self.logger.info(f"Serving OpenMetrics on http://{self.host}:{self.bound_port}{self.path}")
+    
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is None:
+            return
+        await self._runner.cleanup()
+        self._runner = None
+        self._site = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get exporter statistics."""
+        return {
+            **self._stats,
+            "collectors": len(self._collectors),
+            "running": self.running,
+            "address": f"{self.host}:{self.bound_port or self.port}{self.path}"
+        }
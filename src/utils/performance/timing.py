@@ -3,12 +3,19 @@ Performance timing utilities.
 
 This module provides decorators and context managers for timing code execution
 and collecting performance metrics.
+
+Besides count/total/min/max/avg, every operation keeps a fixed-memory
+log-linear (HDR-style) latency histogram. Recording is O(1), percentiles
+(p50/p90/p99/p99.9) are accurate to about 1.6%, recent windows (1m/5m/1h)
+come from a ring of time slots, and histograms merge by adding bucket
+counts.
 """
 
 import time
 import functools
 import asyncio
-from typing import Dict, Any, Optional, Callable, TypeVar, cast
+from array import array
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Callable, Tuple, TypeVar, Union, cast
 from contextlib import contextmanager
 
 # Type variables for generic function types
@@ -18,6 +25,358 @@ C = TypeVar('C', bound=Callable[..., Any])
 # Global performance metrics storage
 _performance_metrics: Dict[str, Dict[str, Any]] = {}
 
+# Latency histograms by category and operation
+_latency_histograms: Dict[str, Dict[str, 'WindowedHistogram']] = {}
+
+# Named windows for histogram snapshots, in seconds
+HISTOGRAM_WINDOWS = {
+    "1m": 60,
+    "5m": 300,
+    "1h": 3600
+}
+
+# Percentiles reported by summaries
+REPORTED_PERCENTILES = (
+    ("p50", 0.50),
+    ("p90", 0.90),
+    ("p99", 0.99),
+    ("p999", 0.999)
+)
+
+# Linear sub-buckets per power of two are 2**(SUB_BUCKET_BITS - 1)
+SUB_BUCKET_BITS = 6
+_HALF_BUCKET_BITS = SUB_BUCKET_BITS - 1
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of durations in microseconds.
+    
+    Values below 2**SUB_BUCKET_BITS get one bucket each; above that every
+    power of two is split into 2**(SUB_BUCKET_BITS - 1) linear buckets, so a
+    bucket is never wider than 1/32 of its values. Bucket counts live in a
+    preallocated array sized for max_value_us.
+    
+    Attributes:
+        count (int): Values recorded
+        total_us (int): Sum of recorded values
+        min_us (int): Smallest value (0 when empty)
+        max_us (int): Largest value
+        counts (array): Count per bucket
+    """
+    
+    SUB_BUCKET_BITS = SUB_BUCKET_BITS
+    
+    __slots__ = ('max_value_us', 'counts', 'count', 'total_us', 'min_us', 'max_us')
+    
+    def __init__(self, max_value_us: int = 2 ** 36):
+        """
+        Initialize an empty histogram.
+        
+        Args:
+            max_value_us: Largest distinct value (larger values are clamped); default about 19 hours
+        """
+        self.max_value_us = max_value_us
+        self.counts = array('Q', bytes(8 * (self.bucket_index(max_value_us) + 1)))
+        self.count = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_us = 0
+    
+    @classmethod
+    def bucket_index(cls, value_us: int) -> int:
+        """Get the bucket for a non-negative value."""
+        shift = value_us.bit_length() - cls.SUB_BUCKET_BITS
+        if shift <= 0:
+            return value_us
+        return (shift << (cls.SUB_BUCKET_BITS - 1)) + (value_us >> shift)
+    
+    @classmethod
+    def bucket_bounds(cls, index: int) -> Tuple[int, int]:
+        """Get the lowest and highest value stored in a bucket."""
+        if index < (1 << cls.SUB_BUCKET_BITS):
+            return index, index
+        shift = (index >> (cls.SUB_BUCKET_BITS - 1)) - 1
+        sub_bucket = index - (shift << (cls.SUB_BUCKET_BITS - 1))
+        return sub_bucket << shift, ((sub_bucket + 1) << shift) - 1
+    
+    def record(self, value_us: int) -> None:
+        """
+        Record one value.
+        
+        Args:
+            value_us: Duration in microseconds (negative values count as 0)
+        """
+        value_us = int(value_us)
+        if value_us < 0:
+            value_us = 0
+        elif value_us > self.max_value_us:
+            value_us = self.max_value_us
+        self._record_clamped(value_us)
+    
+    def _record_clamped(self, value_us: int) -> int:
+        """Record a value already clamped to [0, max_value_us] and return its bucket."""
+        # bucket_index inlined; this is the hot path
+        shift = value_us.bit_length() - SUB_BUCKET_BITS
+        index = value_us if shift <= 0 else (shift << _HALF_BUCKET_BITS) + (value_us >> shift)
+        self.counts[index] += 1
+        if value_us > self.max_us:
+            self.max_us = value_us
+        if value_us < self.min_us or not self.count:
+            self.min_us = value_us
+        self.count += 1
+        self.total_us += value_us
+        return index
+    
+    def add_bucket(self, index: int, count: int) -> None:
+        """Add counts to one bucket (used to rebuild a histogram from sparse slots)."""
+        self.counts[index] += count
+    
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        """
+        Add another histogram's values into this one.
+        
+        Args:
+            other: Histogram with the same max_value_us
+            
+        Returns:
+            This histogram
+            
+        Raises:
+            ValueError: If the histograms have different ranges
+        """
+        if other.max_value_us != self.max_value_us:
+            raise ValueError("Cannot merge histograms with different ranges")
+        if other.count == 0:
+            return self
+        
+        counts = self.counts
+        for index, value in enumerate(other.counts):
+            if value:
+                counts[index] += value
+        if self.count == 0 or other.min_us < self.min_us:
+            self.min_us = other.min_us
+        self.max_us = max(self.max_us, other.max_us)
+        self.count += other.count
+        self.total_us += other.total_us
+        return self
+    
+    def percentile(self, quantile: float) -> int:
+        """
+        Get the value at a quantile.
+        
+        Args:
+            quantile: Quantile between 0 and 1 (e.g. 0.99)
+            
+        Returns:
+            Midpoint of the bucket holding the quantile, in microseconds
+            (0 when empty)
+        """
+        if self.count == 0:
+            return 0
+        
+        rank = max(1, int(quantile * self.count + 0.999999))
+        if rank >= self.count:
+            return self.max_us
+        seen = 0
+        for index, value in enumerate(self.counts):
+            if value:
+                seen += value
+                if seen >= rank:
+                    return self._bucket_value(index)
+        return self.max_us
+    
+    def percentiles(self, quantiles: Iterable[float]) -> List[int]:
+        """
+        Get several quantiles in one pass.
+        
+        Args:
+            quantiles: Quantiles in ascending order
+            
+        Returns:
+            Values in microseconds, in the same order
+        """
+        quantiles = list(quantiles)
+        if self.count == 0:
+            return [0] * len(quantiles)
+        
+        ranks = [max(1, int(q * self.count + 0.999999)) for q in quantiles]
+        results: List[int] = []
+        seen = 0
+        for index, value in enumerate(self.counts):
+            if not value:
+                continue
+            seen += value
+            while len(results) < len(ranks) and seen >= ranks[len(results)]:
+                rank = ranks[len(results)]
+                results.append(self.max_us if rank >= self.count else self._bucket_value(index))
+            if len(results) == len(ranks):
+                break
+        results.extend([self.max_us] * (len(ranks) - len(results)))
+        return results
+    
+    def cumulative_counts(self, bounds_us: Iterable[int]) -> List[int]:
+        """
+        Count the values at or below each bound in one pass.
+        
+        The bucket holding a bound is counted below it, so each count is
+        exact to within one bucket (at most 1/32 of the bound).
+        
+        Args:
+            bounds_us: Upper bounds in microseconds, in ascending order
+            
+        Returns:
+            Cumulative counts, in the same order
+        """
+        counts = self.counts
+        results: List[int] = []
+        seen = 0
+        next_index = 0
+        for bound in bounds_us:
+            last = self.bucket_index(min(max(int(bound), 0), self.max_value_us))
+            while next_index <= last:
+                seen += counts[next_index]
+                next_index += 1
+            results.append(seen)
+        return results
+    
+    def _bucket_value(self, index: int) -> int:
+        """Representative value of a bucket: its midpoint, kept within min and max."""
+        low, high = self.bucket_bounds(index)
+        return min(max((low + high) // 2, self.min_us), self.max_us)
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the histogram in milliseconds.
+        
+        Returns:
+            Dictionary with count, min/max/mean and the reported percentiles
+        """
+        values = self.percentiles(q for _, q in REPORTED_PERCENTILES)
+        summary: Dict[str, Any] = {
+            'count': self.count,
+            'min_ms': self.min_us / 1000,
+            'max_ms': self.max_us / 1000,
+            'mean_ms': (self.total_us / self.count / 1000) if self.count else 0.0
+        }
+        for (name, _), value in zip(REPORTED_PERCENTILES, values):
+            summary[f'{name}_ms'] = value / 1000
+        return summary
+
+class WindowedHistogram:
+    """
+    Latency histogram with an all-time view and rotating recent windows.
+    
+    Recent values also go into a ring of sparse per-slot bucket maps
+    (slot_seconds each, covering horizon_seconds). A window snapshot merges
+    the slots that fall inside it, so "last 1m" spans between
+    60 - slot_seconds and 60 seconds of data.
+    
+    Attributes:
+        total (LatencyHistogram): Every value recorded
+        slot_seconds (int): Width of one ring slot
+    """
+    
+    __slots__ = ('total', 'slot_seconds', '_slots', '_slot_ids', '_slot_stats')
+    
+    def __init__(self, slot_seconds: int = 10, horizon_seconds: int = 3600, max_value_us: int = 2 ** 36):
+        """
+        Initialize an empty windowed histogram.
+        
+        Args:
+            slot_seconds: Width of one ring slot
+            horizon_seconds: Longest window that can be queried
+            max_value_us: Largest distinct value (larger values are clamped)
+        """
+        self.total = LatencyHistogram(max_value_us)
+        self.slot_seconds = slot_seconds
+        slot_count = -(-horizon_seconds // slot_seconds)
+        self._slots: List[Dict[int, int]] = [{} for _ in range(slot_count)]
+        self._slot_ids = array('q', [-1] * slot_count)
+        # Per slot: count, total_us, min_us, max_us
+        self._slot_stats = [[0, 0, 0, 0] for _ in range(slot_count)]
+    
+    def record(self, value_us: int, now: Optional[float] = None) -> None:
+        """
+        Record one value.
+        
+        Args:
+            value_us: Duration in microseconds
+            now: Current monotonic time (default: time.monotonic())
+        """
+        total = self.total
+        value_us = int(value_us)
+        if value_us < 0:
+            value_us = 0
+        elif value_us > total.max_value_us:
+            value_us = total.max_value_us
+        index = total._record_clamped(value_us)
+        
+        slot_id = int((time.monotonic() if now is None else now) // self.slot_seconds)
+        position = slot_id % len(self._slots)
+        stats = self._slot_stats[position]
+        if self._slot_ids[position] != slot_id:
+            # Slot last held data from a previous lap of the ring
+            self._slots[position].clear()
+            stats[:] = [0, 0, value_us, value_us]
+            self._slot_ids[position] = slot_id
+        
+        slot = self._slots[position]
+        slot[index] = slot.get(index, 0) + 1
+        stats[0] += 1
+        stats[1] += value_us
+        if value_us < stats[2]:
+            stats[2] = value_us
+        elif value_us > stats[3]:
+            stats[3] = value_us
+    
+    def snapshot(self, window: Union[str, float, None] = None, now: Optional[float] = None) -> LatencyHistogram:
+        """
+        Get a histogram of the values recorded in a recent window.
+        
+        Args:
+            window: "1m", "5m", "1h", a number of seconds, or None for all time
+            now: Current monotonic time (default: time.monotonic())
+            
+        Returns:
+            Histogram of the window's values (a copy)
+            
+        Raises:
+            ValueError: If the window is unknown or longer than the horizon
+        """
+        if window is None:
+            return LatencyHistogram(self.total.max_value_us).merge(self.total)
+        
+        seconds = HISTOGRAM_WINDOWS.get(window) if isinstance(window, str) else window
+        if seconds is None:
+            raise ValueError(f"Unknown window: {window}. Valid windows are: {', '.join(HISTOGRAM_WINDOWS)}")
+        slots_needed = -(-int(seconds) // self.slot_seconds)
+        if slots_needed > len(self._slots):
+            raise ValueError(f"Window {window} is longer than the {len(self._slots) * self.slot_seconds}s horizon")
+        
+        current = int((time.monotonic() if now is None else now) // self.slot_seconds)
+        result = LatencyHistogram(self.total.max_value_us)
+        for position, slot_id in enumerate(self._slot_ids):
+            if current - slots_needed < slot_id <= current:
+                for index, count in self._slots[position].items():
+                    result.add_bucket(index, count)
+                count, total_us, min_us, max_us = self._slot_stats[position]
+                if result.count == 0 or min_us < result.min_us:
+                    result.min_us = min_us
+                result.max_us = max(result.max_us, max_us)
+                result.count += count
+                result.total_us += total_us
+        return result
+
+def _histogram_for(category: str, operation: str) -> WindowedHistogram:
+    """Get or create the latency histogram for an operation."""
+    operations = _latency_histograms.get(category)
+    if operations is None:
+        operations = _latency_histograms[category] = {}
+    histogram = operations.get(operation)
+    if histogram is None:
+        histogram = operations[operation] = WindowedHistogram()
+    return histogram
+
 def get_performance_metrics() -> Dict[str, Dict[str, Any]]:
     """
     Get the current performance metrics.
@@ -30,8 +389,64 @@ def get_performance_metrics() -> Dict[str, Dict[str, Any]]:
 def reset_performance_metrics() -> None:
     """Reset all performance metrics."""
     _performance_metrics.clear()
+    _latency_histograms.clear()
+
+def get_latency_histogram(
+    category: Optional[str] = None,
+    operation: Optional[str] = None,
+    window: Union[str, float, None] = None
+) -> LatencyHistogram:
+    """
+    Get one operation's latency histogram, or several merged into one.
+    
+    Args:
+        category: Only include this category (default: all)
+        operation: Only include this operation (default: all)
+        window: "1m", "5m", "1h", seconds, or None for all time
+        
+    Returns:
+        Merged histogram of the matching operations
+    """
+    merged = LatencyHistogram()
+    for cat, operations in _latency_histograms.items():
+        if category is not None and cat != category:
+            continue
+        for op, histogram in operations.items():
+            if operation is None or op == operation:
+                merged.merge(histogram.snapshot(window))
+    return merged
+
+def get_latency_percentiles(window: Union[str, float, None] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Get latency percentiles for every operation.
+    
+    Args:
+        window: "1m", "5m", "1h", seconds, or None for all time
+        
+    Returns:
+        Dict: Histogram summaries (count, min/max/mean, p50/p90/p99/p99.9 in ms)
+        by category and operation
+    """
+    return {
+        category: {
+            operation: histogram.snapshot(window).summary()
+            for operation, histogram in operations.items()
+        }
+        for category, operations in _latency_histograms.items()
+    }
 
-def _record_timing(category: str, operation: str, duration: float) -> None:
+def iter_latency_histograms() -> Iterator[Tuple[str, str, WindowedHistogram]]:
+    """
+    Iterate over the live per-operation latency histograms.
+    
+    Yields:
+        (category, operation, histogram) tuples; the histograms are not copied
+    """
+    for category, operations in list(_latency_histograms.items()):
+        for operation, histogram in list(operations.items()):
+            yield category, operation, histogram
+
+def record_timing(category: str, operation: str, duration: float) -> None:
     """
     Record a timing measurement.
     
@@ -58,6 +473,8 @@ def _record_timing(category: str, operation: str, duration: float) -> None:
     metrics['min_time'] = min(metrics['min_time'], duration)
     metrics['max_time'] = max(metrics['max_time'], duration)
     metrics['avg_time'] = metrics['total_time'] / metrics['count']
+    
+    _histogram_for(category, operation).record(duration * 1_000_000)
 
 def timing(category: str = "default", operation: Optional[str] = None) -> Callable[[F], F]:
     """
@@ -74,24 +491,24 @@ def timing(category: str = "default", operation: Optional[str] = None) -> Callab
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             op_name = operation or func.__name__
-            start_time = time.time()
+            start_time = time.perf_counter()
             try:
                 result = func(*args, **kwargs)
                 return result
             finally:
-                duration = time.time() - start_time
-                _record_timing(category, op_name, duration)
+                duration = time.perf_counter() - start_time
+                record_timing(category, op_name, duration)
         
         @functools.wraps(func)
         async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
             op_name = operation or func.__name__
-            start_time = time.time()
+            start_time = time.perf_counter()
             try:
                 result = await func(*args, **kwargs)
                 return result
             finally:
-                duration = time.time() - start_time
-                _record_timing(category, op_name, duration)
+                duration = time.perf_counter() - start_time
+                record_timing(category, op_name, duration)
         
         if asyncio.iscoroutinefunction(func):
             return cast(F, async_wrapper)
@@ -112,12 +529,12 @@ def async_timed(name: str) -> Callable[[C], C]:
     def decorator(func: C) -> C:
         @functools.wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            start_time = time.time()
+            start_time = time.perf_counter()
             try:
                 return await func(*args, **kwargs)
             finally:
-                duration = time.time() - start_time
-                _record_timing("async", name, duration)
+                duration = time.perf_counter() - start_time
+                record_timing("async", name, duration)
         
         return cast(C, wrapper)
     
@@ -132,9 +549,9 @@ def performance_context(operation: str, category: str = "context") -> None:
         operation: Name of the operation
         category: Category for the timing measurement
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
         yield
     finally:
-        duration = time.time() - start_time
-        _record_timing(category, operation, duration)
\ No newline at end of file
+        duration = time.perf_counter() - start_time
+        record_timing(category, operation, duration)
\ No newline at end of file
@@ -13,10 +13,13 @@
 # - Structured JSON log output
 # - Emoji support for visual categorization
 # - Run ID tracking for session management
+# - Buffered NDJSON output (one record per tree section)
+# - Size-based rotation of the JSON log into gzip archives
 #
 # Technical Implementation:
 # - Stack-based tree structure tracking
-# - Atomic file writes for log persistence
+# - One shared TreeLogger per process, rolled over at midnight
+# - Persistent JSON log handle flushed on an interval or on errors
 # - Timezone handling with pytz
 # - JSON serialization for structured logs
 # - Unicode symbol management
@@ -26,32 +29,261 @@
 #   YYYY-MM-DD/
 #     - logs.log    - All log messages
 #     - errors.log  - Only ERROR and CRITICAL messages
-#     - logs.json   - Structured JSON format
+#     - tree.json   - Structured JSON format (NDJSON)
+#     - tree.json.N.gz - Rotated JSON logs, 1 is the most recent
+#   (logs.json in the same directory belongs to StructuredLogger's writer)
 #
 # Required Dependencies:
 # - pytz: Timezone handling
 # =============================================================================
 
+import atexit
+import gzip
 import logging
 import os
+import shutil
+import sys
+import threading
 from datetime import datetime, timezone, timedelta
 import uuid
 import json
 from pathlib import Path
 
+
+class NDJSONSink:
+    """
+    Buffered newline-delimited JSON writer with size-based rotation.
+    
+    Records are serialized on write but only hit the disk when the buffer
+    fills, an urgent record arrives, or the flush thread wakes up. The file
+    handle stays open between flushes. When the file would grow past
+    max_bytes it is renamed to <path>.<n>.rotating and writing continues in a
+    fresh file; the flush thread then compresses it to <path>.1.gz and shifts
+    older archives up, keeping at most backup_count of them, so writers never
+    wait on gzip. Leftover .rotating files from a crash are compressed when
+    the sink next opens that path. The sink must be the only writer of its
+    file, since its size is tracked from its own writes.
+    """
+    
+    def __init__(self, path, max_bytes=10 * 1024 * 1024, backup_count=5,
+                 flush_interval=1.0, buffer_size=100):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        
+        self._buffer = []
+        self._handle = None
+        self._size = 0
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._wakeup = threading.Event()
+        
+        # Rotated files waiting for compression, oldest first, as
+        # (live path, rotated path); the archive lock serializes the chain
+        self._pending_archives = []
+        self._archive_lock = threading.Lock()
+        self._rotation_seq = 0
+        self._stats = {
+            "records": 0,
+            "flushes": 0,
+            "bytes_written": 0,
+            "rotations": 0,
+            "compressions": 0,
+            "write_errors": 0,
+            "compress_errors": 0
+        }
+        self._recover_rotated(path)
+        
+        self._thread = threading.Thread(target=self._flush_loop, name="tree-log-json", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+        
+    def write(self, record, urgent=False):
+        """Queue one record; urgent records are flushed immediately."""
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            self._buffer.append(line)
+            self._stats["records"] += 1
+            if urgent or self._closed.is_set() or len(self._buffer) >= self.buffer_size:
+                self._flush_locked()
+                
+    def set_path(self, path):
+        """Flush pending records and switch to a new file (day rollover)."""
+        with self._lock:
+            if path == self.path:
+                return
+            self._flush_locked()
+            self._close_handle()
+            self.path = path
+            self._recover_rotated(path)
+            
+    def flush(self):
+        """Write buffered records to disk."""
+        with self._lock:
+            self._flush_locked()
+            
+    def close(self):
+        """Flush, close the file, compress rotated files and stop the flush thread."""
+        self._closed.set()
+        self._wakeup.set()
+        with self._lock:
+            self._flush_locked()
+            self._close_handle()
+        self._compress_pending()
+            
+    def get_stats(self):
+        """Get sink statistics."""
+        with self._lock:
+            return {
+                **self._stats,
+                "buffered": len(self._buffer),
+                "file_bytes": self._size,
+                "pending_archives": len(self._pending_archives)
+            }
+        
+    def _flush_loop(self):
+        """Flush thread main loop; also compresses rotated files."""
+        while not self._closed.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._closed.is_set():
+                return
+            self.flush()
+            self._compress_pending()
+            
+    def _flush_locked(self):
+        """Write the buffer in one call (caller holds the lock)."""
+        if not self._buffer:
+            return
+        data = "".join(self._buffer).encode("utf-8")
+        self._buffer.clear()
+        
+        try:
+            if self._handle is None:
+                self._handle = open(self.path, "ab")
+                self._size = self._handle.tell()
+            if self._size and self._size + len(data) > self.max_bytes:
+                self._rotate()
+            self._handle.write(data)
+            self._handle.flush()
+            self._size += len(data)
+            self._stats["bytes_written"] += len(data)
+            self._stats["flushes"] += 1
+        except OSError as e:
+            self._stats["write_errors"] += 1
+            self._close_handle()
+            print(f"Failed to write JSON log {self.path}: {e}", file=sys.stderr)
+            
+    def _rotate(self):
+        """Set the current file aside for compression and start a new one (caller holds the lock)."""
+        self._close_handle()
+        
+        # Rename first so nothing written to the old file can be truncated away
+        rotated = None
+        while rotated is None or os.path.exists(rotated):
+            self._rotation_seq += 1
+            rotated = f"{self.path}.{self._rotation_seq}.rotating"
+        os.replace(self.path, rotated)
+        self._replace_index(None, f"{self.path}.idx")
+        self._pending_archives.append((self.path, rotated))
+        self._wakeup.set()
+                
+        self._handle = open(self.path, "ab")
+        self._size = 0
+        self._stats["rotations"] += 1
+        
+    def _recover_rotated(self, path):
+        """Queue .rotating files left behind for path (e.g. by a crash) for compression."""
+        directory, name = os.path.split(path)
+        try:
+            leftovers = sorted(
+                (os.path.join(directory or ".", entry) for entry in os.listdir(directory or ".")
+                 if entry.startswith(name + ".") and entry.endswith(".rotating")),
+                key=os.path.getmtime
+            )
+        except OSError:
+            return
+        
+        pending = {rotated for _, rotated in self._pending_archives}
+        for rotated in leftovers:
+            if rotated not in pending:
+                self._pending_archives.append((path, rotated))
+        
+    def _compress_pending(self):
+        """Compress rotated files into the archive chain, oldest first."""
+        with self._archive_lock:
+            while True:
+                with self._lock:
+                    if not self._pending_archives:
+                        return
+                    path, rotated = self._pending_archives[0]
+                try:
+                    self._archive(path, rotated)
+                except OSError as e:
+                    # Keep the file queued; the next flush tick retries it
+                    self._stats["compress_errors"] += 1
+                    print(f"Failed to compress JSON log {rotated}: {e}", file=sys.stderr)
+                    return
+                with self._lock:
+                    self._pending_archives.pop(0)
+                    self._stats["compressions"] += 1
+                    
+    def _archive(self, path, rotated):
+        """Compress one rotated file to <path>.1.gz, shifting older archives up."""
+        if self.backup_count > 0:
+            # Compress beside the chain first so a failure leaves it untouched
+            staged = f"{path}.1.gz.tmp"
+            try:
+                with open(rotated, "rb") as f_in, gzip.open(staged, "wb") as f_out:
+                    shutil.copyfileobj(f_in, f_out)
+            except OSError:
+                if os.path.exists(staged):
+                    os.remove(staged)
+                raise
+            for i in range(self.backup_count - 1, 0, -1):
+                src = f"{path}.{i}.gz"
+                if os.path.exists(src):
+                    os.replace(src, f"{path}.{i + 1}.gz")
+                    # Search indexes (.idx) travel with their archive
+                    self._replace_index(f"{src}.idx", f"{path}.{i + 1}.gz.idx")
+            os.replace(staged, f"{path}.1.gz")
+            self._replace_index(None, f"{path}.1.gz.idx")
+        os.remove(rotated)
+        
+    @staticmethod
+    def _replace_index(src, dst):
+        """Move a search index to dst, or remove dst's stale index if src is None or missing."""
+        if src is not None and os.path.exists(src):
+            os.replace(src, dst)
+        elif os.path.exists(dst):
+            os.remove(dst)
+            
+    def _close_handle(self):
+        """Close the open file, if any."""
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            except OSError:
+                pass
+            self._handle = None
+
 class TreeLogger:
     def __init__(self):
         # Use fixed EST timezone (UTC-5) instead of US/Eastern
         self.est_tz = timezone(timedelta(hours=-5))  # Always EST, never EDT
         self.start_time = datetime.now(self.est_tz)  # Add start_time
-        self.log_dir = "logs"
+        self.log_dir = os.path.abspath("logs")  # Stable if the working directory changes
         self.run_id = self._generate_run_id()
         
         # Create log directory for today
-        self.today_dir = os.path.join(self.log_dir, datetime.now(self.est_tz).strftime("%Y-%m-%d"))
+        self.today = datetime.now(self.est_tz).strftime("%Y-%m-%d")
+        self.today_dir = os.path.join(self.log_dir, self.today)
         os.makedirs(self.today_dir, exist_ok=True)
         
         # Set up logging
+        self.json_sink = None
         self._setup_logging()
         
     def _setup_logging(self):
@@ -66,9 +298,10 @@ class TreeLogger:
         root_logger = logging.getLogger()
         root_logger.setLevel(logging.INFO)
         
-        # Remove any existing handlers
+        # Remove any existing handlers (closing them, since roll_day calls this daily)
         for handler in root_logger.handlers[:]:
             root_logger.removeHandler(handler)
+            handler.close()
         
         # Console handler
         console_handler = logging.StreamHandler()
@@ -88,8 +321,23 @@ class TreeLogger:
         error_file_handler.setFormatter(log_formatter)
         root_logger.addHandler(error_file_handler)
         
-        # JSON log file handler
-        self.json_log_path = os.path.join(self.today_dir, "logs.json")
+        # JSON log sink (kept open and flushed in batches); logs.json is left
+        # to StructuredLogger's background writer, which appends to it too
+        self.json_log_path = os.path.join(self.today_dir, "tree.json")
+        if self.json_sink is None:
+            self.json_sink = NDJSONSink(self.json_log_path)
+        else:
+            self.json_sink.set_path(self.json_log_path)
+            
+    def roll_day(self):
+        """Move file output to today's directory if the date has changed."""
+        today = datetime.now(self.est_tz).strftime("%Y-%m-%d")
+        if today == self.today:
+            return
+        self.today = today
+        self.today_dir = os.path.join(self.log_dir, today)
+        os.makedirs(self.today_dir, exist_ok=True)
+        self._setup_logging()
         
     def _generate_run_id(self):
         """Generate a unique run ID."""
@@ -119,20 +367,27 @@ class TreeLogger:
         return now.strftime("%m/%d %I:%M %p EST")  # Always show EST
         
     def _write_json_log(self, level: str, category: str, message: str, **extra):
-        """Write a log entry to the JSON log file."""
+        """Queue a log entry for the JSON log file."""
+        now = datetime.now(self.est_tz)
         log_entry = {
-            "timestamp": f"[{self.format_time()}]",
+            "timestamp": f"[{now.strftime('%m/%d %I:%M %p EST')}]",
             "level": level,
             "category": category,
             "message": message,
             "run_id": self.run_id,
-            "iso_datetime": datetime.now(self.est_tz).isoformat(),
+            "iso_datetime": now.isoformat(),
             **extra
         }
         
-        with open(self.json_log_path, 'a') as f:
-            json.dump(log_entry, f)
-            f.write('\n')
+        self.json_sink.write(log_entry, urgent=level in ("ERROR", "CRITICAL"))
+        
+    def _log_tree(self, header, items):
+        """Log a header and its items as tree lines to the text logs."""
+        logger = logging.getLogger()
+        logger.info(header)
+        for i, (key, value) in enumerate(items):
+            prefix = "└─" if i == len(items) - 1 else "├─"
+            logger.info(f"{prefix} {key}: {value}")
             
     def log_section(self, title, items, emoji=""):
         """Log a section with items in tree format."""
@@ -142,17 +397,10 @@ class TreeLogger:
         logger.info("")
         logger.info("")
         
-        # Log section header
+        # Log section header and items; one JSON record for the whole section
         header = f"{emoji} {title}"
-        logger.info(header)
-        self._write_json_log("INFO", "perfect_tree_section", header)
-        
-        # Log items in tree format
-        for i, (key, value) in enumerate(items):
-            prefix = "└─" if i == len(items) - 1 else "├─"
-            item_msg = f"{prefix} {key}: {value}"
-            logger.info(item_msg)
-            self._write_json_log("INFO", "tree_item", item_msg)
+        self._log_tree(header, items)
+        self._write_json_log("INFO", "perfect_tree_section", header, items=dict(items))
             
     def log_run_header(self, bot_name, version):
         """Log run header with bot info and unique run ID."""
@@ -171,9 +419,6 @@ class TreeLogger:
         
         # Create and log header info (no extra spacing for the first entry)
         header = f"🎯 {bot_name} v{version} - Run ID: {self.run_id}"
-        logger.info(header)
-        self._write_json_log("INFO", "run_header", header)
-        
         items = [
             ("started_at", f"[{self.format_time()}]"),
             ("version", version),
@@ -181,11 +426,8 @@ class TreeLogger:
             ("log_session", date_str)
         ]
         
-        for i, (key, value) in enumerate(items):
-            prefix = "└─" if i == len(items) - 1 else "├─"
-            item_msg = f"{prefix} {key}: {value}"
-            logger.info(item_msg)
-            self._write_json_log("INFO", "run_header", item_msg)
+        self._log_tree(header, items)
+        self._write_json_log("INFO", "run_header", header, items=dict(items))
             
     def log_run_end(self, reason="Normal shutdown"):
         """Log run end with run ID and reason."""
@@ -195,8 +437,6 @@ class TreeLogger:
         header = f"🏁 Bot Run Ended - Run ID: {self.run_id}"
         logger.info("")  # Add spacing
         logger.info("")  # Add spacing
-        logger.info(header)
-        self._write_json_log("INFO", "run_end", header)
         
         items = [
             ("ended_at", f"[{self.format_time()}]"),
@@ -205,11 +445,9 @@ class TreeLogger:
             ("duration", self._get_run_duration())
         ]
         
-        for i, (key, value) in enumerate(items):
-            prefix = "└─" if i == len(items) - 1 else "├─"
-            item_msg = f"{prefix} {key}: {value}"
-            logger.info(item_msg)
-            self._write_json_log("INFO", "run_end", item_msg)
+        self._log_tree(header, items)
+        self._write_json_log("INFO", "run_end", header, items=dict(items))
+        self.json_sink.flush()
         
         # Add final separator
         logger.info("")
@@ -218,30 +456,27 @@ class TreeLogger:
         logger.info("=" * 80)
         logger.info("")
 
+# Shared logger so every call reuses one run ID, handler set and JSON sink
+_tree_logger = None
+_tree_logger_lock = threading.Lock()
+
+def get_tree_logger():
+    """Get the process-wide TreeLogger, rolling it over to today's directory."""
+    global _tree_logger
+    with _tree_logger_lock:
+        if _tree_logger is None:
+            _tree_logger = TreeLogger()
+        else:
+            _tree_logger.roll_day()
+        return _tree_logger
+
 def log_perfect_tree_section(title, items, emoji=""):
     """Log a perfect tree section with proper spacing."""
-    logger = TreeLogger()
-    log = logging.getLogger()
-    
-    # Add spacing before section (two blank lines)
-    log.info("")
-    log.info("")
-    
-    # Log section header
-    header = f"{emoji} {title}"
-    log.info(header)
-    logger._write_json_log("INFO", "perfect_tree_section", header)
-    
-    # Log items in tree format
-    for i, (key, value) in enumerate(items):
-        prefix = "└─" if i == len(items) - 1 else "├─"
-        item_msg = f"{prefix} {key}: {value}"
-        log.info(item_msg)
-        logger._write_json_log("INFO", "tree_item", item_msg)
+    get_tree_logger().log_section(title, items, emoji)
 
 def log_error_with_traceback(message, error, level="ERROR"):
     """Log an error with its traceback if available."""
-    logger = TreeLogger()
+    logger = get_tree_logger()
     log = logging.getLogger()
     
     error_msg = f"❌ {level}: {message}"
@@ -252,27 +487,26 @@ def log_error_with_traceback(message, error, level="ERROR"):
     else:
         log.warning(error_msg)
         
-    logger._write_json_log(level, "error", error_msg)
-    
+    extra = {}
     if error:
         error_detail = f"└─ {type(error).__name__}: {str(error)}"
         log.error(error_detail)
-        logger._write_json_log(level, "error_detail", error_detail)
+        extra["error"] = error_detail
         
         if hasattr(error, '__traceback__'):
             import traceback
-            tb_lines = traceback.format_tb(error.__traceback__)
-            for line in tb_lines:
-                tb_msg = f"   {line.strip()}"
+            tb_lines = [f"   {line.strip()}" for line in traceback.format_tb(error.__traceback__)]
+            for tb_msg in tb_lines:
                 log.error(tb_msg)
-                logger._write_json_log(level, "traceback", tb_msg)
+            extra["traceback"] = tb_lines
+            
+    # One JSON record carries the message, error detail and traceback
+    logger._write_json_log(level, "error", error_msg, **extra)
 
 def log_run_header(bot_name, version):
     """Log a run header."""
-    logger = TreeLogger()
-    return logger.log_run_header(bot_name, version)
+    return get_tree_logger().log_run_header(bot_name, version)
 
 def log_run_end(reason="Normal shutdown"):
     """Log a run end."""
-    logger = TreeLogger()
-    return logger.log_run_end(reason)
+    return get_tree_logger().log_run_end(reason)
@@ -256,68 +256,53 @@ def integrate_with_performance_monitor():
         return False
 
 # Integration with StatsBot member events
+async def _send_member_events_to_webhook(events):
+    """
+    Forward a batch of member events from the member event bus to webhooks.
+    
+    Args:
+        events: GatewayMemberEvent batch
+    """
+    webhook_manager = get_webhook_manager()
+    for event in events:
+        await webhook_manager.send_member_event(
+            event.event_type.value,
+            event.member_id,
+            str(event.user),
+            guild_id=event.guild_id,
+            guild_name=event.guild.name
+        )
+
 def integrate_with_member_events(bot):
     """
     Integrate webhook logging with member events.
     
-    This function patches the bot's member event handlers to also send events to webhooks.
+    This function subscribes a webhook logger to the bot's member event bus.
+    The subscriber has its own bounded queue, so slow webhook delivery never
+    delays gateway dispatch or the bot's other member event consumers; when
+    it falls behind, the oldest pending notifications are dropped.
     
     Args:
         bot: The StatsBot instance
     """
     try:
-        # Store original event handlers
-        original_on_member_join = bot.on_member_join
-        original_on_member_remove = bot.on_member_remove
-        original_on_member_ban = bot.on_member_ban
+        from src.utils.async_utils.event_queue import OverflowPolicy
         
-        # Patch on_member_join
-        async def patched_on_member_join(self, member):
-            # Call original handler
-            await original_on_member_join(member)
-            
-            # Send to webhook
-            log_member_event_to_webhook(
-                "join",
-                member.id,
-                str(member),
-                guild_id=member.guild.id,
-                guild_name=member.guild.name
-            )
+        bus = getattr(bot, "member_event_bus", None)
+        if bus is None:
+            logger.error("Cannot integrate webhook logging: bot has no member event bus")
+            return False
         
-        # Patch on_member_remove
-        async def patched_on_member_remove(self, member):
-            # Call original handler
-            await original_on_member_remove(member)
-            
-            # Send to webhook
-            log_member_event_to_webhook(
-                "leave",
-                member.id,
-                str(member),
-                guild_id=member.guild.id,
-                guild_name=member.guild.name
-            )
-        
-        # Patch on_member_ban
-        async def patched_on_member_ban(self, guild, user):
-            # Call original handler
-            await original_on_member_ban(guild, user)
-            
-            # Send to webhook
-            log_member_event_to_webhook(
-                "ban",
-                user.id,
-                str(user),
-                guild_id=guild.id,
-                guild_name=guild.name
+        if bus.get_subscriber("webhook_logger") is None:
+            bus.subscribe(
+                "webhook_logger",
+                processor=_send_member_events_to_webhook,
+                batch_size=10,
+                max_queue_size=500,
+                flush_interval=1.0,
+                overflow_policy=OverflowPolicy.DROP_OLDEST
             )
         
-        # Apply patches
-        bot.on_member_join = patched_on_member_join.__get__(bot, type(bot))
-        bot.on_member_remove = patched_on_member_remove.__get__(bot, type(bot))
-        bot.on_member_ban = patched_on_member_ban.__get__(bot, type(bot))
-        
         logger.info("Successfully integrated webhook logging with member events")
         return True
     except Exception as e:
@@ -12,11 +12,28 @@ from typing import Dict, List, Optional, Any, Callable, Awaitable
 import aiohttp
 from datetime import datetime, timezone
 
+from ..async_utils.operation_scheduler import (
+    OperationPriority, OperationShedError, global_operation_scheduler
+)
 from .config import WebhookConfig, LogLevel
 from .message_formatter import MessageFormatter, WebhookMessage
 
 logger = logging.getLogger("webhook_logging")
 
+
+async def _get_shared_session() -> aiohttp.ClientSession:
+    """
+    Get the session from the shared network connection pool.
+    
+    Imported lazily to avoid circular imports and to keep the pool from
+    being created until a webhook is actually delivered.
+    
+    Returns:
+        aiohttp.ClientSession: Pooled keep-alive session
+    """
+    from ..network_optimizer import connection_pool
+    return await connection_pool.get_session()
+
 class WebhookClient:
     """
     Client for a single Discord webhook endpoint.
@@ -31,11 +48,11 @@ class WebhookClient:
         
         Args:
             webhook_url: Discord webhook URL
-            session: Optional aiohttp session to use
+            session: Optional aiohttp session to use. When omitted the shared
+                network connection pool session is used.
         """
         self.webhook_url = webhook_url
-        self.session = session or aiohttp.ClientSession()
-        self.created_session = session is None
+        self.session = session
         
         # Circuit breaker state
         self.consecutive_failures = 0
@@ -78,7 +95,8 @@ class WebhookClient:
             payload = message.to_payload()
             
             # Send webhook request
-            async with self.session.post(self.webhook_url, json=payload) as response:
+            session = self.session or await _get_shared_session()
+            async with session.post(self.webhook_url, json=payload) as response:
                 if response.status == 429:
                     # Handle rate limiting
                     retry_after = float(response.headers.get('Retry-After', '1'))
@@ -121,8 +139,8 @@ class WebhookClient:
     
     async def close(self):
         """Close the webhook client and clean up resources."""
-        if self.created_session and not self.session.closed:
-            await self.session.close()
+        # Sessions are owned by the caller or the shared connection pool
+        self.session = None
 
 
 class WebhookManager:
@@ -142,7 +160,6 @@ class WebhookManager:
         """
         self.config = config
         self.webhooks: Dict[str, WebhookClient] = {}
-        self.session = aiohttp.ClientSession()
         self.message_formatter = MessageFormatter(config)
         
         # Initialize webhooks
@@ -161,7 +178,7 @@ class WebhookManager:
                          'performance_webhook_url', 'member_events_webhook_url']:
             url = getattr(self.config, url_attr, None)
             if url and url not in self.webhooks:
-                self.webhooks[url] = WebhookClient(url, self.session)
+                self.webhooks[url] = WebhookClient(url)
                 logger.debug(f"Initialized webhook client for {url_attr}: {url}")
     
     async def start(self):
@@ -181,8 +198,9 @@ class WebhookManager:
                 pass
             self.queue_processor_task = None
         
-        # Close session
-        await self.session.close()
+        # Connections belong to the shared pool, which is closed on shutdown
+        for webhook in self.webhooks.values():
+            await webhook.close()
         logger.debug("WebhookManager stopped")
     
     async def send_log(self, level: LogLevel, message: str, **context) -> None:
@@ -294,8 +312,16 @@ class WebhookManager:
                         logger.warning(f"No webhook client for URL: {webhook_url}")
                         continue
                     
-                    # Send message
-                    success = await webhook.send_message(message)
+                    # Send message at the lowest outbound priority
+                    try:
+                        success = await global_operation_scheduler.submit(
+                            "webhook_log",
+                            lambda: webhook.send_message(message),
+                            priority=OperationPriority.WEBHOOK_LOG
+                        )
+                    except OperationShedError:
+                        logger.debug(f"Webhook message to {webhook_url} shed under load")
+                        continue
                     if not success:
                         logger.warning(f"Failed to send webhook message to {webhook_url}")
                     
@@ -9,6 +9,8 @@ import asyncio
 from unittest.mock import AsyncMock, MagicMock
 from typing import Dict, List, Optional, Any
 
+import discord
+
 from src.types.models import ServiceStatus
 
 
@@ -88,4 +90,32 @@ class MockStructuredLogger:
         self.warning = MagicMock()
         self.error = MagicMock()
         self.critical = MagicMock()
-        self.performance = MagicMock()
\ No newline at end of file
+        self.performance = MagicMock()
+
+
+class MockGuild:
+    """Lightweight stand-in for discord.Guild with the fields the bot reads."""
+    
+    def __init__(self, guild_id: int, name: Optional[str] = None, member_count: int = 0):
+        self.id = guild_id
+        self.name = name or f"guild-{guild_id}"
+        self.member_count = member_count
+        self.premium_subscription_count = 0
+        self.members: List["MockMember"] = []
+    
+    async def bans(self, limit=None):
+        """Mock ban list (empty)."""
+        for _ in ():
+            yield None
+
+
+class MockMember:
+    """Lightweight stand-in for discord.Member/discord.User."""
+    
+    def __init__(self, member_id: int, guild: Optional[MockGuild] = None,
+                 status: discord.Status = discord.Status.online):
+        self.id = member_id
+        self.guild = guild
+        self.name = f"member{member_id}"
+        self.discriminator = "0001"
+        self.status = status
@@ -11,7 +11,9 @@ import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
 from typing import List, Dict, Any
 
-from src.utils.async_utils.event_queue import EventQueue, EventBatcher
+from src.utils.async_utils.event_queue import (
+    EventQueue, EventBatcher, OverflowPolicy, PartitionedEventQueue
+)
 from src.utils.async_utils.semaphore_manager import SemaphoreManager
 from src.core.service_coordinator import ServiceCoordinator
 from src.types.models import ServiceStatus
@@ -79,6 +81,163 @@ class TestEventQueue:
         processed = processor.call_args[0][0]
         assert len(processed) == 2
         assert set(processed) == {"event_1", "event_2"}
+    
+    @pytest.mark.asyncio
+    async def test_idle_queue_does_not_flush(self, event_queue):
+        """An idle queue should not call the processor or spin."""
+        await event_queue.start()
+        await asyncio.sleep(0.2)
+        
+        event_queue.processor.assert_not_called()
+        assert event_queue.get_stats()["batches"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_overflow_drop_oldest(self):
+        """DROP_OLDEST should evict the oldest pending event when full."""
+        processor = AsyncMock()
+        queue = EventQueue("drop_oldest", processor, batch_size=10, max_queue_size=2,
+                           flush_interval=0.05, overflow_policy=OverflowPolicy.DROP_OLDEST)
+        for event in ("a", "b", "c"):
+            await queue.enqueue(event)
+        await queue.stop()
+        
+        processor.assert_called_once_with(["b", "c"])
+        assert queue.get_stats()["dropped_oldest"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_overflow_drop_newest(self):
+        """DROP_NEWEST should discard incoming events when full."""
+        processor = AsyncMock()
+        queue = EventQueue("drop_newest", processor, batch_size=10, max_queue_size=2,
+                           flush_interval=0.05, overflow_policy=OverflowPolicy.DROP_NEWEST)
+        for event in ("a", "b", "c"):
+            await queue.enqueue(event)
+        await queue.stop()
+        
+        processor.assert_called_once_with(["a", "b"])
+        assert queue.get_stats()["dropped_newest"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_overflow_coalesce_by_key(self):
+        """COALESCE should keep only the latest pending event per key."""
+        processor = AsyncMock()
+        queue = EventQueue("coalesce", processor, batch_size=10, flush_interval=0.05,
+                           overflow_policy=OverflowPolicy.COALESCE,
+                           key_func=lambda event: event[0])
+        for event in (("g1", 1), ("g2", 1), ("g1", 2)):
+            await queue.enqueue(event)
+        await queue.stop()
+        
+        processor.assert_called_once_with([("g1", 2), ("g2", 1)])
+        assert queue.get_stats()["coalesced"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_overflow_block_applies_backpressure(self):
+        """BLOCK should make producers wait until the consumer frees space."""
+        processed = []
+        
+        async def processor(batch):
+            processed.extend(batch)
+        
+        queue = EventQueue("block", processor, batch_size=1, max_queue_size=1,
+                           flush_interval=0.01)
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.enqueue(i) for i in range(5))), timeout=1.0
+            )
+            await asyncio.sleep(0.05)
+        finally:
+            await queue.stop()
+        
+        assert sorted(processed) == list(range(5))
+        assert queue.get_stats()["backpressure_events"] > 0
+    
+    @pytest.mark.asyncio
+    async def test_poison_event_dead_lettered_after_retries(self):
+        """A batch that keeps failing should be dropped so later events run."""
+        processed = []
+        attempts = []
+        
+        async def processor(batch):
+            if "bad" in batch:
+                attempts.append(1)
+                raise RuntimeError("poison")
+            processed.extend(batch)
+        
+        queue = EventQueue("poison", processor, batch_size=1, flush_interval=0.01, max_retries=2)
+        try:
+            await queue.enqueue("bad")
+            await queue.enqueue("good")
+            await asyncio.sleep(0.2)
+        finally:
+            await queue.stop()
+        
+        assert processed == ["good"]
+        assert len(attempts) == 3
+        assert queue.get_stats()["dead_lettered"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_latency_histograms_in_stats(self, event_queue):
+        """Queue-wait and batch-latency histograms should be reported."""
+        for i in range(3):
+            await event_queue.enqueue(i)
+        await asyncio.sleep(0.05)
+        
+        stats = event_queue.get_stats()
+        assert stats["queue_wait_ms"]["count"] == 3
+        assert stats["batch_latency_ms"]["count"] == 1
+        assert stats["queue_wait_ms"]["p99_ms"] >= stats["queue_wait_ms"]["p50_ms"]
+        assert sum(stats["queue_wait_ms"]["buckets"].values()) == 3
+        assert list(stats["queue_wait_ms"]["buckets"])[:2] == ["le_1ms", "le_5ms"]
+
+
+class TestPartitionedEventQueue:
+    """Test the PartitionedEventQueue class for per-key ordered processing."""
+    
+    @pytest.mark.asyncio
+    async def test_partitions_keep_order_and_run_concurrently(self):
+        """Events stay ordered per partition while a slow partition runs alongside others."""
+        gate = asyncio.Event()
+        processed = {}
+        
+        async def processor(batch):
+            guild = batch[0][0]
+            if guild == "slow":
+                await gate.wait()
+            processed.setdefault(guild, []).extend(value for _, value in batch)
+        
+        queue = PartitionedEventQueue("partitioned", processor, partition_key=lambda e: e[0],
+                                      batch_size=2, flush_interval=0.05)
+        try:
+            for i in range(4):
+                await queue.enqueue(("slow", i))
+                await queue.enqueue(("fast", i))
+            await asyncio.sleep(0.1)
+            
+            assert processed == {"fast": [0, 1, 2, 3]}
+            assert queue.get_stats()["partitions"] == 2
+        finally:
+            gate.set()
+            await queue.stop()
+        
+        assert processed["slow"] == [0, 1, 2, 3]
+        stats = queue.get_stats()
+        assert stats["processed"] == 8
+        assert stats["queue_wait_ms"]["count"] == 8
+    
+    @pytest.mark.asyncio
+    async def test_remove_partition_drains_events(self):
+        """Removing a partition should process its pending events first."""
+        processor = AsyncMock()
+        queue = PartitionedEventQueue("partitioned", processor, partition_key=lambda e: e[0],
+                                      batch_size=10, flush_interval=10.0)
+        await queue.enqueue(("gone", 1))
+        await queue.remove_partition("gone")
+        
+        processor.assert_called_once_with([("gone", 1)])
+        stats = queue.get_stats()
+        assert stats["partitions"] == 0
+        assert stats["processed"] == 1
 
 
 class TestEventBatcher:
@@ -139,6 +298,92 @@ class TestEventBatcher:
         assert key == "key1"
         assert len(values) == 3
         assert set(values) == {"value1", "value2", "value3"}
+    
+    @pytest.mark.asyncio
+    async def test_slow_key_does_not_block_other_keys(self):
+        """A slow batch should not delay flushing of other keys."""
+        gate = asyncio.Event()
+        flushed = []
+        
+        async def processor(key, items):
+            if key == "slow":
+                await gate.wait()
+            flushed.append(key)
+        
+        batcher = EventBatcher("concurrent", processor, max_batch_size=100, max_batch_age=0.05)
+        try:
+            await batcher.add("slow", 1)
+            await asyncio.sleep(0.01)
+            await batcher.add("fast", 1)
+            await asyncio.sleep(0.15)
+            
+            assert flushed == ["fast"]
+            assert batcher.get_stats()["in_flight_batches"] == 1
+        finally:
+            gate.set()
+            await batcher.stop()
+        
+        assert flushed == ["fast", "slow"]
+    
+    @pytest.mark.asyncio
+    async def test_flush_latency_tracks_batch_age(self):
+        """Batches should flush close to max_batch_age regardless of key count."""
+        flushed = {}
+        
+        async def processor(key, items):
+            flushed[key] = len(items)
+        
+        batcher = EventBatcher("deadlines", processor, max_batch_size=100, max_batch_age=0.05)
+        try:
+            for i in range(200):
+                await batcher.add(i % 50, i)
+            await asyncio.sleep(0.15)
+            
+            stats = batcher.get_stats()
+            assert len(flushed) == 50
+            assert all(count == 4 for count in flushed.values())
+            assert stats["scheduled_deadlines"] == 0
+            assert stats["flush_latency_ms"]["max_ms"] < 150
+        finally:
+            await batcher.stop()
+    
+    @pytest.mark.asyncio
+    async def test_poison_item_dead_lettered_after_retries(self):
+        """An item that keeps failing should be dropped instead of retried forever."""
+        attempts = []
+        processed = []
+        
+        async def processor(key, items):
+            if "bad" in items:
+                attempts.append(list(items))
+                raise RuntimeError("poison")
+            processed.extend(items)
+        
+        batcher = EventBatcher("poison", processor, max_batch_size=100, max_batch_age=0.01, max_retries=2)
+        try:
+            await batcher.add("key1", "bad")
+            await asyncio.sleep(0.15)
+            await batcher.add("key1", "good")
+            await asyncio.sleep(0.05)
+        finally:
+            await batcher.stop()
+        
+        assert attempts == [["bad"], ["bad"], ["bad"]]
+        assert processed == ["good"]
+        stats = batcher.get_stats()
+        assert stats["dead_lettered"] == 1
+        assert stats["pending_events"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending_batches(self):
+        """Stopping should process pending batches without deadlocking."""
+        processor = AsyncMock()
+        batcher = EventBatcher("stopping", processor, max_batch_size=100, max_batch_age=10.0)
+        await batcher.add("key1", "value")
+        
+        await asyncio.wait_for(batcher.stop(), timeout=1.0)
+        
+        processor.assert_called_once_with("key1", ["value"])
 
 
 class TestServiceCoordinator:
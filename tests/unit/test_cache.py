@@ -1,12 +1,19 @@
 """
 Tests for the enhanced caching infrastructure.
 
-This module contains tests for the CircularBuffer and CacheManager classes.
+This module contains tests for the CircularBuffer, CacheManager, eviction
+policy, expiry heap, single-flight loading, stale-while-revalidate and dedupe
+filter classes.
 """
 
+import asyncio
 import unittest
 import time
-from src.utils.cache import CircularBuffer, CacheManager
+from src.utils.cache import (
+    CircularBuffer, CacheManager, SequenceDedupeFilter
+)
+from src.utils.async_utils.task_manager import TaskManager
+from src.utils.cache.eviction import CountMinSketch
 
 
 class TestCircularBuffer(unittest.TestCase):
@@ -198,5 +205,400 @@ class TestCacheManager(unittest.TestCase):
         )
 
 
+
+class TestEvictionPolicies(unittest.TestCase):
+    """Test cases for CacheManager eviction policies."""
+    
+    def test_lru_evicts_least_recently_used(self):
+        """Test that LRU evicts exactly one entry, the least recently used."""
+        cache = CacheManager(max_size=3, eviction_policy="lru")
+        for key in ("a", "b", "c"):
+            cache.set(key, key)
+        cache.get("a")
+        cache.set("d", "d")
+        
+        self.assertEqual(sorted(cache.get_keys()), ["a", "c", "d"])
+        self.assertEqual(cache.get_stats().eviction_count, 1)
+        self.assertEqual(cache.get_stats().eviction_policy, "lru")
+    
+    def test_lru_forgets_invalidated_keys(self):
+        """Test that invalidated keys do not count towards capacity."""
+        cache = CacheManager(max_size=2, eviction_policy="lru")
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.invalidate("a")
+        cache.set("c", 3)
+        
+        self.assertEqual(sorted(cache.get_keys()), ["b", "c"])
+        self.assertEqual(cache.get_stats().eviction_count, 0)
+    
+    def test_tinylfu_keeps_hot_keys_through_scan(self):
+        """Test that a scan of one-off keys does not flush popular entries."""
+        cache = CacheManager(max_size=100, eviction_policy="tinylfu")
+        hot = [f"hot:{i}" for i in range(50)]
+        for _ in range(10):
+            for key in hot:
+                if cache.get(key) is None:
+                    cache.set(key, key)
+        
+        for i in range(300):
+            if cache.get(f"scan:{i}") is None:
+                cache.set(f"scan:{i}", i)
+        
+        self.assertEqual(sum(cache.get(key) is not None for key in hot), len(hot))
+        self.assertLessEqual(len(cache), 100)
+        stats = cache.get_policy_stats()
+        self.assertEqual(stats["policy"], "tinylfu")
+        self.assertGreater(stats["rejections"], 0)
+    
+    def test_scored_policy_evicts_in_batches(self):
+        """Test that the original scorer still evicts 20% of capacity at once."""
+        cache = CacheManager(max_size=10, eviction_policy="scored")
+        for i in range(11):
+            cache.set(f"key{i}", i)
+        
+        self.assertEqual(len(cache), 9)
+    
+    def test_policy_hit_rate(self):
+        """Test that the hit rate is reported with the policy statistics."""
+        cache = CacheManager(eviction_policy="lru")
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+        
+        self.assertEqual(cache.get_policy_stats()["hit_rate"], 0.5)
+    
+    def test_unknown_policy(self):
+        """Test that unknown policy names are rejected."""
+        with self.assertRaises(ValueError):
+            CacheManager(eviction_policy="fifo")
+    
+    def test_count_min_sketch(self):
+        """Test sketch estimates, saturation and aging."""
+        sketch = CountMinSketch(capacity=100)
+        for _ in range(3):
+            sketch.increment("warm")
+        for _ in range(40):
+            sketch.increment("hot")
+        
+        self.assertGreaterEqual(sketch.estimate("warm"), 3)
+        self.assertEqual(sketch.estimate("hot"), CountMinSketch.MAX_COUNT)
+        
+        for i in range(sketch.sample_size):
+            sketch.increment(("filler", i))
+        self.assertEqual(sketch.resets, 1)
+        self.assertLess(sketch.estimate("hot"), CountMinSketch.MAX_COUNT)
+
+
+class TestExpiryHeap(unittest.TestCase):
+    """Test cases for heap-driven CacheManager expiry."""
+    
+    def test_cleanup_only_removes_due_entries(self):
+        """Test that a cleanup tick removes due entries and leaves the rest."""
+        cache = CacheManager(default_ttl=300)
+        for i in range(10):
+            cache.set(f"live{i}", i)
+            cache.set(f"due{i}", i, ttl=0)
+        time.sleep(0.01)
+        
+        self.assertEqual(cache._cleanup_expired(), 10)
+        self.assertEqual(sorted(cache.get_keys()), sorted(f"live{i}" for i in range(10)))
+        self.assertEqual(cache.get_counters()["expirations"], 10)
+        self.assertEqual(cache.get_counters()["expiry_queue"], 10)
+    
+    def test_overwrite_and_refresh_are_not_expired(self):
+        """Test that stale heap items for replaced or refreshed entries are skipped."""
+        cache = CacheManager(default_ttl=300)
+        cache.set("overwritten", 1, ttl=0)
+        cache.set("overwritten", 2)
+        cache.set("refreshed", 1, ttl=0)
+        cache.refresh("refreshed", 300)
+        cache.set("removed", 1, ttl=0)
+        cache.invalidate("removed")
+        time.sleep(0.01)
+        
+        self.assertEqual(cache._cleanup_expired(), 0)
+        self.assertEqual(cache.get("overwritten"), 2)
+        self.assertEqual(cache.get("refreshed"), 1)
+        self.assertEqual(cache.get_counters()["expiry_queue"], 2)
+    
+    def test_cleanup_runs_in_batches(self):
+        """Test that an expiry wave larger than one batch is fully removed."""
+        cache = CacheManager(default_ttl=300)
+        count = CacheManager.EXPIRY_BATCH_SIZE * 2 + 10
+        for i in range(count):
+            cache.set(f"key{i}", i, ttl=0)
+        time.sleep(0.01)
+        
+        self.assertEqual(cache._cleanup_expired(), count)
+        self.assertEqual(len(cache), 0)
+    
+    def test_stale_items_compacted(self):
+        """Test that repeated overwrites do not grow the heap without bound."""
+        cache = CacheManager(default_ttl=300)
+        for _ in range(3 * CacheManager.EXPIRY_BATCH_SIZE):
+            cache.set("hot", 1)
+        
+        cache._cleanup_expired()
+        self.assertEqual(cache.get_counters()["expiry_queue"], 1)
+    
+    def test_next_cleanup_delay(self):
+        """Test that the cleanup thread wakes for the earliest expiry."""
+        cache = CacheManager(default_ttl=600)
+        self.assertEqual(cache._next_cleanup_delay(), 60)
+        
+        cache.set("soon", 1, ttl=5)
+        self.assertLessEqual(cache._next_cleanup_delay(), 5)
+        
+        cache.set("due", 1, ttl=0)
+        self.assertEqual(cache._next_cleanup_delay(), CacheManager.MIN_CLEANUP_INTERVAL)
+
+
+class TestGetOrLoad(unittest.IsolatedAsyncioTestCase):
+    """Test cases for single-flight CacheManager.get_or_load."""
+    
+    async def test_concurrent_misses_share_one_load(self):
+        """Test that concurrent misses for a key run the loader once."""
+        cache = CacheManager()
+        calls = []
+        
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 42
+        
+        results = await asyncio.gather(*(cache.get_or_load("bans", load) for _ in range(10)))
+        
+        self.assertEqual(results, [42] * 10)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(await cache.get_or_load("bans", load), 42)
+        
+        stats = cache.get_stats()
+        self.assertEqual(stats.singleflight_loads, 1)
+        self.assertEqual(stats.singleflight_waits, 9)
+        self.assertEqual(stats.singleflight_hits, 1)
+    
+    async def test_failure_shared_and_not_cached_by_default(self):
+        """Test that waiters share a failure and the next call retries."""
+        cache = CacheManager()
+        calls = []
+        
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("forbidden")
+        
+        results = await asyncio.gather(
+            *(cache.get_or_load("bans", load) for _ in range(3)),
+            return_exceptions=True
+        )
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(len(calls), 1)
+        
+        with self.assertRaises(RuntimeError):
+            await cache.get_or_load("bans", load)
+        self.assertEqual(len(calls), 2)
+    
+    async def test_negative_caching(self):
+        """Test that failures are remembered for negative_ttl seconds."""
+        cache = CacheManager()
+        calls = []
+        
+        async def load():
+            calls.append(1)
+            raise RuntimeError("forbidden")
+        
+        for _ in range(3):
+            with self.assertRaises(RuntimeError):
+                await cache.get_or_load("bans", load, negative_ttl=0.05)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.get_stats().negative_hits, 2)
+        
+        await asyncio.sleep(0.06)
+        with self.assertRaises(RuntimeError):
+            await cache.get_or_load("bans", load, negative_ttl=0.05)
+        self.assertEqual(len(calls), 2)
+        
+        # Invalidating the key forgets the remembered failure
+        cache.invalidate("bans")
+        
+        async def recovered():
+            return 3
+        self.assertEqual(await cache.get_or_load("bans", recovered, negative_ttl=0.05), 3)
+    
+    async def test_cancelled_waiter_does_not_cancel_load(self):
+        """Test that cancelling one caller leaves the shared load running."""
+        cache = CacheManager()
+        
+        async def load():
+            await asyncio.sleep(0.02)
+            return "value"
+        
+        first = asyncio.ensure_future(cache.get_or_load("key", load))
+        second = asyncio.ensure_future(cache.get_or_load("key", load))
+        await asyncio.sleep(0)
+        first.cancel()
+        
+        self.assertEqual(await second, "value")
+        self.assertEqual(cache.get("key"), "value")
+    
+    async def test_invalidate_supersedes_inflight_load(self):
+        """Test that a load started before an invalidation does not cache its result."""
+        cache = CacheManager()
+        counts = iter([10, 11])
+        
+        async def load():
+            value = next(counts)
+            await asyncio.sleep(0.02)
+            return value
+        
+        before = asyncio.ensure_future(cache.get_or_load("bans", load))
+        await asyncio.sleep(0)
+        cache.invalidate("bans")
+        
+        self.assertEqual(await cache.get_or_load("bans", load), 11)
+        self.assertEqual(await before, 10)
+        self.assertEqual(cache.get("bans"), 11)
+    
+    async def test_update_applies_change_and_supersedes_load(self):
+        """Test that update changes a cached value and an older load cannot overwrite it."""
+        cache = CacheManager()
+        cache.set("bans", 10)
+        
+        self.assertTrue(cache.update("bans", lambda count: count + 1))
+        self.assertEqual(cache.get("bans"), 11)
+        self.assertFalse(cache.update("missing", lambda count: count + 1))
+        
+        async def load():
+            await asyncio.sleep(0.02)
+            return 11
+        
+        cache.invalidate("bans")
+        pending = asyncio.ensure_future(cache.get_or_load("bans", load))
+        await asyncio.sleep(0)
+        cache.set("bans", 12)
+        
+        self.assertEqual(await pending, 11)
+        self.assertEqual(cache.get("bans"), 12)
+
+
+class TestStaleWhileRevalidate(unittest.IsolatedAsyncioTestCase):
+    """Test cases for soft TTLs and background refresh in get_or_load."""
+    
+    async def asyncSetUp(self):
+        """Set up a loader that counts calls and returns the call number."""
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+    
+    async def load(self):
+        """Return an increasing value, waiting for release first."""
+        await self.release.wait()
+        self.calls += 1
+        return self.calls
+    
+    async def test_stale_value_served_during_refresh(self):
+        """Test that stale reads return at once and start a single refresh."""
+        task_manager = TaskManager("cache")
+        cache = CacheManager(task_manager=task_manager)
+        self.assertEqual(await cache.get_or_load("bans", self.load, ttl=60, soft_ttl=0.02), 1)
+        await asyncio.sleep(0.03)
+        
+        self.release.clear()
+        results = [await cache.get_or_load("bans", self.load, ttl=60, soft_ttl=0.02) for _ in range(5)]
+        self.assertEqual(results, [1] * 5)
+        self.assertEqual(len(task_manager.get_task_names()), 1)
+        
+        self.release.set()
+        await asyncio.sleep(0.01)
+        self.assertEqual(await cache.get_or_load("bans", self.load, ttl=60, soft_ttl=0.02), 2)
+        
+        stats = cache.get_stats()
+        self.assertEqual(stats.stale_hits, 5)
+        self.assertEqual(stats.background_refreshes, 1)
+        self.assertEqual(stats.singleflight_loads, 1)
+    
+    async def test_hard_expiry_waits_for_load(self):
+        """Test that a value past its hard TTL is loaded inline."""
+        cache = CacheManager()
+        await cache.get_or_load("bans", self.load, ttl=0.02, soft_ttl=0.01)
+        await asyncio.sleep(0.03)
+        
+        self.assertEqual(await cache.get_or_load("bans", self.load, ttl=0.02, soft_ttl=0.01), 2)
+        self.assertEqual(cache.get_stats().stale_hits, 0)
+    
+    async def test_refresh_ahead_for_hot_keys(self):
+        """Test that hot keys are refreshed before they go stale."""
+        cache = CacheManager()
+        options = {"ttl": 60, "soft_ttl": 0.5, "refresh_ahead": 0.5}
+        await cache.get_or_load("hot", self.load, **options)
+        await cache.get_or_load("cold", self.load, **options)
+        for _ in range(CacheManager.HOT_ACCESS_COUNT):
+            await cache.get_or_load("hot", self.load, **options)
+        
+        await asyncio.sleep(0.3)
+        await cache.get_or_load("hot", self.load, **options)
+        await cache.get_or_load("cold", self.load, **options)
+        await asyncio.sleep(0.01)
+        
+        self.assertEqual(cache.get("hot"), 3)
+        self.assertEqual(cache.get("cold"), 2)
+        self.assertEqual(cache.get_stats().background_refreshes, 1)
+        self.assertEqual(cache.get_stats().stale_hits, 0)
+    
+    async def test_failed_refresh_keeps_stale_value(self):
+        """Test that a failing refresh keeps serving the stale value."""
+        cache = CacheManager()
+        await cache.get_or_load("bans", self.load, ttl=60, soft_ttl=0.01)
+        await asyncio.sleep(0.02)
+        
+        attempts = []
+        
+        async def failing():
+            attempts.append(1)
+            raise RuntimeError("forbidden")
+        
+        for _ in range(3):
+            self.assertEqual(
+                await cache.get_or_load("bans", failing, ttl=60, soft_ttl=0.01, negative_ttl=60),
+                1
+            )
+            await asyncio.sleep(0)
+        self.assertEqual(len(attempts), 1)
+
+
+class TestDedupeFilters(unittest.TestCase):
+    """Test cases for the replay dedupe filter."""
+    
+    def test_sequence_drops_only_repeats(self):
+        """Test that the sequence filter only drops a repeat of the last event."""
+        dedupe = SequenceDedupeFilter(capacity=10, window=60.0)
+        self.assertFalse(dedupe.check_and_add((1, 42), "join", now=1000.0))
+        self.assertFalse(dedupe.check_and_add((1, 42), "leave", now=1010.0))
+        self.assertFalse(dedupe.check_and_add((1, 42), "join", now=1020.0))
+        self.assertTrue(dedupe.check_and_add((1, 42), "join", now=1030.0))
+        self.assertEqual(dedupe.get_stats()["hits"], 1)
+    
+    def test_sequence_window_is_not_bucketed(self):
+        """Test that a replay straddling a minute boundary is still dropped."""
+        dedupe = SequenceDedupeFilter(capacity=10, window=60.0)
+        self.assertFalse(dedupe.check_and_add("member", "join", now=119.9))
+        self.assertTrue(dedupe.check_and_add("member", "join", now=120.1))
+        # The window stays anchored to the first event
+        self.assertTrue(dedupe.check_and_add("member", "join", now=179.0))
+        self.assertFalse(dedupe.check_and_add("member", "join", now=180.0))
+    
+    def test_sequence_evicts_least_recent(self):
+        """Test that the sequence filter stays within capacity."""
+        dedupe = SequenceDedupeFilter(capacity=2)
+        dedupe.check_and_add("a", "join", now=0.0)
+        dedupe.check_and_add("b", "join", now=0.0)
+        dedupe.check_and_add("c", "join", now=0.0)  # evicts "a"
+        
+        self.assertFalse(dedupe.check_and_add("a", "join", now=1.0))
+        self.assertEqual(dedupe.get_stats()["evictions"], 2)
+        self.assertEqual(dedupe.get_stats()["size"], 2)
+
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
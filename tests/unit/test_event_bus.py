@@ -0,0 +1,167 @@
+"""
+Tests for the in-process member event bus.
+
+This module tests fan-out to subscribers, isolation of slow subscribers,
+backpressure and the hard cap for lossless subscribers, per-subscriber lag
+metrics and the webhook logging subscription.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.utils.async_utils.event_bus import EventBus
+from src.utils.async_utils.event_queue import OverflowPolicy
+from src.utils.performance.openmetrics import MetricsWriter, write_event_queue_metrics
+
+
+class TestEventBus:
+    """Test the EventBus class."""
+    
+    @pytest.mark.asyncio
+    async def test_events_fan_out_to_all_subscribers(self):
+        """Every subscriber should receive every published event in order."""
+        bus = EventBus("test")
+        first = AsyncMock()
+        second = AsyncMock()
+        bus.subscribe("first", first, batch_size=10, flush_interval=0.01)
+        bus.subscribe("second", second, batch_size=10, flush_interval=0.01)
+        
+        for i in range(3):
+            assert bus.publish(i) == 2
+        await bus.stop()
+        
+        first.assert_called_once_with([0, 1, 2])
+        second.assert_called_once_with([0, 1, 2])
+        assert bus.get_stats()["deliveries"] == 6
+    
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_does_not_block_others(self):
+        """A stalled subscriber must not delay publishing or other subscribers."""
+        bus = EventBus("test")
+        gate = asyncio.Event()
+        fast_events = []
+        
+        async def slow(batch):
+            await gate.wait()
+        
+        async def fast(batch):
+            fast_events.extend(batch)
+        
+        bus.subscribe("slow", slow, batch_size=1, max_queue_size=2, flush_interval=0.01,
+                      overflow_policy=OverflowPolicy.DROP_OLDEST)
+        bus.subscribe("fast", fast, batch_size=10, flush_interval=0.01)
+        
+        try:
+            for i in range(10):
+                bus.publish(i)
+            await asyncio.sleep(0.05)
+            
+            assert fast_events == list(range(10))
+            stats = bus.get_stats()["subscribers"]
+            assert stats["slow"]["lag_events"] == 1
+            assert stats["slow"]["lag_ms"] > 0
+            assert stats["slow"]["dropped"] == 8
+            assert stats["fast"]["lag_events"] == 0
+        finally:
+            gate.set()
+            await bus.stop()
+    
+    @pytest.mark.asyncio
+    async def test_lossless_subscriber_is_capped_for_nowait_publish(self):
+        """publish() cannot wait, so a full BLOCK subscriber refuses events."""
+        bus = EventBus("test")
+        received = []
+        
+        async def processor(batch):
+            received.extend(batch)
+        
+        bus.subscribe("tracker", processor, batch_size=100, max_queue_size=2,
+                      flush_interval=0.01, overflow_policy=OverflowPolicy.BLOCK)
+        accepted = [bus.publish(i) for i in range(5)]
+        
+        stats = bus.get_stats()
+        assert accepted == [1, 1, 0, 0, 0]
+        assert stats["subscribers"]["tracker"]["lag_events"] == 2
+        assert stats["subscribers"]["tracker"]["overflowed"] == 3
+        assert stats["dropped"] == 3
+        
+        writer = MetricsWriter()
+        write_event_queue_metrics(writer, "tracker", stats["subscribers"]["tracker"]["queue"])
+        assert 'statsbot_event_queue_overflowed_total{queue="tracker"} 3' in writer.render()
+        
+        await bus.stop()
+        assert received == [0, 1]
+    
+    @pytest.mark.asyncio
+    async def test_publish_wait_applies_backpressure(self):
+        """publish_wait() keeps BLOCK subscribers within their bound without loss."""
+        bus = EventBus("test")
+        gate = asyncio.Event()
+        received = []
+        peak = 0
+        
+        async def processor(batch):
+            await gate.wait()
+            received.extend(batch)
+        
+        queue = bus.subscribe("tracker", processor, batch_size=1, max_queue_size=2,
+                              flush_interval=0.01, overflow_policy=OverflowPolicy.BLOCK)
+        
+        async def produce():
+            nonlocal peak
+            for i in range(6):
+                await bus.publish_wait(i)
+                peak = max(peak, queue.get_stats()["queue_size"])
+        
+        producer = asyncio.create_task(produce())
+        await asyncio.sleep(0.05)
+        assert not producer.done()
+        
+        gate.set()
+        await asyncio.wait_for(producer, timeout=1.0)
+        await bus.stop()
+        
+        assert received == list(range(6))
+        assert peak <= 2
+        stats = bus.get_stats()["subscribers"]["tracker"]
+        assert stats["overflowed"] == 0
+        assert stats["queue"]["backpressure_events"] > 0
+    
+    def test_duplicate_subscriber_rejected(self):
+        """Subscriber names should be unique per bus."""
+        bus = EventBus("test")
+        bus.subscribe("one", AsyncMock())
+        
+        with pytest.raises(ValueError):
+            bus.subscribe("one", AsyncMock())
+
+
+class TestWebhookMemberEventSubscription:
+    """Test webhook logging as a member event bus subscriber."""
+    
+    @pytest.mark.asyncio
+    async def test_webhook_logger_subscribes_without_patching(self):
+        """The webhook logger should subscribe instead of wrapping handlers."""
+        from src.types.models import EventType, GatewayMemberEvent
+        from src.utils.webhook_logging.integration import integrate_with_member_events
+        
+        bot = MagicMock()
+        bot.member_event_bus = EventBus("member_events")
+        original_handler = bot.on_member_join
+        manager = MagicMock()
+        manager.send_member_event = AsyncMock()
+        
+        with patch("src.utils.webhook_logging.integration.get_webhook_manager", return_value=manager):
+            assert integrate_with_member_events(bot) is True
+            assert bot.on_member_join is original_handler
+            
+            guild = MagicMock(id=1)
+            guild.name = "Guild"
+            bot.member_event_bus.publish(GatewayMemberEvent(EventType.JOIN, guild, MagicMock(id=5)))
+            await bot.member_event_bus.stop()
+        
+        manager.send_member_event.assert_awaited_once()
+        args, kwargs = manager.send_member_event.call_args
+        assert args[:2] == ("join", 5)
+        assert kwargs == {"guild_id": 1, "guild_name": "Guild"}
@@ -0,0 +1,150 @@
+"""
+Tests for latency histograms in the timing module.
+
+This module tests bucket layout and percentile accuracy of
+LatencyHistogram, windowed snapshots and merging, and that timing
+decorators (including the logging @timed decorator on coroutines) feed the
+per-operation histograms.
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from src.utils.logging.structured_logger import timed
+from src.utils.performance.timing import (
+    LatencyHistogram,
+    WindowedHistogram,
+    get_latency_histogram,
+    get_latency_percentiles,
+    record_timing,
+    reset_performance_metrics
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    """Reset global timing metrics around each test."""
+    reset_performance_metrics()
+    yield
+    reset_performance_metrics()
+
+
+class TestLatencyHistogram:
+    """Test the LatencyHistogram class."""
+    
+    def test_buckets_are_contiguous(self):
+        """Every value should land in a bucket whose bounds contain it."""
+        previous = 0
+        for value in list(range(5000)) + [2 ** 20 + 17, 2 ** 30 + 5]:
+            index = LatencyHistogram.bucket_index(value)
+            low, high = LatencyHistogram.bucket_bounds(index)
+            assert low <= value <= high
+            assert index >= previous
+            previous = index
+    
+    def test_percentiles_within_bucket_precision(self):
+        """Percentiles should be within the histogram's relative precision."""
+        rng = random.Random(7)
+        values = sorted(int(rng.lognormvariate(8, 1.5)) for _ in range(20000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+        
+        quantiles = [0.5, 0.9, 0.99, 0.999]
+        for quantile, estimate in zip(quantiles, histogram.percentiles(quantiles)):
+            exact = values[int(quantile * len(values)) - 1]
+            assert abs(estimate - exact) <= exact * 0.02 + 1
+            assert histogram.percentile(quantile) == estimate
+        
+        assert histogram.percentile(1.0) == values[-1]
+        assert histogram.count == len(values)
+    
+    def test_merge_adds_counts(self):
+        """Merging should combine counts, extremes and totals."""
+        fast, slow = LatencyHistogram(), LatencyHistogram()
+        for _ in range(90):
+            fast.record(100)
+        for _ in range(10):
+            slow.record(50000)
+        
+        merged = LatencyHistogram().merge(fast).merge(slow)
+        
+        assert merged.count == 100
+        assert merged.min_us == 100
+        assert merged.max_us == 50000
+        assert abs(merged.percentile(0.5) - 100) <= 2
+        assert abs(merged.percentile(0.95) - 50000) <= 50000 * 0.02
+    
+    def test_cumulative_counts_at_bounds(self):
+        """Cumulative counts should include every value at or below each bound."""
+        histogram = LatencyHistogram()
+        for value in (500, 900, 4000, 20000, 20000, 90000000):
+            histogram.record(value)
+        
+        assert histogram.cumulative_counts([1000, 5000, 25000, 60000000]) == [2, 3, 5, 5]
+        assert histogram.cumulative_counts([]) == []
+    
+    def test_summary_empty(self):
+        """An empty histogram should summarize to zeros."""
+        summary = LatencyHistogram().summary()
+        assert summary["count"] == 0
+        assert summary["p99_ms"] == 0
+
+
+class TestWindowedHistogram:
+    """Test the WindowedHistogram class."""
+    
+    def test_windows_rotate_out_old_values(self):
+        """Snapshots should only include slots inside the window."""
+        histogram = WindowedHistogram(slot_seconds=10, horizon_seconds=3600)
+        for second in range(4000):
+            histogram.record(1000 + second, now=float(second))
+        
+        assert histogram.snapshot("1m", now=3999.0).count == 60
+        assert histogram.snapshot("5m", now=3999.0).count == 300
+        assert histogram.snapshot("1h", now=3999.0).count == 3600
+        assert histogram.snapshot(now=3999.0).count == 4000
+        
+        recent = histogram.snapshot("1m", now=3999.0)
+        assert recent.min_us == 1000 + 3940
+        assert recent.max_us == 1000 + 3999
+    
+    def test_invalid_window(self):
+        """Unknown windows and windows beyond the horizon should be rejected."""
+        histogram = WindowedHistogram(horizon_seconds=600)
+        with pytest.raises(ValueError):
+            histogram.snapshot("1d")
+        with pytest.raises(ValueError):
+            histogram.snapshot("1h")
+
+
+class TestTimingIntegration:
+    """Test that timing decorators feed the histograms."""
+    
+    def test_record_timing_feeds_percentiles(self):
+        """Recorded durations should show up per operation and merged."""
+        for duration in (0.001, 0.002, 0.100):
+            record_timing("stats", "save_data", duration)
+        record_timing("presence", "update_presence", 0.005)
+        
+        percentiles = get_latency_percentiles("5m")
+        assert percentiles["stats"]["save_data"]["count"] == 3
+        assert percentiles["stats"]["save_data"]["max_ms"] == pytest.approx(100, rel=0.01)
+        assert get_latency_histogram().count == 4
+        assert get_latency_histogram(category="stats").count == 3
+    
+    @pytest.mark.asyncio
+    async def test_timed_measures_coroutines(self):
+        """@timed should time a coroutine until it completes."""
+        class Service:
+            @timed("update_online_count")
+            async def update_online_count(self):
+                await asyncio.sleep(0.02)
+        
+        await Service().update_online_count()
+        
+        summary = get_latency_percentiles()["Service"]["update_online_count"]
+        assert summary["count"] == 1
+        assert summary["min_ms"] >= 15
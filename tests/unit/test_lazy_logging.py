@@ -0,0 +1,75 @@
+"""
+Tests for lazy log record construction.
+
+This module tests that StructuredLogger and ContextLogger skip message and
+context formatting for disabled levels, apply %-style arguments and
+callable messages only when a record is emitted, and format each record's
+context once.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.types.models import LogLevel
+from src.utils.logging.structured_logger import StructuredLogger
+
+
+@pytest.fixture
+def logger(tmp_path):
+    """Create a warning-level logger writing into a temp directory."""
+    return StructuredLogger("lazy_test", level=LogLevel.WARNING, log_dir=tmp_path)
+
+
+def messages(logger):
+    """Get the messages in the logger's memory buffer."""
+    return [entry.message for entry in logger.get_recent_logs()]
+
+
+class TestLazyLogging:
+    """Test deferred formatting in StructuredLogger."""
+    
+    def test_is_enabled_follows_level(self, logger):
+        """is_enabled should track the current level, including set_level."""
+        assert not logger.is_enabled(LogLevel.INFO)
+        assert logger.is_enabled(LogLevel.ERROR)
+        
+        logger.set_level("debug")
+        assert logger.is_enabled(LogLevel.DEBUG)
+    
+    def test_disabled_levels_do_not_format(self, logger):
+        """Disabled calls must not call the message or format arguments."""
+        message = MagicMock(return_value="expensive")
+        argument = MagicMock()
+        argument.__str__ = MagicMock(return_value="arg")
+        
+        logger.debug(message)
+        logger.info("value: %s", argument)
+        logger.with_context(user="x").info(message)
+        
+        message.assert_not_called()
+        argument.__str__.assert_not_called()
+        assert messages(logger) == []
+    
+    def test_enabled_levels_render_messages(self, logger):
+        """Enabled calls should apply %-style arguments and resolve callables."""
+        logger.warning("Member joined: %s#%s", "user", "0001")
+        logger.error(lambda: "computed")
+        logger.warning("100% done")
+        logger.warning("%d items", "not a number")
+        
+        assert messages(logger) == [
+            "Member joined: user#0001",
+            "computed",
+            "100% done",
+            "%d items not a number"
+        ]
+    
+    def test_context_formatted_once(self, logger):
+        """A record's context string and JSON should be built once and reused."""
+        logger.warning("cached", guild_id="42")
+        entry = logger.get_recent_logs()[0]
+        
+        assert entry.format_context() == "guild_id=42"
+        assert entry.format_context() is entry.format_context()
+        assert entry.to_json() is entry.to_json()
@@ -0,0 +1,183 @@
+"""
+Tests for indexed log search.
+
+This module tests sparse index construction, block pruning by time, level
+and service, incremental index extension, queries over compressed
+segments and rebuilding indexes that no longer match their segment.
+"""
+
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.utils.logging.log_query import LogSearch
+from src.utils.tree_log import NDJSONSink
+
+START = datetime(2025, 1, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def write_records(path, records, mode="w"):
+    """Append records to a JSON log segment."""
+    with open(path, mode, encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def make_record(minute, level="INFO", service="StatsService", message="tick"):
+    """Create a structured log record at START + minute."""
+    return {
+        "timestamp": (START + timedelta(minutes=minute)).isoformat(),
+        "level": level,
+        "message": message,
+        "context": {},
+        "service": service
+    }
+
+
+@pytest.fixture
+def segment(tmp_path):
+    """Create a day directory with one segment: 10 minutes, one error per even minute."""
+    day_dir = tmp_path / "2025-01-10"
+    day_dir.mkdir()
+    records = []
+    for minute in range(10):
+        records.append(make_record(minute, service="PresenceService"))
+        records.append(make_record(minute, message=f"update {minute}"))
+        if minute % 2 == 0:
+            records.append(make_record(minute, level="ERROR", message=f"failed {minute}"))
+    path = day_dir / "logs.json"
+    write_records(path, records)
+    return path
+
+
+class TestLogSearch:
+    """Test the LogSearch class."""
+    
+    def test_index_has_one_block_per_minute(self, tmp_path, segment):
+        """The index should record offsets and bitmaps per minute."""
+        index = LogSearch(tmp_path).build_index(segment)
+        
+        assert len(index.blocks) == 10
+        assert index.blocks[0].offset == 0
+        assert index.blocks[-1].end == segment.stat().st_size
+        assert set(index.services) == {"StatsService", "PresenceService"}
+        assert segment.with_name("logs.json.idx").exists()
+    
+    def test_query_reads_only_matching_blocks(self, tmp_path, segment):
+        """Errors from one service in a window should skip other minutes."""
+        search = LogSearch(tmp_path)
+        results = list(search.search(
+            start=START + timedelta(minutes=2),
+            end=START + timedelta(minutes=6, seconds=59),
+            levels=["ERROR"],
+            services=["StatsService"]
+        ))
+        
+        assert [r["message"] for r in results] == ["failed 2", "failed 4", "failed 6"]
+        stats = search.get_stats()
+        assert stats["blocks_read"] == 3
+        assert stats["blocks_skipped"] == 7
+        assert stats["bytes_read"] < segment.stat().st_size / 2
+    
+    def test_unknown_service_skips_segment(self, tmp_path, segment):
+        """A service absent from a segment's index should not read it."""
+        search = LogSearch(tmp_path)
+        
+        assert list(search.search(services=["CreditsService"])) == []
+        assert search.get_stats()["bytes_read"] == 0
+    
+    def test_index_extends_as_segment_grows(self, tmp_path, segment):
+        """New records should be indexed incrementally on the next query."""
+        search = LogSearch(tmp_path)
+        search.build_index(segment)
+        write_records(segment, [make_record(30, level="CRITICAL", message="late")], mode="a")
+        
+        results = list(search.search(levels=["CRITICAL"]))
+        
+        assert [r["message"] for r in results] == ["late"]
+        assert search.get_stats()["indexes_extended"] == 1
+    
+    def test_compressed_segment_uses_moved_index(self, tmp_path, segment):
+        """A gzip segment should be searchable with the decompressed offsets."""
+        LogSearch(tmp_path).build_index(segment)
+        compressed = segment.with_name("logs.json.gz")
+        with open(segment, "rb") as f_in, gzip.open(compressed, "wb") as f_out:
+            f_out.write(f_in.read())
+        segment.with_name("logs.json.idx").replace(compressed.with_name("logs.json.gz.idx"))
+        segment.unlink()
+        
+        search = LogSearch(tmp_path)
+        results = list(search.search(levels=["ERROR"], contains="8"))
+        
+        assert [r["message"] for r in results] == ["failed 8"]
+        assert search.get_stats()["indexes_built"] == 0
+    
+    def test_limit_stops_reading(self, tmp_path, segment):
+        """Results should stop at the limit."""
+        assert len(list(LogSearch(tmp_path).search(limit=4))) == 4
+    
+    def test_tree_log_segment_is_searched(self, tmp_path, segment):
+        """TreeLogger's tree.json should be searched alongside logs.json."""
+        write_records(segment.with_name("tree.json"), [{
+            "level": "ERROR",
+            "category": "error",
+            "message": "tree failure",
+            "iso_datetime": (START + timedelta(minutes=3)).isoformat()
+        }])
+        
+        results = list(LogSearch(tmp_path).search(levels=["ERROR"], contains="tree"))
+        
+        assert [r["message"] for r in results] == ["tree failure"]
+    
+    def test_rotated_archives_are_not_searched_with_stale_indexes(self, tmp_path):
+        """Indexes should follow (or be rebuilt for) archives that rotation renames."""
+        day_dir = tmp_path / "2025-01-10"
+        day_dir.mkdir()
+        sink = NDJSONSink(str(day_dir / "tree.json"), max_bytes=400, flush_interval=60, buffer_size=1)
+        search = LogSearch(tmp_path)
+        
+        for batch, level in (("A", "INFO"), ("B", "ERROR"), ("C", "INFO")):
+            for minute in range(4):
+                sink.write(make_record(minute, level=level, message=f"{batch}{minute}"))
+            sink.flush()
+            list(search.search())
+        sink.close()
+        
+        results = [r["message"] for r in LogSearch(tmp_path).search(levels=["ERROR"])]
+        assert sorted(results) == ["B0", "B1", "B2", "B3"]
+    
+    def test_index_left_by_another_archive_is_rebuilt(self, tmp_path, segment):
+        """An index whose head hash does not match its segment should be rebuilt."""
+        compressed = segment.with_name("logs.json.1.gz")
+        with gzip.open(compressed, "wt", encoding="utf-8") as f:
+            f.write(json.dumps(make_record(0, message="first archive")) + "\n")
+        LogSearch(tmp_path).build_index(compressed)
+        
+        with gzip.open(compressed, "wt", encoding="utf-8") as f:
+            for minute in range(3):
+                f.write(json.dumps(make_record(minute, message=f"second archive {minute}")) + "\n")
+        
+        search = LogSearch(tmp_path)
+        results = [r["message"] for r in search.search(contains="archive")]
+        
+        assert results == ["second archive 0", "second archive 1", "second archive 2"]
+        assert search.get_stats()["indexes_stale"] == 1
+    
+    def test_truncated_live_segment_is_reindexed(self, tmp_path, segment):
+        """A live segment truncated and regrown past its index should be rebuilt."""
+        LogSearch(tmp_path).build_index(segment)
+        size = segment.stat().st_size
+        
+        records = []
+        while sum(len(json.dumps(r)) + 1 for r in records) <= size:
+            records.append(make_record(len(records) % 10, level="WARNING", message="after truncation"))
+        write_records(segment, records)
+        
+        search = LogSearch(tmp_path)
+        results = list(search.search(levels=["WARNING"]))
+        
+        assert len(results) == len(records)
+        assert not list(search.search(levels=["ERROR"]))
+        assert search.get_stats()["indexes_extended"] == 0
@@ -0,0 +1,179 @@
+"""
+Tests for log compression and retention.
+
+This module tests background compression of finished day directories,
+late files appended to an archive, the archive index, age-based cleanup
+and oldest-first eviction under a byte budget, including budget checks
+driven by log writer flushes.
+"""
+
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.utils.logging.log_query import LogSearch
+from src.utils.logging.log_rotation import LogRotation, get_log_rotation, open_log_file
+
+
+def make_day(log_dir, days_ago, size=2000, idle=True):
+    """Create a day directory with log files and return its name."""
+    name = (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+    day_dir = log_dir / name
+    day_dir.mkdir(parents=True)
+    for file_name in ("logs.log", "logs.json"):
+        path = day_dir / file_name
+        path.write_text(f"{name} {file_name}\n" * (size // 30), encoding="utf-8")
+        if idle:
+            old = time.time() - 3600
+            os.utime(path, (old, old))
+    return name
+
+
+@pytest.fixture
+def rotation(tmp_path):
+    """Create a rotation utility for a temp directory."""
+    rotation = LogRotation(tmp_path, retention_days=30, min_idle_seconds=60)
+    yield rotation
+    rotation.shutdown()
+
+
+class TestLogRotation:
+    """Test the LogRotation class."""
+    
+    def test_finished_days_compressed_in_background(self, rotation, tmp_path):
+        """rotate_logs should compress quiet past days on the worker thread."""
+        finished = make_day(tmp_path, 2)
+        busy = make_day(tmp_path, 3, idle=False)
+        
+        rotation.rotate_logs().result(timeout=10)
+        
+        day_dir = tmp_path / finished
+        assert sorted(p.name for p in day_dir.iterdir()) == ["logs.json.gz", "logs.log.gz"]
+        with open_log_file(day_dir / "logs.log.gz") as f:
+            assert f.readline() == f"{finished} logs.log\n"
+        
+        # Recently written days are left alone
+        assert (tmp_path / busy / "logs.log").exists()
+        
+        index = rotation.get_archive_index()
+        assert [segment.date for segment in index] == [finished]
+        assert index[0].codec == "gzip"
+        assert index[0].compressed_bytes < index[0].original_bytes
+        assert rotation.get_stats()["days_compressed"] == 1
+    
+    def test_budget_evicts_oldest_days(self, tmp_path):
+        """Days past the byte budget should be removed oldest first."""
+        days = [make_day(tmp_path, n, size=3000) for n in (3, 2, 1)]
+        rotation = LogRotation(tmp_path, max_total_bytes=11000, min_idle_seconds=60)
+        rotation.compress_finished_days = lambda: []
+        
+        try:
+            rotation.rotate_logs().result(timeout=10)
+        finally:
+            rotation.shutdown()
+        
+        remaining = sorted(p.name for p in tmp_path.iterdir() if p.is_dir())
+        assert days[0] not in remaining
+        assert days[1:] == [day for day in remaining if day in days]
+        assert rotation.get_log_size() <= 11000
+    
+    def test_budget_checked_on_flush(self, tmp_path):
+        """Writer flushes should evict old days without waiting for a rollover."""
+        days = [make_day(tmp_path, n, size=3000) for n in (3, 2, 1)]
+        rotation = get_log_rotation(tmp_path, min_idle_seconds=60)
+        try:
+            rotation.on_flush()
+            assert rotation._pending_budget is None
+            
+            # A budget from config reaches the already-registered instance
+            assert get_log_rotation(tmp_path, max_total_bytes=11000) is rotation
+            rotation._pending_budget.result(timeout=10)
+            assert days[0] not in {p.name for p in tmp_path.iterdir()}
+            
+            # Later flushes are throttled to one check per interval
+            make_day(tmp_path, 4, size=3000)
+            rotation.on_flush()
+            assert rotation.get_stats()["budget_checks"] == 1
+            
+            rotation.budget_check_interval = 0
+            rotation.on_flush()
+            rotation._pending_budget.result(timeout=10)
+            assert rotation.get_stats()["budget_checks"] == 2
+            assert rotation.get_log_size() <= 11000
+        finally:
+            rotation.shutdown()
+    
+    def test_open_days_over_budget_are_reported(self, tmp_path):
+        """Days a writer may still use are kept but counted as over budget."""
+        today = make_day(tmp_path, 0, size=3000)
+        rotation = LogRotation(tmp_path, max_total_bytes=1000, min_idle_seconds=60)
+        try:
+            assert rotation.enforce_budget() == []
+            assert (tmp_path / today).exists()
+            assert rotation.get_stats()["over_budget"] == 1
+        finally:
+            rotation.shutdown()
+    
+    def test_expired_days_removed_from_index(self, rotation, tmp_path):
+        """Age-based cleanup should drop removed days from the index."""
+        old = make_day(tmp_path, 40)
+        recent = make_day(tmp_path, 5)
+        
+        rotation.rotate_logs().result(timeout=10)
+        
+        assert not (tmp_path / old).exists()
+        assert [segment.date for segment in rotation.get_archive_index()] == [recent]
+    
+    def test_invalid_codec(self, tmp_path):
+        """Unknown codecs should be rejected."""
+        with pytest.raises(ValueError):
+            LogRotation(tmp_path, compression="lz4")
+    
+    def test_search_index_moves_with_compressed_file(self, rotation, tmp_path):
+        """A complete search index should follow its segment into the archive."""
+        day = make_day(tmp_path, 2)
+        LogSearch(tmp_path).build_index(tmp_path / day / "logs.json")
+        
+        rotation.rotate_logs().result(timeout=10)
+        
+        assert (tmp_path / day / "logs.json.gz.idx").exists()
+        assert not (tmp_path / day / "logs.json.idx").exists()
+    
+    def test_late_file_appended_to_archive(self, rotation, tmp_path):
+        """Records written after a day was compressed should join its archive."""
+        day = make_day(tmp_path, 2)
+        day_dir = tmp_path / day
+        archived_bytes = rotation.compress_finished_days()[0].original_bytes
+        LogSearch(tmp_path).build_index(day_dir / "logs.json.gz")
+        
+        late = day_dir / "logs.log"
+        late.write_text("late record\n", encoding="utf-8")
+        old = time.time() - 3600
+        os.utime(late, (old, old))
+        rotation.compress_finished_days()
+        
+        with open_log_file(day_dir / "logs.log.gz") as f:
+            lines = f.readlines()
+        assert lines[0] == f"{day} logs.log\n"
+        assert lines[-1] == "late record\n"
+        assert not late.exists()
+        assert (day_dir / "logs.json.gz.idx").exists()
+        
+        index = rotation.get_archive_index()
+        assert len(index) == 1
+        assert index[0].original_bytes == archived_bytes + len("late record\n")
+    
+    def test_day_open_in_any_timezone_is_not_compressed(self, rotation, tmp_path):
+        """A day that has not ended in UTC-12 may still be written to."""
+        name = datetime.now(timezone(timedelta(hours=-12))).strftime("%Y-%m-%d")
+        day_dir = tmp_path / name
+        day_dir.mkdir()
+        path = day_dir / "logs.log"
+        path.write_text("still open\n", encoding="utf-8")
+        old = time.time() - 3600
+        os.utime(path, (old, old))
+        
+        assert rotation.compress_finished_days() == []
+        assert path.exists()
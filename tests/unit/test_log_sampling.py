@@ -0,0 +1,130 @@
+"""
+Tests for per-call-site log sampling.
+
+This module tests token bucket rate limiting, per-level sampling
+probabilities, "suppressed N similar messages" summaries and the keyword
+and decorator opt-ins on StructuredLogger and ContextLogger.
+"""
+
+import random
+import time
+
+import pytest
+
+from src.types.models import LogLevel
+from src.utils.logging.log_sampling import LogSampler, SamplingPolicy, TokenBucket, sampled_logging
+from src.utils.logging.structured_logger import StructuredLogger
+
+
+@pytest.fixture
+def logger(tmp_path):
+    """Create a debug-level logger writing into a temp directory."""
+    return StructuredLogger("sampling_test", level=LogLevel.DEBUG, log_dir=tmp_path)
+
+
+def messages(logger):
+    """Get the messages in the logger's memory buffer."""
+    return [entry.message for entry in logger.get_recent_logs()]
+
+
+class TestTokenBucket:
+    """Test the TokenBucket class."""
+    
+    def test_burst_then_refill(self):
+        """A bucket should allow its burst, then refill at its rate."""
+        bucket = TokenBucket(rate=2.0, capacity=3)
+        now = bucket._updated
+        
+        assert [bucket.try_acquire(now) for _ in range(4)] == [True, True, True, False]
+        assert bucket.try_acquire(now + 0.5)
+        assert not bucket.try_acquire(now + 0.5)
+
+
+class TestLogSampler:
+    """Test the LogSampler class."""
+    
+    def test_level_probability_drops_messages(self):
+        """A zero probability should suppress every message at that level only."""
+        sampler = LogSampler(rng=random.Random(0))
+        policy = SamplingPolicy(rate=1000, burst=1000, level_probabilities={LogLevel.DEBUG: 0.0})
+        
+        assert not sampler.check("site", LogLevel.DEBUG, "noisy", policy)[0]
+        assert sampler.check("site", LogLevel.INFO, "kept", policy)[0]
+        assert sampler.get_stats()["suppressed"] == 1
+    
+    def test_quiet_site_is_summarized_after_interval(self):
+        """A site that stops logging should still get its summary from another site."""
+        sampler = LogSampler()
+        policy = SamplingPolicy(rate=0.0, burst=1, summary_interval=0.05)
+        
+        sampler.check("hot", LogLevel.DEBUG, "first", policy)
+        assert sampler.check("hot", LogLevel.DEBUG, "second", policy) == (False, [])
+        time.sleep(0.06)
+        allowed, summaries = sampler.check("other", LogLevel.INFO, "unrelated", policy)
+        
+        assert allowed
+        assert [(s.site, s.count, s.message) for s in summaries] == [("hot", 1, "second")]
+
+
+class TestStructuredLoggerSampling:
+    """Test sampling opt-ins on StructuredLogger."""
+    
+    def test_unsampled_calls_are_not_limited(self, logger):
+        """Call sites that do not opt in should log every message."""
+        for _ in range(20):
+            logger.debug("plain")
+        
+        assert messages(logger).count("plain") == 20
+        assert logger.get_sampling_stats()["sampled"] == 0
+    
+    def test_keyword_opt_in_limits_and_summarizes(self, logger):
+        """A sampled call site should log its burst, then one summary."""
+        policy = SamplingPolicy(rate=0.001, burst=3)
+        for _ in range(10):
+            logger.debug("Online count unchanged, skipping update", sample=policy)
+        
+        assert messages(logger).count("Online count unchanged, skipping update") == 3
+        
+        logger.flush()
+        summary = logger.get_recent_logs()[-1]
+        assert summary.message == "Suppressed 7 similar messages"
+        assert summary.level == LogLevel.DEBUG
+        assert summary.context["example"] == "Online count unchanged, skipping update"
+        assert summary.context["call_site"].startswith("test_log_sampling.py:")
+    
+    def test_call_sites_are_limited_independently(self, logger):
+        """Each call site should have its own bucket."""
+        policy = SamplingPolicy(rate=0.001, burst=1)
+        for _ in range(5):
+            logger.info("first", sample=policy)
+            logger.info("second", sample=policy)
+        
+        assert messages(logger) == ["first", "second"]
+    
+    def test_decorator_opt_in_with_context_logger(self, logger):
+        """Log calls inside a @sampled_logging function should be sampled."""
+        context_logger = logger.with_context(queue="members")
+        
+        @sampled_logging(rate=0.001, burst=2)
+        def flush_loop():
+            for _ in range(5):
+                context_logger.debug("Processing batch")
+            context_logger.debug("always", sample=False)
+        
+        flush_loop()
+        
+        assert messages(logger) == ["Processing batch", "Processing batch", "always"]
+        assert logger.get_sampling_stats()["pending_suppressed"] == 3
+    
+    @pytest.mark.asyncio
+    async def test_decorator_on_coroutine(self, logger):
+        """The decorator should apply across awaits in async functions."""
+        @sampled_logging(rate=0.001, burst=1)
+        async def update():
+            for _ in range(3):
+                logger.debug("skipped")
+        
+        await update()
+        logger.debug("after")
+        
+        assert messages(logger) == ["skipped", "after"]
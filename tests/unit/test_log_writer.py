@@ -0,0 +1,149 @@
+"""
+Tests for the background buffered log writer.
+
+This module tests that StructuredLogger hands file writes to the writer
+thread, that records are batched into open files, that errors are flushed
+promptly, that nothing queued is lost on close or day rotation and that
+records shed by a full queue or a failed write are counted.
+"""
+
+import json
+import threading
+import time
+
+from src.types.models import LogLevel
+from src.utils.logging.log_writer import BackgroundLogWriter, LogRecord
+from src.utils.logging.structured_logger import StructuredLogger
+
+
+def make_record(date, text, is_error=False):
+    """Create a log record with a matching JSON line."""
+    return LogRecord(date=date, text=text, json=json.dumps({"message": text}), is_error=is_error)
+
+
+class TestBackgroundLogWriter:
+    """Test the BackgroundLogWriter class."""
+    
+    def test_records_are_batched_and_written_on_flush(self, tmp_path):
+        """Queued records should be written together once flushed."""
+        writer = BackgroundLogWriter(tmp_path, flush_interval=60.0)
+        try:
+            for i in range(5):
+                writer.submit(make_record("2024-01-01", f"line {i}"))
+            
+            assert writer.flush(timeout=5.0)
+            
+            lines = (tmp_path / "2024-01-01" / "logs.log").read_text().splitlines()
+            assert lines == [f"line {i}" for i in range(5)]
+            assert len((tmp_path / "2024-01-01" / "logs.json").read_text().splitlines()) == 5
+            assert not (tmp_path / "2024-01-01" / "errors.log").exists()
+            
+            stats = writer.get_stats()
+            assert stats["written"] == 5
+            assert stats["batches"] == 1
+            assert stats["open_files"] == 2
+        finally:
+            writer.close()
+    
+    def test_error_records_wake_the_writer(self, tmp_path):
+        """An error should be on disk without waiting for the flush interval."""
+        writer = BackgroundLogWriter(tmp_path, flush_interval=60.0)
+        try:
+            writer.submit(make_record("2024-01-01", "boom", is_error=True))
+            
+            error_log = tmp_path / "2024-01-01" / "errors.log"
+            deadline = time.monotonic() + 5.0
+            while time.monotonic() < deadline and not (error_log.exists() and error_log.read_text()):
+                time.sleep(0.01)
+            
+            assert error_log.read_text() == "boom\n"
+        finally:
+            writer.close()
+    
+    def test_close_drains_queue_and_rotates_days(self, tmp_path):
+        """Closing should write every queued record into its day's directory."""
+        writer = BackgroundLogWriter(tmp_path, flush_interval=60.0)
+        writer.submit(make_record("2024-01-01", "before midnight"))
+        writer.submit(make_record("2024-01-02", "after midnight"))
+        writer.close()
+        
+        assert (tmp_path / "2024-01-01" / "logs.log").read_text() == "before midnight\n"
+        assert (tmp_path / "2024-01-02" / "logs.log").read_text() == "after midnight\n"
+        assert writer.get_stats()["rotations"] == 1
+        assert not writer.get_stats()["running"]
+        
+        # Records logged after close are still written
+        writer.submit(make_record("2024-01-02", "late"))
+        assert (tmp_path / "2024-01-02" / "logs.log").read_text().endswith("late\n")
+
+    
+    def test_full_queue_drops_new_records(self, tmp_path):
+        """A stalled disk should cost dropped records, not unbounded memory."""
+        writer = BackgroundLogWriter(tmp_path, flush_interval=60.0, batch_size=2, max_queue_size=4)
+        gate = threading.Event()
+        write_batch = writer._write_batch
+        
+        def stalled_write(records):
+            gate.wait(5.0)
+            write_batch(records)
+        
+        writer._write_batch = stalled_write
+        try:
+            writer.submit(make_record("2024-01-01", "first", is_error=True))
+            deadline = time.monotonic() + 5.0
+            while time.monotonic() < deadline and writer.get_stats()["queue_size"]:
+                time.sleep(0.01)
+            
+            for i in range(7):
+                writer.submit(make_record("2024-01-01", f"line {i}"))
+            
+            stats = writer.get_stats()
+            assert stats["queue_size"] == 4
+            assert stats["dropped"] == 3
+            
+            gate.set()
+            assert writer.flush(timeout=5.0)
+            lines = (tmp_path / "2024-01-01" / "logs.log").read_text().splitlines()
+            assert lines == ["first", "line 0", "line 1", "line 2", "line 3"]
+        finally:
+            gate.set()
+            writer.close()
+    
+    def test_failed_writes_count_dropped_records(self, tmp_path):
+        """Records lost to an OSError should be counted, not silently discarded."""
+        (tmp_path / "2024-01-01").write_text("not a directory")
+        writer = BackgroundLogWriter(tmp_path, flush_interval=60.0)
+        try:
+            for i in range(3):
+                writer.submit(make_record("2024-01-01", f"line {i}"))
+            assert writer.flush(timeout=5.0)
+            
+            stats = writer.get_stats()
+            assert stats["write_errors"] == 1
+            assert stats["dropped"] == 3
+            assert stats["written"] == 0
+        finally:
+            writer.close()
+
+class TestStructuredLoggerWriter:
+    """Test StructuredLogger use of the background writer."""
+    
+    def test_log_calls_do_not_write_inline(self, tmp_path):
+        """Log calls should queue records that a flush then persists."""
+        logger = StructuredLogger("writer_test", level=LogLevel.DEBUG, log_dir=tmp_path)
+        logger._writer.flush_interval = 60.0
+        
+        logger.info("hello", member_id="1")
+        assert not list(tmp_path.glob("*/logs.log"))
+        
+        logger.error("failed", error=ValueError("bad"))
+        assert logger.flush(timeout=5.0)
+        
+        day_dir = next(path for path in tmp_path.iterdir() if path.is_dir())
+        text = (day_dir / "logs.log").read_text()
+        assert "[INFO] hello (member_id=1)" in text
+        assert "[error=ValueError: bad]" in (day_dir / "errors.log").read_text()
+        
+        entries = [json.loads(line) for line in (day_dir / "logs.json").read_text().splitlines()]
+        assert [entry["message"] for entry in entries] == ["hello", "failed"]
+        assert logger.get_writer_stats()["written"] >= 2
@@ -0,0 +1,149 @@
+"""
+Tests for the bot's member event processing.
+
+These tests call OptimizedStatsBot methods on a mock bot, so they do not
+need a Discord connection or a bot built outside a running event loop.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, call
+
+from src.core.bot import OptimizedStatsBot
+from src.types.models import BotConfig, EventType, GatewayMemberEvent
+from src.utils.cache import SequenceDedupeFilter
+
+
+def make_user(user_id, name):
+    """Create a mock user with a name and discriminator."""
+    user = MagicMock(id=user_id, discriminator="1")
+    user.name = name
+    return user
+
+
+@pytest.fixture
+def bot():
+    """Create a mock bot with a stats service and channel update batcher."""
+    bot = MagicMock()
+    bot.logger = MagicMock()
+    bot.stats_service = MagicMock()
+    bot.channel_update_batcher.add = AsyncMock()
+    return bot
+
+
+class TestMemberEventBatches:
+    """Test batched member event processing."""
+    
+    @pytest.mark.asyncio
+    async def test_member_events_batch_updates_every_guild(self, bot):
+        """Channel updates should be queued for every guild in a batch, in order."""
+        guild_a = MagicMock(id=1)
+        guild_b = MagicMock(id=2)
+        events = [
+            GatewayMemberEvent(EventType.JOIN, guild_a, make_user(10, "a")),
+            GatewayMemberEvent(EventType.LEAVE, guild_a, make_user(10, "a")),
+            GatewayMemberEvent(EventType.JOIN, guild_b, make_user(20, "b")),
+            GatewayMemberEvent(EventType.BAN, guild_b, make_user(30, "c")),
+        ]
+        
+        await OptimizedStatsBot._process_member_events_batch(bot, events)
+        
+        stats_service = bot.stats_service
+        assert stats_service.record_member_join.call_args_list == [call(10, "a#1"), call(20, "b#1")]
+        stats_service.record_member_leave.assert_called_once_with(10, "a#1")
+        assert bot.channel_update_batcher.add.call_args_list == [
+            call("member_count", guild_a),
+            call("member_count", guild_b),
+            call("ban_count", guild_b),
+        ]
+
+
+class TestReplayedMemberEvents:
+    """Test that gateway replays are dropped without losing real events."""
+    
+    @pytest.fixture
+    def dedupe_bot(self, bot):
+        """Give the mock bot a real dedupe filter."""
+        bot.member_event_dedupe = SequenceDedupeFilter(capacity=100, window=60.0)
+        return bot
+    
+    def test_replayed_member_events_are_ignored(self, dedupe_bot):
+        """A member event repeated within the dedupe window should be dropped."""
+        assert not OptimizedStatsBot._is_replayed_member_event(dedupe_bot, "join", 1, 10)
+        assert OptimizedStatsBot._is_replayed_member_event(dedupe_bot, "join", 1, 10)
+        assert not OptimizedStatsBot._is_replayed_member_event(dedupe_bot, "join", 2, 10)
+        assert dedupe_bot.member_event_dedupe.get_stats()["hits"] == 1
+    
+    def test_leave_and_rejoin_are_recorded(self, dedupe_bot):
+        """A real leave and rejoin within the window should not be dropped."""
+        for kind in ("join", "leave", "join", "leave"):
+            assert not OptimizedStatsBot._is_replayed_member_event(dedupe_bot, kind, 1, 10)
+        assert OptimizedStatsBot._is_replayed_member_event(dedupe_bot, "leave", 1, 10)
+    
+    def test_ban_does_not_hide_leave(self, dedupe_bot):
+        """Bans are tracked separately from joins and leaves."""
+        assert not OptimizedStatsBot._is_replayed_member_event(dedupe_bot, "leave", 1, 10)
+        assert not OptimizedStatsBot._is_replayed_member_event(dedupe_bot, "ban", 1, 10)
+        assert OptimizedStatsBot._is_replayed_member_event(dedupe_bot, "leave", 1, 10)
+        assert OptimizedStatsBot._is_replayed_member_event(dedupe_bot, "ban", 1, 10)
+
+
+class TestMemberEventLogging:
+    """Test per-event logging around burst mode."""
+    
+    def test_member_events_logged_outside_burst(self, bot):
+        """Member events get an INFO line when no raid is in progress."""
+        bot.logger.is_enabled.return_value = True
+        bot.stats_service.stats_tracker.burst_active = False
+        
+        assert OptimizedStatsBot._should_log_member_event(bot)
+    
+    def test_member_events_not_logged_during_burst(self, bot):
+        """Burst mode replaces per-event lines with window summaries."""
+        bot.logger.is_enabled.return_value = True
+        bot.stats_service.stats_tracker.burst_active = True
+        
+        assert not OptimizedStatsBot._should_log_member_event(bot)
+    
+    def test_member_events_logged_before_services_start(self, bot):
+        """Events are still logged before the stats service exists."""
+        bot.logger.is_enabled.return_value = True
+        bot.stats_service = None
+        
+        assert OptimizedStatsBot._should_log_member_event(bot)
+
+
+class TestPresenceInterval:
+    """Test the adaptive presence rotation interval."""
+    
+    @pytest.mark.asyncio
+    async def test_presence_poller_uses_presence_update_interval(self):
+        """Presence rotation starts from presence_update_interval, not update_interval."""
+        config = BotConfig(
+            bot_token="token",
+            member_count_channel_id=1,
+            online_count_channel_id=2,
+            ban_count_channel_id=3,
+            heartbeat_channel_id=4,
+            stats_channel_id=5,
+            update_interval=120,
+            presence_update_interval=900
+        )
+        stats_bot = OptimizedStatsBot(config)
+        try:
+            assert stats_bot.presence_poller.base_interval == 900.0
+            assert stats_bot.presence_poller.max_interval == 900.0 * stats_bot.MAX_REFRESH_MULTIPLIER
+            
+            # A quiet rotation backs off from the configured interval
+            assert stats_bot._get_presence_interval() == pytest.approx(990.0)
+        finally:
+            await stats_bot.close()
+    
+    @pytest.mark.asyncio
+    async def test_member_events_recorded_as_presence_activity(self, bot):
+        """Member churn feeds the presence poller as well as the guild poller."""
+        guild = MagicMock(id=1)
+        events = [GatewayMemberEvent(EventType.JOIN, guild, make_user(i, "u")) for i in range(3)]
+        
+        await OptimizedStatsBot._process_member_metrics_batch(bot, events)
+        
+        assert bot.presence_poller.record_activity.call_count == 3
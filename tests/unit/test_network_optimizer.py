@@ -0,0 +1,147 @@
+"""
+Tests for network optimization components.
+
+This module tests the shared connection pool instrumentation, its
+ownership semantics when used by the API batcher, and adaptive polling.
+"""
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.utils.network_optimizer import (
+    AdaptivePoller,
+    APIRequest,
+    ConnectionPool,
+    DiscordAPIBatcher
+)
+
+
+@pytest.fixture
+async def http_server():
+    """Start a local HTTP server that answers every request with 200."""
+    async def handler(request):
+        return web.json_response({"ok": True})
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+    server = TestServer(app)
+    await server.start_server()
+    yield server
+    await server.close()
+
+
+class TestConnectionPool:
+    """Test the shared, instrumented connection pool."""
+
+    @pytest.mark.asyncio
+    async def test_keepalive_connections_are_reused(self, http_server):
+        """Sequential requests to one host should share one handshake."""
+        pool = ConnectionPool(limit_per_host=2)
+        try:
+            for _ in range(3):
+                async with pool.request("GET", str(http_server.make_url("/ping"))) as response:
+                    assert response.status == 200
+                    await response.read()
+
+            stats = pool.get_stats()
+            assert stats["requests"] == 3
+            assert stats["handshakes"] == 1
+            assert stats["reused_connections"] == 2
+            assert stats["reuse_ratio"] == pytest.approx(2 / 3)
+            assert stats["active_connections"] == 0
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_session_is_shared(self):
+        """Every caller should receive the same pooled session."""
+        pool = ConnectionPool()
+        try:
+            first = await pool.get_session()
+            second = await pool.get_session()
+            assert first is second
+            assert first.connector is pool.get_connector()
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_session_recreated_after_connector_closed(self):
+        """A connector closed by another owner should not break the pool."""
+        pool = ConnectionPool()
+        try:
+            session = await pool.get_session()
+            await pool.get_connector().close()
+
+            new_session = await pool.get_session()
+            assert new_session is not session
+            assert session.closed
+            assert not new_session.connector.closed
+        finally:
+            await pool.close()
+
+
+class TestDiscordAPIBatcher:
+    """Test API batcher use of the connection pool."""
+
+    @pytest.mark.asyncio
+    async def test_stop_keeps_shared_pool_open(self):
+        """Stopping the batcher should not close a pool it does not own."""
+        pool = ConnectionPool()
+        batcher = DiscordAPIBatcher(connection_pool=pool)
+        try:
+            session = await pool.get_session()
+            await batcher.stop()
+            assert not session.closed
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_chunked_response_body_is_read(self):
+        """Responses without Content-Length should still return their JSON body."""
+        async def handler(request):
+            response = web.StreamResponse()
+            response.enable_chunked_encoding()
+            await response.prepare(request)
+            await response.write(b'{"ok": true}')
+            await response.write_eof()
+            return response
+
+        app = web.Application()
+        app.router.add_get("/chunked", handler)
+        server = TestServer(app)
+        await server.start_server()
+        pool = ConnectionPool()
+        batcher = DiscordAPIBatcher(connection_pool=pool)
+        try:
+            request = APIRequest(endpoint=str(server.make_url("/chunked")), method="GET")
+            assert await batcher._execute_request(request) == {"ok": True}
+        finally:
+            await pool.close()
+            await server.close()
+
+
+class TestAdaptivePoller:
+    """Test adaptive polling interval adjustments."""
+
+    def test_idle_poller_backs_off_to_max(self):
+        """An idle poller should grow its interval up to the maximum."""
+        poller = AdaptivePoller(base_interval=60, min_interval=30, max_interval=90, name="idle")
+
+        for _ in range(10):
+            interval = poller.get_next_interval()
+
+        assert interval == 90
+        assert poller.current_interval == 90
+        assert poller.get_stats()["name"] == "idle"
+
+    def test_activity_shortens_interval(self):
+        """Recorded activity above the threshold should poll faster."""
+        poller = AdaptivePoller(base_interval=60, min_interval=30, max_interval=90,
+                                activity_threshold=1)
+
+        for _ in range(100):
+            poller.record_activity()
+
+        assert poller.current_interval == 60
+        assert poller.get_next_interval() == pytest.approx(48)
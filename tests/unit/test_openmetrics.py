@@ -0,0 +1,179 @@
+"""
+Tests for the OpenMetrics exporter.
+
+This module tests OpenMetrics text rendering, the subsystem collectors and
+serving scrapes over the local HTTP endpoint.
+"""
+
+import aiohttp
+import pytest
+
+from src.types.models import CircuitBreakerState
+from src.utils.async_utils.event_queue import EventQueue
+from src.utils.cache.cache_manager import CacheManager
+from src.utils.cache.dedupe_filter import SequenceDedupeFilter
+from src.utils.performance.openmetrics import (
+    CONTENT_TYPE,
+    MetricsWriter,
+    OpenMetricsExporter,
+    write_cache_metrics,
+    write_circuit_breaker_metrics,
+    write_dedupe_metrics,
+    write_event_queue_metrics,
+    write_timing_metrics
+)
+from src.utils.performance.timing import record_timing, reset_performance_metrics
+
+
+class TestMetricsWriter:
+    """Test the MetricsWriter class."""
+    
+    def test_families_grouped_and_terminated(self):
+        """Samples for one family should be contiguous, with metadata and EOF."""
+        writer = MetricsWriter()
+        writer.counter("cache_hits", "Cache hits", 3, {"cache": "stats"})
+        writer.gauge("cache_entries", "Entries", 7, {"cache": "stats"})
+        writer.counter("cache_hits", "Cache hits", 5, {"cache": "monitoring"})
+        
+        assert writer.render().splitlines() == [
+            "# TYPE statsbot_cache_hits counter",
+            "# HELP statsbot_cache_hits Cache hits",
+            'statsbot_cache_hits_total{cache="stats"} 3',
+            'statsbot_cache_hits_total{cache="monitoring"} 5',
+            "# TYPE statsbot_cache_entries gauge",
+            "# HELP statsbot_cache_entries Entries",
+            'statsbot_cache_entries{cache="stats"} 7',
+            "# EOF"
+        ]
+    
+    def test_histogram_is_cumulative(self):
+        """Histogram buckets should be cumulative and end with +Inf."""
+        writer = MetricsWriter(prefix="")
+        writer.histogram("wait_seconds", "Wait", [(0.001, 2), (0.01, 3), (float("inf"), 1)], 0.5)
+        
+        lines = writer.render().splitlines()
+        assert 'wait_seconds_bucket{le="0.01"} 5' in lines
+        assert 'wait_seconds_bucket{le="+Inf"} 6' in lines
+        assert "wait_seconds_count 6" in lines
+        assert "wait_seconds_sum 0.5" in lines
+    
+    def test_label_escaping_and_type_conflict(self):
+        """Label values should be escaped and family types must not change."""
+        writer = MetricsWriter()
+        writer.gauge("up", "Up", True, {"name": 'a"b\\c\nd'})
+        
+        assert 'statsbot_up{name="a\\"b\\\\c\\nd"} 1' in writer.render()
+        with pytest.raises(ValueError):
+            writer.counter("up", "Up", 1)
+
+
+class TestCollectors:
+    """Test the subsystem collectors."""
+    
+    def test_cache_metrics(self):
+        """Cache counters should be read without estimating memory."""
+        cache = CacheManager(default_ttl=60, max_size=10)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("missing")
+        writer = MetricsWriter()
+        write_cache_metrics(writer, "stats", cache.get_counters())
+        
+        text = writer.render()
+        assert 'statsbot_cache_hits_total{cache="stats"} 1' in text
+        assert 'statsbot_cache_misses_total{cache="stats"} 1' in text
+        assert 'statsbot_cache_entries{cache="stats"} 1' in text
+        assert 'statsbot_cache_capacity{cache="stats"} 10' in text
+    
+    def test_dedupe_metrics(self):
+        """Dedupe checks and dropped replays should be exported."""
+        dedupe = SequenceDedupeFilter(capacity=10)
+        dedupe.check_and_add((1, 42), "join", now=0.0)
+        dedupe.check_and_add((1, 42), "join", now=1.0)
+        writer = MetricsWriter()
+        write_dedupe_metrics(writer, "member_events", dedupe.get_stats())
+        
+        text = writer.render()
+        assert 'statsbot_dedupe_checks_total{filter="member_events"} 2' in text
+        assert 'statsbot_dedupe_hits_total{filter="member_events"} 1' in text
+        assert 'statsbot_dedupe_entries{filter="member_events"} 1' in text
+    
+    @pytest.mark.asyncio
+    async def test_event_queue_metrics(self):
+        """Queue depth, counters and latency buckets should be exported."""
+        async def process(events):
+            pass
+        
+        queue = EventQueue("members", processor=process, batch_size=10)
+        for n in range(3):
+            await queue.enqueue(n)
+        writer = MetricsWriter()
+        write_event_queue_metrics(writer, "members", queue.get_stats())
+        
+        text = writer.render()
+        assert 'statsbot_event_queue_depth{queue="members"} 3' in text
+        assert 'statsbot_event_queue_enqueued_total{queue="members"} 3' in text
+        assert 'statsbot_event_queue_wait_seconds_bucket{queue="members",le="+Inf"} 0' in text
+    
+    def test_timing_and_circuit_breakers(self):
+        """Latency summaries and breaker state sets should be exported."""
+        class Breaker:
+            state = CircuitBreakerState.OPEN
+            failure_count = 4
+        
+        reset_performance_metrics()
+        try:
+            for _ in range(10):
+                record_timing("stats", "save_data", 0.002)
+            writer = MetricsWriter()
+            write_timing_metrics(writer)
+            write_circuit_breaker_metrics(writer, {"update_heartbeat": Breaker()})
+        finally:
+            reset_performance_metrics()
+        
+        lines = writer.render().splitlines()
+        assert "# TYPE statsbot_operation_latency_seconds summary" in lines
+        assert 'statsbot_operation_latency_seconds_count{category="stats",operation="save_data"} 10' in lines
+        assert any(
+            line.startswith('statsbot_operation_latency_seconds{category="stats",operation="save_data",quantile="0.99"} 0.00')
+            for line in lines
+        )
+        assert "# TYPE statsbot_circuit_breaker_state stateset" in lines
+        assert 'statsbot_circuit_breaker_state{name="update_heartbeat",statsbot_circuit_breaker_state="open"} 1' in lines
+        assert 'statsbot_circuit_breaker_state{name="update_heartbeat",statsbot_circuit_breaker_state="closed"} 0' in lines
+
+
+class TestOpenMetricsExporter:
+    """Test the OpenMetricsExporter class."""
+    
+    @pytest.mark.asyncio
+    async def test_serves_scrapes_on_localhost(self):
+        """A scrape should run the collectors and return OpenMetrics text."""
+        calls = []
+        
+        def collector(writer):
+            calls.append(1)
+            writer.gauge("queue_depth", "Depth", len(calls))
+        
+        def broken(writer):
+            raise RuntimeError("boom")
+        
+        exporter = OpenMetricsExporter(port=0)
+        exporter.register(collector)
+        exporter.register(broken)
+        await exporter.start()
+        try:
+            url = f"http://127.0.0.1:{exporter.bound_port}/metrics"
+            async with aiohttp.ClientSession() as session:
+                async with session.get(url) as response:
+                    assert response.status == 200
+                    assert response.headers["Content-Type"] == CONTENT_TYPE
+                    text = await response.text()
+        finally:
+            await exporter.stop()
+        
+        assert "statsbot_queue_depth 1" in text
+        assert "statsbot_metrics_collector_errors_total 1" in text
+        assert text.endswith("# EOF\n")
+        assert not exporter.running
+        assert exporter.get_stats()["scrapes"] == 1
@@ -0,0 +1,266 @@
+"""
+Tests for the outbound operation scheduler.
+
+This module tests priority ordering, deadline-based load shedding, key
+coalescing and capacity reserved for the daily report.
+"""
+
+import asyncio
+import pytest
+
+from src.utils.async_utils.operation_scheduler import (
+    OperationScheduler, OperationPriority, OperationShedError
+)
+
+
+class TestOperationScheduler:
+    """Test the OperationScheduler class."""
+    
+    @pytest.fixture
+    async def scheduler(self):
+        """Create a single-slot scheduler for deterministic ordering."""
+        scheduler = OperationScheduler("test", max_concurrency=1, reserved_slots=0)
+        yield scheduler
+        await scheduler.stop()
+    
+    @pytest.mark.asyncio
+    async def test_operations_run_in_priority_order(self, scheduler):
+        """Queued operations should run highest priority first."""
+        order = []
+        gate = asyncio.Event()
+        
+        async def blocker():
+            await gate.wait()
+        
+        def record(name):
+            async def op():
+                order.append(name)
+            return op
+        
+        blocking = asyncio.create_task(
+            scheduler.submit("blocker", blocker, OperationPriority.CHANNEL_RENAME)
+        )
+        await asyncio.sleep(0)
+        
+        tasks = [
+            asyncio.create_task(scheduler.submit("log", record("log"), OperationPriority.WEBHOOK_LOG)),
+            asyncio.create_task(scheduler.submit("presence", record("presence"), OperationPriority.PRESENCE)),
+            asyncio.create_task(scheduler.submit("report", record("report"), OperationPriority.DAILY_REPORT)),
+        ]
+        await asyncio.sleep(0.01)
+        gate.set()
+        await asyncio.gather(blocking, *tasks)
+        
+        assert order == ["report", "presence", "log"]
+    
+    @pytest.mark.asyncio
+    async def test_expired_low_priority_work_is_shed(self, scheduler):
+        """Low-priority operations past their deadline should not run."""
+        gate = asyncio.Event()
+        ran = []
+        
+        async def blocker():
+            await gate.wait()
+        
+        async def heartbeat():
+            ran.append("heartbeat")
+        
+        async def rename():
+            ran.append("rename")
+        
+        blocking = asyncio.create_task(
+            scheduler.submit("blocker", blocker, OperationPriority.DAILY_REPORT)
+        )
+        await asyncio.sleep(0)
+        
+        shed = asyncio.create_task(
+            scheduler.submit("heartbeat", heartbeat, OperationPriority.HEARTBEAT, deadline=0.01)
+        )
+        late = asyncio.create_task(
+            scheduler.submit("rename", rename, OperationPriority.CHANNEL_RENAME, deadline=0.01)
+        )
+        await asyncio.sleep(0.05)
+        gate.set()
+        await blocking
+        
+        with pytest.raises(OperationShedError):
+            await shed
+        await late
+        
+        stats = scheduler.get_stats()
+        assert ran == ["rename"]
+        assert stats["shed_expired"] == 1
+        assert stats["late"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_pending_operations_with_same_key_coalesce(self, scheduler):
+        """Only the latest pending operation for a key should execute."""
+        gate = asyncio.Event()
+        calls = []
+        
+        async def blocker():
+            await gate.wait()
+        
+        def rename(value):
+            async def op():
+                calls.append(value)
+                return value
+            return op
+        
+        blocking = asyncio.create_task(
+            scheduler.submit("blocker", blocker, OperationPriority.DAILY_REPORT)
+        )
+        await asyncio.sleep(0)
+        
+        first = asyncio.create_task(scheduler.submit(
+            "rename", rename("first"), OperationPriority.CHANNEL_RENAME, key="channel:1"
+        ))
+        second = asyncio.create_task(scheduler.submit(
+            "rename", rename("second"), OperationPriority.CHANNEL_RENAME, key="channel:1"
+        ))
+        await asyncio.sleep(0.01)
+        gate.set()
+        
+        results = await asyncio.gather(blocking, first, second)
+        
+        assert calls == ["second"]
+        assert results[1:] == ["second", "second"]
+        assert scheduler.get_stats()["coalesced"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_reserved_slot_keeps_report_on_time(self):
+        """Stalled low-priority work must not block the daily report."""
+        scheduler = OperationScheduler("test", max_concurrency=2, reserved_slots=1)
+        stalled = asyncio.Event()
+        
+        async def stuck_presence():
+            await stalled.wait()
+        
+        async def report():
+            return "sent"
+        
+        try:
+            presence_tasks = [
+                asyncio.create_task(scheduler.submit(
+                    f"presence_{i}", stuck_presence, OperationPriority.PRESENCE
+                ))
+                for i in range(3)
+            ]
+            await asyncio.sleep(0.01)
+            
+            result = await asyncio.wait_for(
+                scheduler.submit("report", report, OperationPriority.DAILY_REPORT),
+                timeout=1.0
+            )
+            
+            assert result == "sent"
+            assert scheduler.get_stats()["active"] == 1
+            
+            stalled.set()
+            await asyncio.gather(*presence_tasks)
+        finally:
+            stalled.set()
+            await scheduler.stop()
+    
+    @pytest.mark.asyncio
+    async def test_stalled_renames_cannot_take_reserved_slot(self):
+        """Renames stuck in a rate-limit sleep must not block the daily report."""
+        scheduler = OperationScheduler("test", max_concurrency=2, reserved_slots=1)
+        stalled = asyncio.Event()
+        
+        async def stuck_rename():
+            await stalled.wait()
+        
+        async def report():
+            return "sent"
+        
+        try:
+            renames = [
+                asyncio.create_task(scheduler.submit(
+                    f"rename_{i}", stuck_rename, OperationPriority.CHANNEL_RENAME
+                ))
+                for i in range(2)
+            ]
+            await asyncio.sleep(0.01)
+            assert scheduler.get_stats()["active"] == 1
+            
+            result = await asyncio.wait_for(
+                scheduler.submit("report", report, OperationPriority.DAILY_REPORT),
+                timeout=1.0
+            )
+            assert result == "sent"
+            
+            stalled.set()
+            await asyncio.gather(*renames)
+        finally:
+            stalled.set()
+            await scheduler.stop()
+    
+    @pytest.mark.asyncio
+    async def test_stalled_rename_does_not_block_other_work(self):
+        """A rename stuck in a 429 sleep only holds its own channel's slot."""
+        scheduler = OperationScheduler("test")
+        stalled = asyncio.Event()
+        
+        async def stuck_rename():
+            await stalled.wait()
+        
+        async def done(value):
+            return value
+        
+        try:
+            stuck = asyncio.create_task(scheduler.submit(
+                "rename_1", stuck_rename, OperationPriority.CHANNEL_RENAME, key="channel_rename:1"
+            ))
+            await asyncio.sleep(0.01)
+            queued = asyncio.create_task(scheduler.submit(
+                "rename_1", lambda: done("renamed"), OperationPriority.CHANNEL_RENAME,
+                key="channel_rename:1"
+            ))
+            await asyncio.sleep(0.01)
+            
+            results = await asyncio.wait_for(asyncio.gather(
+                scheduler.submit("rename_2", lambda: done("rename"), OperationPriority.CHANNEL_RENAME,
+                                 key="channel_rename:2"),
+                scheduler.submit("presence", lambda: done("presence"), OperationPriority.PRESENCE),
+                scheduler.submit("heartbeat", lambda: done("heartbeat"), OperationPriority.HEARTBEAT),
+                scheduler.submit("webhook", lambda: done("webhook"), OperationPriority.WEBHOOK_LOG)
+            ), timeout=1.0)
+            
+            assert results == ["rename", "presence", "heartbeat", "webhook"]
+            
+            # The next rename of the stalled channel waits for the first one
+            assert not queued.done()
+            stats = scheduler.get_stats()
+            assert stats["active_by_priority"]["CHANNEL_RENAME"] == 1
+            assert stats["shed_expired"] == 0
+            
+            stalled.set()
+            await stuck
+            assert await asyncio.wait_for(queued, timeout=1.0) == "renamed"
+        finally:
+            stalled.set()
+            await scheduler.stop()
+    
+    @pytest.mark.asyncio
+    async def test_stop_counts_stopped_operations_separately(self):
+        """Operations shed on stop should not be counted as overflow."""
+        scheduler = OperationScheduler("test", max_concurrency=1, reserved_slots=0)
+        gate = asyncio.Event()
+        
+        async def blocker():
+            await gate.wait()
+        
+        running = asyncio.create_task(scheduler.submit("blocker", blocker, OperationPriority.PRESENCE))
+        pending = asyncio.create_task(scheduler.submit("log", blocker, OperationPriority.WEBHOOK_LOG))
+        await asyncio.sleep(0.01)
+        
+        gate.set()
+        await scheduler.stop()
+        await running
+        with pytest.raises(OperationShedError):
+            await pending
+        
+        stats = scheduler.get_stats()
+        assert stats["shed_stopped"] == 1
+        assert stats["shed_overflow"] == 0
@@ -17,9 +17,9 @@ from src.utils.performance import (
     AlertLevel,
     timing,
     memory_timing,
-    performance_context,
     get_performance_report
 )
+from src.utils.performance.monitor import performance_context
 
 
 class TestPerformanceMonitor:
@@ -214,6 +214,80 @@ class TestPerformanceMonitor:
         monitor.shutdown()
 
 
+class TestSampledTiming:
+    """Test cases for the sampled timing mode."""
+    
+    def test_samples_one_call_per_interval(self):
+        """Only the first call and every interval-th call after it are timed."""
+        monitor = PerformanceMonitor(max_metrics=4)
+        
+        @monitor.timing_decorator(category="sampled", sample_rate=0.1, include_memory=False)
+        def add(x: int, y: int) -> int:
+            return x + y
+        
+        assert [add(i, 1) for i in range(25)] == list(range(1, 26))
+        
+        ring = monitor.sample_rings["sampled.add"]
+        assert ring.sampled == 3
+        assert ring.calls == 21
+        assert len(ring.recent_durations_ms()) == 3
+        assert not monitor.metrics
+        
+        summary = monitor.get_metrics_summary("sampled.add")
+        assert summary['sampled_calls'] == 3
+        assert summary['total_calls'] == 21
+        assert 'avg_memory_delta_mb' not in summary
+        
+        monitor.shutdown()
+    
+    def test_ring_keeps_most_recent_samples(self):
+        """The ring should overwrite its oldest samples once full."""
+        monitor = PerformanceMonitor(max_metrics=3)
+        
+        @monitor.timing_decorator(category="sampled", sample_rate=1.0, include_memory=False)
+        def sleep_for(seconds: float):
+            time.sleep(seconds)
+        
+        for seconds in (0.03, 0.001, 0.001, 0.001):
+            sleep_for(seconds)
+        
+        ring = monitor.sample_rings["sampled.sleep_for"]
+        assert all(d < 30 for d in ring.recent_durations_ms())
+        assert ring.max_ns >= 30_000_000
+        assert monitor.get_metrics_summary("sleep_for")['max_duration_ms'] >= 30
+        
+        monitor.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_sampled_async_records_exceptions_and_memory(self):
+        """Sampled async calls should record failures and memory deltas."""
+        monitor = PerformanceMonitor()
+        
+        @monitor.timing_decorator(category="sampled", sample_rate=1.0)
+        async def fail():
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+        
+        with patch.object(monitor, '_get_memory_usage', side_effect=[100.0, 102.0]):
+            with pytest.raises(ValueError):
+                await fail()
+        
+        summary = monitor.get_metrics_summary("sampled.fail")
+        assert summary['exceptions'] == 1
+        assert summary['avg_memory_delta_mb'] == 2.0
+        
+        monitor.shutdown()
+    
+    def test_invalid_sample_rate(self):
+        """Sample rates outside (0, 1] should be rejected."""
+        monitor = PerformanceMonitor()
+        
+        with pytest.raises(ValueError):
+            monitor.timing_decorator(sample_rate=0)
+        
+        monitor.shutdown()
+
+
 class TestConvenienceDecorators:
     """Test cases for convenience decorators and context managers."""
     
@@ -237,7 +311,7 @@ class TestConvenienceDecorators:
     
     def test_performance_context(self):
         """Test performance context manager."""
-        with patch('src.utils.performance.perf_logger') as mock_logger:
+        with patch('src.utils.performance.monitor.perf_logger') as mock_logger:
             with performance_context("test_operation", include_memory=False):
                 time.sleep(0.01)
             
@@ -249,8 +323,8 @@ class TestConvenienceDecorators:
     
     def test_performance_context_with_memory(self):
         """Test performance context manager with memory monitoring."""
-        with patch('src.utils.performance.perf_logger') as mock_logger:
-            with patch('src.utils.performance.performance_monitor._get_memory_usage') as mock_memory:
+        with patch('src.utils.performance.monitor.perf_logger') as mock_logger:
+            with patch('src.utils.performance.monitor.performance_monitor._get_memory_usage') as mock_memory:
                 mock_memory.side_effect = [100.0, 105.0]  # Before and after
                 
                 with performance_context("test_operation", include_memory=True):
@@ -0,0 +1,105 @@
+"""
+Tests for incrementally maintained presence guild metrics.
+
+This module tests seeding, event-driven updates and single-metric reads
+of the GuildMetricsTracker.
+"""
+
+import pytest
+import discord
+from unittest.mock import MagicMock, PropertyMock
+
+from src.services.presence.metrics import GuildMetricsTracker
+from src.services.presence.types import PresenceType
+
+
+def make_member(guild, status):
+    """Create a mock member with the given status."""
+    member = MagicMock()
+    member.guild = guild
+    member.status = status
+    return member
+
+
+@pytest.fixture
+def guild():
+    """Create a mock guild with 10 members, 4 of them online, and 3 bans."""
+    guild = MagicMock()
+    guild.id = 42
+    guild.member_count = 10
+    guild.premium_subscription_count = 7
+    guild.members = [
+        make_member(guild, discord.Status.online if i < 4 else discord.Status.offline)
+        for i in range(10)
+    ]
+    
+    async def bans(limit=None):
+        for _ in range(3):
+            yield MagicMock()
+    
+    guild.bans = MagicMock(side_effect=bans)
+    return guild
+
+
+class TestGuildMetricsTracker:
+    """Test the GuildMetricsTracker class."""
+    
+    @pytest.mark.asyncio
+    async def test_presence_transitions_update_online_count(self, guild):
+        """Status changes should adjust the seeded online count."""
+        tracker = GuildMetricsTracker()
+        assert tracker.seed_online(guild) == 4
+        
+        # No member scans after seeding
+        type(guild).members = PropertyMock(side_effect=AssertionError("member scan"))
+        
+        before = make_member(guild, discord.Status.offline)
+        after = make_member(guild, discord.Status.idle)
+        tracker.on_presence_update(before, after)
+        tracker.on_presence_update(after, make_member(guild, discord.Status.dnd))
+        tracker.on_member_remove(make_member(guild, discord.Status.online))
+        
+        assert await tracker.get_metric(guild, PresenceType.ONLINE_COUNT) == 4
+        
+        tracker.on_presence_update(after, before)
+        assert await tracker.get_metric(guild, PresenceType.ONLINE_COUNT) == 3
+    
+    @pytest.mark.asyncio
+    async def test_ban_count_seeded_once_then_incremental(self, guild):
+        """Bans should be fetched once and then tracked from events."""
+        tracker = GuildMetricsTracker()
+        
+        assert await tracker.get_metric(guild, PresenceType.BAN_COUNT) == 3
+        tracker.on_member_ban(guild)
+        tracker.on_member_ban(guild)
+        tracker.on_member_unban(guild)
+        
+        assert await tracker.get_metric(guild, PresenceType.BAN_COUNT) == 4
+        assert guild.bans.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_only_requested_metric_is_computed(self, guild):
+        """Reading member or boost counts must not scan members or bans."""
+        tracker = GuildMetricsTracker()
+        type(guild).members = PropertyMock(side_effect=AssertionError("member scan"))
+        
+        assert await tracker.get_metric(guild, PresenceType.MEMBER_COUNT) == 10
+        assert await tracker.get_metric(guild, PresenceType.BOOST_COUNT) == 7
+        guild.bans.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_unseeded_online_count_does_not_scan_members(self, guild):
+        """Before on_ready seeds it, the online count should read 0 without a scan."""
+        tracker = GuildMetricsTracker()
+        type(guild).members = PropertyMock(side_effect=AssertionError("member scan"))
+        
+        assert await tracker.get_metric(guild, PresenceType.ONLINE_COUNT) == 0
+        assert tracker.get_stats()["online_seeds"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_ban_count_without_permission(self, guild):
+        """Missing ban permissions should report zero bans."""
+        tracker = GuildMetricsTracker()
+        guild.bans = MagicMock(side_effect=discord.Forbidden(MagicMock(), "Missing permissions"))
+        
+        assert await tracker.get_metric(guild, PresenceType.BAN_COUNT) == 0
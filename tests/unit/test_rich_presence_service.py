@@ -75,6 +75,9 @@ class TestRichPresenceService:
         # Set current index to online_count
         service.current_index = 1  # online_count
         
+        # The bot seeds the online count on ready; presence updates never scan members
+        service.metrics_tracker.seed_online(service.bot.guilds[0])
+        
         # Call update_presence
         await service.update_presence()
         
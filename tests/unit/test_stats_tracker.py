@@ -9,6 +9,7 @@ import unittest
 import asyncio
 import json
 import os
+import time
 import tempfile
 import shutil
 from pathlib import Path
@@ -20,6 +21,9 @@ import sys
 sys.modules['src.core.config'] = MagicMock()
 sys.modules['src.core.config'].config = MagicMock()
 
+# src.core must load before src.services.stats or the two packages import
+# each other half-initialized
+import src.core.bot  # noqa: F401
 from src.services.stats.tracker import StatsTracker
 from src.types.models import EventType, MemberEvent
 
@@ -252,6 +256,63 @@ class TestStatsTracker(unittest.IsolatedAsyncioTestCase):
         self.assertNotIn("invalid-date", self.tracker.daily_stats)
 
 
+    async def test_burst_mode_keeps_counts_exact(self):
+        """Test that a join raid is aggregated without losing any events."""
+        self.tracker.burst_threshold = 5
+        self.tracker.logger = MagicMock()
+        
+        now = float(int(time.time()))
+        with patch('asyncio.create_task'), \
+                patch('src.services.stats.tracker.time.time', return_value=now):
+            for member_id in range(1000, 1050):
+                self.tracker.record_member_join(member_id, f"raider{member_id}")
+        self.addCleanup(lambda: self.tracker._burst_timer and self.tracker._burst_timer.cancel())
+        
+        date = datetime.fromtimestamp(now, self.tracker.est_tz).strftime("%Y-%m-%d")
+        self.assertTrue(self.tracker.burst_active)
+        self.assertEqual(4, len(self.tracker.daily_stats[date]["joins"]))
+        self.assertEqual(50, self.tracker.get_daily_stats(date)["joins"])
+        self.assertEqual(46, self.tracker.get_burst_stats()["pending_events"])
+        
+        # Only the pre-burst events log individually
+        recorded = [c for c in self.tracker.logger.info.call_args_list if "Member join recorded" in c[0][0]]
+        self.assertEqual(4, len(recorded))
+        
+        # Saving folds the open window and survives a reload
+        await self.tracker.save_data()
+        with patch('src.services.stats.tracker.Path', return_value=Path(self.temp_dir)):
+            reloaded = StatsTracker()
+        reloaded.daily_stats = json.loads(self.stats_file.read_text())
+        self.assertEqual(50, reloaded.get_daily_stats(date)["joins"])
+        
+        streamed = [e["id"] for e in reloaded.stream_all_events("joins") if e["date"] == date]
+        self.assertEqual(sorted(streamed), list(range(1000, 1050)))
+    
+    async def test_burst_mode_switches_off_when_calm(self):
+        """Test that a quiet window ends burst mode with one summary line."""
+        self.tracker.burst_threshold = 5
+        self.tracker.burst_window = 10
+        self.tracker.logger = MagicMock()
+        
+        now = float(int(time.time()))
+        with patch('asyncio.create_task'), \
+                patch('src.services.stats.tracker.time.time', return_value=now):
+            for member_id in range(10):
+                self.tracker.record_member_join(member_id, "raider")
+        self.tracker._burst_timer.cancel()
+        
+        with patch('src.services.stats.tracker.time.time', return_value=now + 10):
+            self.tracker._end_burst_window()
+        
+        self.assertFalse(self.tracker.burst_active)
+        summaries = [c for c in self.tracker.logger.info.call_args_list if "Burst window summary" in c[0][0]]
+        self.assertEqual(1, len(summaries))
+        self.assertEqual(0, self.tracker.get_burst_stats()["pending_events"])
+        
+        is_valid, issues = await self.tracker.validate_data_integrity()
+        self.assertTrue(is_valid, issues)
+
+
 if __name__ == '__main__':
     # Use asyncio to run async tests
     asyncio.run(unittest.main())
\ No newline at end of file
@@ -0,0 +1,179 @@
+"""
+Tests for the tree logger's buffered NDJSON output.
+
+This module tests batching and flushing in NDJSONSink, size-based
+rotation into gzip archives on the flush thread, recovery of files left
+mid-rotation, that a tree section is written as a single JSON record, and
+that the tree log keeps out of StructuredLogger's files.
+"""
+
+import gzip
+import json
+import logging
+import threading
+import time
+
+import pytest
+
+from src.utils.tree_log import NDJSONSink, TreeLogger
+
+
+def read_records(path):
+    """Read the NDJSON records in a file."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def restore_root_handlers():
+    """Restore the root logger handlers replaced by TreeLogger."""
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    yield
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    for handler in handlers:
+        root.addHandler(handler)
+
+
+class TestNDJSONSink:
+    """Test the NDJSONSink class."""
+    
+    def test_records_are_buffered_until_flush(self, tmp_path):
+        """Records should stay in memory until the buffer fills or a flush."""
+        path = tmp_path / "logs.json"
+        sink = NDJSONSink(str(path), flush_interval=60, buffer_size=3)
+        
+        sink.write({"n": 1})
+        sink.write({"n": 2})
+        assert not path.exists()
+        
+        sink.write({"n": 3})
+        assert [r["n"] for r in read_records(path)] == [1, 2, 3]
+        
+        sink.write({"n": 4})
+        sink.write({"n": 5}, urgent=True)
+        assert len(read_records(path)) == 5
+        assert sink.get_stats()["flushes"] == 2
+        sink.close()
+    
+    def test_rotation_compresses_old_files(self, tmp_path):
+        """Files past max_bytes should rotate into a bounded gzip chain."""
+        path = tmp_path / "logs.json"
+        sink = NDJSONSink(str(path), max_bytes=200, backup_count=2, flush_interval=60, buffer_size=1)
+        
+        for i in range(20):
+            sink.write({"n": i, "pad": "x" * 40})
+        sink.close()
+        
+        assert (tmp_path / "logs.json.1.gz").exists()
+        assert (tmp_path / "logs.json.2.gz").exists()
+        assert not (tmp_path / "logs.json.3.gz").exists()
+        assert path.stat().st_size <= 200
+        
+        with gzip.open(tmp_path / "logs.json.1.gz", "rt", encoding="utf-8") as f:
+            archived = [json.loads(line)["n"] for line in f]
+        current = [r["n"] for r in read_records(path)]
+        assert archived[-1] + 1 == current[0]
+        assert current[-1] == 19
+        assert not (tmp_path / "logs.json.rotating").exists()
+    
+    def test_rotation_keeps_every_record(self, tmp_path):
+        """Rotating should lose no records between the archive and the live file."""
+        path = tmp_path / "tree.json"
+        sink = NDJSONSink(str(path), max_bytes=400, backup_count=5, flush_interval=60, buffer_size=1)
+        
+        for i in range(30):
+            sink.write({"n": i, "pad": "x" * 40})
+        sink.close()
+        
+        seen = []
+        for i in range(5, 0, -1):
+            archive = tmp_path / f"tree.json.{i}.gz"
+            if archive.exists():
+                with gzip.open(archive, "rt", encoding="utf-8") as f:
+                    seen.extend(json.loads(line)["n"] for line in f)
+        seen.extend(r["n"] for r in read_records(path))
+        assert seen == list(range(30))
+
+    
+    def test_rotation_compresses_on_the_flush_thread(self, tmp_path, monkeypatch):
+        """Writers should only rename the full file; gzip runs on the flush thread."""
+        path = tmp_path / "tree.json"
+        threads = []
+        gzip_open = gzip.open
+        
+        def recording_open(*args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return gzip_open(*args, **kwargs)
+        
+        monkeypatch.setattr(gzip, "open", recording_open)
+        sink = NDJSONSink(str(path), max_bytes=200, backup_count=2, flush_interval=60, buffer_size=1)
+        try:
+            for i in range(6):
+                sink.write({"n": i, "pad": "x" * 40})
+            
+            deadline = time.monotonic() + 5.0
+            while time.monotonic() < deadline and sink.get_stats()["pending_archives"]:
+                time.sleep(0.01)
+            
+            assert threads and set(threads) == {"tree-log-json"}
+            assert (tmp_path / "tree.json.1.gz").exists()
+            assert not list(tmp_path.glob("*.rotating"))
+        finally:
+            sink.close()
+    
+    def test_leftover_rotating_file_is_archived_on_start(self, tmp_path):
+        """A file left mid-rotation by a crash should be compressed, not kept forever."""
+        path = tmp_path / "tree.json"
+        (tmp_path / "tree.json.rotating").write_text('{"n": 1}\n{"n": 2}\n', encoding="utf-8")
+        
+        sink = NDJSONSink(str(path), flush_interval=60)
+        assert sink.get_stats()["pending_archives"] == 1
+        sink.close()
+        
+        with gzip.open(tmp_path / "tree.json.1.gz", "rt", encoding="utf-8") as f:
+            assert [json.loads(line)["n"] for line in f] == [1, 2]
+        assert not list(tmp_path.glob("*.rotating"))
+
+class TestTreeLogger:
+    """Test TreeLogger JSON records."""
+    
+    def test_section_is_one_record(self, tmp_path, monkeypatch, restore_root_handlers):
+        """A tree section should produce one JSON record with its items."""
+        monkeypatch.chdir(tmp_path)
+        tree = TreeLogger()
+        
+        tree.log_section("Cache", [("size", 10), ("hits", 4)], emoji="📦")
+        tree.json_sink.close()
+        
+        records = read_records(tree.json_log_path)
+        assert len(records) == 1
+        assert records[0]["category"] == "perfect_tree_section"
+        assert records[0]["message"] == "📦 Cache"
+        assert records[0]["items"] == {"size": 10, "hits": 4}
+        assert records[0]["run_id"] == tree.run_id
+    
+    def test_json_log_is_separate_from_structured_logs(self, tmp_path, monkeypatch, restore_root_handlers):
+        """Tree records should not share logs.json with the background log writer."""
+        monkeypatch.chdir(tmp_path)
+        tree = TreeLogger()
+        
+        tree.log_section("Cache", [("size", 10)])
+        tree.json_sink.close()
+        
+        assert tree.json_log_path.endswith("tree.json")
+        assert not (tmp_path / "logs" / tree.today / "logs.json").exists()
+    
+    def test_setup_closes_replaced_file_handlers(self, tmp_path, monkeypatch, restore_root_handlers):
+        """Re-running setup (as roll_day does) should close the old file handlers."""
+        monkeypatch.chdir(tmp_path)
+        tree = TreeLogger()
+        old_handlers = [h for h in logging.getLogger().handlers if isinstance(h, logging.FileHandler)]
+        
+        tree._setup_logging()
+        tree.json_sink.close()
+        
+        assert len(old_handlers) == 2
+        assert all(handler.stream is None for handler in old_handlers)